@@ -0,0 +1,34 @@
+"""add pipeline_tasks queue claim index
+
+Revision ID: 3f7a9d20c5e1
+Revises: 9e4b2c71a0d6
+Create Date: 2026-10-16 15:22:48.610354
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f7a9d20c5e1"
+down_revision: Union[str, Sequence[str], None] = "9e4b2c71a0d6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_pipeline_tasks_status_priority_created",
+        "pipeline_tasks",
+        ["status", "priority", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_pipeline_tasks_status_priority_created", table_name="pipeline_tasks"
+    )
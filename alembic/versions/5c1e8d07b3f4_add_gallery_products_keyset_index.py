@@ -0,0 +1,55 @@
+"""add gallery_products keyset index
+
+Revision ID: 5c1e8d07b3f4
+Revises: abf29713d5a2
+Create Date: 2026-10-16 11:40:07.518392
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1e8d07b3f4"
+down_revision: Union[str, Sequence[str], None] = "abf29713d5a2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Backfill the sort key for runs that never recorded an end_time
+    op.execute(
+        sa.text(
+            "UPDATE gallery_products SET end_time = ("
+            "SELECT pipeline_runs.start_time FROM pipeline_runs "
+            "WHERE pipeline_runs.id = gallery_products.pipeline_run_id"
+            ") WHERE end_time IS NULL"
+        )
+    )
+    # Runs without a start_time either fall back to when the entry was built
+    op.execute(
+        sa.text(
+            "UPDATE gallery_products SET end_time = COALESCE(updated_at, "
+            "CURRENT_TIMESTAMP) WHERE end_time IS NULL"
+        )
+    )
+    # A NULL sort key would be skipped by the keyset predicates
+    with op.batch_alter_table("gallery_products", schema=None) as batch_op:
+        batch_op.alter_column("end_time", existing_type=sa.DateTime(), nullable=False)
+    op.create_index(
+        "ix_gallery_products_end_time_run",
+        "gallery_products",
+        ["end_time", "pipeline_run_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_gallery_products_end_time_run", table_name="gallery_products")
+    with op.batch_alter_table("gallery_products", schema=None) as batch_op:
+        batch_op.alter_column("end_time", existing_type=sa.DateTime(), nullable=True)
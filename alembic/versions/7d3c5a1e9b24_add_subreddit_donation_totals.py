@@ -0,0 +1,56 @@
+"""add subreddit_donation_totals rollup
+
+Revision ID: 7d3c5a1e9b24
+Revises: 3f7a9d20c5e1
+Create Date: 2026-10-16 16:40:12.873519
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7d3c5a1e9b24"
+down_revision: Union[str, Sequence[str], None] = "3f7a9d20c5e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "subreddit_donation_totals",
+        sa.Column("subreddit_id", sa.Integer(), nullable=False),
+        sa.Column("total_cents", sa.BigInteger(), nullable=False),
+        sa.Column("donation_count", sa.Integer(), nullable=False),
+        sa.Column("donor_count", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["subreddit_id"], ["subreddits.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("subreddit_id"),
+    )
+
+    # Backfill from existing succeeded donations
+    op.execute(
+        """
+        INSERT INTO subreddit_donation_totals
+            (subreddit_id, total_cents, donation_count, donor_count, updated_at)
+        SELECT subreddit_id,
+               COALESCE(SUM(amount_cents), 0),
+               COUNT(id),
+               COUNT(DISTINCT NULLIF(customer_email, '')),
+               CURRENT_TIMESTAMP
+        FROM donations
+        WHERE status = 'succeeded' AND subreddit_id IS NOT NULL
+        GROUP BY subreddit_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("subreddit_donation_totals")
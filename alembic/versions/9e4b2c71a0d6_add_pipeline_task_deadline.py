@@ -0,0 +1,71 @@
+"""add pipeline_tasks heartbeat deadline
+
+Revision ID: 9e4b2c71a0d6
+Revises: 5c1e8d07b3f4
+Create Date: 2026-10-16 14:05:31.204117
+
+"""
+
+from datetime import timedelta
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9e4b2c71a0d6"
+down_revision: Union[str, Sequence[str], None] = "5c1e8d07b3f4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "pipeline_tasks", sa.Column("deadline_at", sa.DateTime(), nullable=True)
+    )
+    op.create_index(
+        "ix_pipeline_tasks_status_deadline",
+        "pipeline_tasks",
+        ["status", "deadline_at"],
+        unique=False,
+    )
+
+    # Backfill deadlines for tasks already running; interval arithmetic is
+    # dialect-specific, so compute it here (only in-progress rows need one)
+    pipeline_tasks = sa.table(
+        "pipeline_tasks",
+        sa.column("id", sa.Integer),
+        sa.column("status", sa.String),
+        sa.column("last_heartbeat", sa.DateTime),
+        sa.column("started_at", sa.DateTime),
+        sa.column("created_at", sa.DateTime),
+        sa.column("timeout_seconds", sa.Integer),
+        sa.column("deadline_at", sa.DateTime),
+    )
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(
+            pipeline_tasks.c.id,
+            pipeline_tasks.c.last_heartbeat,
+            pipeline_tasks.c.started_at,
+            pipeline_tasks.c.created_at,
+            pipeline_tasks.c.timeout_seconds,
+        ).where(pipeline_tasks.c.status == "in_progress")
+    ).fetchall()
+    for task_id, last_heartbeat, started_at, created_at, timeout_seconds in rows:
+        anchor = last_heartbeat or started_at or created_at
+        if anchor is None:
+            continue
+        bind.execute(
+            pipeline_tasks.update()
+            .where(pipeline_tasks.c.id == task_id)
+            .values(deadline_at=anchor + timedelta(seconds=timeout_seconds or 300))
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_pipeline_tasks_status_deadline", table_name="pipeline_tasks")
+    op.drop_column("pipeline_tasks", "deadline_at")
@@ -0,0 +1,93 @@
+"""add gallery_products read model
+
+Revision ID: abf29713d5a2
+Revises: d848fa9e3ee9
+Create Date: 2026-10-16 09:12:41.203118
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "abf29713d5a2"
+down_revision: Union[str, Sequence[str], None] = "d848fa9e3ee9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Create gallery_products table
+    # Existing products are backfilled by GalleryService.backfill_missing() on API startup
+    op.create_table(
+        "gallery_products",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("pipeline_run_id", sa.Integer(), nullable=False),
+        sa.Column("product_info_id", sa.Integer(), nullable=False),
+        sa.Column("donation_id", sa.Integer(), nullable=True),
+        sa.Column("end_time", sa.DateTime(), nullable=True),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["pipeline_run_id"], ["pipeline_runs.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["product_info_id"], ["product_infos.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(
+            ["donation_id"],
+            ["donations.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_gallery_products_pipeline_run_id"),
+        "gallery_products",
+        ["pipeline_run_id"],
+        unique=True,
+    )
+    op.create_index(
+        op.f("ix_gallery_products_product_info_id"),
+        "gallery_products",
+        ["product_info_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_gallery_products_donation_id"),
+        "gallery_products",
+        ["donation_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_gallery_products_end_time"),
+        "gallery_products",
+        ["end_time"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_gallery_products_updated_at"),
+        "gallery_products",
+        ["updated_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Drop gallery_products table
+    op.drop_index(op.f("ix_gallery_products_updated_at"), table_name="gallery_products")
+    op.drop_index(op.f("ix_gallery_products_end_time"), table_name="gallery_products")
+    op.drop_index(
+        op.f("ix_gallery_products_donation_id"), table_name="gallery_products"
+    )
+    op.drop_index(
+        op.f("ix_gallery_products_product_info_id"), table_name="gallery_products"
+    )
+    op.drop_index(
+        op.f("ix_gallery_products_pipeline_run_id"), table_name="gallery_products"
+    )
+    op.drop_table("gallery_products")
@@ -0,0 +1,32 @@
+"""add openai_usage_rollups.tier
+
+Revision ID: b7d2e4f19a83
+Revises: f3a8c61d9b27
+Create Date: 2026-10-16 23:08:41.775209
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d2e4f19a83"
+down_revision: Union[str, Sequence[str], None] = "f3a8c61d9b27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "openai_usage_rollups",
+        sa.Column("tier", sa.String(length=32), server_default="", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("openai_usage_rollups", "tier")
@@ -0,0 +1,68 @@
+"""add webhook_events inbox
+
+Revision ID: b8e41f6c2d93
+Revises: 7d3c5a1e9b24
+Create Date: 2026-10-16 17:32:05.418862
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b8e41f6c2d93"
+down_revision: Union[str, Sequence[str], None] = "7d3c5a1e9b24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "webhook_events",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("stripe_event_id", sa.String(length=255), nullable=False),
+        sa.Column("event_type", sa.String(length=100), nullable=False),
+        sa.Column("payment_intent_id", sa.String(length=255), nullable=True),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("next_attempt_at", sa.DateTime(), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("stripe_created", sa.BigInteger(), nullable=True),
+        sa.Column("received_at", sa.DateTime(), nullable=True),
+        sa.Column("processed_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("stripe_event_id"),
+    )
+    op.create_index(
+        op.f("ix_webhook_events_event_type"),
+        "webhook_events",
+        ["event_type"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_webhook_events_payment_intent_id"),
+        "webhook_events",
+        ["payment_intent_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_webhook_events_status_next_attempt",
+        "webhook_events",
+        ["status", "next_attempt_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_webhook_events_status_next_attempt", table_name="webhook_events")
+    op.drop_index(
+        op.f("ix_webhook_events_payment_intent_id"), table_name="webhook_events"
+    )
+    op.drop_index(op.f("ix_webhook_events_event_type"), table_name="webhook_events")
+    op.drop_table("webhook_events")
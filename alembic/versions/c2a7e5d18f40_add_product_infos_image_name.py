@@ -0,0 +1,71 @@
+"""add product_infos image_name
+
+Revision ID: c2a7e5d18f40
+Revises: b8e41f6c2d93
+Create Date: 2026-10-16 18:10:44.902316
+
+"""
+
+from typing import Sequence, Union
+from urllib.parse import urlparse
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c2a7e5d18f40"
+down_revision: Union[str, Sequence[str], None] = "b8e41f6c2d93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _image_name(image_url):
+    # Mirrors app.db.models.image_name_from_url as of this revision
+    if not image_url:
+        return None
+    path = urlparse(image_url).path or image_url
+    return path.rstrip("/").rsplit("/", 1)[-1][:255] or None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "product_infos", sa.Column("image_name", sa.String(length=255), nullable=True)
+    )
+
+    # Products sharing an image all carry its name; lookups take the lowest id
+    product_infos = sa.table(
+        "product_infos",
+        sa.column("id", sa.Integer),
+        sa.column("image_url", sa.Text),
+        sa.column("image_name", sa.String),
+    )
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(product_infos.c.id, product_infos.c.image_url).where(
+            product_infos.c.image_url.isnot(None)
+        )
+    ).all()
+    for product_id, image_url in rows:
+        name = _image_name(image_url)
+        if name is not None:
+            bind.execute(
+                product_infos.update()
+                .where(product_infos.c.id == product_id)
+                .values(image_name=name)
+            )
+
+    op.create_index(
+        op.f("ix_product_infos_image_name"),
+        "product_infos",
+        ["image_name"],
+        unique=False,
+        postgresql_ops={"image_name": "varchar_pattern_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_product_infos_image_name"), table_name="product_infos")
+    op.drop_column("product_infos", "image_name")
@@ -0,0 +1,62 @@
+"""add candidate_posts
+
+Revision ID: e5b19c7a3d62
+Revises: c2a7e5d18f40
+Create Date: 2026-10-16 19:02:17.530914
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5b19c7a3d62"
+down_revision: Union[str, Sequence[str], None] = "c2a7e5d18f40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "candidate_posts",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("post_id", sa.String(length=32), nullable=False),
+        sa.Column("subreddit", sa.String(length=100), nullable=False),
+        sa.Column("title", sa.Text(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=True),
+        sa.Column("permalink", sa.Text(), nullable=True),
+        sa.Column("url", sa.Text(), nullable=True),
+        sa.Column("score", sa.Integer(), nullable=False),
+        sa.Column("num_comments", sa.Integer(), nullable=False),
+        sa.Column("posted_at", sa.DateTime(), nullable=False),
+        sa.Column("rank_score", sa.Float(), nullable=False),
+        sa.Column("harvested_at", sa.DateTime(), nullable=False),
+        sa.Column("claimed_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("post_id"),
+    )
+    op.create_index(
+        "ix_candidate_posts_claimed_rank",
+        "candidate_posts",
+        ["claimed_at", "rank_score"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_candidate_posts_subreddit_claimed_rank",
+        "candidate_posts",
+        [sa.text("lower(subreddit)"), "claimed_at", "rank_score"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_candidate_posts_subreddit_claimed_rank", table_name="candidate_posts"
+    )
+    op.drop_index("ix_candidate_posts_claimed_rank", table_name="candidate_posts")
+    op.drop_table("candidate_posts")
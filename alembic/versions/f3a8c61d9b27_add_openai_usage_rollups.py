@@ -0,0 +1,53 @@
+"""add openai_usage_rollups
+
+Revision ID: f3a8c61d9b27
+Revises: e5b19c7a3d62
+Create Date: 2026-10-16 21:14:52.204117
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3a8c61d9b27"
+down_revision: Union[str, Sequence[str], None] = "e5b19c7a3d62"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "openai_usage_rollups",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("window_start", sa.DateTime(), nullable=False),
+        sa.Column("window_end", sa.DateTime(), nullable=False),
+        sa.Column("model", sa.String(length=64), nullable=False),
+        sa.Column("operation", sa.String(length=32), nullable=False),
+        sa.Column("calls", sa.Integer(), nullable=False),
+        sa.Column("failed_calls", sa.Integer(), nullable=False),
+        sa.Column("tokens_used", sa.BigInteger(), nullable=False),
+        sa.Column("cost_usd", sa.Float(), nullable=False),
+        sa.Column("total_response_time_ms", sa.Float(), nullable=False),
+        sa.Column("max_response_time_ms", sa.Float(), nullable=False),
+        sa.Column("latency_histogram", sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_openai_usage_rollups_model_window",
+        "openai_usage_rollups",
+        ["model", "window_start"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_openai_usage_rollups_model_window", table_name="openai_usage_rollups"
+    )
+    op.drop_table("openai_usage_rollups")
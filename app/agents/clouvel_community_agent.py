@@ -7,14 +7,16 @@ import json
 import logging
 import os
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import praw
 from openai import OpenAI
 from praw.models import Comment, Submission
 
+from app.clients.reddit_registry import get_reddit_client
 from app.db.database import SessionLocal
 from app.db.models import CommunityAgentAction, CommunityAgentState, Subreddit
+from app.utils.llm_cache import llm_cache
 
 logger = logging.getLogger(__name__)
 
@@ -22,19 +24,18 @@ logger = logging.getLogger(__name__)
 class ClouvelCommunityAgent:
     """Queen Clouvel - The mythical golden retriever ruler of r/clouvel"""
 
-    def __init__(self, subreddit_name: str = "clouvel", dry_run: bool = True):
+    def __init__(
+        self,
+        subreddit_name: str = "clouvel",
+        dry_run: bool = True,
+        openai_client: Optional[OpenAI] = None,
+    ):
         self.subreddit_name = subreddit_name
         self.dry_run = dry_run
-        self.reddit = praw.Reddit(
-            client_id=os.getenv("REDDIT_CLIENT_ID"),
-            client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
-            username=os.getenv("REDDIT_USERNAME"),
-            password=os.getenv("REDDIT_PASSWORD"),
-            user_agent=os.getenv(
-                "REDDIT_USER_AGENT", "clouvel-agent by u/queen_clouvel"
-            ),
+        self.reddit: praw.Reddit = get_reddit_client(
+            default_user_agent="clouvel-agent by u/queen_clouvel"
         )
-        self.openai = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.openai = openai_client or OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
         self.personality = """You are Queen Clouvel, the beloved golden retriever monarch of r/clouvel.
 You rule your creative kingdom with a gentle paw and an artist's eye.
@@ -338,7 +339,10 @@ You rule your creative kingdom with a gentle paw and an artist's eye.
             )
 
         try:
-            response = self.openai.chat.completions.create(
+            # Executed actions are sampled fresh; dry runs execute nothing, so replay
+            content = llm_cache.chat(
+                self.openai,
+                cache=self.dry_run,
                 model=os.getenv("OPENAI_COMMUNITY_AGENT_MODEL", "gpt-4o-mini"),
                 messages=[
                     {"role": "system", "content": self.personality},
@@ -348,7 +352,7 @@ You rule your creative kingdom with a gentle paw and an artist's eye.
                 response_format={"type": "json_object"},
             )
 
-            actions = json.loads(response.choices[0].message.content)
+            actions = json.loads(content)
             if isinstance(actions, dict) and "actions" in actions:
                 actions = actions["actions"]
 
@@ -15,8 +15,11 @@ import requests
 from openai import OpenAI
 from praw.models import Submission
 
+from app.clients.reddit_registry import get_reddit_client
 from app.db.database import SessionLocal
 from app.db.models import AgentScannedPost, Subreddit
+from app.services.post_dedupe import post_dedupe
+from app.utils.llm_cache import llm_cache
 
 logger = logging.getLogger(__name__)
 
@@ -132,13 +135,7 @@ class ClouvelPromoterAgent:
                 f"Missing required environment variables: {', '.join(missing_vars)}"
             )
 
-        self.reddit = praw.Reddit(
-            client_id=os.getenv("PROMOTER_AGENT_CLIENT_ID"),
-            client_secret=os.getenv("PROMOTER_AGENT_CLIENT_SECRET"),
-            username=os.getenv("PROMOTER_AGENT_USERNAME"),
-            password=os.getenv("PROMOTER_AGENT_PASSWORD"),
-            user_agent=os.getenv("PROMOTER_AGENT_USER_AGENT"),
-        )
+        self.reddit: praw.Reddit = get_reddit_client("promoter")
         self.openai = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
         self.personality = """You are Queen Clouvel - a secretive, humble, powerful queen who is also a majestic, laconic golden retriever.
@@ -407,15 +404,17 @@ class ClouvelPromoterAgent:
                 logger.info(f"Scanning r/{current_subreddit_name} for novel posts...")
 
                 # Get hot posts from current subreddit
-                for post in subreddit.hot(limit=5):
-                    # Skip if already scanned
-                    if self._check_post_already_scanned(session, post.id):
-                        continue
-
-                    # Skip if already commissioned
-                    if self._check_post_already_commissioned(post.id):
-                        logger.info(
-                            f"Skipping commissioned post: {post.id} - {post.title[:50]}..."
+                posts = list(subreddit.hot(limit=5))
+                known = post_dedupe.known_post_ids(
+                    session,
+                    [post.id for post in posts],
+                    sources=("scanned", "commissioned"),
+                )
+                for post in posts:
+                    # Skip if already scanned or commissioned
+                    if post.id in known:
+                        logger.debug(
+                            f"Skipping scanned or commissioned post: {post.id}"
                         )
                         continue
 
@@ -555,7 +554,9 @@ Respond with JSON: {{
     "illustration_potential": 7
 }}"""
 
-            response = self.openai.chat.completions.create(
+            # A yes/no classification; re-analysing the same post replays it
+            response_content = llm_cache.chat(
+                self.openai,
                 model=os.getenv("OPENAI_COMMUNITY_AGENT_MODEL", "gpt-4o-mini"),
                 messages=[
                     {"role": "system", "content": self.personality},
@@ -564,8 +565,6 @@ Respond with JSON: {{
                 temperature=0.7,
                 max_tokens=300,
             )
-
-            response_content = response.choices[0].message.content
             logger.debug(f"LLM response content: {response_content}")
 
             if not response_content or response_content.strip() == "":
@@ -789,7 +788,10 @@ TONE EXAMPLES:
 
 Create a brief, engaging comment that makes 'clouvel' feel like the natural verb for turning Reddit content into art."""
 
-            response = self.openai.chat.completions.create(
+            # Posted comments should be fresh; dry runs post nothing, so replay
+            comment = llm_cache.chat(
+                self.openai,
+                cache=self.dry_run,
                 model=os.getenv("OPENAI_COMMUNITY_AGENT_MODEL", "gpt-4o-mini"),
                 messages=[
                     {"role": "system", "content": self.personality},
@@ -797,9 +799,7 @@ Create a brief, engaging comment that makes 'clouvel' feel like the natural verb
                 ],
                 temperature=0.8,
                 max_tokens=150,  # Reduced for shorter comments
-            )
-
-            comment = response.choices[0].message.content.strip()
+            ).strip()
 
             # Assess comment quality for continuous improvement
             quality_metrics = self._assess_comment_quality(comment, post_content)
@@ -963,9 +963,13 @@ Create a brief, engaging comment that makes 'clouvel' feel like the natural verb
                 subreddit = self.reddit.subreddit(subreddit_name)
 
                 # Get hot posts from the art subreddit
-                for post in subreddit.hot(limit=20):
+                posts = list(subreddit.hot(limit=20))
+                scanned = post_dedupe.known_post_ids(
+                    session, [post.id for post in posts], sources=("scanned",)
+                )
+                for post in posts:
                     # Skip if already engaged with this post
-                    if self._check_post_already_scanned(session, post.id):
+                    if post.id in scanned:
                         continue
 
                     # Skip if score is too low
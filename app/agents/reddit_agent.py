@@ -15,7 +15,7 @@ import random
 import time
 from dataclasses import asdict
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 import openai
 import praw
@@ -31,7 +31,7 @@ from app.clients.imgur_client import ImgurClient
 from app.clients.reddit_client import RedditClient
 from app.db.database import SessionLocal
 from app.db.mappers import product_idea_to_db, product_info_to_db, reddit_context_to_db
-from app.db.models import ProductInfo, RedditPost
+from app.db.models import ProductInfo
 from app.models import (
     DesignInstructions,
     DistributionMetadata,
@@ -42,7 +42,12 @@ from app.models import (
     RedditContext,
 )
 from app.pipeline_status import PipelineStatus
+from app.services.comment_summarizer import comment_summarizer
+from app.services.post_dedupe import post_dedupe
+from app.services.subreddit_pool import subreddit_pool
+from app.utils.llm_cache import llm_cache
 from app.utils.logging_config import get_logger
+from app.utils.openai_rate_limiter import estimate_message_tokens
 from app.utils.openai_usage_tracker import log_session_summary, track_openai_call
 from app.zazzle_product_designer import ZazzleProductDesigner
 from app.zazzle_templates import ZAZZLE_PRINT_TEMPLATE
@@ -456,8 +461,9 @@ SUBREDDIT_CRITERIA = {
 
 def pick_subreddit(db: Session = None) -> str:
     """
-    Pick a random subreddit, trying to fetch a new one from Reddit first,
-    then falling back to database or hardcoded list.
+    Pick a random subreddit from the background-refreshed subreddit pool,
+    falling back to a live r/all listing, the database or a hardcoded list
+    while the pool is empty.
 
     Args:
         db: Database session. If None, creates a new session.
@@ -484,6 +490,11 @@ def pick_subreddit(db: Session = None) -> str:
 
         logger = logging.getLogger(__name__)
 
+        # Weighted pick from memory; only (re)loads from the database when stale
+        pooled_subreddit_name = subreddit_pool.pick(db)
+        if pooled_subreddit_name:
+            return pooled_subreddit_name
+
         # Try to fetch a random subreddit from Reddit's API
         reddit_client = RedditClient()
         random_subreddit_name = reddit_client.fetch_random_subreddit()
@@ -689,15 +700,23 @@ class RedditAgent:
         """
         model = self._get_idea_model()
 
-        # Apply tracking with the actual model being used
-        @track_openai_call(model=model, operation="chat")
+        # Apply tracking with the actual model being used; the tracker needs the
+        # whole response to read its usage and rate-limit headers
+        @track_openai_call(
+            model=model,
+            operation="chat",
+            estimate=lambda: estimate_message_tokens(messages),
+        )
         def _tracked_call():
-            response = self.openai.chat.completions.create(
-                model=model, messages=messages
-            )
-            return response.choices[0].message.content
-
-        return _tracked_call()
+            return self.openai.chat.completions.create(model=model, messages=messages)
+
+        # Product ideas are creative; a replayed response would repeat the same idea
+        return llm_cache.fetch(
+            lambda: _tracked_call().choices[0].message.content,
+            cache=False,
+            model=model,
+            messages=messages,
+        )
 
     async def _determine_product_idea(
         self, reddit_context: RedditContext
@@ -730,7 +749,8 @@ class RedditAgent:
                 },
             ]
 
-            content = self._make_openai_call(messages)
+            # The call may wait on the rate limiter; keep it off the event loop
+            content = await asyncio.to_thread(self._make_openai_call, messages)
 
             # Log the raw response for debugging
             logger.info(f"Raw OpenAI Response: {content}")
@@ -1089,7 +1109,9 @@ class RedditAgent:
                     submission = self.reddit_client.get_post(post_id)
                     if submission:
                         # Generate comment summary and add to submission
-                        comment_summary = self._generate_comment_summary(submission)
+                        comment_summary = await self._generate_comment_summary(
+                            submission
+                        )
                         submission.comment_summary = comment_summary
                         logger.info(
                             f"Successfully fetched commissioned post: {submission.title}"
@@ -1123,9 +1145,13 @@ class RedditAgent:
         try:
             for attempt in range(tries):
                 # Use the existing subreddit object (works for "all" and specific subreddits)
-                for submission in self.reddit_client.reddit.subreddit(
-                    subreddit_name or self.subreddit_name
-                ).hot(limit=limit):
+                submissions = list(
+                    self.reddit_client.reddit.subreddit(
+                        subreddit_name or self.subreddit_name
+                    ).hot(limit=limit)
+                )
+                known_post_ids = self._known_post_ids(submissions)
+                for submission in submissions:
                     logger.info(
                         f"Processing submission: {submission.title} (score: {submission.score}, subreddit: {submission.subreddit.display_name}, is_self: {submission.is_self}, selftext length: {len(submission.selftext) if submission.selftext else 0}, age: {(datetime.now(timezone.utc) - datetime.fromtimestamp(submission.created_utc, timezone.utc)).days} days)"
                     )
@@ -1140,20 +1166,12 @@ class RedditAgent:
                         continue
 
                     # Check if already processed
-                    if self.session:
-                        existing_post = (
-                            self.session.query(RedditPost)
-                            .filter_by(post_id=submission.id)
-                            .first()
-                        )
-                        if existing_post:
-                            logger.info(
-                                f"Skipping post {submission.id}: already processed"
-                            )
-                            continue
+                    if submission.id in known_post_ids:
+                        logger.info(f"Skipping post {submission.id}: already processed")
+                        continue
 
                     # Generate comment summary and add to submission
-                    comment_summary = self._generate_comment_summary(submission)
+                    comment_summary = await self._generate_comment_summary(submission)
                     submission.comment_summary = comment_summary
                     return submission
                 # If we reach here, no suitable post was found in this attempt
@@ -1165,7 +1183,23 @@ class RedditAgent:
             logger.error(f"Error finding trending post: {str(e)}")
             return None
 
-    def _generate_comment_summary(self, submission) -> str:
+    def _known_post_ids(self, submissions) -> Set[str]:
+        """
+        Find which submissions were already processed, with one batched lookup.
+
+        Args:
+            submissions: PRAW submissions from a listing
+
+        Returns:
+            Set of post ids already present as RedditPost rows
+        """
+        if not self.session:
+            return set()
+        return post_dedupe.known_post_ids(
+            self.session, [s.id for s in submissions], sources=("processed",)
+        )
+
+    async def _generate_comment_summary(self, submission) -> str:
         """
         Generate a summary of the top comments for a Reddit submission.
 
@@ -1175,37 +1209,7 @@ class RedditAgent:
         Returns:
             str: Comment summary
         """
-        try:
-            # Get top comments and generate summary
-            submission.comments.replace_more(limit=0)  # Load top-level comments only
-            top_comments = submission.comments.list()[:10]  # Get top 10 comments
-            comment_texts = [
-                comment.body for comment in top_comments if hasattr(comment, "body")
-            ]
-            if comment_texts:
-                # Use GPT to summarize comments
-                response = self.openai.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "Summarize the key points from these Reddit comments in 1-2 sentences.",
-                        },
-                        {
-                            "role": "user",
-                            "content": f"Comments:\n{chr(10).join(comment_texts)}",
-                        },
-                    ],
-                )
-                comment_summary = response.choices[0].message.content.strip()
-            else:
-                comment_summary = "No comments available."
-
-            return comment_summary
-
-        except Exception as e:
-            logger.error(f"Error generating comment summary: {str(e)}")
-            return "Error generating comment summary."
+        return await comment_summarizer.summarize(submission)
 
     async def find_top_post_from_subreddit(
         self,
@@ -1241,7 +1245,9 @@ class RedditAgent:
                     submission = self.reddit_client.get_post(post_id)
                     if submission:
                         # Generate comment summary and add to submission
-                        comment_summary = self._generate_comment_summary(submission)
+                        comment_summary = await self._generate_comment_summary(
+                            submission
+                        )
                         submission.comment_summary = comment_summary
                         logger.info(
                             f"Successfully fetched commissioned post: {submission.title}"
@@ -1282,11 +1288,17 @@ class RedditAgent:
                 skipped_old = 0
                 skipped_no_selftext = 0
                 skipped_already_processed = 0
-                # TODO add smarter time filter fallback logic, we should really just curate posts outside of the commision loops and serve them from the db
+                # Commissions normally take posts pre-screened by the candidate
+                # harvester (app/services/candidate_harvester.py); this live scan
+                # is the fallback when that pool is empty
                 # Use the existing subreddit object (works for "all" and specific subreddits)
-                for submission in self.reddit_client.reddit.subreddit(
-                    subreddit_name or self.subreddit_name
-                ).top(time_filter=time_filter, limit=limit):
+                submissions = list(
+                    self.reddit_client.reddit.subreddit(
+                        subreddit_name or self.subreddit_name
+                    ).top(time_filter=time_filter, limit=limit)
+                )
+                known_post_ids = self._known_post_ids(submissions)
+                for submission in submissions:
                     processed_count += 1
                     logger.info(
                         f"Processing submission {processed_count}: {submission.title} (score: {submission.score}, subreddit: {submission.subreddit.display_name}, is_self: {submission.is_self}, selftext length: {len(submission.selftext) if submission.selftext else 0}, age: {(datetime.now(timezone.utc) - datetime.fromtimestamp(submission.created_utc, timezone.utc)).days} days, num_comments: {submission.num_comments}, stickied: {submission.stickied})"
@@ -1308,15 +1320,9 @@ class RedditAgent:
                             continue
 
                     # Check if already processed
-                    if self.session:
-                        existing_post = (
-                            self.session.query(RedditPost)
-                            .filter_by(post_id=submission.id)
-                            .first()
-                        )
-                        if existing_post:
-                            skipped_already_processed += 1
-                            continue
+                    if submission.id in known_post_ids:
+                        skipped_already_processed += 1
+                        continue
 
                     # Return the submission without generating comment summary
                     # Comment summary will be generated when needed in the actual pipeline
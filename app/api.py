@@ -4,7 +4,8 @@ import logging
 import os
 import traceback
 import uuid
-from datetime import datetime, timezone
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from typing import Any, Dict, List, Optional, Union
 
@@ -26,12 +27,15 @@ from fastapi.responses import RedirectResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
+from app.clients.imgur_client import AsyncImgurClient
+from app.clients.reddit_cache import reddit_cache
+from app.clients.reddit_registry import reddit_registry
+from app.config import REDIRECT_CACHE_SIZE
 from app.db.database import SessionLocal, get_db, init_db
 from app.db.models import (
     AgentScannedPost,
     Donation,
     PipelineRun,
-    PipelineRunUsage,
     PipelineTask,
     ProductInfo,
     ProductSubredditPost,
@@ -39,6 +43,7 @@ from app.db.models import (
     SourceType,
     Subreddit,
     SubredditFundraisingGoal,
+    product_image_name_filter,
 )
 from app.models import (
     AgentScannedPostCreateRequest,
@@ -54,16 +59,15 @@ from app.models import (
     DonationSummary,
     FundraisingGoalsConfig,
     FundraisingProgress,
+    GeneratedProductPageSchema,
     GeneratedProductSchema,
     PipelineRunSchema,
-    PipelineRunUsageSchema,
 )
 from app.models import ProductInfo as ProductInfoDataClass
 from app.models import (
     ProductInfoSchema,
     ProductRedditCommentSchema,
     ProductSubredditPostSchema,
-    RedditContext,
     RedditPostSchema,
     ScannedPostDonationInfoSchema,
     SubredditCreateRequest,
@@ -74,41 +78,36 @@ from app.models import (
 )
 from app.pipeline_status import PipelineStatus
 from app.reddit_commenter import RedditCommenter
+from app.redis_publisher import redis_publisher
+from app.services.aggregate_cache import aggregate_cache
+from app.services.candidate_harvester import CandidatePostService, candidate_harvester
+from app.services.comment_summarizer import comment_summarizer
 from app.services.commission_validator import CommissionValidator
 from app.services.fundraising_goals_service import FundraisingGoalsService
+from app.services.gallery_service import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    GalleryService,
+)
+from app.services.post_dedupe import post_dedupe
 from app.services.stripe_service import StripeService
+from app.services.subreddit_pool import subreddit_pool
+from app.services.webhook_inbox import WebhookInbox, webhook_consumer
 from app.subreddit_service import get_subreddit_service
 from app.subreddit_tier_service import SubredditTierService
 from app.task_manager import TaskManager
 from app.task_queue import TaskQueue
+from app.utils.llm_cache import llm_cache
 from app.utils.logging_config import setup_logging
+from app.utils.openai_rate_limiter import openai_rate_limiter
+from app.utils.openai_usage_tracker import get_usage_tracker, load_latency_metrics
 from app.utils.reddit_utils import extract_post_id
 from app.websocket_manager import websocket_manager
-from app.affiliate_linker import ZazzleAffiliateLinker
-from app.models import AffiliateLinker
 
 # Setup logging
 setup_logging()
 logger = logging.getLogger(__name__)
 
-# Initialize affiliate linker for dynamic link generation
-_affiliate_linker = None
-
-def get_affiliate_linker():
-    """Get or create the affiliate linker instance."""
-    global _affiliate_linker
-    if _affiliate_linker is None:
-        zazzle_affiliate_id = os.getenv("ZAZZLE_AFFILIATE_ID", "")
-        zazzle_tracking_code = os.getenv("ZAZZLE_TRACKING_CODE", "")
-        if zazzle_affiliate_id and zazzle_tracking_code:
-            _affiliate_linker = ZazzleAffiliateLinker(
-                zazzle_affiliate_id=zazzle_affiliate_id,
-                zazzle_tracking_code=zazzle_tracking_code
-            )
-        else:
-            logger.warning("Zazzle affiliate credentials not configured")
-    return _affiliate_linker
-
 
 def get_image_quality_for_tier(tier: str) -> str:
     """
@@ -183,6 +182,24 @@ async def startup_event():
     init_db()
     logger.info("Database initialized successfully!")
 
+    # Build gallery entries for any completed products that predate the read model
+    db = SessionLocal()
+    try:
+        GalleryService(db).backfill_missing()
+    except Exception as e:
+        logger.error(f"Error backfilling gallery read model: {e}")
+
+    # Load known post ids so scans skip processed posts without querying
+    try:
+        post_dedupe.warm(db)
+    except Exception as e:
+        logger.error(f"Error warming post dedupe filter: {e}")
+    finally:
+        db.close()
+
+    logger.info("Starting commission executor...")
+    task_manager.start()
+
     logger.info("Starting WebSocket manager with Redis integration...")
     await websocket_manager.start()
     logger.info("WebSocket manager started successfully!")
@@ -194,6 +211,18 @@ async def startup_event():
     asyncio.create_task(background_scheduler.start())
     logger.info("Background scheduler started successfully!")
 
+    logger.info("Starting webhook consumer...")
+    asyncio.create_task(webhook_consumer.start())
+    logger.info("Webhook consumer started successfully!")
+
+    logger.info("Starting candidate harvester...")
+    asyncio.create_task(candidate_harvester.start())
+    logger.info("Candidate harvester started successfully!")
+
+    logger.info("Starting subreddit pool refresher...")
+    asyncio.create_task(subreddit_pool.start())
+    logger.info("Subreddit pool refresher started successfully!")
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -204,10 +233,32 @@ async def shutdown_event():
     await background_scheduler.stop()
     logger.info("Background scheduler stopped successfully!")
 
+    logger.info("Stopping webhook consumer...")
+    await webhook_consumer.stop()
+    logger.info("Webhook consumer stopped successfully!")
+
+    logger.info("Stopping candidate harvester...")
+    await candidate_harvester.stop()
+    logger.info("Candidate harvester stopped successfully!")
+
+    logger.info("Stopping subreddit pool refresher...")
+    await subreddit_pool.stop()
+    logger.info("Subreddit pool refresher stopped successfully!")
+
+    logger.info("Stopping commission executor...")
+    await asyncio.to_thread(task_manager.shutdown)
+    logger.info("Commission executor stopped successfully!")
+
+    await AsyncImgurClient.aclose_pooled()
+
     logger.info("Stopping WebSocket manager...")
     await websocket_manager.stop()
     logger.info("WebSocket manager stopped successfully!")
 
+    logger.info("Flushing Redis publisher...")
+    await asyncio.to_thread(redis_publisher.close)
+    logger.info("Redis publisher closed successfully!")
+
 
 @app.get("/health")
 async def health_check():
@@ -221,150 +272,20 @@ def model_to_dict(obj):
     return {c.name: getattr(obj, c.name) for c in obj.__table__.columns}
 
 
-def fetch_successful_pipeline_runs(db: Session) -> List[GeneratedProductSchema]:
+def fetch_successful_pipeline_runs(db: Session) -> List[Dict[str, Any]]:
     """
-    Fetch all successful pipeline runs and their related data from the database.
+    Fetch all successful pipeline runs from the precomputed gallery read model.
+
+    Entries are built once per product by GalleryService when the product is
+    saved or its donation changes, so this is a single indexed scan.
 
     Returns:
-        List[GeneratedProductSchema]: A list of Pydantic models containing product information,
-        pipeline run details, and associated Reddit post data.
+        List[Dict[str, Any]]: Serialized GeneratedProductSchema payloads containing
+        product information, pipeline run details, and associated Reddit post data.
     """
     try:
-        logger.info("Fetching successful pipeline runs...")
-        pipeline_runs = (
-            db.query(PipelineRun).filter_by(status=PipelineStatus.COMPLETED.value).all()
-        )
-        logger.info(f"Found {len(pipeline_runs)} completed pipeline runs.")
-        products = []
-        for run in pipeline_runs:
-            try:
-                logger.info(f"Processing pipeline run {run.id}")
-                product_info = (
-                    db.query(ProductInfo).filter_by(pipeline_run_id=run.id).first()
-                )
-                if not product_info:
-                    logger.warning(f"No product info found for pipeline run {run.id}")
-                    continue
-                logger.info(f"Found product info: {product_info.id}")
-
-                reddit_post = run.reddit_posts[0] if run.reddit_posts else None
-                if not reddit_post:
-                    logger.warning(f"No reddit post found for pipeline run {run.id}")
-                    continue
-                logger.info(f"Found reddit post: {reddit_post.post_id}")
-
-                # Fetch donation information if available
-                donation_info = None
-                pipeline_task = (
-                    db.query(PipelineTask).filter_by(pipeline_run_id=run.id).first()
-                )
-                if pipeline_task and pipeline_task.donation_id:
-                    donation = (
-                        db.query(Donation)
-                        .filter_by(id=pipeline_task.donation_id)
-                        .first()
-                    )
-                    if donation:
-                        donation_info = {
-                            "reddit_username": (
-                                donation.reddit_username
-                                if not donation.is_anonymous
-                                else "Anonymous"
-                            ),
-                            "tier_name": donation.tier,
-                            "tier_min_amount": float(
-                                donation.amount_usd
-                            ),  # Use actual donation amount
-                            "donation_amount": float(donation.amount_usd),
-                            "is_anonymous": donation.is_anonymous,
-                            "donation_type": donation.donation_type,
-                            "commission_type": donation.commission_type,
-                            "source": (
-                                donation.source.value if donation.source else None
-                            ),
-                        }
-
-                # Get subreddit name for reddit context
-                subreddit_name = (
-                    reddit_post.subreddit.subreddit_name
-                    if reddit_post.subreddit
-                    else "unknown"
-                )
-
-                # Convert ORM models to in-memory models
-                reddit_context = RedditContext(
-                    post_id=reddit_post.post_id,
-                    post_title=reddit_post.title,
-                    post_url=reddit_post.url,
-                    subreddit=subreddit_name,
-                    post_content=reddit_post.content,
-                    permalink=reddit_post.permalink,
-                    comments=(
-                        [{"text": reddit_post.comment_summary}]
-                        if reddit_post.comment_summary
-                        else [] or []
-                    ),
-                )
-
-                # Convert to Pydantic schemas using model_validate
-                product_schema = ProductInfoSchema.model_validate(product_info)
-                
-                # Generate affiliate link dynamically if not present
-                if not product_schema.affiliate_link and product_schema.product_url:
-                    affiliate_linker = get_affiliate_linker()
-                    if affiliate_linker:
-                        try:
-                            # Generate affiliate link directly using the base AffiliateLinker
-                            affiliate_link = affiliate_linker.affiliate_linker.compose_affiliate_link(
-                                product_schema.product_url
-                            )
-                            product_schema.affiliate_link = affiliate_link
-                            logger.info(f"Generated affiliate link for product {product_schema.theme}")
-                        except Exception as e:
-                            logger.error(f"Failed to generate affiliate link for {product_schema.theme}: {e}")
-                            # Use product_url as fallback
-                            product_schema.affiliate_link = product_schema.product_url
-                pipeline_schema = PipelineRunSchema.model_validate(run)
-                reddit_post_dict = reddit_post.__dict__.copy()
-                reddit_post_dict["subreddit"] = (
-                    reddit_post.subreddit.subreddit_name
-                    if reddit_post.subreddit
-                    else None
-                )
-                reddit_schema = RedditPostSchema.model_validate(reddit_post_dict)
-
-                # Fetch usage data
-                usage_data = (
-                    db.query(PipelineRunUsage).filter_by(pipeline_run_id=run.id).first()
-                )
-                usage_schema = (
-                    PipelineRunUsageSchema.model_validate(usage_data)
-                    if usage_data
-                    else None
-                )
-
-                # Add donation info to the schema if available
-                if donation_info:
-                    product_schema.donation_info = donation_info
-
-                products.append(
-                    GeneratedProductSchema(
-                        product_info=product_schema,
-                        pipeline_run=pipeline_schema,
-                        reddit_post=reddit_schema,
-                        usage=usage_schema,
-                    )
-                )
-                logger.info(
-                    f"Successfully converted pipeline run {run.id} to schema with usage data"
-                )
-            except Exception as e:
-                logger.error(
-                    f"Error converting pipeline run {run.id} to schema: {str(e)}"
-                )
-                logger.error(traceback.format_exc())
-                continue
-        logger.info(f"Returning {len(products)} products.")
+        products = GalleryService(db).list_products()
+        logger.debug(f"Returning {len(products)} products from gallery read model.")
         return products
     except Exception as e:
         logger.error(f"Error in fetch_successful_pipeline_runs: {str(e)}")
@@ -372,21 +293,49 @@ def fetch_successful_pipeline_runs(db: Session) -> List[GeneratedProductSchema]:
         raise
 
 
-@app.get("/api/generated_products", response_model=List[GeneratedProductSchema])
-async def get_generated_products():
+@app.get(
+    "/api/generated_products",
+    response_model=Union[List[GeneratedProductSchema], GeneratedProductPageSchema],
+)
+async def get_generated_products(
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated dotted fields, e.g. product_info,reddit_post.title"
+    ),
+):
     """
     API endpoint to retrieve all successful pipeline runs and their related data.
 
+    Without query parameters the full list is returned. When any of cursor,
+    limit or fields is given, a single keyset page is returned instead.
+
+    Args:
+        cursor: Opaque cursor returned as next_cursor by the previous page
+        limit: Page size (defaults to DEFAULT_PAGE_SIZE when paginating)
+        fields: Comma-separated dotted field paths to include in each item
+
     Returns:
-        List[GeneratedProductSchema]: A list of generated products with their associated data.
+        List[GeneratedProductSchema] | GeneratedProductPageSchema: All products,
+        or one page of (optionally projected) products with the next cursor.
     """
     logger.info("Starting get_generated_products request")
+    db = SessionLocal()
     try:
-        db = SessionLocal()
-        products = fetch_successful_pipeline_runs(db)
-        logger.info(f"Returning {len(products)} products.")
-        logger.info("Successfully converted products to response format")
-        return products
+        if cursor is None and limit is None and fields is None:
+            products = fetch_successful_pipeline_runs(db)
+            logger.info(f"Returning {len(products)} products.")
+            logger.info("Successfully converted products to response format")
+            return products
+
+        field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+        items, next_cursor = GalleryService(db).list_page(
+            cursor=cursor, limit=limit or DEFAULT_PAGE_SIZE, fields=field_list
+        )
+        logger.info(f"Returning page of {len(items)} products.")
+        return GeneratedProductPageSchema(items=items, next_cursor=next_cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in get_generated_products: {str(e)}")
         logger.error(traceback.format_exc())
@@ -395,6 +344,44 @@ async def get_generated_products():
         db.close()
 
 
+class RedirectCache:
+    """
+    Small LRU of image name -> Reddit post id for QR redirects.
+
+    Printed QR codes produce bursts of scans for the same few images; the
+    mapping never changes once a product is saved, so hits skip the database.
+    """
+
+    def __init__(self, maxsize: int = REDIRECT_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, image_name: str) -> Optional[str]:
+        post_id = self._entries.get(image_name)
+        if post_id is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(image_name)
+        self.hits += 1
+        return post_id
+
+    def put(self, image_name: str, post_id: str) -> None:
+        self._entries[image_name] = post_id
+        self._entries.move_to_end(image_name)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+redirect_cache = RedirectCache()
+
+
 @app.get("/redirect/{image_name}")
 async def redirect_to_product(image_name: str):
     """
@@ -406,42 +393,36 @@ async def redirect_to_product(image_name: str):
     Returns:
         RedirectResponse: Redirect to the gallery with product parameter
     """
-    try:
+    post_id = redirect_cache.get(image_name)
+    if post_id is None:
         db = SessionLocal()
+        try:
+            # One probe of the image_name index, joined to the post
+            row = (
+                db.query(ProductInfo.id, RedditPost.post_id)
+                .outerjoin(RedditPost, RedditPost.id == ProductInfo.reddit_post_id)
+                .filter(product_image_name_filter(image_name))
+                .order_by(ProductInfo.id)
+                .first()
+            )
+        except Exception as e:
+            logger.error(f"Error redirecting to product: {str(e)}")
+            raise HTTPException(status_code=500, detail="Internal server error")
+        finally:
+            db.close()
 
-        # Find the product info by image name
-        product_info = (
-            db.query(ProductInfo)
-            .filter(ProductInfo.image_url.like(f"%{image_name}%"))
-            .first()
-        )
-
-        if not product_info:
+        if not row:
             raise HTTPException(status_code=404, detail="Product not found")
-
-        # Find the associated Reddit post
-        reddit_post = (
-            db.query(RedditPost)
-            .filter(RedditPost.id == product_info.reddit_post_id)
-            .first()
-        )
-
-        if not reddit_post:
+        if not row.post_id:
             raise HTTPException(
                 status_code=404, detail="Associated Reddit post not found"
             )
+        post_id = row.post_id
+        redirect_cache.put(image_name, post_id)
 
-        # Redirect to the gallery with product parameter
-        gallery_url = f"https://clouvel.ai/?product={reddit_post.post_id}"
-        return RedirectResponse(url=gallery_url)
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error redirecting to product: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal server error")
-    finally:
-        db.close()
+    # Redirect to the gallery with product parameter
+    gallery_url = f"https://clouvel.ai/?product={post_id}"
+    return RedirectResponse(url=gallery_url)
 
 
 @app.get("/api/product/{image_name}")
@@ -461,7 +442,8 @@ async def get_product_by_image(image_name: str):
         # Find the product info by image name
         product_info = (
             db.query(ProductInfo)
-            .filter(ProductInfo.image_url.like(f"%{image_name}%"))
+            .filter(product_image_name_filter(image_name))
+            .order_by(ProductInfo.id)
             .first()
         )
 
@@ -521,8 +503,24 @@ async def create_payment_intent(donation_request: DonationRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def cached_aggregate(request: Request, response: Response, name: str, compute):
+    """
+    Serve a donation aggregate from the shared cache with a version ETag.
+
+    Returns:
+        The cached value, or a bare 304 response if the client's copy is current
+    """
+    value, etag = aggregate_cache.get_or_compute(name, compute)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return value
+
+
 @app.get("/api/donations/summary", response_model=DonationSummary)
-async def get_donation_summary(db: Session = Depends(get_db)):
+async def get_donation_summary(
+    request: Request, response: Response, db: Session = Depends(get_db)
+):
     """
     Get donation summary statistics.
 
@@ -532,7 +530,8 @@ async def get_donation_summary(db: Session = Depends(get_db)):
     Returns:
         DonationSummary: Summary statistics
     """
-    try:
+
+    def compute() -> Dict[str, Any]:
         summary_data = stripe_service.get_donation_summary(db)
 
         return DonationSummary(
@@ -567,7 +566,10 @@ async def get_donation_summary(db: Session = Depends(get_db)):
                 )
                 for donation in summary_data["recent_donations"]
             ],
-        )
+        ).model_dump(mode="json")
+
+    try:
+        return cached_aggregate(request, response, "donation-summary", compute)
 
     except Exception as e:
         logger.error(f"Error getting donation summary: {str(e)}")
@@ -576,7 +578,9 @@ async def get_donation_summary(db: Session = Depends(get_db)):
 
 
 @app.get("/api/donations/by-subreddit")
-async def get_donations_by_subreddit(response: Response, db: Session = Depends(get_db)):
+async def get_donations_by_subreddit(
+    request: Request, response: Response, db: Session = Depends(get_db)
+):
     """
     Get donations grouped by subreddit for the fundraising/leaderboard page.
 
@@ -586,12 +590,14 @@ async def get_donations_by_subreddit(response: Response, db: Session = Depends(g
     Returns:
         Dict: Donations grouped by subreddit with the same structure as product donations
     """
-    try:
-        from app.db.models import RedditPost
+
+    def compute() -> Dict[str, Any]:
         from sqlalchemy.orm import joinedload
 
+        from app.db.models import RedditPost
+
         subreddit_donations = {}
-        
+
         # Single query with eager loading to prevent N+1
         donations = (
             db.query(Donation)
@@ -602,10 +608,10 @@ async def get_donations_by_subreddit(response: Response, db: Session = Depends(g
             .order_by(Donation.created_at.desc())
             .all()
         )
-        
+
         # Collect all post_ids that we need to fetch
         post_ids = [d.post_id for d in donations if d.post_id]
-        
+
         # Fetch all reddit posts in a single query
         reddit_posts = {}
         if post_ids:
@@ -616,12 +622,12 @@ async def get_donations_by_subreddit(response: Response, db: Session = Depends(g
                 .all()
             )
             reddit_posts = {post.post_id: post for post in posts}
-        
+
         # Now process donations without any additional queries
         for donation in donations:
             # Get reddit post from our pre-fetched dictionary
             reddit_post = reddit_posts.get(donation.post_id) if donation.post_id else None
-            
+
             # Determine subreddit name
             if reddit_post and reddit_post.subreddit:
                 subreddit_name = reddit_post.subreddit.subreddit_name
@@ -629,14 +635,14 @@ async def get_donations_by_subreddit(response: Response, db: Session = Depends(g
                 subreddit_name = donation.subreddit.subreddit_name
             else:
                 subreddit_name = "unknown"
-            
+
             # Initialize subreddit entry if needed
             if subreddit_name not in subreddit_donations:
                 subreddit_donations[subreddit_name] = {
                     "commission": None,
                     "support": [],
                 }
-            
+
             # Build donation data
             donation_data = {
                 "reddit_username": (
@@ -655,7 +661,7 @@ async def get_donations_by_subreddit(response: Response, db: Session = Depends(g
                 "post_id": donation.post_id,
                 "post_title": reddit_post.title if reddit_post else None,
             }
-            
+
             # Add commission-specific fields
             if donation.donation_type == "commission":
                 donation_data.update({
@@ -666,12 +672,14 @@ async def get_donations_by_subreddit(response: Response, db: Session = Depends(g
                     subreddit_donations[subreddit_name]["commission"] = donation_data
             else:
                 subreddit_donations[subreddit_name]["support"].append(donation_data)
-        
+
+
+        return subreddit_donations
+
+    try:
         # Set cache headers - 5 minute cache for leaderboard data
         response.headers["Cache-Control"] = "public, max-age=300"
-        response.headers["ETag"] = f'"donations-by-subreddit-{len(donations)}"'
-        
-        return subreddit_donations
+        return cached_aggregate(request, response, "donations-by-subreddit", compute)
     except Exception as e:
         logger.error(f"Error getting donations by subreddit: {str(e)}")
         logger.error(traceback.format_exc())
@@ -842,7 +850,9 @@ async def get_subreddit_tiers(db: Session = Depends(get_db)):
 
 
 @app.get("/api/subreddit-fundraising")
-async def get_subreddit_fundraising(db: Session = Depends(get_db)):
+async def get_subreddit_fundraising(
+    request: Request, response: Response, db: Session = Depends(get_db)
+):
     """
     Get all subreddit fundraising goals.
 
@@ -852,7 +862,8 @@ async def get_subreddit_fundraising(db: Session = Depends(get_db)):
     Returns:
         List: Subreddit fundraising goals
     """
-    try:
+
+    def compute() -> List[Dict[str, Any]]:
         goals = (
             db.query(SubredditFundraisingGoal)
             .join(SubredditFundraisingGoal.subreddit)
@@ -881,6 +892,9 @@ async def get_subreddit_fundraising(db: Session = Depends(get_db)):
             for goal in goals
         ]
 
+    try:
+        return cached_aggregate(request, response, "subreddit-fundraising", compute)
+
     except Exception as e:
         logger.error(f"Error getting subreddit fundraising: {str(e)}")
         logger.error(traceback.format_exc())
@@ -888,7 +902,9 @@ async def get_subreddit_fundraising(db: Session = Depends(get_db)):
 
 
 @app.get("/api/fundraising/progress", response_model=FundraisingProgress)
-async def get_fundraising_progress(db: Session = Depends(get_db)):
+async def get_fundraising_progress(
+    request: Request, response: Response, db: Session = Depends(get_db)
+):
     """
     Get complete fundraising progress including overall and subreddit goals.
 
@@ -898,9 +914,13 @@ async def get_fundraising_progress(db: Session = Depends(get_db)):
     Returns:
         FundraisingProgress: Complete fundraising progress information
     """
-    try:
+
+    def compute() -> Dict[str, Any]:
         service = FundraisingGoalsService(db)
-        return service.get_fundraising_progress()
+        return service.get_fundraising_progress().model_dump(mode="json")
+
+    try:
+        return cached_aggregate(request, response, "fundraising-progress", compute)
 
     except Exception as e:
         logger.error(f"Error getting fundraising progress: {str(e)}")
@@ -1557,7 +1577,7 @@ async def update_payment_intent(
         donation_request.post_id = post_id
 
         # Update payment intent
-        result = stripe_service.update_payment_intent(
+        result = await stripe_service.update_payment_intent(
             payment_intent_id, donation_request
         )
 
@@ -1591,8 +1611,13 @@ async def update_payment_intent(
 
 
 @app.post("/api/donations/webhook")
-async def stripe_webhook(request: Request):
-    """Handle Stripe webhook events."""
+async def stripe_webhook(request: Request, db: Session = Depends(get_db)):
+    """
+    Receive Stripe webhook events.
+
+    The event is verified and recorded in the webhook inbox, then acknowledged
+    right away; the webhook consumer processes it in the background.
+    """
     try:
         body = await request.body()
         sig_header = request.headers.get("stripe-signature")
@@ -1638,15 +1663,9 @@ async def stripe_webhook(request: Request):
             f"Received Stripe webhook event: {event['type']} (id: {event['id']})"
         )
 
-        # Handle the event
-        if event["type"] == "payment_intent.succeeded":
-            payment_intent = event["data"]["object"]
-            await handle_payment_intent_succeeded(payment_intent)
-        elif event["type"] == "payment_intent.payment_failed":
-            payment_intent = event["data"]["object"]
-            await handle_payment_intent_failed(payment_intent)
-        else:
-            logger.info(f"Unhandled event type: {event['type']}")
+        # Persist the verified body; redeliveries of a known event are acked as-is
+        if WebhookInbox(db).record_event(json.loads(body)):
+            webhook_consumer.notify()
 
         return {"status": "success"}
 
@@ -1767,6 +1786,22 @@ async def handle_payment_intent_succeeded(payment_intent):
         raise
 
 
+async def _process_payment_intent_succeeded_event(event: Dict[str, Any]):
+    """Webhook consumer handler for payment_intent.succeeded."""
+    payment_intent = stripe.PaymentIntent.construct_from(
+        event["data"]["object"], stripe.api_key
+    )
+    await handle_payment_intent_succeeded(payment_intent)
+
+
+async def _process_payment_intent_failed_event(event: Dict[str, Any]):
+    """Webhook consumer handler for payment_intent.payment_failed."""
+    payment_intent = stripe.PaymentIntent.construct_from(
+        event["data"]["object"], stripe.api_key
+    )
+    await handle_payment_intent_failed(payment_intent)
+
+
 async def handle_payment_intent_failed(payment_intent):
     """Handle failed payment intent."""
     try:
@@ -1789,6 +1824,14 @@ async def handle_payment_intent_failed(payment_intent):
         raise
 
 
+webhook_consumer.register(
+    "payment_intent.succeeded", _process_payment_intent_succeeded_event
+)
+webhook_consumer.register(
+    "payment_intent.payment_failed", _process_payment_intent_failed_event
+)
+
+
 from app.models import CommissionValidationRequest
 
 
@@ -1863,11 +1906,11 @@ async def create_commission_task(donation_id: int, db: Session = Depends(get_db)
         }
 
         # Create task using TaskManager (this will automatically run in background thread if K8s not available)
-        task_id = task_manager.create_commission_task(donation.id, task_data)
+        task = task_manager.submit_commission_task(donation.id, task_data)
 
-        logger.info(f"Created commission task: {task_id}")
+        logger.info(f"Created commission task: {task['task_id']}")
 
-        return {"task_id": task_id}
+        return task
 
     except Exception as e:
         logger.error(
@@ -2534,15 +2577,16 @@ async def manual_create_commission(
     }
 
     # Create commission task using TaskManager
-    task_id = task_manager.create_commission_task(donation.id, task_data, db)
+    task = task_manager.submit_commission_task(donation.id, task_data, db)
     logger.info(
-        f"Manual commission task {task_id} created for donation {donation.id} (user: {donation.customer_name}, type: {donation.commission_type}, tier: {donation.tier})"
+        f"Manual commission task {task['task_id']} created for donation {donation.id} (user: {donation.customer_name}, type: {donation.commission_type}, tier: {donation.tier})"
     )
 
     return {
         "status": "manual commission created",
         "donation_id": donation.id,
-        "task_id": task_id,
+        "task_id": task["task_id"],
+        "queue_position": task["queue_position"],
     }
 
 
@@ -2569,6 +2613,43 @@ async def get_scheduler_status(
     return {
         "scheduler": status,
         "redis_healthy": await redis_service.health_check(),
+        "redis_publisher": redis_publisher.stats(),
+        "websocket": websocket_manager.get_metrics(),
+        "reddit": reddit_registry.metrics(),
+        "reddit_cache": reddit_cache.stats(),
+        "candidate_posts": CandidatePostService(db).get_stats(),
+        "post_dedupe": post_dedupe.stats(),
+        "subreddit_pool": subreddit_pool.stats(),
+        "comment_summaries": comment_summarizer.stats(),
+        "llm_cache": llm_cache.stats(),
+        "openai_rate_limits": openai_rate_limiter.metrics(),
+    }
+
+
+@app.get("/api/admin/openai/metrics")
+async def get_openai_metrics(
+    request: Request,
+    hours: int = Query(
+        24, ge=1, le=24 * 30, description="Window of persisted rollups, in hours"
+    ),
+    db: Session = Depends(get_db),
+):
+    """
+    Get OpenAI latency quantiles (p50/p95/p99) per model, operation and tier.
+    "process" covers this API process since startup; "cluster" merges the
+    usage rollups every process has flushed in the last `hours`.
+    Requires X-Admin-Secret header to match ADMIN_SECRET env var.
+    """
+    admin_secret = os.getenv("ADMIN_SECRET")
+    provided_secret = request.headers.get("x-admin-secret")
+    if not admin_secret or provided_secret != admin_secret:
+        raise HTTPException(status_code=403, detail="Forbidden: Invalid admin secret")
+
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    return {
+        "process": get_usage_tracker().get_latency_metrics(),
+        "cluster": load_latency_metrics(db, since),
+        "since": since.isoformat(),
     }
 
 
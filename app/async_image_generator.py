@@ -1,3 +1,4 @@
+import asyncio
 import base64
 import io
 import logging
@@ -9,10 +10,11 @@ from openai import AsyncOpenAI
 from openai.types.images_response import ImagesResponse
 from PIL import Image
 
-from app.clients.imgur_client import ImgurClient
+from app.clients.imgur_client import AsyncImgurClient
 from app.models import ProductIdea, ProductInfo
 from app.services.image_processor import ImageProcessor
 from app.utils.logging_config import get_logger
+from app.utils.openai_usage_tracker import track_openai_call
 
 logger = get_logger(__name__)
 
@@ -64,7 +66,7 @@ class AsyncImageGenerator:
                 f"Invalid model. Must be one of: {', '.join(self.VALID_MODELS)}"
             )
         self.client = AsyncOpenAI(api_key=api_key)
-        self.imgur_client = ImgurClient()
+        self.imgur_client = AsyncImgurClient()
         self.image_processor = ImageProcessor()
         self.model = model
         if model == "dall-e-2":
@@ -122,19 +124,27 @@ class AsyncImageGenerator:
             )
             base_prompt = IMAGE_GENERATION_BASE_PROMPTS[self.model]["prompt"]
             full_prompt = f"{base_prompt} {prompt}"
-            if self.model == "dall-e-3":
-                response = await self.client.images.generate(
-                    model=self.model,
-                    prompt=full_prompt,
-                    size=size,
-                    n=1,
-                    style="vivid",
-                    quality=image_quality,
-                    response_format="b64_json",
-                )
-            else:
+
+            # Track with the real size and quality, which set the price
+            @track_openai_call(
+                model=self.model,
+                operation="image",
+                size=size,
+                quality=image_quality if self.model == "dall-e-3" else None,
+            )
+            async def _tracked_generate():
+                if self.model == "dall-e-3":
+                    return await self.client.images.generate(
+                        model=self.model,
+                        prompt=full_prompt,
+                        size=size,
+                        n=1,
+                        style="vivid",
+                        quality=image_quality,
+                        response_format="b64_json",
+                    )
                 # DALL-E 2 doesn't support quality parameter
-                response = await self.client.images.generate(
+                return await self.client.images.generate(
                     model=self.model,
                     prompt=full_prompt,
                     size=size,
@@ -142,6 +152,8 @@ class AsyncImageGenerator:
                     style=self.style,
                     response_format="b64_json",
                 )
+
+            response = await _tracked_generate()
             image_data_b64 = response.data[0].b64_json
             if not image_data_b64:
                 raise ImageGenerationError("DALL-E did not return base64 image data.")
@@ -181,7 +193,6 @@ class AsyncImageGenerator:
             logger.info(
                 "[Async] Image data successfully retrieved from DALL-E response."
             )
-            image = Image.open(io.BytesIO(image_data))
             timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
             filename_prefix = (
                 f"{template_id}_{timestamp}" if template_id else f"dalle_{timestamp}"
@@ -197,38 +208,47 @@ class AsyncImageGenerator:
                     from app.config import BASE_URL
 
                     stamp_url = f"{BASE_URL}/redirect/{stamped_filename}"
-                stamped_image = self.image_processor.stamp_image_with_logo(
-                    image, stamp_url
+                # Stamping and PNG encoding are CPU-bound; keep them off the loop
+                stamped_image_data = await asyncio.to_thread(
+                    self._stamp_to_png, image_data, stamp_url
                 )
-                stamped_output_bytes = io.BytesIO()
-                stamped_image.save(stamped_output_bytes, format="PNG")
-                stamped_output_bytes.seek(0)
-                stamped_image_data = stamped_output_bytes.read()
-                stamped_local_path = self.imgur_client.save_image_locally(
-                    stamped_image_data,
-                    stamped_filename,
-                    subdirectory="generated_products",
-                )
-                stamped_imgur_url, _ = self.imgur_client.upload_image(
-                    stamped_local_path
+                stamped_imgur_url, stamped_local_path = (
+                    await self.imgur_client.upload_and_save(
+                        stamped_image_data,
+                        stamped_filename,
+                        subdirectory="generated_products",
+                    )
                 )
                 logger.info(
                     f"[Async] Stamped image uploaded to Imgur. URL: {stamped_imgur_url}"
                 )
                 return stamped_imgur_url, stamped_local_path
             else:
-                output_bytes = io.BytesIO()
-                image.save(output_bytes, format="PNG")
-                output_bytes.seek(0)
-                processed_image_data = output_bytes.read()
-                local_path = self.imgur_client.save_image_locally(
+                processed_image_data = await asyncio.to_thread(
+                    self._encode_png, image_data
+                )
+                imgur_url, local_path = await self.imgur_client.upload_and_save(
                     processed_image_data, filename, subdirectory="generated_products"
                 )
                 logger.info(f"[Async] Image saved locally at: {local_path}")
-                imgur_url, _ = self.imgur_client.upload_image(local_path)
                 logger.info(f"[Async] Image uploaded to Imgur. URL: {imgur_url}")
                 return imgur_url, local_path
         except Exception as e:
             raise ImageGenerationError(
                 f"[Async] Failed to process or store image: {str(e)}"
             ) from e
+
+    def _stamp_to_png(self, image_data: bytes, stamp_url: str) -> bytes:
+        """Stamp the QR code onto the image and encode it as PNG bytes."""
+        image = Image.open(io.BytesIO(image_data))
+        stamped_image = self.image_processor.stamp_image_with_logo(image, stamp_url)
+        output_bytes = io.BytesIO()
+        stamped_image.save(output_bytes, format="PNG")
+        return output_bytes.getvalue()
+
+    def _encode_png(self, image_data: bytes) -> bytes:
+        """Re-encode the generated image as PNG bytes."""
+        image = Image.open(io.BytesIO(image_data))
+        output_bytes = io.BytesIO()
+        image.save(output_bytes, format="PNG")
+        return output_bytes.getvalue()
@@ -1,9 +1,13 @@
+import asyncio
 import base64
 import logging
 import os
+import random
+import weakref
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 
+import httpx
 import requests
 from dotenv import load_dotenv
 
@@ -95,3 +99,193 @@ class ImgurClient:
         except IOError as e:
             logger.error(f"Error saving image locally to {abs_path}: {e}")
             raise
+
+
+class ImgurUploadError(Exception):
+    """Exception raised when an Imgur upload fails after all retries."""
+
+    pass
+
+
+class AsyncImgurClient(ImgurClient):
+    """
+    Async Imgur client that uploads from memory over a pooled httpx connection.
+
+    One httpx.AsyncClient is shared per event loop, so every generator running
+    on the same loop reuses the same keep-alive connections. Uploads retry
+    transport errors, 429 and 5xx responses with exponential backoff, honouring
+    Retry-After when Imgur sends it.
+    """
+
+    MAX_RETRIES = 3
+    BACKOFF_BASE_SECONDS = 1.0
+    BACKOFF_MAX_SECONDS = 30.0
+    RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+    TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+    LIMITS = httpx.Limits(max_connections=10, max_keepalive_connections=5)
+
+    # Pooled clients keyed by event loop; entries go away with their loop
+    _http_clients: (
+        "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]"
+    ) = weakref.WeakKeyDictionary()
+
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        """
+        Initialize the async Imgur client.
+
+        Args:
+            http_client: Optional httpx client to use instead of the shared pool
+        """
+        super().__init__()
+        self._http_client = http_client
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Return the injected client or the pooled client for the running loop."""
+        if self._http_client is not None:
+            return self._http_client
+
+        loop = asyncio.get_running_loop()
+        client = self._http_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(timeout=self.TIMEOUT, limits=self.LIMITS)
+            self._http_clients[loop] = client
+        return client
+
+    def _backoff_delay(
+        self, attempt: int, response: Optional[httpx.Response] = None
+    ) -> float:
+        """Delay before the next attempt, preferring the server's Retry-After."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(float(retry_after), self.BACKOFF_MAX_SECONDS)
+                except ValueError:
+                    pass
+        delay = self.BACKOFF_BASE_SECONDS * (2**attempt)
+        return min(delay + random.uniform(0, delay / 2), self.BACKOFF_MAX_SECONDS)
+
+    async def upload_image_bytes(
+        self, image_data: bytes, filename: str = "image.png"
+    ) -> str:
+        """
+        Upload in-memory image data to Imgur.
+
+        Args:
+            image_data: The image content as bytes
+            filename: File name reported to Imgur
+
+        Returns:
+            The Imgur URL of the uploaded image
+
+        Raises:
+            ImgurUploadError: If Imgur rejects the upload or retries are exhausted
+        """
+        client = self._get_http_client()
+        last_error = "no attempts made"
+
+        for attempt in range(self.MAX_RETRIES + 1):
+            response = None
+            try:
+                response = await client.post(
+                    f"{self.base_url}/image",
+                    headers=self.headers,
+                    files={"image": (filename, image_data, "image/png")},
+                )
+            except httpx.TransportError as e:
+                last_error = f"{type(e).__name__}: {e}"
+            else:
+                if response.status_code not in self.RETRY_STATUS_CODES:
+                    return self._parse_upload_response(response)
+                last_error = f"HTTP {response.status_code}"
+
+            if attempt < self.MAX_RETRIES:
+                delay = self._backoff_delay(attempt, response)
+                logger.warning(
+                    f"Imgur upload attempt {attempt + 1} failed ({last_error}), "
+                    f"retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+
+        error_msg = (
+            f"Failed to upload image to Imgur after {self.MAX_RETRIES + 1} "
+            f"attempts: {last_error}"
+        )
+        logger.error(error_msg)
+        raise ImgurUploadError(error_msg)
+
+    def _parse_upload_response(self, response: httpx.Response) -> str:
+        """Extract the image link from a non-retryable Imgur response."""
+        try:
+            response.raise_for_status()
+            data = response.json()
+        except (httpx.HTTPStatusError, ValueError) as e:
+            logger.error(f"Failed to upload image to Imgur: {str(e)}")
+            raise ImgurUploadError(f"Failed to upload image to Imgur: {e}") from e
+
+        if not data.get("success"):
+            error_msg = (
+                f"Imgur API error: {data.get('data', {}).get('error', 'Unknown error')}"
+            )
+            logger.error(error_msg)
+            raise ImgurUploadError(error_msg)
+
+        imgur_url = data["data"]["link"]
+        logger.info(f"Successfully uploaded image to Imgur: {imgur_url}")
+        return imgur_url
+
+    async def upload_and_save(
+        self, image_data: bytes, filename: str, subdirectory: str = ""
+    ) -> Tuple[str, Optional[str]]:
+        """
+        Upload image data to Imgur while writing the local copy concurrently.
+
+        The local copy is a side effect: a failed write is logged and does
+        not fail the upload.
+
+        Args:
+            image_data: The image content as bytes
+            filename: The name of the file to save and upload
+            subdirectory: Optional subdirectory within the output directory
+
+        Returns:
+            Tuple containing (imgur_url, local_path); local_path is None if the
+            local write failed
+
+        Raises:
+            ImgurUploadError: If the upload fails
+        """
+        save_task = asyncio.create_task(
+            asyncio.to_thread(
+                self.save_image_locally, image_data, filename, subdirectory
+            )
+        )
+        try:
+            imgur_url = await self.upload_image_bytes(image_data, filename)
+        finally:
+            # Always let the local write finish, even if the upload failed
+            await asyncio.wait([save_task])
+            save_error = save_task.exception()
+
+        if save_error is not None:
+            logger.error(f"Local copy of {filename} could not be written: {save_error}")
+            return imgur_url, None
+        return imgur_url, save_task.result()
+
+    async def aclose(self) -> None:
+        """Close the injected client or the pooled client for the running loop."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            return
+        await self.aclose_pooled()
+
+    @classmethod
+    async def aclose_pooled(cls) -> None:
+        """
+        Close the pooled client for the running loop, if one was opened.
+
+        Call before the loop shuts down so keep-alive connections are released.
+        """
+        client = cls._http_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
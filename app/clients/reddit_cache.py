@@ -0,0 +1,285 @@
+"""
+Read-through cache for Reddit API reads.
+
+RedditClient looks up posts, post contexts, subreddit info and listings here
+before going to the network, so a commission that validates a post, fetches it
+for the agent and comments on it pays for one Reddit round trip, not three.
+
+Each resource type has its own TTL. Posts and subreddits that Reddit reports as
+missing or private (404/403, or a subreddit redirect) are cached as negative
+entries for REDDIT_CACHE_NEGATIVE_TTL and raise RedditResourceUnavailable on
+later lookups instead of hitting the API again.
+
+JSON-ready values (post contexts, subreddit info, listings) go to the
+configured backend: an in-process LRU, or Redis with REDDIT_CACHE_BACKEND=redis
+so every process shares them. PRAW objects hold a live client and cannot be
+shared, so they always stay in the in-process LRU.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import prawcore
+import redis
+
+from app.config import (
+    REDDIT_CACHE_BACKEND,
+    REDDIT_CACHE_LISTING_TTL,
+    REDDIT_CACHE_NEGATIVE_TTL,
+    REDDIT_CACHE_POST_TTL,
+    REDDIT_CACHE_SIZE,
+    REDDIT_CACHE_SUBREDDIT_TTL,
+    REDIS_DB,
+    REDIS_HOST,
+    REDIS_PASSWORD,
+    REDIS_PORT,
+    REDIS_SSL,
+)
+from app.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Reddit errors meaning the resource is gone or private, not a transient failure
+UNAVAILABLE_ERRORS = (
+    prawcore.exceptions.NotFound,
+    prawcore.exceptions.Forbidden,
+    prawcore.exceptions.Redirect,
+)
+
+# Marker stored in place of a value for negative entries
+_MISSING = "__reddit_unavailable__"
+
+
+class RedditResourceUnavailable(Exception):
+    """Raised for a Reddit resource that is deleted, missing or private."""
+
+
+class MemoryCacheBackend:
+    """
+    Thread-safe in-process LRU with per-entry expiry.
+
+    Args:
+        maxsize: Maximum number of entries
+    """
+
+    def __init__(self, maxsize: int = REDDIT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry[1]
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """
+    Redis-backed cache of JSON-serializable values.
+
+    Args:
+        namespace: Redis key prefix
+    """
+
+    def __init__(self, namespace: str = "reddit:cache"):
+        self.namespace = namespace
+        self._redis: Optional[redis.Redis] = None
+
+    def _get_redis(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.Redis(
+                host=REDIS_HOST,
+                port=REDIS_PORT,
+                db=REDIS_DB,
+                password=REDIS_PASSWORD,
+                ssl=REDIS_SSL,
+                decode_responses=True,
+                socket_timeout=2,
+                socket_connect_timeout=2,
+            )
+        return self._redis
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        try:
+            raw = self._get_redis().get(f"{self.namespace}:{key}")
+        except Exception as e:
+            logger.warning(f"Redis cache read failed for {self.namespace}:{key}: {e}")
+            return False, None
+        if raw is None:
+            return False, None
+        return True, json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        try:
+            self._get_redis().set(
+                f"{self.namespace}:{key}", json.dumps(value), ex=max(1, int(ttl))
+            )
+        except Exception as e:
+            logger.warning(f"Redis cache write failed for {self.namespace}:{key}: {e}")
+
+    def delete(self, key: str) -> None:
+        try:
+            self._get_redis().delete(f"{self.namespace}:{key}")
+        except Exception as e:
+            logger.warning(f"Redis cache delete failed for {self.namespace}:{key}: {e}")
+
+    def clear(self) -> None:
+        # Shared entries expire on their own; clearing only affects this process
+        pass
+
+
+class RedditCache:
+    """
+    Read-through cache with per-resource TTLs and negative caching.
+
+    Args:
+        backend: "memory" or "redis" for JSON-ready values
+        ttls: Seconds to keep each resource type
+        negative_ttl: Seconds to remember that a resource is unavailable
+        maxsize: Size of the in-process LRU
+    """
+
+    def __init__(
+        self,
+        backend: str = REDDIT_CACHE_BACKEND,
+        ttls: Optional[Dict[str, float]] = None,
+        negative_ttl: float = REDDIT_CACHE_NEGATIVE_TTL,
+        maxsize: int = REDDIT_CACHE_SIZE,
+    ):
+        self.ttls = ttls or {
+            "post": REDDIT_CACHE_POST_TTL,
+            "post_context": REDDIT_CACHE_POST_TTL,
+            "subreddit_info": REDDIT_CACHE_SUBREDDIT_TTL,
+            "listing": REDDIT_CACHE_LISTING_TTL,
+        }
+        self.negative_ttl = negative_ttl
+        self.backend_name = "redis" if backend == "redis" else "memory"
+        self._local = MemoryCacheBackend(maxsize)
+        self._shared = (
+            RedisCacheBackend() if self.backend_name == "redis" else self._local
+        )
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, resource: str, outcome: str) -> None:
+        with self._lock:
+            counters = self._stats.setdefault(
+                resource, {"hits": 0, "misses": 0, "negative_hits": 0}
+            )
+            counters[outcome] += 1
+
+    def fetch(
+        self,
+        resource: str,
+        key: str,
+        loader: Callable[[], Any],
+        shared: bool = True,
+        is_negative: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Return a cached value, loading and storing it on a miss.
+
+        Args:
+            resource: Resource type, selecting the TTL
+            key: Resource identifier
+            loader: Fetches the value from Reddit
+            shared: False for PRAW objects, which stay in the in-process LRU
+            is_negative: Marks loaded values (e.g. deleted posts) that should
+                only be kept for the negative TTL
+
+        Returns:
+            The cached or freshly loaded value
+
+        Raises:
+            RedditResourceUnavailable: If Reddit reported the resource missing
+                or private, now or within the negative TTL
+        """
+        backend = self._shared if shared else self._local
+        cache_key = f"{resource}:{key}"
+
+        found, value = backend.get(cache_key)
+        if found:
+            if isinstance(value, dict) and _MISSING in value:
+                self._count(resource, "negative_hits")
+                raise RedditResourceUnavailable(value[_MISSING])
+            self._count(resource, "hits")
+            return value
+
+        self._count(resource, "misses")
+        try:
+            value = loader()
+        except UNAVAILABLE_ERRORS as e:
+            reason = f"Reddit {resource} {key} unavailable: {e}"
+            backend.set(cache_key, {_MISSING: reason}, self.negative_ttl)
+            raise RedditResourceUnavailable(reason) from e
+
+        negative = is_negative is not None and is_negative(value)
+        ttl = self.negative_ttl if negative else self.ttls.get(resource, 60)
+        backend.set(cache_key, value, ttl)
+        return value
+
+    def invalidate(self, resource: str, key: str) -> None:
+        """Drop one cached resource from both tiers."""
+        cache_key = f"{resource}:{key}"
+        self._local.delete(cache_key)
+        if self._shared is not self._local:
+            self._shared.delete(cache_key)
+
+    def clear(self) -> None:
+        """Drop all in-process entries and counters."""
+        self._local.clear()
+        with self._lock:
+            self._stats.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit-rate metrics per resource type."""
+        with self._lock:
+            resources = {}
+            for resource, counters in self._stats.items():
+                lookups = sum(counters.values())
+                resources[resource] = {
+                    **counters,
+                    "hit_rate": (
+                        round(
+                            (counters["hits"] + counters["negative_hits"]) / lookups, 3
+                        )
+                        if lookups
+                        else 0.0
+                    ),
+                }
+        return {
+            "backend": self.backend_name,
+            "local_entries": len(self._local),
+            "resources": resources,
+        }
+
+
+# Global Reddit read cache instance
+reddit_cache = RedditCache()
@@ -5,10 +5,33 @@ from typing import Any, Dict, List, Optional
 
 import praw
 
+from app.clients.reddit_cache import reddit_cache
+from app.clients.reddit_registry import get_reddit_client
 from app.utils.logging_config import get_logger, log_operation
 
 logger = get_logger(__name__)
 
+# Subreddits never picked for random commissions (lowercase)
+EXCLUDED_RANDOM_SUBREDDITS = frozenset(
+    {
+        "all",
+        "popular",
+        "announcements",
+        "blog",
+        "changelog",
+        "modnews",
+        "modsupport",
+        "help",
+        "reddit",
+        "redditeng",
+    }
+)
+
+
+def _is_removed(post: praw.models.Submission) -> bool:
+    """Deleted or removed posts are only cached for the negative TTL."""
+    return bool(getattr(post, "removed_by_category", None))
+
 
 class RedditClient:
     """Client for interacting with Reddit API."""
@@ -20,15 +43,8 @@ class RedditClient:
                 logger, "init", "started", {"mode": os.getenv("REDDIT_MODE", "dryrun")}
             )
 
-            self.reddit = praw.Reddit(
-                client_id=os.getenv("REDDIT_CLIENT_ID"),
-                client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
-                username=os.getenv("REDDIT_USERNAME"),
-                password=os.getenv("REDDIT_PASSWORD"),
-                user_agent=os.getenv(
-                    "REDDIT_USER_AGENT", "zazzle-agent by u/yourusername"
-                ),
-            )
+            # Shared per-process client, rate limited with every other user
+            self.reddit = get_reddit_client()
 
             # Determine operation mode (live or dry run)
             self.mode = os.getenv("REDDIT_MODE", "dryrun").lower()
@@ -121,11 +137,17 @@ class RedditClient:
             raise
 
     def get_post(self, post_id: str) -> praw.models.Submission:
-        """Get a post by ID."""
+        """Get a post by ID, loaded once and served from the Reddit cache."""
         try:
             log_operation(logger, "get_post", "started", {"post_id": post_id})
 
-            post = self.reddit.submission(post_id)
+            post = reddit_cache.fetch(
+                "post",
+                post_id,
+                lambda: self._load_post(post_id),
+                shared=False,
+                is_negative=_is_removed,
+            )
 
             log_operation(logger, "get_post", "success", {"post_id": post_id})
 
@@ -135,6 +157,12 @@ class RedditClient:
             log_operation(logger, "get_post", "failure", {"post_id": post_id}, error=e)
             raise
 
+    def _load_post(self, post_id: str) -> praw.models.Submission:
+        post = self.reddit.submission(post_id)
+        # Access a property to fetch now, so missing or private posts raise here
+        post.title
+        return post
+
     def get_comment(self, comment_id: str) -> praw.models.Comment:
         """Get a comment by ID."""
         return self.reddit.comment(comment_id)
@@ -349,6 +377,8 @@ class RedditClient:
                 "subreddit": post.subreddit.display_name,
             }
         new_comment = post.reply(comment_text)
+        # Our comment may now be among the post's top comments
+        reddit_cache.invalidate("post_context", f"{self.mode}:{post_id}")
         log_operation(
             logger,
             "comment_on_post",
@@ -493,6 +523,13 @@ class RedditClient:
 
     def get_post_context(self, post_id: str) -> Dict[str, Any]:
         """Get detailed context for a given post ID, including top comments."""
+        return reddit_cache.fetch(
+            "post_context",
+            f"{self.mode}:{post_id}",
+            lambda: self._load_post_context(post_id),
+        )
+
+    def _load_post_context(self, post_id: str) -> Dict[str, Any]:
         try:
             log_operation(
                 logger,
@@ -607,6 +644,15 @@ class RedditClient:
         self, subreddit_name: str, limit: int = 1
     ) -> List[Dict[str, Any]]:
         """Get a list of trending posts from a specified subreddit."""
+        return reddit_cache.fetch(
+            "listing",
+            f"{self.mode}:hot:{subreddit_name.lower()}:{limit}",
+            lambda: self._load_trending_posts(subreddit_name, limit),
+        )
+
+    def _load_trending_posts(
+        self, subreddit_name: str, limit: int
+    ) -> List[Dict[str, Any]]:
         try:
             log_operation(
                 logger,
@@ -849,8 +895,15 @@ class RedditClient:
             Dictionary with subreddit information or None if not found
 
         Raises:
-            Exception: If subreddit doesn't exist or is not accessible
+            RedditResourceUnavailable: If the subreddit doesn't exist or is private
         """
+        return reddit_cache.fetch(
+            "subreddit_info",
+            subreddit_name.lower(),
+            lambda: self._load_subreddit_info(subreddit_name),
+        )
+
+    def _load_subreddit_info(self, subreddit_name: str) -> Dict[str, Any]:
         try:
             log_operation(
                 logger,
@@ -941,18 +994,7 @@ class RedditClient:
             subreddit_name = random_post.subreddit.display_name
 
             # Filter out unsuitable subreddits
-            excluded_subreddits = {
-                "all",
-                "popular",
-                "announcements",
-                "blog",
-                "changelog",
-                "modnews",
-                "ModSupport",
-                "help",
-                "reddit",
-                "RedditEng",
-            }
+            excluded_subreddits = EXCLUDED_RANDOM_SUBREDDITS
 
             if subreddit_name.lower() in excluded_subreddits:
                 # Try a few more times to get a different subreddit
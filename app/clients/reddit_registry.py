@@ -0,0 +1,385 @@
+"""
+Process-wide PRAW client registry with a shared Reddit rate-limit governor.
+
+Every component that talks to Reddit (RedditClient, the community and
+promoter agents, the community agent service) gets its praw.Reddit instance from here, so
+each account is authenticated once per process and all of its calls pass
+through one governor.
+
+The governor is a token bucket sized to Reddit's per-account quota. It is
+hooked in as PRAW's requestor, so it sees every HTTP call: it waits for a
+token before the request, and afterwards reads Reddit's X-Ratelimit-Remaining,
+-Used and -Reset headers. When the quota runs low it pauses every caller until
+the window resets. A call never blocks for longer than
+REDDIT_RATE_LIMIT_MAX_WAIT: if the wait would be longer it raises
+RedditRateLimited, so callers on an event loop are not stalled for a whole
+reset window. With REDDIT_RATE_LIMIT_BACKEND=redis the bucket and the
+pause live in Redis, so API replicas, commission workers and agents share one
+budget.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+import praw
+import prawcore
+import redis
+
+from app.config import (
+    REDDIT_RATE_LIMIT_BACKEND,
+    REDDIT_RATE_LIMIT_BURST,
+    REDDIT_RATE_LIMIT_MAX_WAIT,
+    REDDIT_RATE_LIMIT_PER_MINUTE,
+    REDDIT_RATE_LIMIT_RESERVE,
+    REDIS_DB,
+    REDIS_HOST,
+    REDIS_PASSWORD,
+    REDIS_PORT,
+    REDIS_SSL,
+)
+from app.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Environment variables holding each account's credentials
+ACCOUNT_ENV = {
+    "default": {
+        "client_id": "REDDIT_CLIENT_ID",
+        "client_secret": "REDDIT_CLIENT_SECRET",
+        "username": "REDDIT_USERNAME",
+        "password": "REDDIT_PASSWORD",
+        "user_agent": "REDDIT_USER_AGENT",
+    },
+    "promoter": {
+        "client_id": "PROMOTER_AGENT_CLIENT_ID",
+        "client_secret": "PROMOTER_AGENT_CLIENT_SECRET",
+        "username": "PROMOTER_AGENT_USERNAME",
+        "password": "PROMOTER_AGENT_PASSWORD",
+        "user_agent": "PROMOTER_AGENT_USER_AGENT",
+    },
+}
+
+DEFAULT_USER_AGENT = "zazzle-agent by u/yourusername"
+
+# Take one token (the balance may go negative) and return how long the caller
+# must wait for it, honouring any pause set from the rate-limit headers.
+# Redis TIME keeps every process on the same clock.
+TAKE_TOKEN_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate) - 1
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], 3600)
+local wait = 0
+if tokens < 0 then
+    wait = -tokens / rate
+end
+local pause_until = tonumber(redis.call('GET', KEYS[2]) or '0')
+if pause_until - now > wait then
+    wait = pause_until - now
+end
+return tostring(wait)
+"""
+
+
+class RedditRateLimited(Exception):
+    """Raised when a Reddit call would wait longer than the governor allows."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Reddit rate limit reached; retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class RedditRateGovernor:
+    """
+    Token bucket shared by all PRAW calls made with one Reddit account.
+
+    Args:
+        per_minute: Sustained request rate
+        burst: Bucket capacity
+        reserve: Remaining-quota level at which callers pause until reset
+        max_wait: Longest a caller may sleep; longer waits raise RedditRateLimited
+        backend: "memory" for this process only, "redis" to share the budget
+        namespace: Redis key prefix
+    """
+
+    def __init__(
+        self,
+        per_minute: float = REDDIT_RATE_LIMIT_PER_MINUTE,
+        burst: int = REDDIT_RATE_LIMIT_BURST,
+        reserve: float = REDDIT_RATE_LIMIT_RESERVE,
+        max_wait: float = REDDIT_RATE_LIMIT_MAX_WAIT,
+        backend: str = REDDIT_RATE_LIMIT_BACKEND,
+        namespace: str = "reddit:ratelimit:default",
+    ):
+        self.rate = per_minute / 60.0
+        self.capacity = burst
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self.namespace = namespace
+        self._use_redis = backend == "redis"
+        self._redis: Optional[redis.Redis] = None
+        self._lock = threading.Lock()
+
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._pause_until = 0.0  # Wall clock, comparable with Redis
+
+        # Latest values reported by Reddit
+        self.remaining: Optional[float] = None
+        self.used: Optional[int] = None
+        self.reset_at: Optional[float] = None
+
+        self.calls = 0
+        self.queued = 0
+        self.throttled_calls = 0
+        self.throttled_seconds = 0.0
+        self.rejected_calls = 0
+
+    def _get_redis(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.Redis(
+                host=REDIS_HOST,
+                port=REDIS_PORT,
+                db=REDIS_DB,
+                password=REDIS_PASSWORD,
+                ssl=REDIS_SSL,
+                decode_responses=True,
+                socket_timeout=2,
+                socket_connect_timeout=2,
+            )
+        return self._redis
+
+    def _take_local(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._pause_until - time.time())
+
+    def _take(self) -> float:
+        if self._use_redis:
+            try:
+                return float(
+                    self._get_redis().eval(
+                        TAKE_TOKEN_SCRIPT,
+                        2,
+                        f"{self.namespace}:bucket",
+                        f"{self.namespace}:pause_until",
+                        self.capacity,
+                        self.rate,
+                    )
+                )
+            except Exception as e:
+                logger.warning(f"Reddit governor falling back to local bucket: {e}")
+        return self._take_local()
+
+    def _refund(self) -> None:
+        """Return the token taken by a call that was rejected."""
+        if self._use_redis:
+            try:
+                self._get_redis().hincrbyfloat(f"{self.namespace}:bucket", "tokens", 1)
+                return
+            except Exception as e:
+                logger.warning(f"Failed to refund Reddit governor token: {e}")
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    def acquire(self) -> float:
+        """
+        Wait until a Reddit API call may be made.
+
+        Returns:
+            float: Seconds spent waiting
+
+        Raises:
+            RedditRateLimited: If the wait would exceed max_wait
+        """
+        wait = self._take()
+        if wait > self.max_wait:
+            self._refund()
+            with self._lock:
+                self.rejected_calls += 1
+            raise RedditRateLimited(wait)
+
+        with self._lock:
+            self.calls += 1
+            if wait > 0:
+                self.throttled_calls += 1
+                self.throttled_seconds += wait
+                self.queued += 1
+        if wait <= 0:
+            return 0.0
+
+        logger.debug(f"Reddit governor delaying call by {wait:.2f}s")
+        try:
+            time.sleep(wait)
+        finally:
+            with self._lock:
+                self.queued -= 1
+        return wait
+
+    def observe(self, headers: Mapping[str, str]) -> None:
+        """
+        Update the governor from Reddit's rate-limit response headers.
+
+        Args:
+            headers: Response headers of a Reddit API call
+        """
+        remaining = headers.get("x-ratelimit-remaining")
+        reset = headers.get("x-ratelimit-reset")
+        if remaining is None or reset is None:
+            return
+        try:
+            remaining = float(remaining)
+            reset = float(reset)
+            used = int(headers.get("x-ratelimit-used", 0))
+        except ValueError:
+            return
+
+        now = time.time()
+        with self._lock:
+            self.remaining = remaining
+            self.used = used
+            self.reset_at = now + reset
+
+        if remaining > self.reserve:
+            return
+
+        logger.warning(
+            f"Reddit quota nearly spent ({remaining:.0f} left); "
+            f"pausing calls for {reset:.0f}s"
+        )
+        with self._lock:
+            self._pause_until = max(self._pause_until, now + reset)
+        if self._use_redis:
+            try:
+                self._get_redis().set(
+                    f"{self.namespace}:pause_until", now + reset, ex=int(reset) + 1
+                )
+            except Exception as e:
+                logger.warning(f"Failed to share Reddit rate-limit pause: {e}")
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return quota and throttling metrics."""
+        with self._lock:
+            now = time.time()
+            return {
+                "backend": "redis" if self._use_redis else "memory",
+                "remaining": self.remaining,
+                "used": self.used,
+                "reset_in": (
+                    max(0.0, self.reset_at - now) if self.reset_at is not None else None
+                ),
+                "paused_for": max(0.0, self._pause_until - now),
+                "calls": self.calls,
+                "queued": self.queued,
+                "throttled_calls": self.throttled_calls,
+                "throttled_seconds": round(self.throttled_seconds, 3),
+                "rejected_calls": self.rejected_calls,
+            }
+
+
+class GovernedRequestor(prawcore.Requestor):
+    """PRAW requestor that routes every HTTP call through a rate governor."""
+
+    def __init__(self, *args, governor: RedditRateGovernor, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.governor = governor
+
+    def request(self, *args, **kwargs):
+        self.governor.acquire()
+        response = super().request(*args, **kwargs)
+        self.governor.observe(response.headers)
+        return response
+
+
+class RedditClientRegistry:
+    """
+    One praw.Reddit instance, and one governor, per Reddit account.
+
+    Instances are shared by every thread of the process. PRAW objects are not
+    designed for concurrent mutation, but the shared client's rate limiting
+    goes through the governor's lock, and token refresh races only cost an
+    extra refresh.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, praw.Reddit] = {}
+        self._governors: Dict[str, RedditRateGovernor] = {}
+        self._lock = threading.Lock()
+
+    def governor(self, account: str = "default") -> RedditRateGovernor:
+        """Get the rate governor for an account."""
+        with self._lock:
+            if account not in self._governors:
+                self._governors[account] = RedditRateGovernor(
+                    namespace=f"reddit:ratelimit:{account}"
+                )
+            return self._governors[account]
+
+    def get(
+        self, account: str = "default", default_user_agent: str = DEFAULT_USER_AGENT
+    ) -> praw.Reddit:
+        """
+        Get the shared PRAW client for an account, creating it on first use.
+
+        Args:
+            account: Credential set from ACCOUNT_ENV
+            default_user_agent: User agent if the account's variable is unset;
+                only used when the client is first created
+
+        Returns:
+            praw.Reddit: Shared client
+        """
+        governor = self.governor(account)
+        with self._lock:
+            client = self._clients.get(account)
+            if client is None:
+                env = ACCOUNT_ENV[account]
+                client = praw.Reddit(
+                    client_id=os.getenv(env["client_id"]),
+                    client_secret=os.getenv(env["client_secret"]),
+                    username=os.getenv(env["username"]),
+                    password=os.getenv(env["password"]),
+                    user_agent=os.getenv(env["user_agent"], default_user_agent),
+                    requestor_class=GovernedRequestor,
+                    requestor_kwargs={"governor": governor},
+                )
+                self._clients[account] = client
+                logger.info(f"Created shared Reddit client for account '{account}'")
+            return client
+
+    def clear(self) -> None:
+        """Forget all clients and governors."""
+        with self._lock:
+            self._clients.clear()
+            self._governors.clear()
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Return governor metrics per account."""
+        with self._lock:
+            governors = dict(self._governors)
+        return {account: g.metrics() for account, g in governors.items()}
+
+
+# Global Reddit client registry
+reddit_registry = RedditClientRegistry()
+
+
+def get_reddit_client(
+    account: str = "default", default_user_agent: str = DEFAULT_USER_AGENT
+) -> praw.Reddit:
+    """Get the shared PRAW client for an account."""
+    return reddit_registry.get(account, default_user_agent)
@@ -0,0 +1,461 @@
+"""
+Bounded executor for commission tasks.
+
+Commission tasks run on a fixed number of long-lived workers instead of one
+thread and one event loop per task. A coordinator event loop in a dedicated
+thread owns the queue; each worker runs its tasks on its own long-lived
+event loop thread, so the blocking OpenAI, PRAW and database calls inside a
+commission only hold up that worker.
+
+PipelineTask rows are the source of truth. The in-memory queue is a bounded
+window onto the pending commission tasks in the database: tasks that do not
+fit stay pending and are loaded oldest-first as soon as capacity frees up,
+and tasks that were pending when the process stopped are recovered on start.
+Before running a task, a worker atomically claims it (pending -> in_progress),
+so API workers and replicas that load the same pending rows never run the same
+commission twice.
+"""
+
+import asyncio
+import threading
+import traceback
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.clients.imgur_client import AsyncImgurClient
+from app.config import (
+    COMMISSION_QUEUE_SIZE,
+    COMMISSION_SHUTDOWN_TIMEOUT,
+    COMMISSION_WORKERS,
+)
+from app.db.database import SessionLocal
+from app.db.models import Donation, PipelineTask
+from app.task_queue import TaskQueue
+from app.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+CommissionRunner = Callable[[int, int, Dict[str, Any]], Awaitable[None]]
+
+
+class CommissionExecutorStoppedError(Exception):
+    """Raised when a task is submitted after the executor has been stopped."""
+
+    pass
+
+
+class CommissionExecutor:
+    """
+    Runs commission tasks on a bounded pool of workers, one event loop each.
+
+    Args:
+        runner: Coroutine function called as runner(task_id, donation_id, task_data)
+        num_workers: Number of concurrent workers
+        max_queue_size: Maximum number of tasks held in memory waiting for a worker
+        claim: Called as claim(task_id) in a thread before a task runs; returns
+            False if another process already took the task. Defaults to an
+            atomic pending -> in_progress update in the database.
+    """
+
+    def __init__(
+        self,
+        runner: CommissionRunner,
+        num_workers: int = COMMISSION_WORKERS,
+        max_queue_size: int = COMMISSION_QUEUE_SIZE,
+        claim: Optional[Callable[[int], bool]] = None,
+    ):
+        self._runner = runner
+        self._claim = claim or self._claim_pending_task
+        self.num_workers = max(1, num_workers)
+        self.max_queue_size = max(1, max_queue_size)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._refill_lock: Optional[asyncio.Lock] = None
+        self._workers: List[asyncio.Task] = []
+        self._worker_loops: List[Tuple[asyncio.AbstractEventLoop, threading.Thread]] = (
+            []
+        )
+
+        # Guards the bookkeeping below, which is touched from API threads
+        self._lock = threading.Lock()
+        self._waiting: "OrderedDict[int, Tuple[int, Dict[str, Any]]]" = OrderedDict()
+        self._running: Set[int] = set()
+        self._has_backlog = False
+        self._backlog_generation = 0
+        self._accepting = False
+        self._stopped = False
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, recover: bool = True) -> None:
+        """
+        Start the worker thread and its event loop.
+
+        Args:
+            recover: Load commission tasks left pending in the database
+        """
+        with self._lock:
+            if self.is_running:
+                return
+            self._accepting = True
+            self._stopped = False
+            self._has_backlog = recover
+
+        ready = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run_loop,
+            args=(ready,),
+            name="commission-executor",
+            daemon=True,
+        )
+        self._thread.start()
+        ready.wait()
+        logger.info(
+            f"Commission executor started with {self.num_workers} workers "
+            f"(queue size {self.max_queue_size})"
+        )
+
+    def submit(self, task_id: int, donation_id: int, task_data: Dict[str, Any]) -> int:
+        """
+        Admit a commission task for execution.
+
+        Tasks beyond the in-memory limit stay pending in the database and are
+        picked up in order once workers free up. Submitting a task that is
+        already queued or running is a no-op.
+
+        Args:
+            task_id: PipelineTask ID
+            donation_id: The donation ID
+            task_data: Task configuration data
+
+        Returns:
+            int: Queue position; 0 if the task is already running, 1 if it is
+            next in line
+
+        Raises:
+            CommissionExecutorStoppedError: If the executor has been stopped
+        """
+        if not self.is_running:
+            if self._stopped:
+                raise CommissionExecutorStoppedError(
+                    f"Commission executor is stopped; task {task_id} left pending"
+                )
+            self.start(recover=False)
+
+        with self._lock:
+            if not self._accepting:
+                raise CommissionExecutorStoppedError(
+                    f"Commission executor is stopping; task {task_id} left pending"
+                )
+            if task_id in self._running:
+                return 0
+            if task_id in self._waiting:
+                return list(self._waiting).index(task_id) + 1
+
+            if not self._has_backlog and len(self._waiting) < self.max_queue_size:
+                self._waiting[task_id] = (donation_id, task_data)
+                position = len(self._waiting)
+                self._loop.call_soon_threadsafe(self._queue.put_nowait, task_id)
+                logger.info(f"Commission task {task_id} queued at position {position}")
+                return position
+
+            # Queue is full (or older tasks are already waiting in the database):
+            # leave the task pending in the database to keep FIFO order
+            self._has_backlog = True
+            self._backlog_generation += 1
+            waiting_count = len(self._waiting)
+            tracked = set(self._waiting) | self._running
+
+        self._loop.call_soon_threadsafe(self._schedule_refill)
+        position = waiting_count + self._backlog_position(task_id, tracked)
+        logger.info(
+            f"Commission queue full; task {task_id} deferred to database backlog "
+            f"at position {position}"
+        )
+        return position
+
+    def queue_position(
+        self, task_id: int, db: Optional[Session] = None
+    ) -> Optional[int]:
+        """
+        Get the current queue position of a task.
+
+        Returns:
+            int: 0 if running, 1+ if waiting, or None if the executor does not
+            know about the task
+        """
+        with self._lock:
+            if task_id in self._running:
+                return 0
+            if task_id in self._waiting:
+                return list(self._waiting).index(task_id) + 1
+            if not self._has_backlog:
+                return None
+            waiting_count = len(self._waiting)
+            tracked = set(self._waiting) | self._running
+        return waiting_count + self._backlog_position(task_id, tracked, db)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of executor state for status endpoints."""
+        with self._lock:
+            return {
+                "running": self.is_running,
+                "workers": self.num_workers,
+                "max_queue_size": self.max_queue_size,
+                "in_progress": len(self._running),
+                "queued": len(self._waiting),
+                "has_backlog": self._has_backlog,
+            }
+
+    def stop(self, timeout: float = COMMISSION_SHUTDOWN_TIMEOUT) -> None:
+        """
+        Stop accepting tasks and shut the workers down gracefully.
+
+        In-flight tasks get up to ``timeout`` seconds to finish before they are
+        cancelled. Queued tasks are dropped from memory only; they remain
+        pending in the database and are recovered on the next start.
+        """
+        with self._lock:
+            self._accepting = False
+            self._stopped = True
+            loop = self._loop
+            thread = self._thread
+
+        if loop is None or thread is None or not thread.is_alive():
+            return
+
+        logger.info("Stopping commission executor...")
+        try:
+            future = asyncio.run_coroutine_threadsafe(self._drain(timeout), loop)
+            future.result(timeout + 5)
+        except Exception as e:
+            logger.error(f"Error draining commission executor: {e}")
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+            self._thread = None
+            self._loop = None
+        logger.info("Commission executor stopped")
+
+    def _run_loop(self, ready: threading.Event) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._refill_lock = asyncio.Lock()
+        self._worker_loops = [
+            self._start_worker_loop(i) for i in range(self.num_workers)
+        ]
+        self._workers = [
+            loop.create_task(self._worker(i, worker_loop))
+            for i, (worker_loop, _) in enumerate(self._worker_loops)
+        ]
+        self._schedule_refill()
+        ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            pending = [t for t in asyncio.all_tasks(loop) if not t.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(
+                    asyncio.gather(*pending, return_exceptions=True)
+                )
+            for worker_loop, worker_thread in self._worker_loops:
+                worker_loop.call_soon_threadsafe(worker_loop.stop)
+                worker_thread.join(timeout=5)
+            self._worker_loops = []
+            loop.close()
+
+    def _start_worker_loop(
+        self, index: int
+    ) -> Tuple[asyncio.AbstractEventLoop, threading.Thread]:
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(
+            target=self._run_worker_loop,
+            args=(loop,),
+            name=f"commission-worker-{index}",
+            daemon=True,
+        )
+        thread.start()
+        return loop, thread
+
+    def _run_worker_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            pending = [t for t in asyncio.all_tasks(loop) if not t.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(
+                    asyncio.gather(*pending, return_exceptions=True)
+                )
+            loop.run_until_complete(AsyncImgurClient.aclose_pooled())
+            loop.close()
+
+    async def _worker(self, index: int, worker_loop: asyncio.AbstractEventLoop) -> None:
+        while True:
+            task_id = await self._queue.get()
+            try:
+                if task_id is None:
+                    return
+                with self._lock:
+                    entry = self._waiting.pop(task_id, None)
+                    if entry is None:
+                        continue
+                    self._running.add(task_id)
+
+                donation_id, task_data = entry
+                try:
+                    if await asyncio.to_thread(self._claim, task_id):
+                        logger.debug(
+                            f"Worker {index} starting commission task {task_id}"
+                        )
+                        # Cancelling this await cancels the task on its loop too
+                        await asyncio.wrap_future(
+                            asyncio.run_coroutine_threadsafe(
+                                self._runner(task_id, donation_id, task_data),
+                                worker_loop,
+                            )
+                        )
+                    else:
+                        logger.info(
+                            f"Commission task {task_id} was claimed elsewhere; skipping"
+                        )
+                except Exception as e:
+                    logger.error(
+                        f"Commission task {task_id} raised in worker {index}: {str(e)}\n{traceback.format_exc()}"
+                    )
+                finally:
+                    with self._lock:
+                        self._running.discard(task_id)
+            finally:
+                self._queue.task_done()
+
+            await self._refill()
+
+    def _schedule_refill(self) -> None:
+        self._loop.create_task(self._refill())
+
+    async def _refill(self) -> None:
+        """Move pending tasks from the database backlog into the queue."""
+        async with self._refill_lock:
+            with self._lock:
+                if not self._has_backlog or not self._accepting:
+                    return
+                capacity = self.max_queue_size - len(self._waiting)
+                if capacity <= 0:
+                    return
+                tracked = set(self._waiting) | self._running
+                generation = self._backlog_generation
+
+            try:
+                rows = await asyncio.to_thread(
+                    self._load_pending_tasks, capacity, tracked
+                )
+            except Exception as e:
+                logger.error(f"Error loading pending commission tasks: {e}")
+                return
+
+            with self._lock:
+                for task_id, donation_id, task_data in rows:
+                    if task_id in self._waiting or task_id in self._running:
+                        continue
+                    self._waiting[task_id] = (donation_id, task_data)
+                    self._queue.put_nowait(task_id)
+                # Only clear the flag if nothing was deferred while loading
+                if len(rows) < capacity and generation == self._backlog_generation:
+                    self._has_backlog = False
+
+            if rows:
+                logger.info(f"Loaded {len(rows)} pending commission tasks from backlog")
+
+    async def _drain(self, timeout: float) -> None:
+        with self._lock:
+            dropped = len(self._waiting)
+            self._waiting.clear()
+        while not self._queue.empty():
+            self._queue.get_nowait()
+            self._queue.task_done()
+        if dropped:
+            logger.info(f"{dropped} queued commission tasks left pending in database")
+
+        for _ in self._workers:
+            self._queue.put_nowait(None)
+        done, pending = await asyncio.wait(self._workers, timeout=timeout)
+        if pending:
+            logger.warning(
+                f"Cancelling {len(pending)} commission workers still running after {timeout}s"
+            )
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def _claim_pending_task(self, task_id: int) -> bool:
+        db = SessionLocal()
+        try:
+            return TaskQueue(db).claim_task(task_id)
+        finally:
+            db.close()
+
+    def _pending_commission_query(self, db: Session, tracked: Set[int]):
+        query = (
+            db.query(PipelineTask)
+            .join(Donation, PipelineTask.donation_id == Donation.id)
+            .filter(
+                PipelineTask.status == "pending",
+                PipelineTask.type == "SUBREDDIT_POST",
+                Donation.donation_type == "commission",
+            )
+        )
+        if tracked:
+            query = query.filter(~PipelineTask.id.in_(tracked))
+        return query
+
+    def _load_pending_tasks(
+        self, limit: int, tracked: Set[int]
+    ) -> List[Tuple[int, int, Dict[str, Any]]]:
+        db = SessionLocal()
+        try:
+            tasks = (
+                self._pending_commission_query(db, tracked)
+                .order_by(PipelineTask.id.asc())
+                .limit(limit)
+                .all()
+            )
+            return [
+                (task.id, task.donation_id, task.context_data or {}) for task in tasks
+            ]
+        finally:
+            db.close()
+
+    def _backlog_position(
+        self, task_id: int, tracked: Set[int], db: Optional[Session] = None
+    ) -> int:
+        """1-based position of a task among the pending tasks not yet queued."""
+        should_close_db = False
+        if db is None:
+            db = SessionLocal()
+            should_close_db = True
+        try:
+            ahead = (
+                self._pending_commission_query(db, tracked)
+                .filter(PipelineTask.id < task_id)
+                .count()
+            )
+            return ahead + 1
+        except Exception as e:
+            logger.error(f"Error computing backlog position for task {task_id}: {e}")
+            return 1
+        finally:
+            if should_close_db:
+                db.close()
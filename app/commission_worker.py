@@ -13,17 +13,18 @@ import os
 import sys
 import threading
 import traceback
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
 from app.affiliate_linker import ZazzleAffiliateLinker
 from app.agents.reddit_agent import RedditAgent
-from app.clients.imgur_client import ImgurClient
+from app.clients.imgur_client import AsyncImgurClient, ImgurClient
 from app.config import REDIS_DB, REDIS_HOST, REDIS_PORT, WEBSOCKET_TASK_UPDATES_CHANNEL
 from app.content_generator import ContentGenerator
 from app.db.database import SessionLocal
 from app.db.models import Donation, PipelineRun, PipelineTask, ProductInfo, RedditPost
 from app.models import DonationStatus
+from app.redis_publisher import redis_publisher
 from app.redis_service import redis_service
 from app.services.commission_validator import CommissionValidator
 from app.utils.logging_config import get_logger
@@ -198,7 +199,7 @@ class CommissionWorker:
                     priority=10,  # High priority for commissions
                     status="pending",
                     context_data=self.task_data,
-                    created_at=datetime.now(),
+                    created_at=datetime.now(timezone.utc),
                 )
 
                 self.db.add(task)
@@ -252,17 +253,17 @@ class CommissionWorker:
                     hasattr(self.pipeline_task, "started_at")
                     and not self.pipeline_task.started_at
                 ):
-                    self.pipeline_task.started_at = datetime.now()
+                    self.pipeline_task.started_at = datetime.now(timezone.utc)
                 if hasattr(self.pipeline_task, "last_heartbeat"):
-                    self.pipeline_task.last_heartbeat = datetime.now()
+                    self.pipeline_task.last_heartbeat = datetime.now(timezone.utc)
             elif status in ["completed", "failed"]:
-                self.pipeline_task.completed_at = datetime.now()
+                self.pipeline_task.completed_at = datetime.now(timezone.utc)
 
             # Always update heartbeat for in_progress tasks
             if status == "in_progress" and hasattr(
                 self.pipeline_task, "last_heartbeat"
             ):
-                self.pipeline_task.last_heartbeat = datetime.now()
+                self.pipeline_task.last_heartbeat = datetime.now(timezone.utc)
 
             if error_message:
                 self.pipeline_task.error_message = error_message
@@ -280,38 +281,9 @@ class CommissionWorker:
             self.db.rollback()
 
     def _publish_task_update_simple(self, task_id: str, update: dict):
-        """Simple synchronous Redis publishing without event loop conflicts."""
+        """Queue a task update on the shared Redis publisher without blocking."""
         try:
-            import json
-
-            import redis
-
-            from app.config import (
-                REDIS_DB,
-                REDIS_HOST,
-                REDIS_PASSWORD,
-                REDIS_PORT,
-                REDIS_SSL,
-            )
-
-            # Create a simple Redis client for this operation
-            r = redis.Redis(
-                host=REDIS_HOST,
-                port=REDIS_PORT,
-                db=REDIS_DB,
-                password=REDIS_PASSWORD,
-                ssl=REDIS_SSL,
-                decode_responses=True,
-            )
-            # Create the message
-            message = {
-                "type": "task_update",
-                "task_id": str(task_id),
-                "data": update,
-                "timestamp": datetime.now().isoformat(),
-            }
-            # Publish to Redis
-            r.publish("task_updates", json.dumps(message))
+            redis_publisher.publish_task_update(task_id, update)
             # Only log Redis publishing for errors or major status changes
             if update.get("status") in ["completed", "failed"] or logger.isEnabledFor(
                 logging.DEBUG
@@ -540,8 +512,8 @@ class CommissionWorker:
                 status="completed",  # Use simple string status
                 summary=f"Commission for donation {donation.id}",
                 config={"commission": True, "donation_id": donation.id},
-                start_time=datetime.now(),
-                end_time=datetime.now(),
+                start_time=datetime.now(timezone.utc),
+                end_time=datetime.now(timezone.utc),
                 duration=0,
                 version="1.0.0",
             )
@@ -593,6 +565,11 @@ class CommissionWorker:
                 f"Saved product to database with ID: {db_product_info.id} (pipeline run: {pipeline_run.id}, reddit post: {db_reddit_post.id})"
             )
 
+            # Publish the product to the gallery read model
+            from app.services.gallery_service import GalleryService
+
+            GalleryService(self.db).refresh_pipeline_run(pipeline_run.id)
+
         except Exception as e:
             logger.error(f"Error saving product: {e}")
             self.db.rollback()
@@ -613,6 +590,11 @@ class CommissionWorker:
                     donation.message = f"Commission failed: {error}"
                 logger.error(f"Updated donation {self.donation_id} status to FAILED")
             self.db.commit()
+
+            # Refresh any gallery cards that display this donation
+            from app.services.gallery_service import GalleryService
+
+            GalleryService(self.db).refresh_for_donation(self.donation_id)
         except Exception as e:
             logger.error(f"Error updating donation status: {e}")
             self.db.rollback()
@@ -621,7 +603,7 @@ class CommissionWorker:
         """Send a heartbeat to indicate the task is still running."""
         try:
             if self.pipeline_task and hasattr(self.pipeline_task, "last_heartbeat"):
-                self.pipeline_task.last_heartbeat = datetime.now()
+                self.pipeline_task.last_heartbeat = datetime.now(timezone.utc)
                 self.db.commit()
                 logger.debug(f"Sent heartbeat for task {self.pipeline_task.id}")
         except Exception as e:
@@ -691,6 +673,14 @@ class CommissionWorker:
             # Don't let callback errors break the main workflow
 
 
+async def _run_standalone(worker: CommissionWorker) -> bool:
+    """Run one commission on a fresh loop, closing its pooled uploads client."""
+    try:
+        return await worker.run()
+    finally:
+        await AsyncImgurClient.aclose_pooled()
+
+
 def main():
     """Main entry point for the commission worker."""
     parser = argparse.ArgumentParser(description="Commission Worker")
@@ -703,24 +693,28 @@ def main():
 
     args = parser.parse_args()
 
+    success = False
     try:
         # Parse task data
         task_data = json.loads(args.task_data)
 
         # Create and run worker
         worker = CommissionWorker(args.donation_id, task_data)
-        success = asyncio.run(worker.run())
+        success = asyncio.run(_run_standalone(worker))
 
         if success:
             logger.info("Commission worker completed successfully")
-            sys.exit(0)
         else:
             logger.error("Commission worker failed")
-            sys.exit(1)
 
     except Exception as e:
         logger.error(f"Commission worker error: {e}")
-        sys.exit(1)
+    finally:
+        # Task updates are sent by a background thread; deliver the final
+        # status before the process exits
+        redis_publisher.close()
+
+    sys.exit(0 if success else 1)
 
 
 if __name__ == "__main__":
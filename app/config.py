@@ -29,5 +29,98 @@ else:
 WEBSOCKET_TASK_UPDATES_CHANNEL = "task_updates"
 WEBSOCKET_GENERAL_UPDATES_CHANNEL = "general_updates"
 
+# Per-connection outbound WebSocket queue
+WEBSOCKET_QUEUE_SIZE = int(os.getenv("WEBSOCKET_QUEUE_SIZE", "100"))
+WEBSOCKET_SEND_TIMEOUT = float(os.getenv("WEBSOCKET_SEND_TIMEOUT", "5"))
+
 # Base URL Configuration
 BASE_URL = os.getenv("BASE_URL", "https://clouvel.ai")
+
+# QR redirects: image names remembered in memory (image_name -> Reddit post id)
+REDIRECT_CACHE_SIZE = int(os.getenv("REDIRECT_CACHE_SIZE", "1024"))
+
+# Commission Executor Configuration
+COMMISSION_WORKERS = int(os.getenv("COMMISSION_WORKERS", "2"))
+COMMISSION_QUEUE_SIZE = int(os.getenv("COMMISSION_QUEUE_SIZE", "50"))
+COMMISSION_SHUTDOWN_TIMEOUT = float(os.getenv("COMMISSION_SHUTDOWN_TIMEOUT", "30"))
+
+# Donation/fundraising aggregate cache ("memory" or "redis")
+AGGREGATE_CACHE_BACKEND = os.getenv("AGGREGATE_CACHE_BACKEND", "memory")
+AGGREGATE_CACHE_TTL = int(os.getenv("AGGREGATE_CACHE_TTL", "300"))
+
+# Stripe webhook inbox consumer
+WEBHOOK_POLL_INTERVAL = float(os.getenv("WEBHOOK_POLL_INTERVAL", "5"))
+WEBHOOK_BATCH_SIZE = int(os.getenv("WEBHOOK_BATCH_SIZE", "20"))
+WEBHOOK_MAX_ATTEMPTS = int(os.getenv("WEBHOOK_MAX_ATTEMPTS", "8"))
+WEBHOOK_RETRY_BASE_SECONDS = float(os.getenv("WEBHOOK_RETRY_BASE_SECONDS", "10"))
+WEBHOOK_RETRY_MAX_SECONDS = float(os.getenv("WEBHOOK_RETRY_MAX_SECONDS", "3600"))
+WEBHOOK_LEASE_SECONDS = int(os.getenv("WEBHOOK_LEASE_SECONDS", "300"))
+
+# Payment intent locks: lease expiry and how long callers wait for a holder
+PAYMENT_INTENT_LOCK_TTL = int(os.getenv("PAYMENT_INTENT_LOCK_TTL", "30"))
+PAYMENT_INTENT_LOCK_WAIT = float(os.getenv("PAYMENT_INTENT_LOCK_WAIT", "30"))
+
+# Reddit API governor shared by every PRAW client of an account ("memory" or "redis")
+REDDIT_RATE_LIMIT_BACKEND = os.getenv("REDDIT_RATE_LIMIT_BACKEND", "memory")
+REDDIT_RATE_LIMIT_PER_MINUTE = float(os.getenv("REDDIT_RATE_LIMIT_PER_MINUTE", "90"))
+REDDIT_RATE_LIMIT_BURST = int(os.getenv("REDDIT_RATE_LIMIT_BURST", "10"))
+REDDIT_RATE_LIMIT_RESERVE = float(os.getenv("REDDIT_RATE_LIMIT_RESERVE", "5"))
+# Longest a call may block waiting for quota before it is rejected instead
+REDDIT_RATE_LIMIT_MAX_WAIT = float(os.getenv("REDDIT_RATE_LIMIT_MAX_WAIT", "5"))
+
+# Reddit read cache ("memory" or "redis"); TTLs in seconds per resource type
+REDDIT_CACHE_BACKEND = os.getenv("REDDIT_CACHE_BACKEND", "memory")
+REDDIT_CACHE_SIZE = int(os.getenv("REDDIT_CACHE_SIZE", "512"))
+REDDIT_CACHE_POST_TTL = int(os.getenv("REDDIT_CACHE_POST_TTL", "300"))
+REDDIT_CACHE_SUBREDDIT_TTL = int(os.getenv("REDDIT_CACHE_SUBREDDIT_TTL", "3600"))
+REDDIT_CACHE_LISTING_TTL = int(os.getenv("REDDIT_CACHE_LISTING_TTL", "120"))
+REDDIT_CACHE_NEGATIVE_TTL = int(os.getenv("REDDIT_CACHE_NEGATIVE_TTL", "600"))
+
+# Candidate-post harvester: pre-screens subreddit listings for commissions
+CANDIDATE_HARVEST_INTERVAL = float(os.getenv("CANDIDATE_HARVEST_INTERVAL", "900"))
+CANDIDATE_HARVEST_SUBREDDITS = int(os.getenv("CANDIDATE_HARVEST_SUBREDDITS", "10"))
+CANDIDATE_HARVEST_LIMIT = int(os.getenv("CANDIDATE_HARVEST_LIMIT", "100"))
+CANDIDATE_TIME_FILTER = os.getenv("CANDIDATE_TIME_FILTER", "month")
+CANDIDATE_MAX_AGE_DAYS = int(os.getenv("CANDIDATE_MAX_AGE_DAYS", "60"))
+# Seconds a validated candidate stays reserved for the donor's checkout
+CANDIDATE_CLAIM_TTL = int(os.getenv("CANDIDATE_CLAIM_TTL", "900"))
+
+# Bloom filter of known Reddit post ids used to skip processed/scanned posts
+POST_DEDUPE_CAPACITY = int(os.getenv("POST_DEDUPE_CAPACITY", "200000"))
+POST_DEDUPE_ERROR_RATE = float(os.getenv("POST_DEDUPE_ERROR_RATE", "0.01"))
+POST_DEDUPE_SYNC_SECONDS = float(os.getenv("POST_DEDUPE_SYNC_SECONDS", "10"))
+# Trailing ids re-read on each sync, for rows whose transaction committed late
+POST_DEDUPE_SYNC_OVERLAP = int(os.getenv("POST_DEDUPE_SYNC_OVERLAP", "1000"))
+POST_DEDUPE_REWARM_SECONDS = float(os.getenv("POST_DEDUPE_REWARM_SECONDS", "3600"))
+
+# Random subreddit pool: refreshed from r/all, weighted by recent completed commissions
+SUBREDDIT_POOL_REFRESH_INTERVAL = float(
+    os.getenv("SUBREDDIT_POOL_REFRESH_INTERVAL", "1800")
+)
+SUBREDDIT_POOL_SUCCESS_WINDOW_DAYS = int(
+    os.getenv("SUBREDDIT_POOL_SUCCESS_WINDOW_DAYS", "30")
+)
+
+# Comment summaries for commissioned posts: top-N comments, prompt token budget, cache
+COMMENT_SUMMARY_MODEL = os.getenv("COMMENT_SUMMARY_MODEL", "gpt-4")
+COMMENT_SUMMARY_TOP_N = int(os.getenv("COMMENT_SUMMARY_TOP_N", "10"))
+COMMENT_SUMMARY_TOKEN_BUDGET = int(os.getenv("COMMENT_SUMMARY_TOKEN_BUDGET", "1500"))
+COMMENT_SUMMARY_CACHE_TTL = int(os.getenv("COMMENT_SUMMARY_CACHE_TTL", "3600"))
+COMMENT_SUMMARY_CACHE_SIZE = int(os.getenv("COMMENT_SUMMARY_CACHE_SIZE", "256"))
+
+# OpenAI chat response cache ("sqlite", "redis", "memory" or "off"); path defaults to data/llm_cache.db
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "sqlite")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "")
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "5000"))
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "86400"))
+
+# OpenAI usage tracking: recent calls kept in memory, seconds between rollup writes
+OPENAI_USAGE_HISTORY_SIZE = int(os.getenv("OPENAI_USAGE_HISTORY_SIZE", "1000"))
+OPENAI_USAGE_FLUSH_SECONDS = float(os.getenv("OPENAI_USAGE_FLUSH_SECONDS", "60"))
+
+# OpenAI rate limiter ("redis", falling back to local buckets when Redis is down,
+# or "memory"); fraction of published limits to use, and the request limit for
+# models missing from OpenAIUsageTracker.RATE_LIMITS
+OPENAI_RATE_LIMIT_BACKEND = os.getenv("OPENAI_RATE_LIMIT_BACKEND", "redis")
+OPENAI_RATE_LIMIT_HEADROOM = float(os.getenv("OPENAI_RATE_LIMIT_HEADROOM", "0.9"))
+OPENAI_RATE_LIMIT_DEFAULT_RPM = float(os.getenv("OPENAI_RATE_LIMIT_DEFAULT_RPM", "60"))
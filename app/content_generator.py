@@ -22,7 +22,9 @@ from dotenv import load_dotenv
 from openai import OpenAI
 
 from app.models import PipelineConfig, ProductIdea, ProductInfo, RedditContext
+from app.utils.llm_cache import llm_cache
 from app.utils.logging_config import get_logger
+from app.utils.openai_rate_limiter import estimate_message_tokens
 from app.utils.openai_usage_tracker import log_session_summary, track_openai_call
 
 load_dotenv()
@@ -69,15 +71,25 @@ class ContentGenerator:
         """
         model = self._get_model()
 
-        # Apply tracking with the actual model being used
-        @track_openai_call(model=model, operation="chat")
-        def _tracked_call():
-            response = self.client.chat.completions.create(
-                model=model, messages=[{"role": "user", "content": prompt}]
-            )
-            return response.choices[0].message.content.strip()
+        messages = [{"role": "user", "content": prompt}]
 
-        return _tracked_call()
+        # Apply tracking with the actual model being used; the tracker needs the
+        # whole response to read its usage and rate-limit headers
+        @track_openai_call(
+            model=model,
+            operation="chat",
+            estimate=lambda: estimate_message_tokens(messages),
+        )
+        def _tracked_call():
+            return self.client.chat.completions.create(model=model, messages=messages)
+
+        # Generated copy should vary between calls, so it is never replayed
+        return llm_cache.fetch(
+            lambda: _tracked_call().choices[0].message.content.strip(),
+            cache=False,
+            model=model,
+            messages=messages,
+        )
 
     def _get_model(self) -> str:
         """
@@ -5,6 +5,8 @@ from pathlib import Path
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
+# Registers the flush listeners that keep subreddit_donation_totals current
+from . import donation_totals  # noqa: F401
 from .models import Base
 
 logger = logging.getLogger(__name__)
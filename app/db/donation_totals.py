@@ -0,0 +1,215 @@
+"""
+Transactional maintenance of the subreddit_donation_totals rollup.
+
+Whenever a flush moves a Donation into or out of the succeeded state (or
+changes the amount, subreddit or email of a succeeded donation), the matching
+rollup rows are adjusted in the same transaction. The rollup therefore commits
+or rolls back together with the donation change that caused it.
+
+Imported by app.db.database so the listeners are registered in every process
+that writes donations. ``rebuild_donation_totals`` recomputes the table from
+scratch for backfills and repairs.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy import distinct, event, func, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.db.models import Donation, SubredditDonationTotal
+from app.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+SUCCEEDED = "succeeded"
+
+# Dialects whose INSERT supports ON CONFLICT ... DO UPDATE
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+# (subreddit_id, amount_cents, customer_email)
+_Contribution = Tuple[int, int, Optional[str]]
+
+_CONTRIBUTION_ATTRS = ("status", "subreddit_id", "amount_cents", "customer_email")
+
+
+def _noop_set(target, value, oldvalue, initiator):
+    return value
+
+
+# Make the ORM load the previous value on assignment, so history has it even
+# when the attribute was expired by an earlier commit
+for _attr in _CONTRIBUTION_ATTRS:
+    event.listen(
+        getattr(Donation, _attr),
+        "set",
+        _noop_set,
+        active_history=True,
+        retval=True,
+    )
+
+
+def _cents(donation: Donation, amount_cents: Optional[int]) -> int:
+    if amount_cents is not None:
+        return int(amount_cents)
+    return int(round((donation.amount_usd or 0) * 100))
+
+
+def _contribution(donation: Donation, before: bool) -> Optional[_Contribution]:
+    """What a donation adds to the rollup before or after the pending flush."""
+    state = inspect(donation)
+    values = {}
+    for attr in _CONTRIBUTION_ATTRS:
+        history = state.attrs[attr].history
+        if before and history.deleted:
+            values[attr] = history.deleted[0]
+        elif before and history.added and not history.unchanged:
+            # Set for the first time in this transaction; no prior value
+            values[attr] = None
+        else:
+            values[attr] = getattr(donation, attr)
+
+    if values["status"] != SUCCEEDED or values["subreddit_id"] is None:
+        return None
+    return (
+        values["subreddit_id"],
+        _cents(donation, values["amount_cents"]),
+        values["customer_email"] or None,
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_donation_total_changes(session, flush_context, instances):
+    changes = []
+    for donation in session.new:
+        if isinstance(donation, Donation):
+            new = _contribution(donation, before=False)
+            if new:
+                changes.append((None, new, donation))
+    for donation in session.dirty:
+        if isinstance(donation, Donation) and session.is_modified(donation):
+            old = _contribution(donation, before=True)
+            new = _contribution(donation, before=False)
+            if old != new:
+                changes.append((old, new, donation))
+    for donation in session.deleted:
+        if isinstance(donation, Donation):
+            old = _contribution(donation, before=True)
+            if old:
+                changes.append((old, None, donation))
+    session.info["donation_total_changes"] = changes
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_donation_total_changes(session, flush_context):
+    changes = session.info.pop("donation_total_changes", None)
+    if not changes:
+        return
+
+    totals: Dict[int, list] = defaultdict(lambda: [0, 0, 0])
+    added: Dict[Tuple[int, str], Set[int]] = defaultdict(set)
+    removed: Set[Tuple[int, str]] = set()
+
+    for old, new, donation in changes:
+        if old:
+            subreddit_id, cents, email = old
+            totals[subreddit_id][0] -= cents
+            totals[subreddit_id][1] -= 1
+            if email:
+                removed.add((subreddit_id, email))
+        if new:
+            subreddit_id, cents, email = new
+            totals[subreddit_id][0] += cents
+            totals[subreddit_id][1] += 1
+            if email:
+                added[(subreddit_id, email)].add(donation.id)
+
+    connection = session.connection()
+
+    # A donor counts once per subreddit: compare whether the email had any
+    # succeeded donation there before this flush with whether it has one now
+    for key in set(added) | removed:
+        subreddit_id, email = key
+        succeeded_now = set(
+            connection.execute(
+                select(Donation.id).where(
+                    Donation.subreddit_id == subreddit_id,
+                    Donation.customer_email == email,
+                    Donation.status == SUCCEEDED,
+                )
+            ).scalars()
+        )
+        existed_before = key in removed or bool(succeeded_now - added.get(key, set()))
+        totals[subreddit_id][2] += int(bool(succeeded_now)) - int(existed_before)
+
+    table = SubredditDonationTotal.__table__
+    now = datetime.now(timezone.utc)
+    for subreddit_id, (cents, count, donors) in totals.items():
+        if not (cents or count or donors):
+            continue
+        upsert = _UPSERT_INSERTS[connection.dialect.name](table).values(
+            subreddit_id=subreddit_id,
+            total_cents=cents,
+            donation_count=count,
+            donor_count=donors,
+            updated_at=now,
+        )
+        # One statement, so two first donations to a subreddit flushed
+        # concurrently both land instead of racing on the INSERT
+        connection.execute(
+            upsert.on_conflict_do_update(
+                index_elements=[table.c.subreddit_id],
+                set_={
+                    "total_cents": table.c.total_cents + upsert.excluded.total_cents,
+                    "donation_count": table.c.donation_count
+                    + upsert.excluded.donation_count,
+                    "donor_count": table.c.donor_count + upsert.excluded.donor_count,
+                    "updated_at": upsert.excluded.updated_at,
+                },
+            )
+        )
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_donation_total_changes(session):
+    session.info.pop("donation_total_changes", None)
+
+
+def rebuild_donation_totals(session: Session) -> int:
+    """
+    Recompute subreddit_donation_totals from the donations table.
+
+    Args:
+        session: SQLAlchemy database session
+
+    Returns:
+        int: Number of subreddits with succeeded donations
+    """
+    rows = session.execute(
+        select(
+            Donation.subreddit_id,
+            func.coalesce(func.sum(Donation.amount_cents), 0),
+            func.count(Donation.id),
+            func.count(distinct(func.nullif(Donation.customer_email, ""))),
+        )
+        .where(Donation.status == SUCCEEDED, Donation.subreddit_id.isnot(None))
+        .group_by(Donation.subreddit_id)
+    ).all()
+
+    now = datetime.now(timezone.utc)
+    session.query(SubredditDonationTotal).delete(synchronize_session=False)
+    session.add_all(
+        SubredditDonationTotal(
+            subreddit_id=subreddit_id,
+            total_cents=int(total_cents),
+            donation_count=donation_count,
+            donor_count=donor_count,
+            updated_at=now,
+        )
+        for subreddit_id, total_cents, donation_count, donor_count in rows
+    )
+    session.commit()
+    logger.info(f"Rebuilt donation totals for {len(rows)} subreddits")
+    return len(rows)
@@ -1,17 +1,26 @@
 import enum
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from urllib.parse import urlparse
 
 from sqlalchemy import (
     JSON,
+    BigInteger,
     Boolean,
     Column,
     DateTime,
     Enum,
+    Float,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Text,
+    event,
+    func,
+    inspect,
+    or_,
 )
 from sqlalchemy.orm import backref, declarative_base, relationship
 
@@ -223,6 +232,28 @@ class SubredditFundraisingGoal(Base):
     donations = relationship("Donation", back_populates="subreddit_fundraising_goal")
 
 
+class SubredditDonationTotal(Base):
+    """Rollup of succeeded donations per subreddit, kept in step on every flush"""
+
+    __tablename__ = "subreddit_donation_totals"
+    subreddit_id = Column(
+        Integer, ForeignKey("subreddits.id", ondelete="CASCADE"), primary_key=True
+    )
+    total_cents = Column(BigInteger, default=0, nullable=False)
+    donation_count = Column(Integer, default=0, nullable=False)
+    donor_count = Column(Integer, default=0, nullable=False)  # Distinct emails
+    updated_at = Column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+
+    subreddit = relationship("Subreddit")
+
+
+DEFAULT_TASK_TIMEOUT_SECONDS = 300
+
+
 class PipelineTask(Base):
     """Task queue for pipeline execution"""
 
@@ -260,13 +291,52 @@ class PipelineTask(Base):
     retry_count = Column(Integer, default=0, nullable=False)  # Number of retry attempts
     max_retries = Column(Integer, default=2, nullable=False)  # Maximum retry attempts
     timeout_seconds = Column(
-        Integer, default=300, nullable=False
+        Integer, default=DEFAULT_TASK_TIMEOUT_SECONDS, nullable=False
     )  # Task timeout in seconds (5 minutes)
+    deadline_at = Column(
+        DateTime, nullable=True
+    )  # last_heartbeat (or started_at) + timeout_seconds; maintained by listeners below
 
     subreddit = relationship("Subreddit", back_populates="pipeline_tasks")
     donation = relationship("Donation", backref="tasks")
     pipeline_run = relationship("PipelineRun", backref="tasks")
 
+    __table_args__ = (
+        # Stuck-task detection is a range scan over expired in-progress deadlines
+        Index("ix_pipeline_tasks_status_deadline", "status", "deadline_at"),
+        # Queue claims scan pending tasks in priority, then age, order
+        Index(
+            "ix_pipeline_tasks_status_priority_created",
+            "status",
+            "priority",
+            "created_at",
+        ),
+    )
+
+
+def _task_deadline(task: PipelineTask, anchor: datetime) -> datetime:
+    timeout = task.timeout_seconds or DEFAULT_TASK_TIMEOUT_SECONDS
+    return anchor + timedelta(seconds=timeout)
+
+
+@event.listens_for(PipelineTask.last_heartbeat, "set")
+def _heartbeat_sets_deadline(target, value, oldvalue, initiator):
+    """Keep deadline_at one timeout ahead of the latest heartbeat."""
+    if value is not None:
+        target.deadline_at = _task_deadline(target, value)
+    elif target.started_at is not None:
+        target.deadline_at = _task_deadline(target, target.started_at)
+    else:
+        target.deadline_at = None
+
+
+@event.listens_for(PipelineTask.started_at, "set")
+def _start_sets_deadline(target, value, oldvalue, initiator):
+    """Give a started task a deadline before its first heartbeat."""
+    if target.last_heartbeat is not None:
+        return
+    target.deadline_at = _task_deadline(target, value) if value is not None else None
+
 
 class RedditPost(Base):
     __tablename__ = "reddit_posts"
@@ -321,6 +391,9 @@ class ProductInfo(Base):
     theme = Column(String(512), index=True)
     image_title = Column(String(256), nullable=True, index=True)
     image_url = Column(Text, nullable=True)  # URL to the product image
+    image_name = Column(
+        String(255), nullable=True
+    )  # File name from image_url; QR redirects look products up by it
     product_url = Column(Text)
     affiliate_link = Column(Text)
     template_id = Column(String(64), index=True)
@@ -348,6 +421,50 @@ class ProductInfo(Base):
         cascade="all, delete-orphan",
     )
 
+    __table_args__ = (
+        # Pattern opclass so Postgres also serves the "<name>.%" prefix LIKE
+        # in product_image_name_filter from the index, not just equality
+        Index(
+            "ix_product_infos_image_name",
+            "image_name",
+            postgresql_ops={"image_name": "varchar_pattern_ops"},
+        ),
+    )
+
+
+def image_name_from_url(image_url: Optional[str]) -> Optional[str]:
+    """Extract the image file name (last path segment) from an image URL."""
+    if not image_url:
+        return None
+    path = urlparse(image_url).path or image_url
+    return path.rstrip("/").rsplit("/", 1)[-1][:255] or None
+
+
+@event.listens_for(ProductInfo, "before_insert")
+@event.listens_for(ProductInfo, "before_update")
+def _product_sets_image_name(mapper, connection, target):
+    """Keep image_name in step with image_url at save time."""
+    state = inspect(target)
+    if state.has_identity and not state.attrs.image_url.history.has_changes():
+        return
+    target.image_name = image_name_from_url(target.image_url)
+
+
+def product_image_name_filter(image_name: str):
+    """
+    Filter matching products by the image name in a QR redirect URL.
+
+    Several products may share an image; callers order by id so the first
+    one wins. A name without an extension also matches "<name>.<ext>".
+    """
+    if "." in image_name:
+        return ProductInfo.image_name == image_name
+    escaped = image_name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return or_(
+        ProductInfo.image_name == image_name,
+        ProductInfo.image_name.like(f"{escaped}.%", escape="\\"),
+    )
+
 
 class ErrorLog(Base):
     __tablename__ = "error_logs"
@@ -594,3 +711,141 @@ class ProductRedditComment(Base):
 
     # Relationship to product
     product_info = relationship("ProductInfo", back_populates="reddit_comments")
+
+
+class GalleryProduct(Base):
+    """Denormalized gallery read model - one precomputed row per completed product"""
+
+    __tablename__ = "gallery_products"
+    id = Column(Integer, primary_key=True)
+    pipeline_run_id = Column(
+        Integer,
+        ForeignKey("pipeline_runs.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+        index=True,
+    )
+    product_info_id = Column(
+        Integer,
+        ForeignKey("product_infos.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    donation_id = Column(
+        Integer, ForeignKey("donations.id"), nullable=True, index=True
+    )  # Commission donation shown on the card, if any
+    end_time = Column(
+        DateTime, nullable=False, index=True
+    )  # PipelineRun end_time, else start_time, else refresh time; keyset sort key
+    payload = Column(JSON, nullable=False)  # Serialized GeneratedProductSchema
+    updated_at = Column(
+        DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        index=True,
+    )
+
+    # Keyset pagination index for the gallery API (newest first)
+    __table_args__ = (
+        Index("ix_gallery_products_end_time_run", "end_time", "pipeline_run_id"),
+    )
+
+
+class WebhookEvent(Base):
+    """Durable inbox of received Stripe webhook events, processed in the background"""
+
+    __tablename__ = "webhook_events"
+    id = Column(Integer, primary_key=True)
+    stripe_event_id = Column(
+        String(255), unique=True, nullable=False
+    )  # Stripe's event id; the unique constraint dedupes redeliveries
+    event_type = Column(String(100), nullable=False, index=True)
+    payment_intent_id = Column(
+        String(255), nullable=True, index=True
+    )  # Events for the same payment intent are processed in order
+    payload = Column(JSON, nullable=False)  # Verified event body
+    status = Column(
+        String(32), default="pending", nullable=False
+    )  # pending, processing, processed, ignored, failed
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(
+        DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
+    )  # Retry time when pending; lease expiry when processing
+    last_error = Column(Text, nullable=True)
+    stripe_created = Column(
+        BigInteger, nullable=True
+    )  # Event creation time (unix seconds), the ordering key
+    received_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    processed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # The consumer scans due pending/processing events
+        Index("ix_webhook_events_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+
+class CandidatePost(Base):
+    """Reddit posts pre-screened by the candidate harvester, ranked for commissions"""
+
+    __tablename__ = "candidate_posts"
+    id = Column(Integer, primary_key=True)
+    post_id = Column(String(32), nullable=False, unique=True)  # Reddit's post ID
+    subreddit = Column(String(100), nullable=False)  # Subreddit the post lives in
+    title = Column(Text, nullable=False)
+    content = Column(Text, nullable=True)  # Selftext
+    permalink = Column(Text, nullable=True)
+    url = Column(Text, nullable=True)
+    score = Column(Integer, nullable=False, default=0)
+    num_comments = Column(Integer, nullable=False, default=0)
+    posted_at = Column(DateTime, nullable=False)  # Reddit's created_utc
+    rank_score = Column(
+        Float, nullable=False, default=0.0
+    )  # Engagement decayed by age; higher is better
+    harvested_at = Column(
+        DateTime, default=lambda: datetime.now(timezone.utc), nullable=False
+    )  # Last time a listing returned this post
+    claimed_at = Column(
+        DateTime, nullable=True
+    )  # Start of a validation's lease; expires after CANDIDATE_CLAIM_TTL
+
+    __table_args__ = (
+        # Commission validation takes the best unclaimed candidate, overall or
+        # within one subreddit
+        Index("ix_candidate_posts_claimed_rank", "claimed_at", "rank_score"),
+    )
+
+
+# Subreddit names are matched case-insensitively
+Index(
+    "ix_candidate_posts_subreddit_claimed_rank",
+    func.lower(CandidatePost.subreddit),
+    CandidatePost.claimed_at,
+    CandidatePost.rank_score,
+)
+
+
+class OpenAIUsageRollup(Base):
+    """OpenAI API usage per model and operation over one tracker flush interval"""
+
+    __tablename__ = "openai_usage_rollups"
+    id = Column(Integer, primary_key=True)
+    window_start = Column(DateTime, nullable=False)
+    window_end = Column(DateTime, nullable=False)
+    model = Column(String(64), nullable=False)
+    operation = Column(String(32), nullable=False)  # chat, image, ...
+    tier = Column(
+        String(32), nullable=False, default="", server_default=""
+    )  # Image quality/size, e.g. "hd/1024x1792"; empty for chat
+    calls = Column(Integer, nullable=False, default=0)
+    failed_calls = Column(Integer, nullable=False, default=0)
+    tokens_used = Column(BigInteger, nullable=False, default=0)  # Successful calls only
+    cost_usd = Column(Float, nullable=False, default=0.0)
+    total_response_time_ms = Column(Float, nullable=False, default=0.0)
+    max_response_time_ms = Column(Float, nullable=False, default=0.0)
+    latency_histogram = Column(
+        JSON, nullable=True
+    )  # Bucket counts for LATENCY_BUCKETS_MS, plus one open-ended bucket
+
+    __table_args__ = (
+        Index("ix_openai_usage_rollups_model_window", "model", "window_start"),
+    )
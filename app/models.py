@@ -226,6 +226,13 @@ class GeneratedProductSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class GeneratedProductPageSchema(BaseModel):
+    """One keyset page of gallery products, optionally field-projected."""
+
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+
+
 # SQLAlchemy Enums
 class RedditPostStatus(Enum):
     PENDING = "PENDING"
@@ -0,0 +1,286 @@
+"""
+Shared Redis publisher for task progress and general updates.
+
+Every producer (CommissionWorker, TaskManager, RedisService) publishes through
+the single ``redis_publisher`` instance instead of opening its own client.
+
+Messages are buffered and flushed by one background thread over a pooled
+connection, pipelining bursts of progress events into a single round trip.
+The sync face (``publish``) only enqueues, so it never blocks the caller on
+network I/O; the async face (``publish_async``) awaits delivery of the batch
+without blocking the event loop.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import redis
+
+from app.config import (
+    REDIS_DB,
+    REDIS_HOST,
+    REDIS_PASSWORD,
+    REDIS_PORT,
+    REDIS_SSL,
+    WEBSOCKET_GENERAL_UPDATES_CHANNEL,
+    WEBSOCKET_TASK_UPDATES_CHANNEL,
+)
+from app.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# (channel, serialized message, enqueue time, delivery future)
+_PendingMessage = Tuple[str, str, float, Optional[Future]]
+
+
+def task_update_channel(task_id: Any) -> str:
+    """
+    Get the Redis channel carrying updates for a single task.
+
+    Replicas subscribe to a task's channel only while one of their local
+    WebSocket clients is watching that task.
+    """
+    return f"{WEBSOCKET_TASK_UPDATES_CHANNEL}:{task_id}"
+
+
+class RedisPublisher:
+    """
+    Batched, pooled Redis publisher with sync and async faces.
+
+    Args:
+        flush_interval: Seconds to wait for more messages before flushing a batch
+        max_batch_size: Maximum number of messages sent in one pipeline
+        max_buffer_size: Messages kept while Redis is unavailable; oldest are dropped
+        max_connections: Size of the shared connection pool
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 0.02,
+        max_batch_size: int = 100,
+        max_buffer_size: int = 10000,
+        max_connections: int = 4,
+    ):
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self.max_buffer_size = max_buffer_size
+        self.max_connections = max_connections
+
+        self._client: Optional[redis.Redis] = None
+        self._buffer: Deque[_PendingMessage] = deque()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._in_flight = 0
+
+        # Counters exposed through stats()
+        self._published = 0
+        self._failed = 0
+        self._dropped = 0
+        self._batches = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._last_error: Optional[str] = None
+
+    def _get_client(self) -> redis.Redis:
+        if self._client is None:
+            pool = redis.ConnectionPool(
+                host=REDIS_HOST,
+                port=REDIS_PORT,
+                db=REDIS_DB,
+                password=REDIS_PASSWORD,
+                connection_class=(
+                    redis.SSLConnection if REDIS_SSL else redis.Connection
+                ),
+                decode_responses=True,
+                max_connections=self.max_connections,
+                health_check_interval=30,
+                socket_timeout=5,
+                socket_connect_timeout=5,
+            )
+            self._client = redis.Redis(connection_pool=pool)
+        return self._client
+
+    def _ensure_flusher(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._flush_loop, name="redis-publisher", daemon=True
+        )
+        self._thread.start()
+
+    def _enqueue(
+        self, channel: str, message: Dict[str, Any], future: Optional[Future] = None
+    ) -> None:
+        payload = json.dumps(message)
+        with self._condition:
+            self._ensure_flusher()
+            if len(self._buffer) >= self.max_buffer_size:
+                _, _, _, dropped_future = self._buffer.popleft()
+                self._dropped += 1
+                if dropped_future is not None and not dropped_future.done():
+                    dropped_future.set_result(False)
+            self._buffer.append((channel, payload, time.perf_counter(), future))
+            self._condition.notify()
+
+    def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        """Queue a message for publishing without waiting for delivery."""
+        self._enqueue(channel, message)
+
+    async def publish_async(self, channel: str, message: Dict[str, Any]) -> bool:
+        """
+        Queue a message and wait until its batch has been sent.
+
+        Returns:
+            True if Redis accepted the message, False otherwise
+        """
+        future: Future = Future()
+        self._enqueue(channel, message, future)
+        return await asyncio.wrap_future(future)
+
+    def publish_task_update(self, task_id: Any, update: Dict[str, Any]) -> None:
+        """Queue a task update on the task's own channel."""
+        self.publish(task_update_channel(task_id), self._task_message(task_id, update))
+
+    async def publish_task_update_async(
+        self, task_id: Any, update: Dict[str, Any]
+    ) -> bool:
+        """Publish a task update and wait for delivery."""
+        return await self.publish_async(
+            task_update_channel(task_id), self._task_message(task_id, update)
+        )
+
+    def publish_general_update(self, update: Dict[str, Any]) -> None:
+        """Queue an update on the general updates channel."""
+        self.publish(WEBSOCKET_GENERAL_UPDATES_CHANNEL, self._general_message(update))
+
+    async def publish_general_update_async(self, update: Dict[str, Any]) -> bool:
+        """Publish a general update and wait for delivery."""
+        return await self.publish_async(
+            WEBSOCKET_GENERAL_UPDATES_CHANNEL, self._general_message(update)
+        )
+
+    @staticmethod
+    def _task_message(task_id: Any, update: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "type": "task_update",
+            "task_id": str(task_id),
+            "data": update,
+            "timestamp": time.time(),
+        }
+
+    @staticmethod
+    def _general_message(update: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "type": "general_update",
+            "data": update,
+            "timestamp": time.time(),
+        }
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._buffer and not self._closed:
+                    self._condition.wait()
+                if not self._buffer and self._closed:
+                    return
+            # Give a burst of progress events a moment to accumulate
+            if self.flush_interval and not self._closed:
+                time.sleep(self.flush_interval)
+            with self._condition:
+                batch = [
+                    self._buffer.popleft()
+                    for _ in range(min(self.max_batch_size, len(self._buffer)))
+                ]
+                self._in_flight = len(batch)
+            self._send_batch(batch)
+            with self._condition:
+                self._in_flight = 0
+                self._condition.notify_all()
+
+    def _send_batch(self, batch: List[_PendingMessage]) -> None:
+        if not batch:
+            return
+        ok = False
+        try:
+            pipe = self._get_client().pipeline(transaction=False)
+            for channel, payload, _, _ in batch:
+                pipe.publish(channel, payload)
+            pipe.execute()
+            ok = True
+        except Exception as e:
+            self._last_error = str(e)
+            logger.error(f"Failed to publish {len(batch)} Redis messages: {e}")
+
+        now = time.perf_counter()
+        with self._condition:
+            self._batches += 1
+            if ok:
+                self._published += len(batch)
+                for _, _, enqueued_at, _ in batch:
+                    latency = now - enqueued_at
+                    self._latency_total += latency
+                    self._latency_max = max(self._latency_max, latency)
+            else:
+                self._failed += len(batch)
+        for _, _, _, future in batch:
+            if future is not None and not future.done():
+                future.set_result(ok)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Block until every queued message has been sent (or failed).
+
+        Returns:
+            True if the buffer drained within the timeout
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._buffer or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush pending messages, stop the flusher and release the pool."""
+        self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._client is not None:
+            self._client.close()
+            self._client.connection_pool.disconnect()
+            self._client = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return publish counters and latency figures (milliseconds)."""
+        with self._condition:
+            return {
+                "published": self._published,
+                "failed": self._failed,
+                "dropped": self._dropped,
+                "batches": self._batches,
+                "pending": len(self._buffer),
+                "avg_latency_ms": (
+                    round(self._latency_total / self._published * 1000, 2)
+                    if self._published
+                    else 0.0
+                ),
+                "max_latency_ms": round(self._latency_max * 1000, 2),
+                "last_error": self._last_error,
+            }
+
+
+# Global publisher instance shared by all producers
+redis_publisher = RedisPublisher()
@@ -8,24 +8,31 @@ for real-time task updates across multiple services.
 import asyncio
 import json
 import logging
-import time
 from typing import Any, Callable, Dict, Optional
 
 import redis.asyncio as redis
 
-from app.config import (
-    REDIS_DB,
-    REDIS_HOST,
-    REDIS_PASSWORD,
-    REDIS_PORT,
-    REDIS_SSL,
-    WEBSOCKET_GENERAL_UPDATES_CHANNEL,
-    WEBSOCKET_TASK_UPDATES_CHANNEL,
-)
+from app.config import REDIS_DB, REDIS_HOST, REDIS_PASSWORD, REDIS_PORT, REDIS_SSL
+from app.redis_publisher import redis_publisher
 from app.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Delete the lock only if the caller still holds it, then wake one waiter
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    redis.call('del', KEYS[1])
+    redis.call('del', KEYS[2])
+    redis.call('rpush', KEYS[2], '1')
+    redis.call('pexpire', KEYS[2], ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# A release signal nobody consumed is dropped after this long
+LOCK_RELEASE_SIGNAL_TTL_MS = 60000
+
 
 class RedisService:
     """
@@ -67,6 +74,13 @@ class RedisService:
 
         except Exception as e:
             logger.error(f"Failed to connect to Redis: {e}")
+            # Leave the service disconnected so callers see Redis as unavailable
+            if self.redis_client is not None:
+                try:
+                    await self.redis_client.close()
+                except Exception:
+                    pass
+                self.redis_client = None
             raise
 
     async def disconnect(self) -> None:
@@ -84,52 +98,50 @@ class RedisService:
 
     async def publish_task_update(self, task_id: str, update: Dict[str, Any]) -> None:
         """Publish a task update to the task updates channel."""
-        if not self.redis_client:
-            logger.warning("Redis client not connected, cannot publish task update")
-            return
-
-        try:
-            message = {
-                "type": "task_update",
-                "task_id": task_id,
-                "data": update,
-                "timestamp": time.time(),
-            }
-
-            await self.redis_client.publish(
-                WEBSOCKET_TASK_UPDATES_CHANNEL, json.dumps(message)
-            )
+        if await redis_publisher.publish_task_update_async(task_id, update):
             logger.info(f"Published task update for {task_id} to Redis")
-
-        except Exception as e:
-            logger.error(f"Failed to publish task update: {e}")
+        else:
+            logger.error(f"Failed to publish task update for {task_id}")
 
     async def publish_general_update(self, update: Dict[str, Any]) -> None:
         """Publish a general update to the general updates channel."""
-        if not self.redis_client:
-            logger.warning("Redis client not connected, cannot publish general update")
-            return
-
-        try:
-            message = {
-                "type": "general_update",
-                "data": update,
-                "timestamp": time.time(),
-            }
-
-            await self.redis_client.publish(
-                WEBSOCKET_GENERAL_UPDATES_CHANNEL, json.dumps(message)
-            )
+        if await redis_publisher.publish_general_update_async(update):
             logger.info("Published general update to Redis")
-
-        except Exception as e:
-            logger.error(f"Failed to publish general update: {e}")
+        else:
+            logger.error("Failed to publish general update")
 
     def subscribe_to_channel(self, channel: str, callback: Callable) -> None:
         """Subscribe to a Redis channel with a callback function."""
         self._subscribers[channel] = callback
         logger.info(f"Subscribed to Redis channel: {channel}")
 
+    async def subscribe(self, channel: str, callback: Callable) -> None:
+        """
+        Subscribe to a channel, including while the listener is running.
+
+        Used for short-lived per-task channels; if the listener has not
+        started yet the channel is picked up when it does.
+        """
+        already_subscribed = channel in self._subscribers
+        self._subscribers[channel] = callback
+        if self.pubsub and not already_subscribed:
+            try:
+                await self.pubsub.subscribe(channel)
+            except Exception as e:
+                logger.error(f"Failed to subscribe to Redis channel {channel}: {e}")
+        logger.debug(f"Subscribed to Redis channel: {channel}")
+
+    async def unsubscribe(self, channel: str) -> None:
+        """Unsubscribe from a channel and drop its callback."""
+        if self._subscribers.pop(channel, None) is None:
+            return
+        if self.pubsub:
+            try:
+                await self.pubsub.unsubscribe(channel)
+            except Exception as e:
+                logger.error(f"Failed to unsubscribe from Redis channel {channel}: {e}")
+        logger.debug(f"Unsubscribed from Redis channel: {channel}")
+
     async def start_listening(self) -> None:
         """Start listening for messages on subscribed channels."""
         if not self.redis_client:
@@ -144,7 +156,7 @@ class RedisService:
             self.pubsub = self.redis_client.pubsub()
 
             # Subscribe to all channels
-            for channel in self._subscribers.keys():
+            for channel in list(self._subscribers.keys()):
                 await self.pubsub.subscribe(channel)
                 logger.info(f"Subscribed to Redis channel: {channel}")
 
@@ -155,36 +167,31 @@ class RedisService:
                 if not self._running:
                     break
 
-                logger.debug(f"Redis received message: {message}")
-
-                if message["type"] == "message":
-                    channel = message["channel"]
-                    data = message["data"]
-
-                    logger.info(
-                        f"Processing Redis message on channel {channel}: {data}"
-                    )
-
-                    if channel in self._subscribers:
-                        try:
-                            # Parse the JSON message
-                            parsed_data = json.loads(data)
-                            logger.debug(f"Parsed Redis message: {parsed_data}")
-                            callback = self._subscribers[channel]
-                            if asyncio.iscoroutinefunction(callback):
-                                await callback(parsed_data)
-                            else:
-                                callback(parsed_data)
-                        except json.JSONDecodeError as e:
-                            logger.error(f"Failed to parse Redis message: {e}")
-                            logger.error(f"Raw message data: {data}")
-                        except Exception as e:
-                            logger.error(f"Error in subscriber callback: {e}")
-                            logger.error(
-                                f"Parsed data that caused error: {parsed_data}"
-                            )
+                if message["type"] != "message":
+                    continue
+
+                channel = message["channel"]
+                callback = self._subscribers.get(channel)
+                if callback is None:
+                    # Late message for a channel we just unsubscribed from
+                    logger.debug(f"No subscriber found for channel: {channel}")
+                    continue
+
+                data = message["data"]
+                parsed_data = None
+                try:
+                    # Parse the JSON message
+                    parsed_data = json.loads(data)
+                    if asyncio.iscoroutinefunction(callback):
+                        await callback(parsed_data)
                     else:
-                        logger.warning(f"No subscriber found for channel: {channel}")
+                        callback(parsed_data)
+                except json.JSONDecodeError as e:
+                    logger.error(f"Failed to parse Redis message on {channel}: {e}")
+                    logger.debug(f"Raw message data: {data}")
+                except Exception as e:
+                    logger.error(f"Error in subscriber callback for {channel}: {e}")
+                    logger.debug(f"Parsed data that caused error: {parsed_data}")
 
         except Exception as e:
             logger.error(f"Error in Redis listener: {e}")
@@ -210,25 +217,36 @@ class RedisService:
             logger.error(f"Redis health check failed: {e}")
             return False
 
-    async def acquire_lock(self, lock_key: str, timeout_seconds: int) -> bool:
+    async def acquire_lock(
+        self,
+        lock_key: str,
+        timeout_seconds: int,
+        token: str = "locked",
+        raise_errors: bool = False,
+    ) -> bool:
         """
         Acquire a distributed lock with expiration.
 
         Args:
             lock_key: The key for the lock
             timeout_seconds: How long the lock should be held (in seconds)
+            token: Value identifying the holder, checked by release_lock
+            raise_errors: Raise when Redis is unavailable instead of returning
+                False, so callers can tell an outage from a held lock
 
         Returns:
             True if lock was acquired, False otherwise
         """
         if not self.redis_client:
+            if raise_errors:
+                raise ConnectionError("Redis client not connected")
             logger.error("Redis client not connected, cannot acquire lock")
             return False
 
         try:
             # Use SET with NX (only set if not exists) and EX (expiration)
             result = await self.redis_client.set(
-                lock_key, "locked", nx=True, ex=timeout_seconds
+                lock_key, token, nx=True, ex=timeout_seconds
             )
             if result:
                 logger.info(f"Acquired lock: {lock_key}")
@@ -237,15 +255,22 @@ class RedisService:
                 logger.debug(f"Failed to acquire lock: {lock_key} (already held)")
                 return False
         except Exception as e:
+            if raise_errors:
+                raise
             logger.error(f"Error acquiring lock {lock_key}: {e}")
             return False
 
-    async def release_lock(self, lock_key: str) -> bool:
+    async def release_lock(self, lock_key: str, token: Optional[str] = None) -> bool:
         """
         Release a distributed lock.
 
+        With a token the key is only deleted if it still holds that token, so
+        a holder whose lock expired cannot release its successor's lock, and
+        one waiter blocked in wait_for_lock_release is woken.
+
         Args:
             lock_key: The key for the lock to release
+            token: Holder token passed to acquire_lock, if any
 
         Returns:
             True if lock was released, False otherwise
@@ -255,7 +280,17 @@ class RedisService:
             return False
 
         try:
-            result = await self.redis_client.delete(lock_key)
+            if token is None:
+                result = await self.redis_client.delete(lock_key)
+            else:
+                result = await self.redis_client.eval(
+                    RELEASE_LOCK_SCRIPT,
+                    2,
+                    lock_key,
+                    f"{lock_key}:released",
+                    token,
+                    LOCK_RELEASE_SIGNAL_TTL_MS,
+                )
             if result:
                 logger.info(f"Released lock: {lock_key}")
                 return True
@@ -266,6 +301,44 @@ class RedisService:
             logger.error(f"Error releasing lock {lock_key}: {e}")
             return False
 
+    async def wait_for_lock_release(self, lock_key: str, timeout: float) -> bool:
+        """
+        Block (without blocking the event loop) until a lock is released.
+
+        Args:
+            lock_key: The key for the lock
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if a release was signalled, False on timeout or error. On error
+            the full timeout is still waited out, so callers retrying in a loop
+            back off instead of spinning.
+        """
+        if not self.redis_client:
+            await asyncio.sleep(timeout)
+            return False
+
+        try:
+            return bool(
+                await self.redis_client.blpop(f"{lock_key}:released", timeout=timeout)
+            )
+        except Exception as e:
+            logger.error(f"Error waiting for lock {lock_key}: {e}")
+            await asyncio.sleep(timeout)
+            return False
+
+    async def next_fencing_token(self, lock_key: str) -> int:
+        """
+        Issue the next fencing token for a lock.
+
+        Args:
+            lock_key: The key for the lock
+
+        Returns:
+            A number that increases with every acquisition of the lock
+        """
+        return int(await self.redis_client.incr(f"{lock_key}:fence"))
+
 
 # Global Redis service instance
 redis_service = RedisService()
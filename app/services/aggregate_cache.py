@@ -0,0 +1,213 @@
+"""
+Versioned cache for donation and fundraising aggregates.
+
+The donation summary, leaderboard and fundraising endpoints are derived from
+every succeeded Donation. Rather than recomputing them on each request, their
+JSON-ready results are cached under a single version number. Any commit that
+touches a Donation or SubredditFundraisingGoal bumps the version, which
+invalidates every aggregate at once and gives clients a real ETag.
+
+Entries live in process; with AGGREGATE_CACHE_BACKEND=redis the version and
+values are also shared through Redis so every API replica (and the commission
+workers that update donations) agree on what is current.
+"""
+
+import json
+import threading
+import time
+from itertools import chain
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import redis
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import (
+    AGGREGATE_CACHE_BACKEND,
+    AGGREGATE_CACHE_TTL,
+    REDIS_DB,
+    REDIS_HOST,
+    REDIS_PASSWORD,
+    REDIS_PORT,
+    REDIS_SSL,
+)
+from app.db.models import Donation, SubredditFundraisingGoal
+from app.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Models whose changes affect the cached aggregates
+AGGREGATE_SOURCE_MODELS = (Donation, SubredditFundraisingGoal)
+
+
+class AggregateCache:
+    """
+    Version-invalidated cache of JSON-serializable aggregate results.
+
+    Args:
+        backend: "memory" for a per-process cache, "redis" to share it
+        ttl: Seconds an entry may be served, as a bound on staleness from
+            writers that bypass the ORM
+        namespace: Redis key prefix
+    """
+
+    def __init__(
+        self,
+        backend: str = AGGREGATE_CACHE_BACKEND,
+        ttl: int = AGGREGATE_CACHE_TTL,
+        namespace: str = "aggregates",
+    ):
+        self.ttl = ttl
+        self.namespace = namespace
+        self._use_redis = backend == "redis"
+        self._redis: Optional[redis.Redis] = None
+        self._lock = threading.Lock()
+        # Distinguishes in-process versions across restarts so ETags never repeat
+        self._epoch = format(int(time.time()), "x")
+        self._local_version = 0
+        self._entries: Dict[str, Tuple[str, float, Any]] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def _version_key(self) -> str:
+        return f"{self.namespace}:version"
+
+    def _value_key(self, name: str, version: str) -> str:
+        return f"{self.namespace}:{name}:{version}"
+
+    def _get_redis(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.Redis(
+                host=REDIS_HOST,
+                port=REDIS_PORT,
+                db=REDIS_DB,
+                password=REDIS_PASSWORD,
+                ssl=REDIS_SSL,
+                decode_responses=True,
+                socket_timeout=2,
+                socket_connect_timeout=2,
+            )
+        return self._redis
+
+    def version(self) -> str:
+        """Get the current aggregate version."""
+        if self._use_redis:
+            try:
+                return f"r{int(self._get_redis().get(self._version_key) or 0)}"
+            except Exception as e:
+                logger.warning(f"Aggregate cache falling back to local version: {e}")
+        with self._lock:
+            return f"{self._epoch}.{self._local_version}"
+
+    def etag(self, name: str, version: str) -> str:
+        """Build the ETag header value for an aggregate at a version."""
+        return f'"{name}-{version}"'
+
+    def get_or_compute(self, name: str, compute: Callable[[], Any]) -> Tuple[Any, str]:
+        """
+        Return a cached aggregate, computing and storing it on a miss.
+
+        The version is read before computing, so a write that lands during the
+        computation leaves the new entry already stale rather than serving it
+        under the newer version.
+
+        Args:
+            name: Aggregate name
+            compute: Builds the JSON-serializable value
+
+        Returns:
+            Tuple of (value, ETag)
+        """
+        version = self.version()
+        etag = self.etag(name, version)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry and entry[0] == version and entry[1] > now:
+                self.hits += 1
+                return entry[2], etag
+
+        value = None
+        if self._use_redis:
+            try:
+                raw = self._get_redis().get(self._value_key(name, version))
+                if raw is not None:
+                    value = json.loads(raw)
+            except Exception as e:
+                logger.warning(f"Aggregate cache Redis read failed for {name}: {e}")
+
+        if value is None:
+            self.misses += 1
+            value = compute()
+            if self._use_redis:
+                try:
+                    self._get_redis().set(
+                        self._value_key(name, version),
+                        json.dumps(value),
+                        ex=self.ttl,
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"Aggregate cache Redis write failed for {name}: {e}"
+                    )
+        else:
+            self.hits += 1
+
+        with self._lock:
+            self._entries[name] = (version, now + self.ttl, value)
+        return value, etag
+
+    def invalidate(self) -> None:
+        """Bump the version, invalidating every cached aggregate."""
+        with self._lock:
+            self._local_version += 1
+            self._entries.clear()
+        if self._use_redis:
+            try:
+                self._get_redis().incr(self._version_key)
+            except Exception as e:
+                logger.error(f"Failed to bump aggregate cache version: {e}")
+        logger.debug("Invalidated donation aggregate cache")
+
+    def clear(self) -> None:
+        """Drop all in-process entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters."""
+        with self._lock:
+            return {
+                "backend": "redis" if self._use_redis else "memory",
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Global aggregate cache instance
+aggregate_cache = AggregateCache()
+
+
+@event.listens_for(Session, "before_flush")
+def _track_aggregate_changes(session, flush_context, instances):
+    """Remember that this transaction touched donation aggregate sources."""
+    if any(
+        isinstance(obj, AGGREGATE_SOURCE_MODELS)
+        for obj in chain(session.new, session.dirty, session.deleted)
+    ):
+        session.info["aggregates_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_aggregates_on_commit(session):
+    if session.info.pop("aggregates_changed", False):
+        aggregate_cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_aggregate_changes(session):
+    session.info.pop("aggregates_changed", None)
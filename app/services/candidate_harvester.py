@@ -0,0 +1,389 @@
+"""
+Background harvester of candidate posts for random commissions.
+
+Random commissions used to walk up to 100 submissions of a live top() listing,
+retrying across several subreddits, while the donor waited. The harvester does
+that work ahead of time: it periodically pulls listings for r/all and the
+known subreddits, applies the same stickied/age/selftext/already-processed
+filters, and stores the survivors in candidate_posts with a rank score.
+Commission validation then claims the best candidate with one indexed query.
+
+Validation is only a preview, so a claim is a lease: it hides the candidate
+from other validations for CANDIDATE_CLAIM_TTL seconds. A candidate is used up
+once a donation or processed post references it; an abandoned preview simply
+lets the lease lapse.
+"""
+
+import asyncio
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.clients.reddit_client import RedditClient
+from app.config import (
+    CANDIDATE_CLAIM_TTL,
+    CANDIDATE_HARVEST_INTERVAL,
+    CANDIDATE_HARVEST_LIMIT,
+    CANDIDATE_HARVEST_SUBREDDITS,
+    CANDIDATE_MAX_AGE_DAYS,
+    CANDIDATE_TIME_FILTER,
+)
+from app.db.database import SessionLocal
+from app.db.models import CandidatePost, Donation, RedditPost, Subreddit
+from app.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Age at which a candidate's rank is halved
+RANK_HALF_LIFE_DAYS = 14
+
+
+def rank_score(score: int, num_comments: int, age_days: float) -> float:
+    """
+    Rank a post by engagement, decayed by age.
+
+    Args:
+        score: Reddit score
+        num_comments: Number of comments
+        age_days: Days since the post was created
+
+    Returns:
+        float: Rank score; higher is better
+    """
+    engagement = math.log10(max(score, 1)) + 0.5 * math.log10(num_comments + 1)
+    return engagement * 0.5 ** (max(age_days, 0) / RANK_HALF_LIFE_DAYS)
+
+
+def screen_submission(
+    submission: Any,
+    now: datetime,
+    max_age_days: int = CANDIDATE_MAX_AGE_DAYS,
+) -> Optional[Dict[str, Any]]:
+    """
+    Apply the commission filters to a PRAW submission.
+
+    Args:
+        submission: PRAW submission from a listing
+        now: Current time
+        max_age_days: Oldest post age to accept
+
+    Returns:
+        Candidate fields, or None if the post is unsuitable
+    """
+    if submission.stickied:
+        return None
+    posted_at = datetime.fromtimestamp(submission.created_utc, timezone.utc)
+    age = now - posted_at
+    if age.days > max_age_days:
+        return None
+    # Link and image posts only qualify with a real discussion to draw from
+    if not submission.selftext and not (
+        submission.num_comments > 20 and submission.score > 20
+    ):
+        return None
+
+    return {
+        "post_id": submission.id,
+        "subreddit": submission.subreddit.display_name,
+        "title": submission.title,
+        "content": submission.selftext or "",
+        "permalink": submission.permalink,
+        "url": submission.url,
+        "score": submission.score,
+        "num_comments": submission.num_comments,
+        "posted_at": posted_at.replace(tzinfo=None),
+        "rank_score": rank_score(
+            submission.score, submission.num_comments, age.total_seconds() / 86400
+        ),
+    }
+
+
+class CandidatePostService:
+    """Stores and hands out harvested candidate posts."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def _processed_post_ids(self, post_ids: Iterable[str]) -> set:
+        post_ids = list(post_ids)
+        if not post_ids:
+            return set()
+        processed = self.session.execute(
+            select(RedditPost.post_id).where(RedditPost.post_id.in_(post_ids))
+        ).scalars()
+        commissioned = self.session.execute(
+            select(Donation.post_id).where(Donation.post_id.in_(post_ids))
+        ).scalars()
+        return set(processed) | set(commissioned)
+
+    def store_candidates(self, candidates: List[Dict[str, Any]]) -> int:
+        """
+        Insert or refresh screened candidates, skipping already-processed posts.
+
+        Args:
+            candidates: Fields returned by screen_submission
+
+        Returns:
+            int: Number of candidates stored
+        """
+        by_id = {c["post_id"]: c for c in candidates}
+        for post_id in self._processed_post_ids(by_id):
+            by_id.pop(post_id)
+        if not by_id:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        existing = {
+            c.post_id: c
+            for c in self.session.query(CandidatePost).filter(
+                CandidatePost.post_id.in_(list(by_id))
+            )
+        }
+        for post_id, fields in by_id.items():
+            candidate = existing.get(post_id)
+            if candidate is None:
+                self.session.add(CandidatePost(harvested_at=now, **fields))
+            else:
+                # Refresh engagement; a claimed candidate stays claimed
+                for name, value in fields.items():
+                    setattr(candidate, name, value)
+                candidate.harvested_at = now
+        self.session.commit()
+        return len(by_id)
+
+    def _used_filters(self) -> List[Any]:
+        """Candidates already processed or taken by a commission."""
+        processed = (
+            select(RedditPost.id)
+            .where(RedditPost.post_id == CandidatePost.post_id)
+            .exists()
+        )
+        commissioned = (
+            select(Donation.id)
+            .where(Donation.post_id == CandidatePost.post_id)
+            .exists()
+        )
+        return [processed, commissioned]
+
+    @staticmethod
+    def _unleased(now: datetime, claim_ttl: int) -> Any:
+        return CandidatePost.claimed_at.is_(None) | (
+            CandidatePost.claimed_at < now - timedelta(seconds=claim_ttl)
+        )
+
+    def claim_best(
+        self,
+        subreddit_name: Optional[str] = None,
+        attempts: int = 3,
+        claim_ttl: int = CANDIDATE_CLAIM_TTL,
+    ) -> Optional[CandidatePost]:
+        """
+        Lease the highest-ranked available candidate.
+
+        The lease keeps concurrent validations from offering the same post. It
+        lapses after claim_ttl seconds unless a donation takes the post.
+
+        Args:
+            subreddit_name: Restrict to one subreddit (case-insensitive)
+            attempts: Retries when a concurrent commission claims it first
+            claim_ttl: Lease length in seconds
+
+        Returns:
+            The claimed CandidatePost, or None if none is available
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(days=CANDIDATE_MAX_AGE_DAYS)
+        processed, commissioned = self._used_filters()
+
+        for _ in range(attempts):
+            now = datetime.now(timezone.utc)
+            query = self.session.query(CandidatePost).filter(
+                self._unleased(now, claim_ttl),
+                CandidatePost.posted_at >= cutoff,
+                ~processed,
+                ~commissioned,
+            )
+            if subreddit_name:
+                query = query.filter(
+                    func.lower(CandidatePost.subreddit) == subreddit_name.lower()
+                )
+            candidate = query.order_by(CandidatePost.rank_score.desc()).first()
+            if candidate is None:
+                return None
+
+            # Compare-and-set on the claim we read, so two validations racing
+            # for the same (unclaimed or expired) candidate cannot both win
+            if candidate.claimed_at is None:
+                unchanged = CandidatePost.claimed_at.is_(None)
+            else:
+                unchanged = CandidatePost.claimed_at == candidate.claimed_at
+            claimed = self.session.execute(
+                update(CandidatePost)
+                .where(CandidatePost.id == candidate.id, unchanged)
+                .values(claimed_at=now)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            self.session.commit()
+            if claimed == 1:
+                self.session.refresh(candidate)
+                return candidate
+        return None
+
+    def prune(self, max_age_days: int = CANDIDATE_MAX_AGE_DAYS) -> int:
+        """
+        Delete candidates that are too old or already used by a commission.
+
+        Args:
+            max_age_days: Oldest post age to keep
+
+        Returns:
+            int: Number of candidates deleted
+        """
+        now = datetime.now(timezone.utc)
+        processed, commissioned = self._used_filters()
+        deleted = (
+            self.session.query(CandidatePost)
+            .filter(
+                (CandidatePost.posted_at < now - timedelta(days=max_age_days))
+                | processed
+                | commissioned
+            )
+            .delete(synchronize_session=False)
+        )
+        self.session.commit()
+        return deleted
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return candidate pool counts."""
+        now = datetime.now(timezone.utc)
+        total, available = self.session.execute(
+            select(
+                func.count(CandidatePost.id),
+                func.count(CandidatePost.id).filter(
+                    self._unleased(now, CANDIDATE_CLAIM_TTL)
+                ),
+            )
+        ).one()
+        return {"total": total, "available": available}
+
+
+class CandidateHarvester:
+    """
+    Background loop that refreshes the candidate pool.
+
+    Each cycle harvests r/all plus the next few known subreddits in rotation,
+    so every subreddit is revisited without one cycle scanning them all.
+    """
+
+    def __init__(
+        self,
+        interval: float = CANDIDATE_HARVEST_INTERVAL,
+        subreddits_per_cycle: int = CANDIDATE_HARVEST_SUBREDDITS,
+        limit: int = CANDIDATE_HARVEST_LIMIT,
+        time_filter: str = CANDIDATE_TIME_FILTER,
+    ):
+        self.interval = interval
+        self.subreddits_per_cycle = subreddits_per_cycle
+        self.limit = limit
+        self.time_filter = time_filter
+        self.running = False
+        self._cursor = 0
+        self._wakeup: Optional[asyncio.Event] = None
+
+    async def start(self) -> None:
+        """Run the harvester loop until stopped."""
+        self.running = True
+        self._wakeup = asyncio.Event()
+        logger.info("Starting candidate harvester")
+
+        while self.running:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception as e:
+                logger.error(f"Error in candidate harvester: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def stop(self) -> None:
+        """Stop the harvester loop."""
+        self.running = False
+        if self._wakeup is not None:
+            self._wakeup.set()
+        logger.info("Candidate harvester stopped")
+
+    def _next_subreddits(self, session: Session) -> List[str]:
+        names = list(
+            session.execute(
+                select(Subreddit.subreddit_name)
+                .where(Subreddit.subreddit_name != "all")
+                .order_by(Subreddit.id)
+            ).scalars()
+        )
+        if not names:
+            return ["all"]
+        count = min(self.subreddits_per_cycle, len(names))
+        start = self._cursor % len(names)
+        self._cursor = start + count
+        return ["all"] + [names[(start + i) % len(names)] for i in range(count)]
+
+    def run_once(self) -> int:
+        """
+        Run one harvest cycle.
+
+        Returns:
+            int: Number of candidates stored
+        """
+        reddit_client = RedditClient()
+        db = SessionLocal()
+        try:
+            service = CandidatePostService(db)
+            stored = 0
+            for subreddit_name in self._next_subreddits(db):
+                try:
+                    stored += self.harvest_subreddit(
+                        reddit_client, service, subreddit_name
+                    )
+                except Exception as e:
+                    db.rollback()
+                    logger.warning(f"Failed to harvest r/{subreddit_name}: {e}")
+            pruned = service.prune()
+            logger.info(
+                f"Candidate harvest stored {stored} candidates, pruned {pruned}"
+            )
+            return stored
+        finally:
+            db.close()
+
+    def harvest_subreddit(
+        self, reddit_client: Any, service: CandidatePostService, subreddit_name: str
+    ) -> int:
+        """
+        Screen one subreddit's top listing into the candidate pool.
+
+        Args:
+            reddit_client: RedditClient to read the listing with
+            service: Candidate store
+            subreddit_name: Subreddit to harvest
+
+        Returns:
+            int: Number of candidates stored
+        """
+        now = datetime.now(timezone.utc)
+        listing = reddit_client.reddit.subreddit(subreddit_name).top(
+            time_filter=self.time_filter, limit=self.limit
+        )
+        candidates = [
+            fields
+            for fields in (screen_submission(s, now) for s in listing)
+            if fields is not None
+        ]
+        return service.store_candidates(candidates)
+
+
+# Global candidate harvester instance
+candidate_harvester = CandidateHarvester()
@@ -0,0 +1,230 @@
+"""
+Cached, token-budgeted summaries of a Reddit post's top comments.
+
+RedditAgent used to summarize comments with a blocking gpt-4 call inside async
+commission code, over every comment returned by comments.list(), and redid it
+each time the same post was commissioned or validated. CommentSummarizer
+fetches a bounded set of top-level comments off the event loop, trims them to
+a token budget, summarizes with the async OpenAI client and caches the result
+keyed by post id and a hash of the comments it summarized, so repeat
+commissions of a popular post reuse the summary until the comments change or
+the entry expires.
+"""
+
+import asyncio
+import hashlib
+import os
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+from openai import AsyncOpenAI
+
+from app.clients.reddit_cache import MemoryCacheBackend
+from app.config import (
+    COMMENT_SUMMARY_CACHE_SIZE,
+    COMMENT_SUMMARY_CACHE_TTL,
+    COMMENT_SUMMARY_MODEL,
+    COMMENT_SUMMARY_TOKEN_BUDGET,
+    COMMENT_SUMMARY_TOP_N,
+)
+from app.utils.logging_config import get_logger
+from app.utils.openai_rate_limiter import CHARS_PER_TOKEN, estimate_tokens
+from app.utils.openai_usage_tracker import track_openai_call
+
+logger = get_logger(__name__)
+
+NO_COMMENTS = "No comments available."
+SUMMARY_ERROR = "Error generating comment summary."
+
+SYSTEM_PROMPT = "Summarize the key points from these Reddit comments in 1-2 sentences."
+
+
+def truncate_to_budget(texts: List[str], token_budget: int) -> List[str]:
+    """
+    Keep texts in order until the token budget is spent.
+
+    The text that crosses the budget is cut short rather than dropped, so a
+    long first comment still contributes.
+
+    Args:
+        texts: Comment bodies, best first
+        token_budget: Maximum estimated tokens to keep
+
+    Returns:
+        List of texts fitting the budget
+    """
+    kept: List[str] = []
+    remaining = token_budget
+    for text in texts:
+        if remaining <= 0:
+            break
+        cost = estimate_tokens(text) + 1  # +1 for the joining newline
+        if cost > remaining:
+            kept.append(text[: max(remaining - 1, 0) * CHARS_PER_TOKEN])
+            break
+        kept.append(text)
+        remaining -= cost
+    return [text for text in kept if text]
+
+
+class CommentSummarizer:
+    """
+    Summarizes a submission's top comments with the async OpenAI client.
+
+    Args:
+        model: Chat model used for summaries
+        top_n: Maximum number of top-level comments fetched
+        token_budget: Maximum estimated prompt tokens of comment text
+        cache_ttl: Seconds a summary stays cached
+        cache_size: Maximum number of cached summaries
+        client: AsyncOpenAI client; if not given, one is created per event loop
+    """
+
+    def __init__(
+        self,
+        model: str = COMMENT_SUMMARY_MODEL,
+        top_n: int = COMMENT_SUMMARY_TOP_N,
+        token_budget: int = COMMENT_SUMMARY_TOKEN_BUDGET,
+        cache_ttl: float = COMMENT_SUMMARY_CACHE_TTL,
+        cache_size: int = COMMENT_SUMMARY_CACHE_SIZE,
+        client: Optional[AsyncOpenAI] = None,
+    ):
+        self.model = model
+        self.top_n = top_n
+        self.token_budget = token_budget
+        self.cache_ttl = cache_ttl
+        self._cache = MemoryCacheBackend(maxsize=cache_size)
+        self._client = client
+        # AsyncOpenAI connections are bound to the loop that opened them
+        self._loop_clients: (
+            "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]"
+        ) = weakref.WeakKeyDictionary()
+
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _get_client(self) -> AsyncOpenAI:
+        if self._client is not None:
+            return self._client
+        loop = asyncio.get_running_loop()
+        client = self._loop_clients.get(loop)
+        if client is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise ValueError("OPENAI_API_KEY must be set")
+            client = AsyncOpenAI(api_key=api_key)
+            self._loop_clients[loop] = client
+        return client
+
+    def fetch_comments(self, submission: Any) -> List[Tuple[str, str]]:
+        """
+        Fetch up to top_n top-level comments, highest voted first.
+
+        This makes blocking PRAW requests; call it off the event loop.
+
+        Args:
+            submission: PRAW submission object
+
+        Returns:
+            List of (comment id, body) pairs
+        """
+        # Only takes effect if the comment forest has not been loaded yet
+        submission.comment_sort = "top"
+        submission.comment_limit = self.top_n
+        submission.comments.replace_more(limit=0)
+        comments = []
+        for comment in list(submission.comments)[: self.top_n]:
+            body = getattr(comment, "body", None)
+            if body and body not in ("[deleted]", "[removed]"):
+                comments.append((str(getattr(comment, "id", "")), body))
+        return comments
+
+    @staticmethod
+    def cache_key(post_id: str, comments: List[Tuple[str, str]]) -> str:
+        """
+        Key a summary by post and the exact comments it summarized.
+
+        Args:
+            post_id: Reddit post id
+            comments: (comment id, body) pairs
+
+        Returns:
+            str: Cache key
+        """
+        digest = hashlib.sha256()
+        for comment_id, body in comments:
+            digest.update(comment_id.encode())
+            digest.update(b"\0")
+            digest.update(body.encode())
+            digest.update(b"\0")
+        return f"{post_id}:{digest.hexdigest()[:32]}"
+
+    async def _complete(self, texts: List[str]) -> str:
+        prompt = "Comments:\n" + "\n".join(texts)
+        estimated_tokens = estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(prompt)
+
+        # The model is per instance, so the tracked call is built per request
+        @track_openai_call(self.model, estimate=lambda: estimated_tokens)
+        async def create():
+            return await self._get_client().chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
+            )
+
+        response = await create()
+        return response.choices[0].message.content.strip()
+
+    async def summarize(self, submission: Any) -> str:
+        """
+        Summarize a submission's top comments, reusing a cached summary if the
+        same comments were summarized recently.
+
+        Args:
+            submission: PRAW submission object
+
+        Returns:
+            str: Comment summary, or a fallback message
+        """
+        try:
+            comments = await asyncio.to_thread(self.fetch_comments, submission)
+            if not comments:
+                return NO_COMMENTS
+
+            key = self.cache_key(submission.id, comments)
+            found, summary = self._cache.get(key)
+            if found:
+                self.hits += 1
+                return summary
+            self.misses += 1
+
+            texts = truncate_to_budget(
+                [body for _, body in comments], self.token_budget
+            )
+            summary = await self._complete(texts)
+            self._cache.set(key, summary, self.cache_ttl)
+            return summary
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Error generating comment summary: {str(e)}")
+            return SUMMARY_ERROR
+
+    def clear(self) -> None:
+        """Drop every cached summary."""
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache size and hit counters."""
+        return {
+            "size": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+        }
+
+
+# Global comment summarizer instance
+comment_summarizer = CommentSummarizer()
@@ -14,8 +14,9 @@ from sqlalchemy.orm import Session
 from app.agents.reddit_agent import RedditAgent, pick_subreddit
 from app.clients.reddit_client import RedditClient
 from app.db.database import SessionLocal
-from app.db.models import AgentScannedPost, Donation, Subreddit
+from app.db.models import AgentScannedPost, CandidatePost, Donation, Subreddit
 from app.models import PipelineConfig, RedditContext
+from app.services.candidate_harvester import CandidatePostService
 from app.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -202,6 +203,32 @@ class CommissionValidator:
                 valid=False, error=f"Failed to validate scanned post {scanned_post.post_id}: {str(e)}"
             )
 
+    def _validate_candidate_post(
+        self, candidate: CandidatePost, commission_type: str
+    ) -> ValidationResult:
+        """Validate a harvested candidate post (no Reddit API call needed)."""
+        return ValidationResult(
+            valid=True,
+            subreddit=candidate.subreddit,
+            subreddit_id=self._get_subreddit_id(candidate.subreddit),
+            post_id=candidate.post_id,
+            post_title=candidate.title,
+            post_url=f"https://reddit.com{candidate.permalink}",
+            post_content=candidate.content,
+            commission_type=commission_type,
+        )
+
+    def _claim_candidate_post(
+        self, subreddit_name: Optional[str] = None
+    ) -> Optional[CandidatePost]:
+        """Claim the best harvested candidate, overall or in one subreddit."""
+        try:
+            return CandidatePostService(self.session).claim_best(subreddit_name)
+        except Exception as e:
+            logger.error(f"Error claiming candidate post: {str(e)}")
+            self.session.rollback()
+            return None
+
     def _find_uncommissioned_scanned_post(self) -> Optional[AgentScannedPost]:
         """
         Find a scanned post with high artistic potential that has never had any commission attempt.
@@ -284,9 +311,18 @@ class CommissionValidator:
                     scanned_post, "random_random"
                 )
 
-            # Fallback to existing random selection logic
+            # Then the best post pre-screened by the candidate harvester
+            candidate = self._claim_candidate_post()
+            if candidate:
+                logger.info(
+                    f"Using harvested candidate {candidate.post_id} from "
+                    f"r/{candidate.subreddit} (rank {candidate.rank_score:.2f})"
+                )
+                return self._validate_candidate_post(candidate, "random_random")
+
+            # Fallback to live random selection when the pool is empty
             logger.info(
-                "No suitable scanned posts found, falling back to random selection"
+                "No suitable scanned or harvested posts found, falling back to random selection"
             )
             
             # Try multiple subreddits until we find a valid post
@@ -333,6 +369,9 @@ class CommissionValidator:
                     valid=False,
                     error=f"Subreddit r/{subreddit_name} not found or not accessible",
                 )
+            candidate = self._claim_candidate_post(subreddit_name)
+            if candidate:
+                return self._validate_candidate_post(candidate, "random_subreddit")
             submission = await self.reddit_agent.find_top_post_from_subreddit(
                 subreddit_name=subreddit_name
             )
@@ -13,9 +13,11 @@ from typing import Dict, List, Optional
 
 import praw
 import redis
+from openai import OpenAI
 from praw.models import Comment, Submission
 
 from app.agents.clouvel_community_agent import ClouvelCommunityAgent
+from app.clients.reddit_registry import get_reddit_client
 from app.db.database import SessionLocal
 
 logger = logging.getLogger(__name__)
@@ -62,14 +64,8 @@ class CommunityAgentService:
         self.running = False
 
         # Initialize Reddit client for streaming
-        self.reddit = praw.Reddit(
-            client_id=os.getenv("REDDIT_CLIENT_ID"),
-            client_secret=os.getenv("REDDIT_CLIENT_SECRET"),
-            username=os.getenv("REDDIT_USERNAME"),
-            password=os.getenv("REDDIT_PASSWORD"),
-            user_agent=os.getenv(
-                "REDDIT_USER_AGENT", "clouvel-agent by u/queen_clouvel"
-            ),
+        self.reddit: praw.Reddit = get_reddit_client(
+            default_user_agent="clouvel-agent by u/queen_clouvel"
         )
 
         # Initialize Redis for real-time updates
@@ -86,11 +82,15 @@ class CommunityAgentService:
                 logger.warning(f"Redis connection failed: {e}")
                 self.redis_client = None
 
-        # Create agents for each subreddit
+        # Create agents for each subreddit; they share the Reddit client above
+        # (via the registry) and one OpenAI client
+        self.openai = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         self.agents: Dict[str, ClouvelCommunityAgent] = {}
         for subreddit_name in self.subreddit_names:
             self.agents[subreddit_name] = ClouvelCommunityAgent(
-                subreddit_name=subreddit_name, dry_run=dry_run
+                subreddit_name=subreddit_name,
+                dry_run=dry_run,
+                openai_client=self.openai,
             )
 
         logger.info(
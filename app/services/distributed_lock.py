@@ -0,0 +1,208 @@
+"""
+Cluster-wide locks built on RedisService.acquire_lock/release_lock.
+
+A lock is a Redis key set with NX and an expiry, holding a random token so
+only its holder can release it. Waiters block on a release signal (BLPOP)
+instead of polling, and every acquisition gets a fencing token that increases
+monotonically, so work guarded by the lock can reject a holder whose lease
+already expired.
+
+When Redis is not connected (local development, tests) or a Redis call fails,
+locks fall back to per-process asyncio locks, which still serialize callers
+within one worker.
+"""
+
+import asyncio
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from itertools import count
+from typing import AsyncIterator, Dict, Optional
+
+from app.config import PAYMENT_INTENT_LOCK_TTL, PAYMENT_INTENT_LOCK_WAIT
+from app.redis_service import RedisService, redis_service
+from app.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class LockTimeoutError(Exception):
+    """Raised when a lock could not be acquired within the wait timeout."""
+
+
+@dataclass
+class LockLease:
+    """A held lock."""
+
+    key: str
+    token: str
+    fencing_token: int
+    distributed: bool
+
+
+class DistributedLock:
+    """
+    Factory for named, expiring, cluster-wide locks.
+
+    Args:
+        namespace: Prefix for the Redis lock keys
+        ttl: Seconds before an unreleased lock expires
+        wait_timeout: Default seconds to wait for a held lock
+        service: Redis service providing the lock primitives
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: int = PAYMENT_INTENT_LOCK_TTL,
+        wait_timeout: float = PAYMENT_INTENT_LOCK_WAIT,
+        service: Optional[RedisService] = None,
+    ):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self._service = service
+        # key -> [lock, number of holders and waiters]
+        self._local_locks: Dict[str, list] = {}
+        self._local_fence = count(1)
+
+    @property
+    def service(self) -> RedisService:
+        return self._service or redis_service
+
+    def _key(self, name: str) -> str:
+        return f"{self.namespace}:{name}"
+
+    async def acquire(
+        self, name: str, wait_timeout: Optional[float] = None
+    ) -> Optional[LockLease]:
+        """
+        Acquire a lock, waiting for the current holder if necessary.
+
+        Args:
+            name: Lock name, e.g. a payment intent ID
+            wait_timeout: Seconds to wait; defaults to the lock's wait_timeout
+
+        Returns:
+            LockLease if acquired, None on timeout
+        """
+        key = self._key(name)
+        timeout = self.wait_timeout if wait_timeout is None else wait_timeout
+
+        if self.service.redis_client is None:
+            return await self._acquire_local(key, timeout)
+
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                if await self.service.acquire_lock(
+                    key, self.ttl, token=token, raise_errors=True
+                ):
+                    try:
+                        fencing_token = await self.service.next_fencing_token(key)
+                    except Exception:
+                        await self.service.release_lock(key, token=token)
+                        raise
+                    return LockLease(key, token, fencing_token, distributed=True)
+            except Exception as e:
+                logger.warning(
+                    f"Redis unavailable for lock {key}, using local lock: {e}"
+                )
+                remaining = max(0.0, deadline - time.monotonic())
+                return await self._acquire_local(key, remaining)
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning(f"Timed out after {timeout}s waiting for lock {key}")
+                return None
+            # Wake on release; the cap re-checks for holders that simply expired
+            await self.service.wait_for_lock_release(key, min(remaining, 1.0))
+
+    async def _acquire_local(self, key: str, timeout: float) -> Optional[LockLease]:
+        entry = self._local_locks.setdefault(key, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            await asyncio.wait_for(entry[0].acquire(), timeout)
+        except asyncio.TimeoutError:
+            self._drop_local_user(key, entry)
+            logger.warning(f"Timed out after {timeout}s waiting for local lock {key}")
+            return None
+        return LockLease(key, "local", next(self._local_fence), distributed=False)
+
+    def _drop_local_user(self, key: str, entry: list) -> None:
+        # Forget the lock once nobody holds or waits on it
+        entry[1] -= 1
+        if entry[1] == 0:
+            self._local_locks.pop(key, None)
+
+    async def release(self, lease: LockLease) -> bool:
+        """
+        Release a held lock.
+
+        Args:
+            lease: Lease returned by acquire
+
+        Returns:
+            bool: False if the lease had already expired
+        """
+        if lease.distributed:
+            released = await self.service.release_lock(lease.key, token=lease.token)
+            if not released:
+                logger.warning(
+                    f"Lock {lease.key} expired before release "
+                    f"(fencing token {lease.fencing_token})"
+                )
+            return released
+
+        entry = self._local_locks.get(lease.key)
+        if entry is None or not entry[0].locked():
+            return False
+        entry[0].release()
+        self._drop_local_user(lease.key, entry)
+        return True
+
+    async def still_held(self, lease: LockLease) -> bool:
+        """
+        Check that a lease has not expired or passed to another holder.
+
+        Args:
+            lease: Lease returned by acquire
+
+        Returns:
+            bool: True if the lease is still current
+        """
+        if not lease.distributed:
+            return True
+        try:
+            return await self.service.redis_client.get(lease.key) == lease.token
+        except Exception as e:
+            logger.error(f"Error checking lock {lease.key}: {e}")
+            return False
+
+    @asynccontextmanager
+    async def hold(
+        self, name: str, wait_timeout: Optional[float] = None
+    ) -> AsyncIterator[LockLease]:
+        """
+        Hold a lock for the duration of a block.
+
+        Args:
+            name: Lock name
+            wait_timeout: Seconds to wait for the lock
+
+        Raises:
+            LockTimeoutError: If the lock could not be acquired in time
+        """
+        lease = await self.acquire(name, wait_timeout)
+        if lease is None:
+            raise LockTimeoutError(f"Unable to acquire lock {self._key(name)}")
+        try:
+            yield lease
+        finally:
+            await self.release(lease)
+
+
+# Serializes modifications of a Stripe payment intent across workers and replicas
+payment_intent_lock = DistributedLock("lock:payment_intent")
@@ -12,10 +12,15 @@ import logging
 from decimal import Decimal
 from typing import List
 
-from sqlalchemy import and_, func
-from sqlalchemy.orm import Session, joinedload
-
-from app.db.models import Donation, Subreddit, SubredditFundraisingGoal
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.db.models import (
+    Donation,
+    Subreddit,
+    SubredditDonationTotal,
+    SubredditFundraisingGoal,
+)
 from app.models import (
     FundraisingGoalsConfig,
     FundraisingProgress,
@@ -47,38 +52,53 @@ class FundraisingGoalsService:
 
         return Decimal(str(total or 0))
 
-    def get_subreddit_goals_with_progress(
-        self,
-    ) -> List[SubredditFundraisingGoalSchema]:
-        """Get all active subreddit goals with calculated progress."""
-        goals = (
-            self.session.query(SubredditFundraisingGoal)
-            .options(joinedload(SubredditFundraisingGoal.subreddit))
+    def _active_goals_with_totals(self):
+        """
+        Load active goals with their subreddit name and amount raised.
+
+        Progress comes from the subreddit_donation_totals rollup in a single
+        join instead of one SUM over donations per goal.
+
+        Returns:
+            List of (goal, subreddit_name, current_amount) tuples
+        """
+        rows = (
+            self.session.query(
+                SubredditFundraisingGoal,
+                Subreddit.subreddit_name,
+                SubredditDonationTotal.total_cents,
+            )
+            .join(Subreddit, SubredditFundraisingGoal.subreddit_id == Subreddit.id)
+            .outerjoin(
+                SubredditDonationTotal,
+                SubredditDonationTotal.subreddit_id
+                == SubredditFundraisingGoal.subreddit_id,
+            )
             .filter(SubredditFundraisingGoal.status == "active")
             .all()
         )
-
-        result = []
-        for goal in goals:
-            # Calculate current progress dynamically
-            current_amount = (
-                self.session.query(func.coalesce(func.sum(Donation.amount_usd), 0))
-                .filter(
-                    and_(
-                        Donation.subreddit_id == goal.subreddit_id,
-                        Donation.status == "succeeded",
-                    )
-                )
-                .scalar()
+        return [
+            (
+                goal,
+                subreddit_name,
+                (Decimal(total_cents or 0) / 100).quantize(Decimal("0.01")),
             )
+            for goal, subreddit_name, total_cents in rows
+        ]
 
+    def get_subreddit_goals_with_progress(
+        self,
+    ) -> List[SubredditFundraisingGoalSchema]:
+        """Get all active subreddit goals with calculated progress."""
+        result = []
+        for goal, subreddit_name, current_amount in self._active_goals_with_totals():
             result.append(
                 SubredditFundraisingGoalSchema(
                     id=goal.id,
                     subreddit_id=goal.subreddit_id,
-                    subreddit_name=goal.subreddit.subreddit_name,
+                    subreddit_name=subreddit_name,
                     goal_amount=goal.goal_amount,
-                    current_amount=Decimal(str(current_amount or 0)),
+                    current_amount=current_amount,
                     status=goal.status,
                     created_at=goal.created_at,
                     completed_at=goal.completed_at,
@@ -151,39 +171,17 @@ class FundraisingGoalsService:
         """Check and update completion status for completed goals."""
         completed_goals = []
 
-        goals = (
-            self.session.query(SubredditFundraisingGoal)
-            .filter(SubredditFundraisingGoal.status == "active")
-            .all()
-        )
-
-        for goal in goals:
-            # Calculate current progress
-            current_amount = (
-                self.session.query(func.coalesce(func.sum(Donation.amount_usd), 0))
-                .filter(
-                    and_(
-                        Donation.subreddit_id == goal.subreddit_id,
-                        Donation.status == "succeeded",
-                    )
-                )
-                .scalar()
-            )
-
-            current_amount = Decimal(str(current_amount or 0))
-
+        for goal, subreddit_name, current_amount in self._active_goals_with_totals():
             # Check if goal is completed
             if current_amount >= goal.goal_amount:
                 goal.status = "completed"
                 goal.completed_at = func.now()
                 goal.current_amount = current_amount
-
-                subreddit = self.session.query(Subreddit).get(goal.subreddit_id)
                 completed_goals.append(
                     SubredditFundraisingGoalSchema(
                         id=goal.id,
                         subreddit_id=goal.subreddit_id,
-                        subreddit_name=subreddit.subreddit_name,
+                        subreddit_name=subreddit_name,
                         goal_amount=goal.goal_amount,
                         current_amount=current_amount,
                         status=goal.status,
@@ -195,7 +193,7 @@ class FundraisingGoalsService:
 
                 logger.info(
                     f"Fundraising goal completed for "
-                    f"{subreddit.subreddit_name}: ${current_amount}"
+                    f"{subreddit_name}: ${current_amount}"
                 )
 
         self.session.commit()
@@ -0,0 +1,414 @@
+"""
+Service for maintaining the denormalized gallery read model.
+
+The gallery endpoint used to assemble every product from ProductInfo,
+PipelineTask, Donation and PipelineRunUsage rows on each request. This
+service precomputes that response once per product and stores it in the
+``gallery_products`` table, so reads become a single indexed scan.
+
+Entries are refreshed incrementally:
+- When a commission product is saved (CommissionWorker._save_product)
+- When a donation linked to a product changes (Stripe webhook)
+- On startup, for any completed run that has no entry yet (backfill)
+"""
+
+import base64
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.affiliate_linker import ZazzleAffiliateLinker
+from app.db.models import (
+    Donation,
+    GalleryProduct,
+    PipelineRun,
+    PipelineRunUsage,
+    PipelineTask,
+    ProductInfo,
+)
+from app.models import (
+    GeneratedProductSchema,
+    PipelineRunSchema,
+    PipelineRunUsageSchema,
+    ProductInfoSchema,
+    RedditPostSchema,
+)
+from app.pipeline_status import PipelineStatus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 24
+MAX_PAGE_SIZE = 100
+
+# Initialize affiliate linker for dynamic link generation
+_affiliate_linker = None
+
+
+def get_affiliate_linker() -> Optional[ZazzleAffiliateLinker]:
+    """Get or create the affiliate linker instance."""
+    global _affiliate_linker
+    if _affiliate_linker is None:
+        zazzle_affiliate_id = os.getenv("ZAZZLE_AFFILIATE_ID", "")
+        zazzle_tracking_code = os.getenv("ZAZZLE_TRACKING_CODE", "")
+        if zazzle_affiliate_id and zazzle_tracking_code:
+            _affiliate_linker = ZazzleAffiliateLinker(
+                zazzle_affiliate_id=zazzle_affiliate_id,
+                zazzle_tracking_code=zazzle_tracking_code,
+            )
+        else:
+            logger.warning("Zazzle affiliate credentials not configured")
+    return _affiliate_linker
+
+
+class GalleryService:
+    """Service for building and serving precomputed gallery entries."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def list_products(self) -> List[Dict[str, Any]]:
+        """Return every gallery payload in a single indexed scan."""
+        rows = (
+            self.session.query(GalleryProduct.payload)
+            .order_by(GalleryProduct.pipeline_run_id.asc())
+            .all()
+        )
+        return [row.payload for row in rows]
+
+    def list_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Return one page of gallery payloads, newest first.
+
+        Pages are keyed on (end_time, pipeline_run_id) so each request is a
+        bounded range scan on ix_gallery_products_end_time_run, regardless of
+        how deep the client has paged.
+
+        Args:
+            cursor: Opaque cursor returned with the previous page, or None
+            limit: Maximum number of items to return (capped at MAX_PAGE_SIZE)
+            fields: Optional dotted field paths to keep in each item, e.g.
+                ["product_info", "reddit_post.title"]
+
+        Returns:
+            Tuple of (items, next_cursor); next_cursor is None on the last page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        query = self.session.query(
+            GalleryProduct.pipeline_run_id,
+            GalleryProduct.end_time,
+            GalleryProduct.payload,
+        )
+
+        if cursor:
+            end_time, pipeline_run_id = decode_cursor(cursor)
+            query = query.filter(
+                or_(
+                    GalleryProduct.end_time < end_time,
+                    and_(
+                        GalleryProduct.end_time == end_time,
+                        GalleryProduct.pipeline_run_id < pipeline_run_id,
+                    ),
+                )
+            )
+
+        # Fetch one extra row to know whether another page exists
+        rows = (
+            query.order_by(
+                GalleryProduct.end_time.desc(), GalleryProduct.pipeline_run_id.desc()
+            )
+            .limit(limit + 1)
+            .all()
+        )
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(last.end_time, last.pipeline_run_id)
+
+        items = [project_payload(row.payload, fields) for row in rows]
+        return items, next_cursor
+
+    def build_payload(self, pipeline_run: PipelineRun) -> Optional[Dict[str, Any]]:
+        """
+        Build the serialized GeneratedProductSchema for a completed pipeline run.
+
+        Args:
+            pipeline_run: The completed pipeline run
+
+        Returns:
+            Dict ready to be stored as the gallery payload, or None if the run
+            has no product or Reddit post yet
+        """
+        product_info = (
+            self.session.query(ProductInfo)
+            .filter_by(pipeline_run_id=pipeline_run.id)
+            .first()
+        )
+        if not product_info:
+            logger.warning(f"No product info found for pipeline run {pipeline_run.id}")
+            return None
+
+        reddit_post = (
+            pipeline_run.reddit_posts[0] if pipeline_run.reddit_posts else None
+        )
+        if not reddit_post:
+            logger.warning(f"No reddit post found for pipeline run {pipeline_run.id}")
+            return None
+
+        product_schema = ProductInfoSchema.model_validate(product_info)
+
+        # Generate affiliate link once here instead of on every gallery request
+        if not product_schema.affiliate_link and product_schema.product_url:
+            affiliate_linker = get_affiliate_linker()
+            if affiliate_linker:
+                try:
+                    product_schema.affiliate_link = (
+                        affiliate_linker.affiliate_linker.compose_affiliate_link(
+                            product_schema.product_url
+                        )
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Failed to generate affiliate link for {product_schema.theme}: {e}"
+                    )
+                    # Use product_url as fallback
+                    product_schema.affiliate_link = product_schema.product_url
+
+        donation = self._get_task_donation(pipeline_run.id)
+        if donation:
+            product_schema.donation_info = {
+                "reddit_username": (
+                    donation.reddit_username
+                    if not donation.is_anonymous
+                    else "Anonymous"
+                ),
+                "tier_name": donation.tier,
+                "tier_min_amount": float(
+                    donation.amount_usd
+                ),  # Use actual donation amount
+                "donation_amount": float(donation.amount_usd),
+                "is_anonymous": donation.is_anonymous,
+                "donation_type": donation.donation_type,
+                "commission_type": donation.commission_type,
+                "source": donation.source.value if donation.source else None,
+            }
+
+        reddit_post_dict = reddit_post.__dict__.copy()
+        reddit_post_dict["subreddit"] = (
+            reddit_post.subreddit.subreddit_name if reddit_post.subreddit else None
+        )
+
+        usage = (
+            self.session.query(PipelineRunUsage)
+            .filter_by(pipeline_run_id=pipeline_run.id)
+            .first()
+        )
+
+        generated_product = GeneratedProductSchema(
+            product_info=product_schema,
+            pipeline_run=PipelineRunSchema.model_validate(pipeline_run),
+            reddit_post=RedditPostSchema.model_validate(reddit_post_dict),
+            usage=PipelineRunUsageSchema.model_validate(usage) if usage else None,
+        )
+        return generated_product.model_dump(mode="json")
+
+    def refresh_pipeline_run(self, pipeline_run_id: int) -> Optional[GalleryProduct]:
+        """
+        Rebuild (or remove) the gallery entry for a single pipeline run.
+
+        Args:
+            pipeline_run_id: ID of the pipeline run to refresh
+
+        Returns:
+            GalleryProduct: The upserted entry, or None if the run is not
+            (or no longer) a completed product
+        """
+        try:
+            pipeline_run = (
+                self.session.query(PipelineRun).filter_by(id=pipeline_run_id).first()
+            )
+            entry = (
+                self.session.query(GalleryProduct)
+                .filter_by(pipeline_run_id=pipeline_run_id)
+                .first()
+            )
+
+            payload = None
+            if pipeline_run and pipeline_run.status == PipelineStatus.COMPLETED.value:
+                payload = self.build_payload(pipeline_run)
+
+            if payload is None:
+                if entry:
+                    self.session.delete(entry)
+                    self.session.commit()
+                    logger.info(
+                        f"Removed gallery entry for pipeline run {pipeline_run_id}"
+                    )
+                return None
+
+            task = self._get_pipeline_task(pipeline_run_id)
+            if entry is None:
+                entry = GalleryProduct(pipeline_run_id=pipeline_run_id)
+                self.session.add(entry)
+            entry.product_info_id = payload["product_info"]["id"]
+            entry.donation_id = task.donation_id if task else None
+            # Keyset pagination needs a non-null sort key
+            entry.end_time = (
+                pipeline_run.end_time
+                or pipeline_run.start_time
+                or datetime.now(timezone.utc)
+            )
+            entry.payload = payload
+            self.session.commit()
+
+            logger.debug(f"Refreshed gallery entry for pipeline run {pipeline_run_id}")
+            return entry
+
+        except Exception as e:
+            self.session.rollback()
+            logger.error(
+                f"Error refreshing gallery entry for pipeline run {pipeline_run_id}: {e}"
+            )
+            return None
+
+    def refresh_for_donation(self, donation_id: int) -> int:
+        """
+        Refresh every gallery entry that displays the given donation.
+
+        Args:
+            donation_id: ID of the donation that changed
+
+        Returns:
+            int: Number of entries refreshed
+        """
+        pipeline_run_ids = [
+            row.pipeline_run_id
+            for row in self.session.query(PipelineTask.pipeline_run_id)
+            .filter(
+                PipelineTask.donation_id == donation_id,
+                PipelineTask.pipeline_run_id.isnot(None),
+            )
+            .all()
+        ]
+        refreshed = 0
+        for pipeline_run_id in pipeline_run_ids:
+            if self.refresh_pipeline_run(pipeline_run_id):
+                refreshed += 1
+        return refreshed
+
+    def backfill_missing(self) -> int:
+        """
+        Build entries for completed pipeline runs that have none yet.
+
+        Returns:
+            int: Number of entries created
+        """
+        missing_run_ids = [
+            row.id
+            for row in self.session.query(PipelineRun.id)
+            .outerjoin(GalleryProduct, GalleryProduct.pipeline_run_id == PipelineRun.id)
+            .filter(
+                PipelineRun.status == PipelineStatus.COMPLETED.value,
+                GalleryProduct.id.is_(None),
+            )
+            .all()
+        ]
+        created = 0
+        for pipeline_run_id in missing_run_ids:
+            if self.refresh_pipeline_run(pipeline_run_id):
+                created += 1
+
+        if created:
+            logger.info(f"Backfilled {created} gallery entries")
+        return created
+
+    def rebuild_all(self) -> int:
+        """
+        Drop and rebuild the whole read model.
+
+        Returns:
+            int: Number of entries rebuilt
+        """
+        self.session.query(GalleryProduct).delete()
+        self.session.commit()
+        return self.backfill_missing()
+
+    def _get_pipeline_task(self, pipeline_run_id: int) -> Optional[PipelineTask]:
+        return (
+            self.session.query(PipelineTask)
+            .filter_by(pipeline_run_id=pipeline_run_id)
+            .first()
+        )
+
+    def _get_task_donation(self, pipeline_run_id: int) -> Optional[Donation]:
+        task = self._get_pipeline_task(pipeline_run_id)
+        if not task or not task.donation_id:
+            return None
+        return self.session.query(Donation).filter_by(id=task.donation_id).first()
+
+
+def encode_cursor(end_time: datetime, pipeline_run_id: int) -> str:
+    """Encode a keyset position as an opaque URL-safe cursor."""
+    raw = json.dumps({"t": end_time.isoformat(), "id": pipeline_run_id})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["t"]), int(data["id"])
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def project_payload(
+    payload: Dict[str, Any], fields: Optional[Sequence[str]]
+) -> Dict[str, Any]:
+    """
+    Keep only the requested dotted field paths of a gallery payload.
+
+    ``["product_info", "reddit_post.title"]`` keeps the whole product_info
+    object and only the title of reddit_post; everything else (e.g. usage or
+    reddit_post.content) is dropped before serialization.
+    """
+    if not fields:
+        return payload
+
+    projected: Dict[str, Any] = {}
+    for field in fields:
+        parts = field.split(".")
+        source: Any = payload
+        for part in parts:
+            if not isinstance(source, dict) or part not in source:
+                break
+            source = source[part]
+        else:
+            target = projected
+            for part in parts[:-1]:
+                existing = target.get(part)
+                if not isinstance(existing, dict):
+                    existing = target[part] = {}
+                target = existing
+            target[parts[-1]] = source
+    return projected
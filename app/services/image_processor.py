@@ -9,13 +9,17 @@ The module handles:
 - Signature addition with custom text
 - Image format conversion and preservation
 - Error handling and logging
+- Caching of rendered QR stamps
 """
 
 import logging
 import os
 import random
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Callable, Dict, Hashable, Optional, Tuple
 
 import numpy as np
 import qrcode
@@ -28,6 +32,13 @@ from app.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+STYLED_QR_SIZE = 512
+STYLED_QR_BACKGROUND = (235, 240, 250, 255)  # Very light blue-grey, fully opaque
+STYLED_QR_HALO = (255, 255, 255, 180)  # Semi-transparent white glow
+STYLED_QR_GRAD_START = np.array([70, 100, 150])  # Darker blue-grey
+STYLED_QR_GRAD_END = np.array([110, 140, 190])  # Lighter blue-grey
+FULL_QR_SIZE = (512, 512)
+
 
 class ImageProcessingError(Exception):
     """Exception raised for errors in image processing."""
@@ -35,6 +46,123 @@ class ImageProcessingError(Exception):
     pass
 
 
+class QRStampCache:
+    """
+    Thread-safe LRU cache of rendered QR stamps keyed by (url, style, size).
+
+    Images are copied on the way in and out so callers can freely mutate
+    what they get back.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Image.Image]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Image.Image]:
+        with self._lock:
+            image = self._entries.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return image.copy()
+
+    def put(self, key: Hashable, image: Image.Image) -> None:
+        with self._lock:
+            self._entries[key] = image.copy()
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get_or_render(
+        self, key: Hashable, render: Callable[[], Image.Image]
+    ) -> Image.Image:
+        """Return the cached image for key, rendering and storing it on a miss."""
+        image = self.get(key)
+        if image is None:
+            image = render()
+            self.put(key, image)
+        return image
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Global stamp cache shared by all ImageProcessor instances
+qr_stamp_cache = QRStampCache()
+
+
+@lru_cache(maxsize=16)
+def _styled_module_sprites(
+    module_size: int,
+) -> Tuple[Dict[Tuple[int, int], np.ndarray], np.ndarray]:
+    """
+    Precompute the rounded module and halo masks for a module size.
+
+    The halo is module_size + 4 pixels wide and overhangs its cell by 2px on
+    every side, so it is split into the 3x3 cell-aligned tiles it touches.
+    Tile (a, b) is the part of the halo that lands in the cell offset by
+    (a, b) rows/columns from the module that owns it.
+
+    Returns:
+        Tuple of (halo tiles keyed by (a, b), module mask), all module_size
+        square int32 arrays of mask values
+    """
+    corner_radius = max(6, module_size // 2)
+    halo_size = module_size + 4
+
+    halo_mask = Image.new("L", (halo_size, halo_size), 0)
+    ImageDraw.Draw(halo_mask).rounded_rectangle(
+        [0, 0, halo_size, halo_size], radius=corner_radius + 2, fill=180
+    )
+    module_mask = Image.new("L", (module_size, module_size), 0)
+    ImageDraw.Draw(module_mask).rounded_rectangle(
+        [0, 0, module_size, module_size], radius=corner_radius, fill=255
+    )
+
+    padded = np.zeros((3 * module_size, 3 * module_size), dtype=np.int32)
+    start = module_size - 2
+    padded[start : start + halo_size, start : start + halo_size] = np.asarray(halo_mask)
+    halo_tiles = {
+        (a, b): padded[
+            (a + 1) * module_size : (a + 2) * module_size,
+            (b + 1) * module_size : (b + 2) * module_size,
+        ]
+        for a in (-1, 0, 1)
+        for b in (-1, 0, 1)
+    }
+    return halo_tiles, np.asarray(module_mask, dtype=np.int32)
+
+
+@lru_cache(maxsize=16)
+def _styled_module_colors(modules_count: int) -> np.ndarray:
+    """Diagonal gradient color for every module of a grid, shape (n, n, 3)."""
+    idx = np.arange(modules_count)
+    t = ((idx[:, None] + idx[None, :]) / (2 * (modules_count - 1)))[..., None]
+    return (STYLED_QR_GRAD_START * (1 - t) + STYLED_QR_GRAD_END * t).astype(int)
+
+
+def _paste_blend(dst: np.ndarray, src: np.ndarray, mask: np.ndarray) -> None:
+    """
+    In-place equivalent of ``Image.paste(src, mask=src)`` on RGBA arrays.
+
+    Uses the same integer rounding as PIL's paste so results match exactly.
+    """
+    alpha = mask[..., None]
+    tmp = dst * (255 - alpha) + src * alpha + 128
+    dst[...] = ((tmp >> 8) + tmp) >> 8
+
+
 class ImageProcessor:
     """
     Handles image processing operations including stamping and signing.
@@ -111,26 +239,10 @@ class ImageProcessor:
 
                 url = f"{BASE_URL}/redirect/test_image_20250625124000_1024x1024.png"
 
-            # Generate the full-size QR code stamp based on mode
-            if use_logo:
-                qr_stamp_full = self.logo_to_qr(None, url)
-            else:
-                qr_stamp_full = self.simple_qr(None, url)
-
-            # Resize to stamp size
-            qr_stamp = qr_stamp_full.resize(self.stamp_size, Image.LANCZOS)
-
-            # Add white border around the QR code stamp
-            border_size = 3  # 3px white border
-            bordered_stamp = Image.new(
-                "RGBA",
-                (
-                    self.stamp_size[0] + 2 * border_size,
-                    self.stamp_size[1] + 2 * border_size,
-                ),
-                (255, 255, 255, 255),
-            )  # White background
-            bordered_stamp.paste(qr_stamp, (border_size, border_size), qr_stamp)
+            bordered_stamp = qr_stamp_cache.get_or_render(
+                (url, self._qr_style(use_logo), tuple(self.stamp_size)),
+                lambda: self._render_qr_stamp(url, use_logo),
+            )
 
             stamped = image.copy().convert("RGBA")
             img_width, img_height = stamped.size
@@ -145,6 +257,34 @@ class ImageProcessor:
             logger.error(error_msg)
             raise ImageProcessingError(error_msg) from e
 
+    def _qr_style(self, use_logo: bool) -> str:
+        """Cache key style for a QR stamp; logo stamps depend on the logo file."""
+        return f"logo:{self.logo_path}" if use_logo else "simple"
+
+    def _render_qr_stamp(self, url: str, use_logo: bool) -> Image.Image:
+        """Render the bordered, stamp-sized QR code for url."""
+        # Generate the full-size QR code stamp based on mode
+        if use_logo:
+            qr_stamp_full = self.logo_to_qr(None, url)
+        else:
+            qr_stamp_full = self.simple_qr(None, url)
+
+        # Resize to stamp size
+        qr_stamp = qr_stamp_full.resize(self.stamp_size, Image.LANCZOS)
+
+        # Add white border around the QR code stamp
+        border_size = 3  # 3px white border
+        bordered_stamp = Image.new(
+            "RGBA",
+            (
+                self.stamp_size[0] + 2 * border_size,
+                self.stamp_size[1] + 2 * border_size,
+            ),
+            (255, 255, 255, 255),
+        )  # White background
+        bordered_stamp.paste(qr_stamp, (border_size, border_size), qr_stamp)
+        return bordered_stamp
+
     def sign_image_with_clouvel(self, image: Image.Image) -> Image.Image:
         """
         Add a 'Clouvel '25' signature to the bottom-right corner of the image.
@@ -279,11 +419,60 @@ class ImageProcessor:
         Ignores the input image size, always returns a 512x512 QR code image.
         """
         # Always use the manual method for maximum control
-        return self._create_manual_styled_qr(url)
+        return qr_stamp_cache.get_or_render(
+            (url, self._qr_style(False), FULL_QR_SIZE),
+            lambda: self._create_manual_styled_qr(url),
+        )
 
     def _create_manual_styled_qr(self, url: str) -> Image.Image:
-        """Create a manually styled QR code with enhanced styling and Clouvel '25 signature for better appearance when reduced."""
-        QR_SIZE = 512
+        """
+        Create a styled QR code with the Clouvel '25 signature watermark.
+
+        The whole module grid is rasterized in a single NumPy pass: halos and
+        rounded modules are stamped from precomputed sprites, and the
+        gradient is computed once per grid size. Output matches the
+        per-module reference renderer in tests/test_image_processor.py.
+        """
+        qr_img = self._styled_qr_background()
+        dark = np.array(self._styled_qr_matrix(url), dtype=bool)
+        modules_count = dark.shape[0]
+        module_size = STYLED_QR_SIZE // modules_count
+        span = modules_count * module_size
+
+        halo_tiles, module_mask = _styled_module_sprites(module_size)
+        canvas = np.asarray(qr_img, dtype=np.int32).copy()
+        grid = canvas[:span, :span]
+        padded_dark = np.pad(dark, 1)
+        halo_color = np.array(STYLED_QR_HALO, dtype=np.int32)
+
+        # A pixel is only touched by its own module and the halos of its 8
+        # neighbours. Row-major drawing order visits those cells in the same
+        # (dy, dx) order for every pixel, so each offset is one canvas-wide
+        # blend and the result matches drawing module by module.
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                source = padded_dark[
+                    1 + dy : 1 + dy + modules_count, 1 + dx : 1 + dx + modules_count
+                ]
+                if source.any():
+                    mask = np.kron(source, halo_tiles[(-dy, -dx)])
+                    _paste_blend(grid, halo_color, mask)
+
+                if dy == 0 and dx == 0:
+                    colors = _styled_module_colors(modules_count)
+                    colors = np.repeat(
+                        np.repeat(colors, module_size, axis=0), module_size, axis=1
+                    )
+                    module_color = np.concatenate(
+                        [colors, np.full(colors.shape[:2] + (1,), 255)], axis=-1
+                    )
+                    mask = np.kron(dark, module_mask)
+                    _paste_blend(grid, module_color, mask)
+
+        return Image.fromarray(canvas.astype(np.uint8))
+
+    def _styled_qr_matrix(self, url: str) -> list:
+        """Build the boolean module matrix (including quiet zone) for url."""
         qr = qrcode.QRCode(
             version=1,
             error_correction=qrcode.constants.ERROR_CORRECT_H,
@@ -292,11 +481,12 @@ class ImageProcessor:
         )
         qr.add_data(url)
         qr.make(fit=True)
+        return qr.get_matrix()
 
-        # Soft, very light blue/grey background
-        bg_color = (235, 240, 250, 255)  # Very light blue-grey, fully opaque
-        qr_img = Image.new("RGBA", (QR_SIZE, QR_SIZE), bg_color)
-        draw = ImageDraw.Draw(qr_img)
+    def _styled_qr_background(self) -> Image.Image:
+        """Create the styled QR background with the Clouvel '25 watermark."""
+        QR_SIZE = STYLED_QR_SIZE
+        qr_img = Image.new("RGBA", (QR_SIZE, QR_SIZE), STYLED_QR_BACKGROUND)
 
         # Add subtle Clouvel '25 signature watermark
         try:
@@ -358,70 +548,6 @@ class ImageProcessor:
             logger.warning(f"Could not add signature watermark: {e}")
             # Continue without signature if there's an error
 
-        # Enhanced blue/grey gradient for better readability when reduced
-        grad_start = np.array([70, 100, 150])  # Darker blue-grey
-        grad_end = np.array([110, 140, 190])  # Lighter blue-grey
-        alpha = 255  # Fully opaque for maximum contrast and readability
-
-        qr_matrix = qr.get_matrix()
-        modules_count = len(qr_matrix)
-        module_size = QR_SIZE // modules_count
-
-        # Larger corner radius for smoother appearance when scaled
-        corner_radius = max(6, module_size // 2)
-
-        for y in range(modules_count):
-            for x in range(modules_count):
-                if qr_matrix[y][x]:
-                    # Calculate gradient based on position
-                    t = (y + x) / (2 * (modules_count - 1))  # Diagonal gradient
-                    color = tuple((grad_start * (1 - t) + grad_end * t).astype(int))
-
-                    # Module coordinates
-                    left = x * module_size
-                    top = y * module_size
-                    right = (x + 1) * module_size
-                    bottom = (y + 1) * module_size
-
-                    # Create a slightly larger area for the halo effect
-                    halo_size = module_size + 4
-                    halo_left = left - 2
-                    halo_top = top - 2
-
-                    # Draw white halo/glow first
-                    halo_mask = Image.new("L", (halo_size, halo_size), 0)
-                    halo_draw = ImageDraw.Draw(halo_mask)
-                    halo_draw.rounded_rectangle(
-                        [0, 0, halo_size, halo_size],
-                        radius=corner_radius + 2,
-                        fill=180,  # Semi-transparent white
-                    )
-
-                    # Create the halo image
-                    halo_img = Image.new(
-                        "RGBA", (halo_size, halo_size), (255, 255, 255, 180)
-                    )
-                    halo_img.putalpha(halo_mask)
-
-                    # Paste the halo
-                    qr_img.paste(halo_img, (halo_left, halo_top), halo_img)
-
-                    # Draw the main module with rounded corners
-                    mask = Image.new("L", (module_size, module_size), 0)
-                    mask_draw = ImageDraw.Draw(mask)
-                    mask_draw.rounded_rectangle(
-                        [0, 0, module_size, module_size], radius=corner_radius, fill=255
-                    )
-
-                    # Create the colored module
-                    module_img = Image.new(
-                        "RGBA", (module_size, module_size), color + (alpha,)
-                    )
-                    module_img.putalpha(mask)
-
-                    # Paste the main module
-                    qr_img.paste(module_img, (left, top), module_img)
-
         return qr_img
 
     def logo_to_qr(
@@ -431,6 +557,13 @@ class ImageProcessor:
         Generate a full-size QR code image (512x512) with the prepped background and advanced styling.
         Ignores the input image size, always returns a 512x512 QR code image.
         """
+        return qr_stamp_cache.get_or_render(
+            (url, self._qr_style(True), FULL_QR_SIZE),
+            lambda: self._render_logo_qr(url),
+        )
+
+    def _render_logo_qr(self, url: str) -> Image.Image:
+        """Render the logo-background QR code for logo_to_qr."""
         try:
             prepped_bg_path = os.path.join(
                 os.path.dirname(__file__), "../../scripts/logo_qr_background.png"
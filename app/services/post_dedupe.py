@@ -0,0 +1,280 @@
+"""
+Batched "have we seen this post?" checks for Reddit scanning.
+
+Scanning loops used to query the database once per submission to skip posts
+that were already processed (RedditPost), scanned by the promoter agent
+(AgentScannedPost) or commissioned (Donation). PostDedupe answers for a whole
+page of submission ids at once.
+
+An in-memory Bloom filter holds every known post id. Ids the filter has never
+seen are definitely new and need no query; the rest (known posts plus rare
+false positives) are confirmed with one query across the source tables. The filter
+is warmed from the database on first use, updated by insert listeners in this
+process, and caught up with rows inserted by other processes at most every
+POST_DEDUPE_SYNC_SECONDS.
+
+Row ids are handed out when a transaction inserts, not when it commits, so a
+slow transaction can commit a row below ids a sync has already passed. Each
+sync therefore re-reads the last POST_DEDUPE_SYNC_OVERLAP ids of every table,
+and the filter is rebuilt every POST_DEDUPE_REWARM_SECONDS to pick up anything
+that committed later still.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from typing import Dict, Iterable, Optional, Sequence, Set
+
+from sqlalchemy import event, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.config import (
+    POST_DEDUPE_CAPACITY,
+    POST_DEDUPE_ERROR_RATE,
+    POST_DEDUPE_REWARM_SECONDS,
+    POST_DEDUPE_SYNC_OVERLAP,
+    POST_DEDUPE_SYNC_SECONDS,
+)
+from app.db.models import AgentScannedPost, Donation, RedditPost
+from app.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Tables a post id can be known from
+SOURCES = {
+    "processed": RedditPost,
+    "scanned": AgentScannedPost,
+    "commissioned": Donation,
+}
+ALL_SOURCES = tuple(SOURCES)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter of strings.
+
+    Args:
+        capacity: Expected number of items
+        error_rate: Target false-positive rate at capacity
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(capacity, 1)
+        self.size = max(
+            8, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str) -> Iterable[int]:
+        # Double hashing: two 64-bit halves of one digest derive all k positions
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        added = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not self._bits[position >> 3] & mask:
+                self._bits[position >> 3] |= mask
+                added = True
+        # Re-adding a present item (e.g. from a sync overlap) leaves count alone
+        if added:
+            self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class PostDedupe:
+    """
+    Bloom-filtered, batched lookup of already-known Reddit post ids.
+
+    Args:
+        capacity: Minimum Bloom filter capacity
+        error_rate: Bloom filter false-positive rate
+        sync_interval: Seconds between catch-ups with other processes' inserts
+        sync_overlap: Trailing row ids re-read by each catch-up
+        rewarm_interval: Seconds between full rebuilds of the filter
+    """
+
+    def __init__(
+        self,
+        capacity: int = POST_DEDUPE_CAPACITY,
+        error_rate: float = POST_DEDUPE_ERROR_RATE,
+        sync_interval: float = POST_DEDUPE_SYNC_SECONDS,
+        sync_overlap: int = POST_DEDUPE_SYNC_OVERLAP,
+        rewarm_interval: float = POST_DEDUPE_REWARM_SECONDS,
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.sync_overlap = sync_overlap
+        self.rewarm_interval = rewarm_interval
+        self._lock = threading.Lock()
+        self._bloom: Optional[BloomFilter] = None
+        # Highest row id seen per source, for incremental catch-up
+        self._high_water: Dict[str, int] = {}
+        self._synced_at = 0.0
+        self._warmed_at = 0.0
+
+        self.checked = 0
+        self.bloom_rejections = 0
+        self.db_confirmed = 0
+
+    def warm(self, session: Session) -> int:
+        """
+        (Re)build the Bloom filter from every known post id.
+
+        Args:
+            session: Database session
+
+        Returns:
+            int: Number of post ids loaded
+        """
+        rows = session.execute(self._rows_since({})).all()
+        bloom = BloomFilter(max(self.capacity, 2 * len(rows)), self.error_rate)
+        high_water = {source: 0 for source in SOURCES}
+        for source, row_id, post_id in rows:
+            bloom.add(post_id)
+            high_water[source] = max(high_water[source], row_id)
+
+        with self._lock:
+            self._bloom = bloom
+            self._high_water = high_water
+            self._synced_at = self._warmed_at = time.monotonic()
+        logger.info(f"Warmed post dedupe filter with {len(rows)} post ids")
+        return len(rows)
+
+    def _rows_since(self, high_water: Dict[str, int], overlap: int = 0):
+        return union_all(
+            *(
+                select(literal(source), model.id, model.post_id).where(
+                    model.id > high_water.get(source, 0) - overlap,
+                    model.post_id.isnot(None),
+                )
+                for source, model in SOURCES.items()
+            )
+        )
+
+    def sync(self, session: Session) -> int:
+        """
+        Add post ids inserted since the last warm or sync, e.g. by other processes.
+
+        The last sync_overlap ids per table are read again so rows that
+        committed after a higher id was seen are not missed; once
+        rewarm_interval has passed the filter is rebuilt instead.
+
+        Args:
+            session: Database session
+
+        Returns:
+            int: Number of post ids read
+        """
+        with self._lock:
+            high_water = dict(self._high_water)
+            rewarm = time.monotonic() - self._warmed_at >= self.rewarm_interval
+        if rewarm:
+            return self.warm(session)
+        rows = session.execute(self._rows_since(high_water, self.sync_overlap)).all()
+
+        with self._lock:
+            if self._bloom is None:
+                return 0
+            for source, row_id, post_id in rows:
+                self._bloom.add(post_id)
+                self._high_water[source] = max(self._high_water[source], row_id)
+            self._synced_at = time.monotonic()
+            overfull = self._bloom.count > self._bloom.capacity
+        if overfull:
+            self.warm(session)
+        return len(rows)
+
+    def add(self, post_id: str) -> None:
+        """Record a post id as known."""
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(post_id)
+
+    def known_post_ids(
+        self,
+        session: Session,
+        post_ids: Iterable[str],
+        sources: Sequence[str] = ALL_SOURCES,
+    ) -> Set[str]:
+        """
+        Return which of a page of post ids are already known.
+
+        Args:
+            session: Database session
+            post_ids: Submission ids to check
+            sources: Which of "processed", "scanned" and "commissioned" count
+
+        Returns:
+            Set of post ids found in any of the given sources
+        """
+        post_ids = set(post_ids)
+        if self._bloom is None:
+            self.warm(session)
+        elif time.monotonic() - self._synced_at >= self.sync_interval:
+            self.sync(session)
+
+        with self._lock:
+            maybe_known = [p for p in post_ids if p in self._bloom]
+            self.checked += len(post_ids)
+            self.bloom_rejections += len(post_ids) - len(maybe_known)
+        if not maybe_known:
+            return set()
+
+        known = set(
+            session.execute(
+                union_all(
+                    *(
+                        select(SOURCES[source].post_id).where(
+                            SOURCES[source].post_id.in_(maybe_known)
+                        )
+                        for source in sources
+                    )
+                )
+            ).scalars()
+        )
+        with self._lock:
+            self.db_confirmed += len(known)
+        return known
+
+    def clear(self) -> None:
+        """Drop the filter; the next check warms it again."""
+        with self._lock:
+            self._bloom = None
+            self._high_water = {}
+
+    def stats(self) -> Dict[str, float]:
+        """Return filter size and hit counters."""
+        with self._lock:
+            return {
+                "warm": self._bloom is not None,
+                "post_ids": self._bloom.count if self._bloom else 0,
+                "checked": self.checked,
+                "bloom_rejections": self.bloom_rejections,
+                "db_confirmed": self.db_confirmed,
+            }
+
+
+# Global post dedupe instance
+post_dedupe = PostDedupe()
+
+
+def _remember_post_id(mapper, connection, target):
+    if target.post_id:
+        post_dedupe.add(target.post_id)
+
+
+for _model in SOURCES.values():
+    event.listen(_model, "after_insert", _remember_post_id)
@@ -1,15 +1,17 @@
+import asyncio
 import logging
 import os
-import threading
-import time
 from decimal import Decimal
 from typing import Dict, Optional
 
 import stripe
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.db.models import Donation, PipelineTask, SubredditFundraisingGoal
 from app.models import DonationRequest, DonationStatus
+from app.services.distributed_lock import LockTimeoutError, payment_intent_lock
+from app.services.gallery_service import GalleryService
 from app.subreddit_tier_service import SubredditTierService
 
 logger = logging.getLogger(__name__)
@@ -33,58 +35,6 @@ class StripeService:
                 "STRIPE_PUBLISHABLE_KEY not set - client-side operations may fail"
             )
 
-        # In-memory lock for payment intent operations
-        self._payment_intent_locks = {}
-        self._lock_mutex = threading.Lock()
-
-    def _acquire_payment_intent_lock(
-        self, payment_intent_id: str, timeout: int = 30
-    ) -> bool:
-        """
-        Acquire a lock for a payment intent to prevent concurrent modifications.
-
-        Args:
-            payment_intent_id: The payment intent ID to lock
-            timeout: Maximum time to wait for the lock in seconds
-
-        Returns:
-            bool: True if lock was acquired, False otherwise
-        """
-        start_time = time.time()
-
-        while time.time() - start_time < timeout:
-            with self._lock_mutex:
-                if payment_intent_id not in self._payment_intent_locks:
-                    self._payment_intent_locks[payment_intent_id] = threading.Lock()
-
-                if self._payment_intent_locks[payment_intent_id].acquire(
-                    blocking=False
-                ):
-                    logger.debug(
-                        f"Acquired lock for payment intent {payment_intent_id}"
-                    )
-                    return True
-
-            # Wait a bit before trying again
-            time.sleep(0.1)
-
-        logger.warning(
-            f"Failed to acquire lock for payment intent {payment_intent_id} after {timeout}s"
-        )
-        return False
-
-    def _release_payment_intent_lock(self, payment_intent_id: str):
-        """
-        Release a lock for a payment intent.
-
-        Args:
-            payment_intent_id: The payment intent ID to unlock
-        """
-        with self._lock_mutex:
-            if payment_intent_id in self._payment_intent_locks:
-                self._payment_intent_locks[payment_intent_id].release()
-                logger.debug(f"Released lock for payment intent {payment_intent_id}")
-
     def _validate_and_prepare_metadata(self, donation_request: DonationRequest) -> Dict:
         """
         Validate and prepare metadata for Stripe payment intent.
@@ -241,12 +191,16 @@ class StripeService:
             )
             raise
 
-    def update_payment_intent(
+    async def update_payment_intent(
         self, payment_intent_id: str, donation_request: DonationRequest
     ) -> Dict:
         """
         Update a Stripe payment intent with new metadata and amount.
 
+        Concurrent updates of the same intent are serialized cluster-wide by
+        the payment intent lock; the Stripe calls run in a worker thread so
+        waiting never blocks the event loop.
+
         Args:
             payment_intent_id: The Stripe payment intent ID to update
             donation_request: The donation request containing updated info
@@ -257,12 +211,26 @@ class StripeService:
         Raises:
             stripe.error.StripeError: If Stripe API call fails
         """
-        # Acquire lock to prevent concurrent modifications
-        if not self._acquire_payment_intent_lock(payment_intent_id):
+        try:
+            async with payment_intent_lock.hold(payment_intent_id) as lease:
+                logger.debug(
+                    f"Holding lock for payment intent {payment_intent_id} "
+                    f"(fencing token {lease.fencing_token})"
+                )
+                return await asyncio.to_thread(
+                    self._update_payment_intent_locked,
+                    payment_intent_id,
+                    donation_request,
+                )
+        except LockTimeoutError:
             raise Exception(
                 f"Unable to acquire lock for payment intent {payment_intent_id}"
             )
 
+    def _update_payment_intent_locked(
+        self, payment_intent_id: str, donation_request: DonationRequest
+    ) -> Dict:
+        """Update a payment intent; the caller holds its lock."""
         try:
             # First, retrieve the payment intent to check if it exists and can be updated
             try:
@@ -329,9 +297,6 @@ class StripeService:
                 f"Unexpected error updating payment intent {payment_intent_id}: {str(e)}"
             )
             raise
-        finally:
-            # Always release the lock
-            self._release_payment_intent_lock(payment_intent_id)
 
     def save_donation_to_db(
         self, db: Session, payment_intent_data: Dict, donation_request: DonationRequest
@@ -497,6 +462,9 @@ class StripeService:
                 db.refresh(donation)
                 logger.info(f"Updated donation {donation.id} status to {status.value}")
 
+                # Refresh any gallery cards that display this donation
+                GalleryService(db).refresh_for_donation(donation.id)
+
                 # Create pipeline task if donation succeeded and is a commission
                 if (
                     status == DonationStatus.SUCCEEDED
@@ -700,24 +668,29 @@ class StripeService:
             Dict containing donation summary
         """
         try:
-            # Get total successful donations
-            successful_donations = (
-                db.query(Donation)
-                .filter_by(status=DonationStatus.SUCCEEDED.value)
-                .all()
-            )
+            succeeded = Donation.status == DonationStatus.SUCCEEDED.value
 
-            total_donations = len(successful_donations)
-            total_amount_usd = sum(
-                donation.amount_usd for donation in successful_donations
+            # Count and sum in the database instead of loading every donation
+            total_donations, total_amount_usd = (
+                db.query(
+                    func.count(Donation.id),
+                    func.coalesce(func.sum(Donation.amount_usd), 0),
+                )
+                .filter(succeeded)
+                .one()
             )
 
             # Count unique donors (by email, excluding anonymous)
-            unique_emails = set()
-            for donation in successful_donations:
-                if donation.customer_email and not donation.is_anonymous:
-                    unique_emails.add(donation.customer_email)
-            total_donors = len(unique_emails)
+            total_donors = (
+                db.query(func.count(func.distinct(Donation.customer_email)))
+                .filter(
+                    succeeded,
+                    Donation.customer_email.isnot(None),
+                    Donation.customer_email != "",
+                    Donation.is_anonymous.isnot(True),
+                )
+                .scalar()
+            )
 
             # Get recent donations
             recent_donations = (
@@ -802,6 +775,7 @@ class StripeService:
             donation.stripe_refund_id = refund.id
             donation.message = f"Refunded: {reason}"
             db.commit()
+            GalleryService(db).refresh_for_donation(donation.id)
 
             logger.info(
                 f"Successfully refunded payment intent {payment_intent_id} for donation {donation.id} "
@@ -925,6 +899,7 @@ class StripeService:
             donation.status = DonationStatus.REFUNDED.value
             donation.stripe_refund_id = refund.id
             db.commit()
+            GalleryService(db).refresh_for_donation(donation.id)
 
             logger.info(
                 f"Successfully refunded donation {donation_id} (refund_id: {refund.id})"
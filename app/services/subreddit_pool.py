@@ -0,0 +1,281 @@
+"""
+In-memory pool of subreddits for random commissions.
+
+pick_subreddit used to list 100 hot posts from r/all on every call just to
+choose one subreddit name, and random commissions call it several times. The
+pool instead refreshes in the background: it reads r/all once per interval,
+records the subreddits it sees (with subscriber counts) in the subreddits
+table, and loads the table into memory. Picking is then a weighted random
+choice over that list, favouring large subreddits and ones whose recent
+commissions completed.
+"""
+
+import asyncio
+import math
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.clients.reddit_client import EXCLUDED_RANDOM_SUBREDDITS, RedditClient
+from app.config import (
+    SUBREDDIT_POOL_REFRESH_INTERVAL,
+    SUBREDDIT_POOL_SUCCESS_WINDOW_DAYS,
+)
+from app.db.database import SessionLocal
+from app.db.models import PipelineTask, Subreddit
+from app.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Each recent completed commission adds this much to a subreddit's weight,
+# up to MAX_SUCCESS_BOOST times
+SUCCESS_BOOST = 0.25
+MAX_SUCCESS_BOOST = 8
+
+
+def subreddit_weight(subscribers: Optional[int], recent_successes: int) -> float:
+    """
+    Sampling weight of a subreddit.
+
+    Args:
+        subscribers: Subscriber count, if known
+        recent_successes: Commissions completed within the success window
+
+    Returns:
+        float: Relative weight
+    """
+    size = math.log10((subscribers or 0) + 10)
+    return size * (1 + SUCCESS_BOOST * min(recent_successes, MAX_SUCCESS_BOOST))
+
+
+class SubredditPool:
+    """
+    Weighted pool of subreddit names, refreshed from r/all in the background.
+
+    Args:
+        refresh_interval: Seconds between background refreshes; also how stale
+            the in-memory copy may get before it is reloaded from the database
+        success_window_days: How far back completed commissions count
+    """
+
+    def __init__(
+        self,
+        refresh_interval: float = SUBREDDIT_POOL_REFRESH_INTERVAL,
+        success_window_days: int = SUBREDDIT_POOL_SUCCESS_WINDOW_DAYS,
+    ):
+        self.refresh_interval = refresh_interval
+        self.success_window_days = success_window_days
+        self.running = False
+        self._lock = threading.Lock()
+        self._names: List[str] = []
+        self._weights: List[float] = []
+        self._loaded_at: Optional[float] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+        self.picks = 0
+        self.refreshes = 0
+
+    def load(self, session: Session) -> int:
+        """
+        Load the pool from the subreddits table.
+
+        Args:
+            session: Database session
+
+        Returns:
+            int: Number of subreddits in the pool
+        """
+        since = datetime.now(timezone.utc) - timedelta(days=self.success_window_days)
+        rows = session.execute(
+            select(
+                Subreddit.subreddit_name,
+                Subreddit.subscribers,
+                func.count(PipelineTask.id),
+            )
+            .outerjoin(
+                PipelineTask,
+                and_(
+                    PipelineTask.subreddit_id == Subreddit.id,
+                    PipelineTask.status == "completed",
+                    PipelineTask.completed_at >= since,
+                ),
+            )
+            .where(Subreddit.over18.is_(False))
+            .group_by(Subreddit.id, Subreddit.subreddit_name, Subreddit.subscribers)
+        ).all()
+
+        entries: List[Tuple[str, float]] = [
+            (name, subreddit_weight(subscribers, successes))
+            for name, subscribers, successes in rows
+            if name.lower() not in EXCLUDED_RANDOM_SUBREDDITS
+        ]
+        with self._lock:
+            self._names = [name for name, _ in entries]
+            self._weights = [weight for _, weight in entries]
+            self._loaded_at = time.monotonic()
+        return len(entries)
+
+    def pick(self, session: Optional[Session] = None) -> Optional[str]:
+        """
+        Pick a random subreddit, weighted by size and recent success.
+
+        Args:
+            session: Used to (re)load the pool if it is empty or stale
+
+        Returns:
+            Subreddit name, or None if the pool is empty
+        """
+        stale = (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at > self.refresh_interval
+        )
+        if stale and session is not None:
+            try:
+                self.load(session)
+            except Exception as e:
+                logger.warning(f"Failed to load subreddit pool: {e}")
+
+        with self._lock:
+            if not self._names:
+                return None
+            self.picks += 1
+            return random.choices(self._names, weights=self._weights)[0]
+
+    def record_listing(self, session: Session, submissions: List[Any]) -> int:
+        """
+        Save the subreddits seen in a listing, with their subscriber counts.
+
+        Subreddits seen only through NSFW posts are left out.
+
+        Args:
+            session: Database session
+            submissions: PRAW submissions, e.g. r/all hot posts
+
+        Returns:
+            int: Number of distinct subreddits seen
+        """
+        # Keyed by lowercased name; Reddit names are case-insensitive
+        seen: Dict[str, Tuple[str, Optional[int]]] = {}
+        for submission in submissions:
+            name = submission.subreddit.display_name
+            if name.lower() in EXCLUDED_RANDOM_SUBREDDITS:
+                continue
+            # New rows default to over18=False, so NSFW posts must not add one
+            if getattr(submission, "over_18", False):
+                continue
+            # Listings carry the subscriber count, so no per-subreddit fetch
+            seen[name.lower()] = (
+                name,
+                getattr(submission, "subreddit_subscribers", None),
+            )
+        if not seen:
+            return 0
+
+        existing = {
+            s.subreddit_name.lower(): s
+            for s in session.query(Subreddit).filter(
+                func.lower(Subreddit.subreddit_name).in_(list(seen))
+            )
+        }
+        for key, (name, subscribers) in seen.items():
+            subreddit = existing.get(key)
+            if subreddit is None:
+                try:
+                    with session.begin_nested():
+                        session.add(
+                            Subreddit(
+                                subreddit_name=name,
+                                display_name=name,
+                                subscribers=subscribers,
+                            )
+                        )
+                except IntegrityError:
+                    # Another process recorded the subreddit first
+                    logger.debug(f"Subreddit r/{name} already recorded")
+            elif subscribers is not None:
+                subreddit.subscribers = subscribers
+        session.commit()
+        return len(seen)
+
+    def refresh(self, session: Session, reddit_client: Any) -> int:
+        """
+        Read r/all, record its subreddits and reload the pool.
+
+        Args:
+            session: Database session
+            reddit_client: RedditClient to read the listing with
+
+        Returns:
+            int: Number of subreddits in the pool
+        """
+        submissions = list(reddit_client.reddit.subreddit("all").hot(limit=100))
+        seen = self.record_listing(session, submissions)
+        size = self.load(session)
+        self.refreshes += 1
+        logger.info(f"Refreshed subreddit pool: {seen} seen on r/all, {size} total")
+        return size
+
+    def _refresh_once(self) -> None:
+        db = SessionLocal()
+        try:
+            self.refresh(db, RedditClient())
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def start(self) -> None:
+        """Run the refresh loop until stopped."""
+        self.running = True
+        self._wakeup = asyncio.Event()
+        logger.info("Starting subreddit pool refresher")
+
+        while self.running:
+            try:
+                await asyncio.to_thread(self._refresh_once)
+            except Exception as e:
+                logger.error(f"Error refreshing subreddit pool: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.refresh_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def stop(self) -> None:
+        """Stop the refresh loop."""
+        self.running = False
+        if self._wakeup is not None:
+            self._wakeup.set()
+        logger.info("Subreddit pool refresher stopped")
+
+    def clear(self) -> None:
+        """Empty the in-memory pool."""
+        with self._lock:
+            self._names = []
+            self._weights = []
+            self._loaded_at = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool size and counters."""
+        with self._lock:
+            return {
+                "size": len(self._names),
+                "picks": self.picks,
+                "refreshes": self.refreshes,
+                "age_seconds": (
+                    round(time.monotonic() - self._loaded_at, 1)
+                    if self._loaded_at is not None
+                    else None
+                ),
+            }
+
+
+# Global subreddit pool instance
+subreddit_pool = SubredditPool()
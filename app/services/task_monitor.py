@@ -3,6 +3,11 @@ Task Monitor Service for detecting and handling stuck tasks.
 
 This service monitors running tasks and detects when they become stuck,
 then provides mechanisms to restart or recover them.
+
+Every in-progress task carries a heartbeat deadline (``deadline_at``), so each
+check is a single indexed range query for expired deadlines. A replica claims
+a stuck task by atomically pushing its deadline out by a short lease before
+handling it, so several API replicas never restart the same task twice.
 """
 
 import asyncio
@@ -10,6 +15,7 @@ import logging
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional
 
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 
 from app.db.database import SessionLocal
@@ -29,6 +35,7 @@ class TaskMonitor:
         self.monitor_task = None
         self.check_interval = 60  # Check every minute
         self.task_timeout = 300  # 5 minutes default timeout
+        self.claim_lease = 120  # Seconds other replicas skip a claimed task
 
     async def start_monitoring(self):
         """Start the task monitoring loop."""
@@ -72,6 +79,11 @@ class TaskMonitor:
                 stuck_tasks = self._find_stuck_tasks(db)
 
                 for task in stuck_tasks:
+                    if not self._claim_stuck_task(db, task):
+                        logger.debug(
+                            f"Stuck task {task.id} already claimed by another monitor"
+                        )
+                        continue
                     logger.warning(f"Found stuck task {task.id} - handling...")
                     await self._handle_stuck_task(db, task)
 
@@ -92,9 +104,18 @@ class TaskMonitor:
 
         stuck_tasks = []
 
-        # Query for in_progress tasks
+        # Only in_progress tasks whose heartbeat deadline has passed; rows
+        # without a deadline fall through to the started_at/created_at checks
         in_progress_tasks = (
-            db.query(PipelineTask).filter(PipelineTask.status == "in_progress").all()
+            db.query(PipelineTask)
+            .filter(
+                PipelineTask.status == "in_progress",
+                or_(
+                    PipelineTask.deadline_at <= now,
+                    PipelineTask.deadline_at.is_(None),
+                ),
+            )
+            .all()
         )
 
         for task in in_progress_tasks:
@@ -132,6 +153,42 @@ class TaskMonitor:
 
         return stuck_tasks
 
+    def _claim_stuck_task(self, db: Session, task: PipelineTask) -> bool:
+        """
+        Atomically claim a stuck task for this monitor.
+
+        The claim is a compare-and-set on deadline_at: it only succeeds if the
+        task is still in progress with the deadline we saw, and it moves the
+        deadline ``claim_lease`` seconds ahead. Other replicas then no longer
+        see the task as expired, and if this one dies before handling it the
+        lease lapses and the task is picked up again.
+
+        Returns:
+            bool: True if this monitor now owns the task
+        """
+        try:
+            seen_deadline = task.deadline_at
+            query = db.query(PipelineTask).filter(
+                PipelineTask.id == task.id, PipelineTask.status == "in_progress"
+            )
+            if seen_deadline is None:
+                query = query.filter(PipelineTask.deadline_at.is_(None))
+            else:
+                query = query.filter(PipelineTask.deadline_at == seen_deadline)
+
+            lease_until = datetime.now(timezone.utc) + timedelta(
+                seconds=self.claim_lease
+            )
+            claimed = query.update(
+                {PipelineTask.deadline_at: lease_until}, synchronize_session=False
+            )
+            db.commit()
+            return claimed == 1
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error claiming stuck task {task.id}: {e}")
+            return False
+
     async def _handle_stuck_task(self, db: Session, task: PipelineTask):
         """Handle a stuck task by attempting to restart it."""
         try:
@@ -0,0 +1,358 @@
+"""
+Durable inbox for Stripe webhook events.
+
+The webhook endpoint only verifies the signature, records the event here and
+acknowledges it, so Stripe gets its 2xx quickly even during bursts. The
+WebhookConsumer drains the inbox in the background:
+
+- Redeliveries are deduplicated by the unique Stripe event id.
+- Events for the same payment intent are handled one at a time, oldest first.
+- Failed events are retried with exponential backoff until they run out of
+  attempts, and an event whose consumer died is reclaimed once its lease
+  expires.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import (
+    WEBHOOK_BATCH_SIZE,
+    WEBHOOK_LEASE_SECONDS,
+    WEBHOOK_MAX_ATTEMPTS,
+    WEBHOOK_POLL_INTERVAL,
+    WEBHOOK_RETRY_BASE_SECONDS,
+    WEBHOOK_RETRY_MAX_SECONDS,
+)
+from app.db.database import SessionLocal
+from app.db.models import WebhookEvent
+from app.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Statuses of events that still have to be handled
+UNFINISHED_STATUSES = ("pending", "processing")
+
+WebhookHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def _payment_intent_id(payload: Dict[str, Any]) -> Optional[str]:
+    """Extract the payment intent an event refers to, if any."""
+    obj = (payload.get("data") or {}).get("object") or {}
+    if obj.get("object") == "payment_intent":
+        return obj.get("id")
+    payment_intent = obj.get("payment_intent")
+    if isinstance(payment_intent, dict):
+        return payment_intent.get("id")
+    return payment_intent
+
+
+class WebhookInbox:
+    """Database operations on the webhook_events inbox."""
+
+    def __init__(self, session: Session):
+        """
+        Initialize the webhook inbox.
+
+        Args:
+            session: SQLAlchemy database session
+        """
+        self.session = session
+
+    def record_event(self, payload: Dict[str, Any]) -> bool:
+        """
+        Persist a verified webhook event.
+
+        Args:
+            payload: Parsed Stripe event body
+
+        Returns:
+            bool: True if the event was new, False for a duplicate delivery
+        """
+        duplicate = (
+            self.session.query(WebhookEvent.id)
+            .filter(WebhookEvent.stripe_event_id == payload["id"])
+            .first()
+        )
+        if duplicate:
+            logger.info(f"Duplicate webhook event {payload['id']} ignored")
+            return False
+
+        event = WebhookEvent(
+            stripe_event_id=payload["id"],
+            event_type=payload["type"],
+            payment_intent_id=_payment_intent_id(payload),
+            payload=payload,
+            status="pending",
+            next_attempt_at=datetime.now(timezone.utc),
+            stripe_created=payload.get("created"),
+        )
+        self.session.add(event)
+        try:
+            self.session.commit()
+        except IntegrityError:
+            # A concurrent delivery of the same event won the insert
+            self.session.rollback()
+            logger.info(f"Duplicate webhook event {payload['id']} ignored")
+            return False
+        return True
+
+    def claim_due_events(
+        self,
+        limit: int = WEBHOOK_BATCH_SIZE,
+        lease_seconds: int = WEBHOOK_LEASE_SECONDS,
+    ) -> List[WebhookEvent]:
+        """
+        Claim due events for processing.
+
+        An event is due when it is pending and its retry time has passed, or
+        processing with an expired lease. Only the oldest unfinished event of
+        each payment intent is eligible, so a later event waits for (or backs
+        off behind) an earlier one. Each claim is a compare-and-set on the
+        attempt counter, so two consumers never process the same event.
+
+        Args:
+            limit: Maximum number of events to claim
+            lease_seconds: Seconds before an unfinished claim can be reclaimed
+
+        Returns:
+            List[WebhookEvent]: Claimed events, oldest first
+        """
+        now = datetime.now(timezone.utc)
+        order = (WebhookEvent.stripe_created.asc(), WebhookEvent.id.asc())
+        candidates = (
+            self.session.query(WebhookEvent)
+            .filter(
+                WebhookEvent.status.in_(UNFINISHED_STATUSES),
+                WebhookEvent.next_attempt_at <= now,
+            )
+            .order_by(*order)
+            .limit(limit * 4)
+            .all()
+        )
+        if not candidates:
+            return []
+
+        # The head (oldest unfinished event) of each payment intent in play
+        intents = {e.payment_intent_id for e in candidates if e.payment_intent_id}
+        heads: Dict[str, int] = {}
+        if intents:
+            rows = (
+                self.session.query(WebhookEvent.id, WebhookEvent.payment_intent_id)
+                .filter(
+                    WebhookEvent.payment_intent_id.in_(intents),
+                    WebhookEvent.status.in_(UNFINISHED_STATUSES),
+                )
+                .order_by(*order)
+                .all()
+            )
+            for event_id, payment_intent_id in rows:
+                heads.setdefault(payment_intent_id, event_id)
+
+        claimed_ids = []
+        for event in candidates:
+            if len(claimed_ids) >= limit:
+                break
+            if event.payment_intent_id and heads[event.payment_intent_id] != event.id:
+                continue
+            result = self.session.execute(
+                update(WebhookEvent)
+                .where(
+                    and_(
+                        WebhookEvent.id == event.id,
+                        WebhookEvent.status == event.status,
+                        WebhookEvent.attempts == event.attempts,
+                    )
+                )
+                .values(
+                    status="processing",
+                    attempts=WebhookEvent.attempts + 1,
+                    next_attempt_at=now + timedelta(seconds=lease_seconds),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount:
+                claimed_ids.append(event.id)
+        self.session.commit()
+
+        if not claimed_ids:
+            return []
+        return (
+            self.session.query(WebhookEvent)
+            .filter(WebhookEvent.id.in_(claimed_ids))
+            .order_by(*order)
+            .populate_existing()
+            .all()
+        )
+
+    def mark_done(self, event: WebhookEvent, status: str = "processed") -> None:
+        """
+        Mark a claimed event as finished.
+
+        Args:
+            event: Claimed event
+            status: "processed", or "ignored" for events without a handler
+        """
+        event.status = status
+        event.processed_at = datetime.now(timezone.utc)
+        event.last_error = None
+        self.session.commit()
+
+    def mark_failed(
+        self,
+        event: WebhookEvent,
+        error: str,
+        max_attempts: int = WEBHOOK_MAX_ATTEMPTS,
+        base_delay: float = WEBHOOK_RETRY_BASE_SECONDS,
+        max_delay: float = WEBHOOK_RETRY_MAX_SECONDS,
+    ) -> None:
+        """
+        Record a processing failure and schedule a retry with backoff.
+
+        Args:
+            event: Claimed event
+            error: Error description
+            max_attempts: Attempts after which the event is given up on
+            base_delay: Delay before the first retry, in seconds
+            max_delay: Upper bound on the retry delay, in seconds
+        """
+        event.last_error = error
+        if event.attempts >= max_attempts:
+            event.status = "failed"
+            logger.error(
+                f"Webhook event {event.stripe_event_id} failed after "
+                f"{event.attempts} attempts: {error}"
+            )
+        else:
+            delay = min(base_delay * 2 ** (event.attempts - 1), max_delay)
+            event.status = "pending"
+            event.next_attempt_at = datetime.now(timezone.utc) + timedelta(
+                seconds=delay
+            )
+            logger.warning(
+                f"Webhook event {event.stripe_event_id} failed "
+                f"(attempt {event.attempts}), retrying in {delay:.0f}s: {error}"
+            )
+        self.session.commit()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Count inbox events by status.
+
+        Returns:
+            Dict[str, int]: Event counts keyed by status
+        """
+        rows = (
+            self.session.query(WebhookEvent.status, func.count(WebhookEvent.id))
+            .group_by(WebhookEvent.status)
+            .all()
+        )
+        return {status: count for status, count in rows}
+
+
+class WebhookConsumer:
+    """Background loop that drains the webhook inbox."""
+
+    def __init__(
+        self,
+        poll_interval: float = WEBHOOK_POLL_INTERVAL,
+        batch_size: int = WEBHOOK_BATCH_SIZE,
+    ):
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.handlers: Dict[str, WebhookHandler] = {}
+        self.running = False
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def register(self, event_type: str, handler: WebhookHandler) -> None:
+        """
+        Register the coroutine that handles an event type.
+
+        Args:
+            event_type: Stripe event type, e.g. "payment_intent.succeeded"
+            handler: Coroutine called with the event payload
+        """
+        self.handlers[event_type] = handler
+
+    def notify(self) -> None:
+        """Wake the consumer early, e.g. right after an event was recorded."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        """Run the consumer loop until stopped."""
+        self.running = True
+        self._wakeup = asyncio.Event()
+        logger.info("Starting webhook consumer")
+
+        while self.running:
+            try:
+                processed = await self.process_due()
+            except Exception as e:
+                logger.error(f"Error in webhook consumer: {e}")
+                processed = 0
+
+            # A full batch likely means more events are waiting
+            if processed >= self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def stop(self) -> None:
+        """Stop the consumer loop."""
+        self.running = False
+        self.notify()
+        logger.info("Webhook consumer stopped")
+
+    async def process_due(self) -> int:
+        """
+        Claim and process one batch of due events.
+
+        Returns:
+            int: Number of events claimed
+        """
+        db = SessionLocal()
+        try:
+            return await self.process_batch(WebhookInbox(db))
+        finally:
+            db.close()
+
+    async def process_batch(self, inbox: WebhookInbox) -> int:
+        """
+        Claim and process one batch of due events from an inbox.
+
+        Args:
+            inbox: Webhook inbox to drain
+
+        Returns:
+            int: Number of events claimed
+        """
+        events = inbox.claim_due_events(limit=self.batch_size)
+        for event in events:
+            handler = self.handlers.get(event.event_type)
+            if handler is None:
+                logger.info(f"Unhandled webhook event type: {event.event_type}")
+                inbox.mark_done(event, status="ignored")
+                continue
+            try:
+                await handler(event.payload)
+            except Exception as e:
+                inbox.mark_failed(event, str(e))
+            else:
+                inbox.mark_done(event)
+                logger.info(
+                    f"Processed webhook event {event.stripe_event_id} "
+                    f"({event.event_type})"
+                )
+        return len(events)
+
+
+# Global webhook consumer instance
+webhook_consumer = WebhookConsumer()
@@ -15,7 +15,7 @@ from typing import Any, Dict, List, Optional
 
 from sqlalchemy.orm import Session
 
-from app.db.models import Donation, SubredditFundraisingGoal
+from app.db.models import Donation, SubredditDonationTotal, SubredditFundraisingGoal
 from app.subreddit_service import get_subreddit_service
 from app.task_queue import TaskQueue
 from app.utils.logging_config import get_logger
@@ -52,19 +52,30 @@ class SubredditTierService:
             subreddit_name, self.session
         )
 
-        # Query all succeeded donations for this subreddit (direct or via fundraising goal)
-        donations = (
-            self.session.query(Donation)
-            .filter(Donation.subreddit_id == subreddit.id)
-            .filter(Donation.status == "succeeded")
-            .all()
-        )
-        # Use a set to ensure uniqueness by donation id
-        unique_donations = {d.id: d for d in donations}.values()
+        totals = self._get_donation_totals(subreddit.id)
+        return Decimal(totals.total_cents) / 100 if totals else Decimal("0")
+
+    def _get_donation_totals(self, subreddit_id: int):
+        """
+        Read a subreddit's row from the subreddit_donation_totals rollup.
+
+        Columns are selected rather than the entity so the values are never
+        served stale from the identity map after a flush updated the rollup.
+
+        Args:
+            subreddit_id: Subreddit ID
+
+        Returns:
+            Row with total_cents, donation_count and donor_count, or None
+        """
         return (
-            sum(d.amount_usd for d in unique_donations)
-            if unique_donations
-            else Decimal("0")
+            self.session.query(
+                SubredditDonationTotal.total_cents,
+                SubredditDonationTotal.donation_count,
+                SubredditDonationTotal.donor_count,
+            )
+            .filter(SubredditDonationTotal.subreddit_id == subreddit_id)
+            .first()
         )
 
     def get_subreddit_tiers(self, subreddit_name: str) -> List[Dict[str, Any]]:
@@ -294,26 +305,15 @@ class SubredditTierService:
                 subreddit_name, self.session
             )
 
-            total_donations = self.get_subreddit_total_donations(subreddit_name)
-            tiers = self.get_subreddit_tiers(subreddit_name)
-            goals = self.get_fundraising_goals(subreddit_name)
-
-            # Count donors
-            donor_count = (
-                self.session.query(Donation)
-                .filter(Donation.subreddit_id == subreddit.id)
-                .filter(Donation.status == "succeeded")
-                .distinct(Donation.customer_email)
-                .count()
+            totals = self._get_donation_totals(subreddit.id)
+            total_donations = (
+                Decimal(totals.total_cents) / 100 if totals else Decimal("0")
             )
+            goals = self.get_fundraising_goals(subreddit_name)
 
-            # Count active donations (sponsors no longer exist)
-            active_donations = (
-                self.session.query(Donation)
-                .filter(Donation.subreddit_id == subreddit.id)
-                .filter(Donation.status == "succeeded")
-                .count()
-            )
+            # Donor and donation counts come from the rollup (sponsors no longer exist)
+            donor_count = totals.donor_count if totals else 0
+            active_donations = totals.donation_count if totals else 0
 
             return {
                 "subreddit": subreddit_name,
@@ -2,23 +2,24 @@
 Unified Task Manager for commission processing.
 
 This module provides a unified interface for task management that can use
-both Kubernetes Jobs and direct execution as fallback
+both Kubernetes Jobs and direct execution as fallback. Direct execution runs
+on a bounded CommissionExecutor rather than a thread per task.
 """
 
 import asyncio
-import json
 import logging
-import threading
 import traceback
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
 from sqlalchemy.orm import Session
 
+from app.commission_executor import CommissionExecutor
 from app.commission_worker import CommissionWorker
 from app.db.database import SessionLocal
 from app.db.models import Donation, PipelineTask
+from app.redis_publisher import redis_publisher
 from app.utils.logging_config import get_logger
 
 # Optional k8s dependency
@@ -54,8 +55,18 @@ class TaskManager:
         else:
             self.k8s_manager = None
             self.use_k8s = False
+        self.executor = CommissionExecutor(self._execute_commission_task)
         logger.info(f"Task Manager initialized - K8s available: {self.use_k8s}")
 
+    def start(self) -> None:
+        """Start the commission executor and recover pending tasks (direct mode only)."""
+        if not self.use_k8s:
+            self.executor.start(recover=True)
+
+    def shutdown(self) -> None:
+        """Gracefully stop the commission executor."""
+        self.executor.stop()
+
     def create_commission_task(
         self, donation_id: int, task_data: Dict[str, Any], db: Optional[Session] = None
     ) -> str:
@@ -70,6 +81,23 @@ class TaskManager:
         Returns:
             Task ID
         """
+        return self.submit_commission_task(donation_id, task_data, db)["task_id"]
+
+    def submit_commission_task(
+        self, donation_id: int, task_data: Dict[str, Any], db: Optional[Session] = None
+    ) -> Dict[str, Any]:
+        """
+        Create a commission task and report where it was admitted.
+
+        Args:
+            donation_id: The donation ID
+            task_data: Task configuration data
+            db: Optional database session to use (if not provided, creates a new one)
+
+        Returns:
+            Dict with the task_id and its queue_position; the position is None
+            for Kubernetes jobs and for tasks that could not be queued
+        """
         # Create the pipeline task in the database
         task_id = self._create_pipeline_task(donation_id, task_data, db)
 
@@ -82,14 +110,17 @@ class TaskManager:
                 f"Creating K8s Job for task {task_id} (donation_id={donation_id})"
             )
             self.k8s_manager.create_commission_job(task_id, donation_id, task_data)
+            queue_position = None
         else:
             # Use direct execution fallback
             logger.info(
                 f"Running commission task {task_id} directly (donation_id={donation_id})"
             )
-            self._run_commission_task_directly(task_id, donation_id, task_data)
+            queue_position = self._run_commission_task_directly(
+                task_id, donation_id, task_data
+            )
 
-        return task_id
+        return {"task_id": task_id, "queue_position": queue_position}
 
     def _broadcast_task_creation(
         self, task_id: str, donation_id: int, db: Optional[Session] = None
@@ -137,33 +168,9 @@ class TaskManager:
 
             # Broadcast via Redis pub/sub
             try:
-                import redis
-
-                from app.config import (
-                    REDIS_DB,
-                    REDIS_HOST,
-                    REDIS_PASSWORD,
-                    REDIS_PORT,
-                    REDIS_SSL,
-                )
-
-                r = redis.Redis(
-                    host=REDIS_HOST,
-                    port=REDIS_PORT,
-                    db=REDIS_DB,
-                    password=REDIS_PASSWORD,
-                    ssl=REDIS_SSL,
-                    decode_responses=True,
+                redis_publisher.publish_general_update(
+                    {"type": "task_created", "task_info": task_info}
                 )
-
-                # Broadcast general update for task creation
-                message = {
-                    "type": "general_update",
-                    "data": {"type": "task_created", "task_info": task_info},
-                    "timestamp": datetime.now().isoformat(),
-                }
-
-                r.publish("general_updates", json.dumps(message))
                 logger.info(
                     f"Broadcasted task creation for task {task_id} to all clients"
                 )
@@ -212,7 +219,7 @@ class TaskManager:
                 status=TaskStatus.PENDING.value,
                 priority=10,  # Default priority for commission tasks
                 context_data=task_data,  # Use 'context_data' not 'task_data'
-                created_at=datetime.now(),
+                created_at=datetime.now(timezone.utc),
             )
             db.add(task)
             db.commit()
@@ -232,67 +239,84 @@ class TaskManager:
 
     def _run_commission_task_directly(
         self, task_id: str, donation_id: int, task_data: Dict[str, Any]
-    ):
+    ) -> Optional[int]:
         """
-        Run commission task directly in a background thread.
+        Submit a commission task to the bounded commission executor.
+
+        A task that cannot be queued stays pending in the database and is
+        recovered on next start. Clients read the live queue position from
+        get_task_status.
 
         Args:
             task_id: The task ID
             donation_id: The donation ID
             task_data: Task configuration data
-        """
 
-        def run_task():
-            try:
-                logger.debug(
-                    f"Starting commission task {task_id} in background thread (donation_id={donation_id})"
-                )
+        Returns:
+            Queue position at admission (0 if already running), or None if the
+            task could not be queued
+        """
+        try:
+            position = self.executor.submit(int(task_id), donation_id, task_data)
+            logger.debug(
+                f"Commission task {task_id} submitted at queue position {position} (donation_id={donation_id})"
+            )
+            return position
+        except Exception as e:
+            logger.error(
+                f"Failed to queue commission task {task_id} (donation_id={donation_id}): {str(e)}"
+            )
+            return None
 
-                # Update task status to in progress
-                self._update_task_status(task_id, TaskStatus.IN_PROGRESS.value)
+    async def _execute_commission_task(
+        self, task_id: int, donation_id: int, task_data: Dict[str, Any]
+    ) -> None:
+        """
+        Run a single commission task on the executor's event loop.
 
-                # Create and run the commission worker
-                worker = CommissionWorker(donation_id, task_data)
+        Args:
+            task_id: The task ID
+            donation_id: The donation ID
+            task_data: Task configuration data
+        """
+        try:
+            logger.debug(
+                f"Starting commission task {task_id} on executor (donation_id={donation_id})"
+            )
 
-                # Run the async worker in a new event loop
-                try:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    success = loop.run_until_complete(worker.run())
-
-                    if success:
-                        # Update task status to completed
-                        self._update_task_status(task_id, TaskStatus.COMPLETED.value)
-                        logger.info(
-                            f"Commission task {task_id} completed successfully (donation_id={donation_id})"
-                        )
-                    else:
-                        # Update task status to failed
-                        self._update_task_status(
-                            task_id,
-                            TaskStatus.FAILED.value,
-                            "Commission processing failed",
-                        )
-                        logger.error(
-                            f"Commission task {task_id} failed (donation_id={donation_id})"
-                        )
+            # Status updates do blocking DB and Redis I/O; keep them off the shared loop
+            await asyncio.to_thread(
+                self._update_task_status, str(task_id), TaskStatus.IN_PROGRESS.value
+            )
 
-                finally:
-                    loop.close()
+            worker = CommissionWorker(donation_id, task_data)
+            success = await worker.run()
 
-            except Exception as e:
+            if success:
+                await asyncio.to_thread(
+                    self._update_task_status, str(task_id), TaskStatus.COMPLETED.value
+                )
+                logger.info(
+                    f"Commission task {task_id} completed successfully (donation_id={donation_id})"
+                )
+            else:
+                await asyncio.to_thread(
+                    self._update_task_status,
+                    str(task_id),
+                    TaskStatus.FAILED.value,
+                    "Commission processing failed",
+                )
                 logger.error(
-                    f"Commission task {task_id} failed (donation_id={donation_id}): {str(e)}\n{traceback.format_exc()}"
+                    f"Commission task {task_id} failed (donation_id={donation_id})"
                 )
-                # Update task status to failed
-                self._update_task_status(task_id, TaskStatus.FAILED.value, str(e))
 
-        # Run the task in a background thread
-        thread = threading.Thread(target=run_task, daemon=True)
-        thread.start()
-        logger.debug(
-            f"Commission task {task_id} started in background thread (donation_id={donation_id})"
-        )
+        except Exception as e:
+            logger.error(
+                f"Commission task {task_id} failed (donation_id={donation_id}): {str(e)}\n{traceback.format_exc()}"
+            )
+            await asyncio.to_thread(
+                self._update_task_status, str(task_id), TaskStatus.FAILED.value, str(e)
+            )
 
     def _update_task_status(self, task_id: str, status: str, error_message: str = None):
         """Update task status in the database and broadcast over WebSocket."""
@@ -305,15 +329,15 @@ class TaskManager:
                 # Update timing fields
                 if status == "in_progress":
                     if hasattr(task, "started_at") and not task.started_at:
-                        task.started_at = datetime.now()
+                        task.started_at = datetime.now(timezone.utc)
                     if hasattr(task, "last_heartbeat"):
-                        task.last_heartbeat = datetime.now()
+                        task.last_heartbeat = datetime.now(timezone.utc)
                 elif status in ["completed", "failed"]:
-                    task.completed_at = datetime.now()
+                    task.completed_at = datetime.now(timezone.utc)
 
                 # Update heartbeat for in_progress tasks
                 if status == "in_progress" and hasattr(task, "last_heartbeat"):
-                    task.last_heartbeat = datetime.now()
+                    task.last_heartbeat = datetime.now(timezone.utc)
 
                 if error_message:
                     task.error_message = error_message
@@ -355,38 +379,9 @@ class TaskManager:
                     )
                 else:
                     logger.debug(f"Task {task_id} status: {status}")
-                # Use simple Redis publishing to avoid event loop conflicts
+                # Queue on the shared publisher; never blocks on Redis I/O
                 try:
-                    import json
-
-                    import redis
-
-                    from app.config import (
-                        REDIS_DB,
-                        REDIS_HOST,
-                        REDIS_PASSWORD,
-                        REDIS_PORT,
-                        REDIS_SSL,
-                    )
-
-                    # Create a simple Redis client for this operation
-                    r = redis.Redis(
-                        host=REDIS_HOST,
-                        port=REDIS_PORT,
-                        db=REDIS_DB,
-                        password=REDIS_PASSWORD,
-                        ssl=REDIS_SSL,
-                        decode_responses=True,
-                    )
-                    # Create the message
-                    message = {
-                        "type": "task_update",
-                        "task_id": str(task.id),
-                        "data": update,
-                        "timestamp": datetime.now().isoformat(),
-                    }
-                    # Publish to Redis
-                    r.publish("task_updates", json.dumps(message))
+                    redis_publisher.publish_task_update(task.id, update)
                     # Only log Redis publishing for major status changes or if debug enabled
                     if status in ["completed", "failed"] or logger.isEnabledFor(
                         logging.DEBUG
@@ -531,6 +526,11 @@ class TaskManager:
                     "retry_count": getattr(task, "retry_count", 0),
                     "max_retries": getattr(task, "max_retries", 2),
                     "timeout_seconds": getattr(task, "timeout_seconds", 300),
+                    "queue_position": (
+                        self.executor.queue_position(task.id, db)
+                        if task.status == TaskStatus.PENDING.value and not self.use_k8s
+                        else None
+                    ),
                 }
             return None
         finally:
@@ -651,7 +651,7 @@ class TaskManager:
 
             # Update task status to failed
             task.status = TaskStatus.FAILED.value
-            task.completed_at = datetime.now()
+            task.completed_at = datetime.now(timezone.utc)
             task.error_message = error_message
             db.commit()
 
@@ -683,7 +683,7 @@ class TaskManager:
                 task = db.query(PipelineTask).filter(PipelineTask.id == task_id).first()
                 if task and task.status == "in_progress":
                     if hasattr(task, "last_heartbeat"):
-                        task.last_heartbeat = datetime.now()
+                        task.last_heartbeat = datetime.now(timezone.utc)
                         db.commit()
                         logger.debug(f"Updated heartbeat for task {task_id}")
                         return True
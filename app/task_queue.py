@@ -6,12 +6,13 @@ including sponsored posts, front picks, and subreddit tier posts.
 """
 
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
+from sqlalchemy import or_, select, update
 from sqlalchemy.orm import Session
 
-from app.db.models import Donation, PipelineTask
+from app.db.models import DEFAULT_TASK_TIMEOUT_SECONDS, Donation, PipelineTask
 from app.subreddit_service import get_subreddit_service
 from app.utils.logging_config import get_logger
 
@@ -136,37 +137,129 @@ class TaskQueue:
 
     def get_next_task(self) -> Optional[PipelineTask]:
         """
-        Get the next task to execute based on priority and scheduling.
+        Claim the next task to execute based on priority and scheduling.
+
+        The task is atomically moved to in_progress, so concurrent consumers
+        never receive the same task and no separate mark_in_progress call is
+        needed.
+
+        Returns:
+            PipelineTask: The claimed task or None if no tasks available
+        """
+        tasks = self.claim_tasks(limit=1)
+        return tasks[0] if tasks else None
+
+    def claim_tasks(
+        self, limit: int = 1, lease_seconds: int = DEFAULT_TASK_TIMEOUT_SECONDS
+    ) -> List[PipelineTask]:
+        """
+        Atomically claim up to ``limit`` ready tasks for this consumer.
+
+        A single UPDATE ... RETURNING moves the highest priority, oldest ready
+        tasks to in_progress and stamps started_at, last_heartbeat and a lease
+        deadline. On PostgreSQL the candidate rows are selected FOR UPDATE SKIP
+        LOCKED, so concurrent consumers claim disjoint batches without waiting
+        on each other; SQLite serializes writers, and the status guard in the
+        UPDATE keeps a task from being claimed twice.
+
+        Args:
+            limit: Maximum number of tasks to claim
+            lease_seconds: Seconds until an unheartbeated claim counts as stuck
 
         Returns:
-            PipelineTask: The next task to execute or None if no tasks available
+            List[PipelineTask]: Claimed tasks in priority order
         """
         try:
-            now = datetime.now(timezone.utc)
+            ready = or_(
+                PipelineTask.scheduled_for.is_(None),
+                PipelineTask.scheduled_for <= datetime.now(timezone.utc),
+            )
+            candidates = (
+                select(PipelineTask.id)
+                .where(PipelineTask.status == "pending", ready)
+                .order_by(
+                    PipelineTask.priority.desc(),
+                    PipelineTask.created_at.asc(),
+                    PipelineTask.id.asc(),
+                )
+                .limit(limit)
+            )
+            if self.session.get_bind().dialect.name == "postgresql":
+                candidates = candidates.with_for_update(skip_locked=True)
+
+            claim = (
+                update(PipelineTask)
+                .where(
+                    PipelineTask.id.in_(candidates),
+                    PipelineTask.status == "pending",
+                )
+                .values(**self._lease_values(lease_seconds))
+                .returning(PipelineTask.id)
+                .execution_options(synchronize_session=False)
+            )
+            claimed_ids = self.session.execute(claim).scalars().all()
+            self.session.commit()
 
-            # Get the highest priority pending task that's ready to execute
-            task = (
+            if not claimed_ids:
+                logger.debug("No tasks available in queue")
+                return []
+
+            tasks = (
                 self.session.query(PipelineTask)
-                .filter(PipelineTask.status == "pending")
-                .filter(
-                    (PipelineTask.scheduled_for.is_(None))
-                    | (PipelineTask.scheduled_for <= now)
-                )
+                .filter(PipelineTask.id.in_(claimed_ids))
                 .order_by(PipelineTask.priority.desc(), PipelineTask.created_at.asc())
-                .first()
+                .populate_existing()
+                .all()
             )
+            logger.info(
+                f"Claimed {len(tasks)} task(s) from queue: {[task.id for task in tasks]}"
+            )
+            return tasks
 
-            if task:
-                logger.info(f"Retrieved task {task.id} of type {task.type} from queue")
-                return task
-            else:
-                logger.debug("No tasks available in queue")
-                return None
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Error claiming tasks: {str(e)}")
+            raise
+
+    def claim_task(
+        self, task_id: int, lease_seconds: int = DEFAULT_TASK_TIMEOUT_SECONDS
+    ) -> bool:
+        """
+        Atomically claim one specific task if it is still pending.
+
+        The status guard in the UPDATE is the compare-and-set: when several
+        consumers try to claim the same task, exactly one of them wins.
 
+        Args:
+            task_id: ID of the task to claim
+            lease_seconds: Seconds until an unheartbeated claim counts as stuck
+
+        Returns:
+            bool: True if this call claimed the task
+        """
+        try:
+            claimed = (
+                self.session.query(PipelineTask)
+                .filter(PipelineTask.id == task_id, PipelineTask.status == "pending")
+                .update(self._lease_values(lease_seconds), synchronize_session=False)
+            )
+            self.session.commit()
+            return claimed == 1
         except Exception as e:
-            logger.error(f"Error getting next task: {str(e)}")
+            self.session.rollback()
+            logger.error(f"Error claiming task {task_id}: {str(e)}")
             raise
 
+    def _lease_values(self, lease_seconds: int) -> Dict[str, Any]:
+        """Column values that move a task to in_progress under a fresh lease."""
+        now = datetime.now(timezone.utc)
+        return {
+            "status": "in_progress",
+            "started_at": now,
+            "last_heartbeat": now,
+            "deadline_at": now + timedelta(seconds=lease_seconds),
+        }
+
     def mark_completed(self, task_id: int, error_message: Optional[str] = None) -> bool:
         """
         Mark a task as completed or failed.
@@ -345,25 +438,24 @@ class TaskQueue:
                 minutes=max_duration_minutes
             )
 
-            stuck_tasks = (
+            # One conditional UPDATE: the status check makes the reset atomic,
+            # so concurrent cleanups on other replicas can't double-reset a task
+            cleaned_count = (
                 self.session.query(PipelineTask)
                 .filter(PipelineTask.status == "in_progress")
                 .filter(PipelineTask.created_at < cutoff_time)
-                .all()
-            )
-
-            cleaned_count = 0
-            for task in stuck_tasks:
-                task.status = "pending"  # Reset to pending so it can be retried
-                task.error_message = f"Task was stuck in progress for {max_duration_minutes} minutes, reset to pending"
-                cleaned_count += 1
-                logger.warning(
-                    f"Reset stuck task {task.id} (type: {task.type}) back to pending"
+                .update(
+                    {
+                        PipelineTask.status: "pending",  # Reset so it can be retried
+                        PipelineTask.error_message: f"Task was stuck in progress for {max_duration_minutes} minutes, reset to pending",
+                    },
+                    synchronize_session=False,
                 )
+            )
+            self.session.commit()
 
             if cleaned_count > 0:
-                self.session.commit()
-                logger.info(f"Cleaned up {cleaned_count} stuck tasks")
+                logger.warning(f"Reset {cleaned_count} stuck tasks back to pending")
 
             return cleaned_count
 
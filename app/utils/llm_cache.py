@@ -0,0 +1,254 @@
+"""
+Content-addressed cache of OpenAI chat completion responses.
+
+Chat calls used to hit OpenAI every time, so retries after transient failures
+and dry-run loops over the same posts paid full latency and cost again.
+LLMResponseCache keys each completion on a hash of its request (model,
+messages, temperature, response_format and any other parameters) and stores the
+returned message content with a TTL.
+
+Backends (LLM_CACHE_BACKEND):
+- "sqlite": on-disk cache at LLM_CACHE_PATH, evicting least recently used
+  entries beyond LLM_CACHE_SIZE; survives restarts
+- "redis": shared by every process; entries expire by TTL and Redis' own
+  maxmemory policy bounds the size
+- "memory": in-process LRU
+- "off": no caching
+
+Callers whose output should differ on every call pass cache=False. Hits and
+misses are counted per model in OpenAIUsageTracker.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.clients.reddit_cache import MemoryCacheBackend, RedisCacheBackend
+from app.config import LLM_CACHE_BACKEND, LLM_CACHE_PATH, LLM_CACHE_SIZE, LLM_CACHE_TTL
+from app.utils.logging_config import get_logger
+from app.utils.openai_usage_tracker import get_usage_tracker, track_openai_call
+
+logger = get_logger(__name__)
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent.parent / "data" / "llm_cache.db"
+
+
+def llm_cache_key(**params: Any) -> str:
+    """
+    Hash a chat completion request into a cache key.
+
+    Args:
+        **params: Request parameters as passed to chat.completions.create
+
+    Returns:
+        str: Hex digest identifying the request
+    """
+    canonical = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class SQLiteCacheBackend:
+    """
+    On-disk cache in a single SQLite file, with per-entry expiry and LRU eviction.
+
+    Args:
+        path: SQLite database file
+        maxsize: Maximum number of entries
+    """
+
+    def __init__(self, path: str = "", maxsize: int = LLM_CACHE_SIZE):
+        self.path = Path(path) if path else DEFAULT_CACHE_PATH
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _get_conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.path), check_same_thread=False, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_llm_cache_accessed_at "
+                "ON llm_cache (accessed_at)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        now = time.time()
+        with self._lock:
+            conn = self._get_conn()
+            row = conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return False, None
+            if row[1] <= now:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return False, None
+            conn.execute(
+                "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        return True, json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            conn = self._get_conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache "
+                "(key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + ttl, now),
+            )
+            conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+            conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                "SELECT key FROM llm_cache ORDER BY accessed_at DESC "
+                "LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._get_conn().execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._get_conn().execute("DELETE FROM llm_cache")
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._get_conn().execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        return row[0]
+
+
+def _create_backend(name: str):
+    if name == "sqlite":
+        return SQLiteCacheBackend(LLM_CACHE_PATH, LLM_CACHE_SIZE)
+    if name == "redis":
+        return RedisCacheBackend(namespace="openai:cache")
+    if name == "memory":
+        return MemoryCacheBackend(maxsize=LLM_CACHE_SIZE)
+    return None
+
+
+class LLMResponseCache:
+    """
+    Memoizes chat completion content by request.
+
+    Args:
+        backend: Cache backend; created from backend_name on first use if not given
+        ttl: Seconds a response stays cached
+        backend_name: "sqlite", "redis", "memory" or "off"
+    """
+
+    def __init__(
+        self,
+        backend: Any = None,
+        ttl: float = LLM_CACHE_TTL,
+        backend_name: str = LLM_CACHE_BACKEND,
+    ):
+        self.ttl = ttl
+        self.backend_name = backend_name
+        self._backend = backend
+        self._lock = threading.Lock()
+
+    def _get_backend(self):
+        with self._lock:
+            if self._backend is None and self.backend_name != "off":
+                self._backend = _create_backend(self.backend_name)
+                if self._backend is None:
+                    logger.warning(
+                        f"Unknown LLM_CACHE_BACKEND {self.backend_name!r}, "
+                        "caching disabled"
+                    )
+                    self.backend_name = "off"
+            return self._backend
+
+    def fetch(
+        self, loader: Callable[[], Optional[str]], cache: bool = True, **params: Any
+    ) -> Optional[str]:
+        """
+        Return cached content for a request, or call the loader and cache it.
+
+        Args:
+            loader: Makes the OpenAI call and returns the message content
+            cache: False to always call the loader and store nothing
+            **params: Request parameters the response depends on; model,
+                messages, temperature, response_format, etc.
+
+        Returns:
+            Message content
+        """
+        backend = self._get_backend() if cache else None
+        if backend is None:
+            return loader()
+
+        model = params.get("model", "unknown")
+        key = llm_cache_key(**params)
+        try:
+            found, content = backend.get(key)
+        except Exception as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            found, content = False, None
+        get_usage_tracker().record_cache_lookup(model, hit=found)
+        if found:
+            return content
+
+        content = loader()
+        # Only plain, non-empty text is worth replaying
+        if isinstance(content, str) and content:
+            try:
+                backend.set(key, content, self.ttl)
+            except Exception as e:
+                logger.warning(f"LLM cache write failed: {e}")
+        return content
+
+    def chat(self, client: Any, cache: bool = True, **params: Any) -> Optional[str]:
+        """
+        Create a chat completion through the cache.
+
+        Cache misses are rate limited and tracked with track_openai_call.
+
+        Args:
+            client: OpenAI client
+            cache: False to bypass the cache for this call
+            **params: Arguments for client.chat.completions.create
+
+        Returns:
+            Message content of the first choice
+        """
+
+        @track_openai_call(model=params.get("model", "unknown"), operation="chat")
+        def _create():
+            return client.chat.completions.create(**params)
+
+        def _load():
+            return _create().choices[0].message.content
+
+        return self.fetch(_load, cache=cache, **params)
+
+    def clear(self) -> None:
+        """Drop every cached response this process can reach."""
+        backend = self._get_backend()
+        if backend is not None:
+            backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the backend in use and hit/miss counters."""
+        return {"backend": self.backend_name, **get_usage_tracker().get_cache_stats()}
+
+
+# Global LLM response cache instance
+llm_cache = LLMResponseCache()
@@ -0,0 +1,478 @@
+"""
+Per-model OpenAI rate limiter shared across processes.
+
+OpenAIUsageTracker.RATE_LIMITS used to be informational only, so concurrent
+commissions, the promoter agent and the community agent raced into 429s. Each
+model now has two token buckets, one for requests and one for tokens, sized to
+its per-minute limits (times OPENAI_RATE_LIMIT_HEADROOM). Every OpenAI call
+takes a request, and the tokens it is expected to use, before it is sent;
+callers wait for capacity rather than failing. Token usage reported after a
+call is debited from the bucket, so heavy calls slow the ones that follow.
+
+The buckets follow OpenAI's own view of the quota: the x-ratelimit-limit-*,
+-remaining-* and -reset-* headers resize the buckets, cap their level at the
+remaining quota, and pause the model until the reset when a quota is spent or
+a 429 comes back. With OPENAI_RATE_LIMIT_BACKEND=redis the buckets and pauses
+live in Redis, so API replicas, commission workers and agents share one budget.
+"""
+
+import asyncio
+import re
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import redis
+
+from app.config import (
+    OPENAI_RATE_LIMIT_BACKEND,
+    OPENAI_RATE_LIMIT_DEFAULT_RPM,
+    OPENAI_RATE_LIMIT_HEADROOM,
+    REDIS_DB,
+    REDIS_HOST,
+    REDIS_PASSWORD,
+    REDIS_PORT,
+    REDIS_SSL,
+)
+from app.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Refill a bucket and take n units from it (the balance may go negative). A
+# capacity of 0 means the bucket is not limited. Shared by TAKE_SCRIPT and
+# CAP_SCRIPT; Redis TIME keeps every process on the same clock.
+_BUCKET_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local function refill(key, capacity, rate)
+    local state = redis.call('HMGET', key, 'level', 'ts')
+    local level = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    return math.min(capacity, level + math.max(0, now - ts) * rate)
+end
+local function store(key, level)
+    redis.call('HSET', key, 'level', tostring(level), 'ts', tostring(now))
+    redis.call('EXPIRE', key, 3600)
+end
+"""
+
+# KEYS: requests bucket, tokens bucket, pause_until
+# ARGV: request capacity, request rate, requests, token capacity, token rate, tokens
+# Returns the seconds the caller must wait
+TAKE_SCRIPT = (
+    _BUCKET_LUA
+    + """
+local wait = 0
+for i = 0, 1 do
+    local capacity = tonumber(ARGV[i * 3 + 1])
+    local rate = tonumber(ARGV[i * 3 + 2])
+    if capacity > 0 then
+        local level = refill(KEYS[i + 1], capacity, rate) - tonumber(ARGV[i * 3 + 3])
+        store(KEYS[i + 1], level)
+        if level < 0 then
+            wait = math.max(wait, -level / rate)
+        end
+    end
+end
+local pause_until = tonumber(redis.call('GET', KEYS[3]) or '0')
+return tostring(math.max(wait, pause_until - now))
+"""
+)
+
+# KEYS: bucket
+# ARGV: capacity, rate, reported remaining quota
+CAP_SCRIPT = (
+    _BUCKET_LUA
+    + """
+local capacity = tonumber(ARGV[1])
+if capacity > 0 then
+    local level = refill(KEYS[1], capacity, tonumber(ARGV[2]))
+    store(KEYS[1], math.min(level, tonumber(ARGV[3])))
+end
+return 'OK'
+"""
+)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+def parse_reset(value: Optional[str]) -> Optional[float]:
+    """
+    Parse an x-ratelimit-reset-* header into seconds.
+
+    Args:
+        value: Header value, e.g. "1s", "6m0s", "20ms" or "0.5"
+
+    Returns:
+        Seconds until the quota resets, or None if the value is unreadable
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+# Rough English average; close enough for budgeting without a tokenizer
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate the number of tokens in a piece of text.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        int: Estimated token count
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def estimate_message_tokens(messages: List[Dict[str, Any]]) -> int:
+    """
+    Approximate the prompt tokens of a chat request, to reserve before sending.
+
+    Args:
+        messages: Chat messages as passed to chat.completions.create
+
+    Returns:
+        int: Estimated token count
+    """
+    return sum(estimate_tokens(str(m.get("content") or "")) for m in messages)
+
+
+class _Bucket:
+    """In-process token bucket; capacity 0 means unlimited."""
+
+    def __init__(self, per_minute: float):
+        self.resize(per_minute)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def resize(self, per_minute: float) -> None:
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+
+    def take(self, amount: float) -> float:
+        if self.capacity <= 0:
+            return 0.0
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        self.level -= amount
+        return -self.level / self.rate if self.level < 0 else 0.0
+
+    def cap(self, remaining: float) -> None:
+        if self.capacity <= 0:
+            return
+        self.take(0)
+        self.level = min(self.level, remaining)
+
+
+class ModelRateLimiter:
+    """
+    Request and token buckets for one OpenAI model.
+
+    Args:
+        model: Model name
+        requests_per_minute: Request limit; 0 for no limit
+        tokens_per_minute: Token limit; 0 for no limit
+        backend: "memory" for this process only, "redis" to share the budget
+        namespace: Redis key prefix
+    """
+
+    def __init__(
+        self,
+        model: str,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        backend: str = OPENAI_RATE_LIMIT_BACKEND,
+        namespace: str = "openai:ratelimit",
+    ):
+        self.model = model
+        self.namespace = f"{namespace}:{model}"
+        self._use_redis = backend == "redis"
+        self._redis: Optional[redis.Redis] = None
+        self._lock = threading.Lock()
+        self._requests = _Bucket(requests_per_minute)
+        self._tokens = _Bucket(tokens_per_minute)
+        self._pause_until = 0.0  # Wall clock, comparable with Redis
+
+        # Latest values reported by OpenAI
+        self.remaining_requests: Optional[float] = None
+        self.remaining_tokens: Optional[float] = None
+
+        self.calls = 0
+        self.queued = 0
+        self.throttled_calls = 0
+        self.throttled_seconds = 0.0
+        self.rate_limited = 0
+
+    def _get_redis(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.Redis(
+                host=REDIS_HOST,
+                port=REDIS_PORT,
+                db=REDIS_DB,
+                password=REDIS_PASSWORD,
+                ssl=REDIS_SSL,
+                decode_responses=True,
+                socket_timeout=2,
+                socket_connect_timeout=2,
+            )
+        return self._redis
+
+    def _keys(self) -> Tuple[str, str, str]:
+        return (
+            f"{self.namespace}:requests",
+            f"{self.namespace}:tokens",
+            f"{self.namespace}:pause_until",
+        )
+
+    def _take(self, requests: float, tokens: float) -> float:
+        if self._use_redis:
+            try:
+                return float(
+                    self._get_redis().eval(
+                        TAKE_SCRIPT,
+                        3,
+                        *self._keys(),
+                        self._requests.capacity,
+                        self._requests.rate,
+                        requests,
+                        self._tokens.capacity,
+                        self._tokens.rate,
+                        tokens,
+                    )
+                )
+            except Exception as e:
+                logger.warning(f"OpenAI limiter falling back to local buckets: {e}")
+        with self._lock:
+            wait = max(self._requests.take(requests), self._tokens.take(tokens))
+            return max(wait, self._pause_until - time.time())
+
+    def _reserve(self, tokens: float) -> float:
+        wait = self._take(1, tokens)
+        with self._lock:
+            self.calls += 1
+            if wait > 0:
+                self.throttled_calls += 1
+                self.throttled_seconds += wait
+                self.queued += 1
+        if wait > 0:
+            logger.debug(f"OpenAI limiter delaying {self.model} call by {wait:.2f}s")
+        return max(wait, 0.0)
+
+    def _done_waiting(self) -> None:
+        with self._lock:
+            self.queued -= 1
+
+    def acquire(self, tokens: float = 0) -> float:
+        """
+        Wait until a call may be made.
+
+        Args:
+            tokens: Tokens the call is expected to use
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait:
+            try:
+                time.sleep(wait)
+            finally:
+                self._done_waiting()
+        return wait
+
+    async def acquire_async(self, tokens: float = 0) -> float:
+        """
+        Wait until a call may be made without blocking the event loop.
+
+        Args:
+            tokens: Tokens the call is expected to use
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        if self._use_redis:
+            wait = await asyncio.to_thread(self._reserve, tokens)
+        else:
+            wait = self._reserve(tokens)
+        if wait:
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self._done_waiting()
+        return wait
+
+    def debit(self, tokens: float) -> None:
+        """
+        Charge tokens a call used beyond what it reserved.
+
+        Args:
+            tokens: Additional tokens used
+        """
+        if tokens > 0 and self._tokens.capacity > 0:
+            self._take(0, tokens)
+
+    def _pause(self, seconds: float) -> None:
+        until = time.time() + seconds
+        with self._lock:
+            self._pause_until = max(self._pause_until, until)
+        if self._use_redis:
+            try:
+                self._get_redis().set(self._keys()[2], until, ex=int(seconds) + 1)
+            except Exception as e:
+                logger.warning(f"Failed to share OpenAI rate-limit pause: {e}")
+
+    def _cap(self, index: int, bucket: _Bucket, remaining: float) -> None:
+        with self._lock:
+            bucket.cap(remaining)
+        if self._use_redis:
+            try:
+                self._get_redis().eval(
+                    CAP_SCRIPT,
+                    1,
+                    self._keys()[index],
+                    bucket.capacity,
+                    bucket.rate,
+                    remaining,
+                )
+            except Exception as e:
+                logger.warning(f"Failed to share OpenAI rate-limit state: {e}")
+
+    def observe(self, headers: Mapping[str, str], rate_limited: bool = False) -> None:
+        """
+        Update the buckets from OpenAI's rate-limit response headers.
+
+        Args:
+            headers: Response headers of an OpenAI API call
+            rate_limited: Whether the call failed with a 429
+        """
+        resets = []
+        for index, (kind, bucket) in enumerate(
+            (("requests", self._requests), ("tokens", self._tokens))
+        ):
+            try:
+                limit = headers.get(f"x-ratelimit-limit-{kind}")
+                if limit is not None:
+                    with self._lock:
+                        bucket.resize(float(limit) * OPENAI_RATE_LIMIT_HEADROOM)
+                remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+                if remaining is None:
+                    continue
+                remaining = float(remaining)
+            except (TypeError, ValueError):
+                continue
+
+            setattr(self, f"remaining_{kind}", remaining)
+            self._cap(index, bucket, remaining)
+            reset = parse_reset(headers.get(f"x-ratelimit-reset-{kind}"))
+            if reset is not None and (remaining <= 0 or rate_limited):
+                resets.append(reset)
+
+        if rate_limited:
+            with self._lock:
+                self.rate_limited += 1
+            # Without a reset hint, back off for one request interval
+            if not resets and self._requests.rate > 0:
+                resets.append(1.0 / self._requests.rate)
+        if resets:
+            logger.warning(
+                f"OpenAI quota for {self.model} spent; pausing calls for "
+                f"{max(resets):.1f}s"
+            )
+            self._pause(max(resets))
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return quota and throttling metrics."""
+        with self._lock:
+            return {
+                "requests_per_minute": self._requests.capacity,
+                "tokens_per_minute": self._tokens.capacity,
+                "remaining_requests": self.remaining_requests,
+                "remaining_tokens": self.remaining_tokens,
+                "paused_for": round(max(0.0, self._pause_until - time.time()), 3),
+                "calls": self.calls,
+                "queued": self.queued,
+                "throttled_calls": self.throttled_calls,
+                "throttled_seconds": round(self.throttled_seconds, 3),
+                "rate_limited": self.rate_limited,
+            }
+
+
+class OpenAIRateLimiter:
+    """
+    One ModelRateLimiter per model, sized from OpenAIUsageTracker.RATE_LIMITS.
+
+    Args:
+        backend: "memory" or "redis"
+    """
+
+    def __init__(self, backend: str = OPENAI_RATE_LIMIT_BACKEND):
+        self.backend = backend
+        self._limiters: Dict[str, ModelRateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def for_model(self, model: str) -> ModelRateLimiter:
+        """Get the limiter for a model."""
+        from app.utils.openai_usage_tracker import OpenAIUsageTracker
+
+        with self._lock:
+            if model not in self._limiters:
+                limits = OpenAIUsageTracker.RATE_LIMITS.get(
+                    model, {"requests": OPENAI_RATE_LIMIT_DEFAULT_RPM, "tokens": 0}
+                )
+                self._limiters[model] = ModelRateLimiter(
+                    model,
+                    limits["requests"] * OPENAI_RATE_LIMIT_HEADROOM,
+                    limits["tokens"] * OPENAI_RATE_LIMIT_HEADROOM,
+                    backend=self.backend,
+                )
+            return self._limiters[model]
+
+    def acquire(self, model: str, tokens: float = 0) -> float:
+        """Wait for capacity to call a model; see ModelRateLimiter.acquire."""
+        return self.for_model(model).acquire(tokens)
+
+    async def acquire_async(self, model: str, tokens: float = 0) -> float:
+        """Await capacity to call a model; see ModelRateLimiter.acquire_async."""
+        return await self.for_model(model).acquire_async(tokens)
+
+    def debit(self, model: str, tokens: float) -> None:
+        """Charge a model's token bucket for tokens a call used."""
+        self.for_model(model).debit(tokens)
+
+    def observe(
+        self, model: str, headers: Mapping[str, str], rate_limited: bool = False
+    ) -> None:
+        """Feed a model's response headers to its limiter."""
+        self.for_model(model).observe(headers, rate_limited=rate_limited)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return metrics for every model called so far."""
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {
+            "backend": self.backend,
+            "models": {model: lim.metrics() for model, lim in limiters.items()},
+        }
+
+    def clear(self) -> None:
+        """Forget every model's limiter."""
+        with self._lock:
+            self._limiters.clear()
+
+
+# Global OpenAI rate limiter instance
+openai_rate_limiter = OpenAIRateLimiter()
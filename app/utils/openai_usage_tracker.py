@@ -10,18 +10,37 @@ Features:
 - Cost estimation
 - Detailed logging
 - Usage statistics
+
+Memory stays flat in long-running processes: only the most recent calls are
+kept (a ring buffer of OPENAI_USAGE_HISTORY_SIZE), while session statistics are
+streaming aggregates per model, operation and tier (counts, token and cost sums, a
+fixed-bucket latency histogram). Aggregates accumulated since the last flush
+are written to the openai_usage_rollups table every OPENAI_USAGE_FLUSH_SECONDS
+by a background thread, and once more at exit.
+
+Image calls carry a tier ("quality/size", e.g. "hd/1024x1792") that sets their
+price and keeps their latency apart from cheaper variants. track_openai_call
+wraps both regular and async functions.
 """
 
+import asyncio
+import atexit
+import bisect
+import inspect
 import json
 import logging
 import os
+import threading
 import time
-from dataclasses import asdict, dataclass
-from datetime import datetime, timezone
+from collections import Counter, deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
 from functools import wraps
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Deque, Dict, Mapping, Optional, Tuple
 
+from app.config import OPENAI_USAGE_FLUSH_SECONDS, OPENAI_USAGE_HISTORY_SIZE
 from app.utils.logging_config import get_logger
+from app.utils.openai_rate_limiter import openai_rate_limiter, parse_reset
 
 logger = get_logger(__name__)
 
@@ -40,6 +59,149 @@ class APIUsage:
     error_message: Optional[str] = None
     rate_limit_remaining: Optional[int] = None
     rate_limit_reset: Optional[datetime] = None
+    size: Optional[str] = None
+    quality: Optional[str] = None
+
+    @property
+    def tier(self) -> str:
+        """Pricing tier within the model, e.g. "hd/1024x1792"; empty for chat."""
+        return "/".join(part for part in (self.quality, self.size) if part)
+
+
+# Upper bounds in ms of the latency histogram buckets; one more bucket is open-ended
+LATENCY_BUCKETS_MS = (
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+    20000,
+    40000,
+    60000,
+    120000,
+)
+
+
+def classify_error(error_message: str) -> str:
+    """Map an API error message to a coarse error type."""
+    message = error_message.lower()
+    if "429" in message or "rate limit" in message:
+        return "rate_limit"
+    if "quota" in message:
+        return "quota_exceeded"
+    if "invalid_api_key" in message:
+        return "invalid_api_key"
+    if "timeout" in message:
+        return "timeout"
+    return "unknown"
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram with interpolated quantiles.
+
+    Args:
+        bounds: Ascending bucket upper bounds in milliseconds
+    """
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a latency quantile.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            float: Estimated latency in milliseconds, 0 if nothing was observed
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.max_ms
+                fraction = (rank - seen) / bucket_count
+                return min(lower + (upper - lower) * fraction, self.max_ms)
+            seen += bucket_count
+        return self.max_ms
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "p50_ms": round(self.quantile(0.5), 2),
+            "p95_ms": round(self.quantile(0.95), 2),
+            "p99_ms": round(self.quantile(0.99), 2),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+@dataclass
+class UsageAggregate:
+    """Running totals of API calls for one model and operation."""
+
+    calls: int = 0
+    successful_calls: int = 0
+    tokens_used: int = 0
+    cost_usd: float = 0.0
+    error_types: Counter = field(default_factory=Counter)
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def add(self, usage: "APIUsage") -> None:
+        self.calls += 1
+        self.latency.observe(usage.response_time_ms)
+        if usage.success:
+            self.successful_calls += 1
+            self.tokens_used += usage.tokens_used
+            self.cost_usd += usage.cost_usd
+        elif usage.error_message:
+            self.error_types[classify_error(usage.error_message)] += 1
+
+    def merge(self, other: "UsageAggregate") -> None:
+        self.calls += other.calls
+        self.successful_calls += other.successful_calls
+        self.tokens_used += other.tokens_used
+        self.cost_usd += other.cost_usd
+        self.error_types.update(other.error_types)
+        self.latency.merge(other.latency)
+
+    @property
+    def failed_calls(self) -> int:
+        return self.calls - self.successful_calls
+
+
+def _latency_report(
+    aggregates: Dict[Tuple[str, str, str], UsageAggregate],
+) -> Dict[str, Any]:
+    return {
+        ":".join(filter(None, key)): {
+            "calls": agg.calls,
+            "avg_ms": round(agg.latency.total_ms / agg.calls, 2) if agg.calls else 0.0,
+            **agg.latency.summary(),
+        }
+        for key, agg in aggregates.items()
+    }
 
 
 @dataclass
@@ -66,29 +228,53 @@ class OpenAIUsageTracker:
         "gpt-4": {"input": 0.03, "output": 0.06},  # per 1K tokens
         "gpt-4-turbo": {"input": 0.01, "output": 0.03},
         "gpt-3.5-turbo": {"input": 0.0015, "output": 0.002},
-        "dall-e-3": {"1024x1024": 0.04, "1024x1792": 0.08, "1792x1024": 0.08},
+        "dall-e-3": {
+            "1024x1024": 0.04,
+            "1024x1792": 0.08,
+            "1792x1024": 0.08,
+            "hd:1024x1024": 0.08,
+            "hd:1024x1792": 0.12,
+            "hd:1792x1024": 0.12,
+        },
         "dall-e-2": {"1024x1024": 0.02, "512x512": 0.018, "256x256": 0.016},
     }
 
-    # Rate limits (requests per minute)
+    # Per-minute limits; they also size the buckets in openai_rate_limiter
     RATE_LIMITS = {
         "gpt-4": {"requests": 500, "tokens": 40000},
+        "gpt-4o": {"requests": 500, "tokens": 30000},
+        "gpt-4o-mini": {"requests": 500, "tokens": 200000},
         "gpt-4-turbo": {"requests": 500, "tokens": 40000},
         "gpt-3.5-turbo": {"requests": 3500, "tokens": 90000},
         "dall-e-3": {"requests": 50, "tokens": 0},
         "dall-e-2": {"requests": 50, "tokens": 0},
     }
 
-    def __init__(self, test_mode: bool = False):
+    def __init__(
+        self,
+        test_mode: bool = False,
+        history_size: int = OPENAI_USAGE_HISTORY_SIZE,
+        flush_interval: float = OPENAI_USAGE_FLUSH_SECONDS,
+    ):
         """Initialize the usage tracker.
 
         Args:
             test_mode: If True, disables detailed logging and session summaries for faster tests
+            history_size: Number of most recent calls kept in usage_history
+            flush_interval: Seconds between writes of usage rollups to the database
         """
         self.test_mode = test_mode
-        self.usage_history: List[APIUsage] = []
+        self.flush_interval = flush_interval
+        self.usage_history: Deque[APIUsage] = deque(maxlen=history_size)
+        # Session totals and totals not yet written, per (model, operation, tier)
+        self.aggregates: Dict[Tuple[str, str, str], UsageAggregate] = {}
+        self._pending: Dict[Tuple[str, str, str], UsageAggregate] = {}
+        self._pending_since = datetime.now(timezone.utc)
+        self._lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
         self.current_usage: Dict[str, Dict[str, int]] = {}
         self.rate_limit_info: Dict[str, RateLimitInfo] = {}
+        self.cache_lookups: Dict[str, Dict[str, int]] = {}
         self.session_start = datetime.now(timezone.utc)
 
         # Initialize current usage tracking
@@ -109,6 +295,8 @@ class OpenAIUsageTracker:
         error_message: Optional[str] = None,
         rate_limit_remaining: Optional[int] = None,
         rate_limit_reset: Optional[datetime] = None,
+        size: Optional[str] = None,
+        quality: Optional[str] = None,
     ) -> None:
         """
         Log an API call with detailed information.
@@ -122,9 +310,11 @@ class OpenAIUsageTracker:
             error_message: Error message if call failed
             rate_limit_remaining: Remaining requests in current window
             rate_limit_reset: When the rate limit resets
+            size: Image size, for image calls
+            quality: Image quality, for image calls
         """
         # Calculate cost
-        cost_usd = self._calculate_cost(model, operation, tokens_used)
+        cost_usd = self._calculate_cost(model, operation, tokens_used, size, quality)
 
         # Create usage record
         usage = APIUsage(
@@ -138,18 +328,69 @@ class OpenAIUsageTracker:
             error_message=error_message,
             rate_limit_remaining=rate_limit_remaining,
             rate_limit_reset=rate_limit_reset,
+            size=size,
+            quality=quality,
         )
 
-        # Add to history
-        self.usage_history.append(usage)
+        # Add to history and the running aggregates
+        key = (model, operation, usage.tier)
+        with self._lock:
+            self.usage_history.append(usage)
+            self.aggregates.setdefault(key, UsageAggregate()).add(usage)
+            self._pending.setdefault(key, UsageAggregate()).add(usage)
+
+            # Update current usage
+            self._update_current_usage(model, tokens_used)
 
-        # Update current usage
-        self._update_current_usage(model, tokens_used)
+        if not self.test_mode:
+            self._ensure_flusher()
 
         # Log the usage
         self._log_usage_summary(usage)
 
-    def _calculate_cost(self, model: str, operation: str, tokens_used: int) -> float:
+    def record_cache_lookup(self, model: str, hit: bool) -> None:
+        """
+        Count a response cache lookup for a model.
+
+        Args:
+            model: The OpenAI model the cached request was for
+            hit: Whether a cached response was returned
+        """
+        counts = self.cache_lookups.setdefault(model, {"hits": 0, "misses": 0})
+        counts["hits" if hit else "misses"] += 1
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get response cache hit/miss counts, overall and per model."""
+        hits = sum(c["hits"] for c in self.cache_lookups.values())
+        misses = sum(c["misses"] for c in self.cache_lookups.values())
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": (
+                f"{(hits / (hits + misses)) * 100:.1f}%" if hits + misses else "0%"
+            ),
+            "by_model": {model: dict(c) for model, c in self.cache_lookups.items()},
+        }
+
+    def get_latency_metrics(self) -> Dict[str, Any]:
+        """
+        Get this process's latency quantiles per model, operation and tier.
+
+        Returns:
+            Dict keyed by "model:operation[:tier]" with call counts, average
+            and p50/p95/p99/max latency in milliseconds
+        """
+        with self._lock:
+            return _latency_report(self.aggregates)
+
+    def _calculate_cost(
+        self,
+        model: str,
+        operation: str,
+        tokens_used: int,
+        size: Optional[str] = None,
+        quality: Optional[str] = None,
+    ) -> float:
         """Calculate the cost of an API call."""
         if model not in self.PRICING:
             return 0.0
@@ -167,9 +408,9 @@ class OpenAIUsageTracker:
             return input_cost + output_cost
 
         elif operation == "image":
-            # For image generation, use the size-based pricing
-            size = "1024x1024"  # Default size
-            return pricing.get(size, 0)
+            # For image generation, use the size- and quality-based pricing
+            size = size or "1024x1024"  # Default size
+            return pricing.get(f"{quality}:{size}", pricing.get(size, 0))
 
         return 0.0
 
@@ -253,61 +494,64 @@ class OpenAIUsageTracker:
 
     def get_session_summary(self) -> Dict[str, Any]:
         """Get a summary of the current session's API usage."""
-        if not self.usage_history:
-            return {"message": "No API calls recorded in this session"}
-
-        total_calls = len(self.usage_history)
-        successful_calls = sum(1 for u in self.usage_history if u.success)
-        failed_calls = total_calls - successful_calls
+        with self._lock:
+            aggregates = {
+                key: (
+                    agg.calls,
+                    agg.successful_calls,
+                    agg.tokens_used,
+                    agg.cost_usd,
+                    Counter(agg.error_types),
+                    agg.latency.total_ms,
+                    agg.latency.summary(),
+                )
+                for key, agg in self.aggregates.items()
+            }
+            current_usage = {
+                model: dict(usage) for model, usage in self.current_usage.items()
+            }
 
-        total_cost = sum(u.cost_usd for u in self.usage_history if u.success)
-        total_tokens = sum(u.tokens_used for u in self.usage_history if u.success)
+        if not aggregates:
+            return {
+                "message": "No API calls recorded in this session",
+                "response_cache": self.get_cache_stats(),
+            }
 
-        avg_response_time = (
-            sum(u.response_time_ms for u in self.usage_history) / total_calls
-            if total_calls > 0
-            else 0
-        )
+        total_calls = 0
+        successful_calls = 0
+        total_tokens = 0
+        total_cost = 0.0
+        total_response_time = 0.0
+        error_counts: Counter = Counter()
 
         # Group by model
         model_usage = {}
-        for usage in self.usage_history:
-            if usage.model not in model_usage:
-                model_usage[usage.model] = {
-                    "calls": 0,
-                    "tokens": 0,
-                    "cost": 0.0,
-                    "errors": 0,
-                    "error_types": [],
-                }
-
-            model_usage[usage.model]["calls"] += 1
-            if usage.success:
-                model_usage[usage.model]["tokens"] += usage.tokens_used
-                model_usage[usage.model]["cost"] += usage.cost_usd
-            else:
-                model_usage[usage.model]["errors"] += 1
-                if usage.error_message:
-                    # Extract error type from error message
-                    error_type = "unknown"
-                    if (
-                        "429" in usage.error_message
-                        or "rate limit" in usage.error_message.lower()
-                    ):
-                        error_type = "rate_limit"
-                    elif (
-                        "quota" in usage.error_message.lower()
-                        or "insufficient_quota" in usage.error_message.lower()
-                    ):
-                        error_type = "quota_exceeded"
-                    elif "invalid_api_key" in usage.error_message.lower():
-                        error_type = "invalid_api_key"
-                    elif "timeout" in usage.error_message.lower():
-                        error_type = "timeout"
-
-                    if error_type not in model_usage[usage.model]["error_types"]:
-                        model_usage[usage.model]["error_types"].append(error_type)
+        latency = {}
+        for (model, operation, tier), values in aggregates.items():
+            calls, successes, tokens, cost, errors, response_time, quantiles = values
+            total_calls += calls
+            successful_calls += successes
+            total_tokens += tokens
+            total_cost += cost
+            total_response_time += response_time
+            error_counts.update(errors)
+
+            breakdown = model_usage.setdefault(
+                model,
+                {"calls": 0, "tokens": 0, "cost": 0.0, "errors": 0, "error_types": []},
+            )
+            breakdown["calls"] += calls
+            breakdown["tokens"] += tokens
+            breakdown["cost"] += cost
+            breakdown["errors"] += calls - successes
+            for error_type in errors:
+                if error_type not in breakdown["error_types"]:
+                    breakdown["error_types"].append(error_type)
+
+            latency[":".join(filter(None, (model, operation, tier)))] = quantiles
 
+        failed_calls = total_calls - successful_calls
+        avg_response_time = total_response_time / total_calls
         session_duration = datetime.now(timezone.utc) - self.session_start
 
         summary = {
@@ -315,16 +559,14 @@ class OpenAIUsageTracker:
             "total_api_calls": total_calls,
             "successful_calls": successful_calls,
             "failed_calls": failed_calls,
-            "success_rate": (
-                f"{(successful_calls/total_calls)*100:.1f}%"
-                if total_calls > 0
-                else "0%"
-            ),
+            "success_rate": f"{(successful_calls/total_calls)*100:.1f}%",
             "total_tokens_used": total_tokens,
             "total_cost_usd": f"${total_cost:.4f}",
             "average_response_time_ms": f"{avg_response_time:.2f}ms",
             "model_breakdown": model_usage,
-            "current_rate_limits": self.current_usage,
+            "latency": latency,
+            "current_rate_limits": current_usage,
+            "response_cache": self.get_cache_stats(),
         }
 
         # Add specific error information if there were failures
@@ -332,24 +574,88 @@ class OpenAIUsageTracker:
             summary["error_summary"] = {
                 "total_failures": failed_calls,
                 "failure_rate": f"{(failed_calls/total_calls)*100:.1f}%",
-                "common_errors": [],
+                "common_errors": [
+                    {"type": error_type, "count": count}
+                    for error_type, count in error_counts.most_common()
+                ],
             }
 
-            # Collect common error types
-            all_error_types = []
-            for model_data in model_usage.values():
-                all_error_types.extend(model_data.get("error_types", []))
+        return summary
 
-            if all_error_types:
-                from collections import Counter
+    def flush(self, session: Any = None) -> int:
+        """
+        Write usage accumulated since the last flush to openai_usage_rollups.
 
-                error_counts = Counter(all_error_types)
-                summary["error_summary"]["common_errors"] = [
-                    {"type": error_type, "count": count}
-                    for error_type, count in error_counts.most_common()
-                ]
+        Args:
+            session: Database session; a new one is opened if not given
 
-        return summary
+        Returns:
+            int: Number of rollup rows written
+        """
+        from app.db.database import SessionLocal
+        from app.db.models import OpenAIUsageRollup
+
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            window_start, self._pending_since = (
+                self._pending_since,
+                datetime.now(timezone.utc),
+            )
+        if not pending:
+            return 0
+
+        window_end = datetime.now(timezone.utc)
+        db = session or SessionLocal()
+        try:
+            db.add_all(
+                OpenAIUsageRollup(
+                    window_start=window_start,
+                    window_end=window_end,
+                    model=model,
+                    operation=operation,
+                    tier=tier,
+                    calls=agg.calls,
+                    failed_calls=agg.failed_calls,
+                    tokens_used=agg.tokens_used,
+                    cost_usd=agg.cost_usd,
+                    total_response_time_ms=agg.latency.total_ms,
+                    max_response_time_ms=agg.latency.max_ms,
+                    latency_histogram=agg.latency.counts,
+                )
+                for (model, operation, tier), agg in pending.items()
+            )
+            db.commit()
+            return len(pending)
+        except Exception as e:
+            if session is None:
+                db.rollback()
+            logger.warning(f"Failed to persist OpenAI usage rollups: {e}")
+            # Keep the totals for the next attempt
+            with self._lock:
+                for key, agg in pending.items():
+                    self._pending.setdefault(key, UsageAggregate()).merge(agg)
+                self._pending_since = min(self._pending_since, window_start)
+            return 0
+        finally:
+            if session is None:
+                db.close()
+
+    def _ensure_flusher(self) -> None:
+        with self._lock:
+            if self._flusher is not None and self._flusher.is_alive():
+                return
+            if self._flusher is None:
+                # Write whatever the last interval collected when the process exits
+                atexit.register(self.flush)
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="openai-usage-flusher", daemon=True
+            )
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
 
     def log_session_summary(self) -> None:
         """Log a comprehensive session summary."""
@@ -378,84 +684,163 @@ def get_usage_tracker() -> OpenAIUsageTracker:
     return _usage_tracker
 
 
-def track_openai_call(model: str, operation: str = "chat"):
+def _response_headers(obj: Any) -> Mapping[str, str]:
+    """Find the HTTP response headers on an OpenAI result or error, if any."""
+    headers = getattr(obj, "_headers", None)
+    if headers is None:
+        headers = getattr(getattr(obj, "response", None), "headers", None)
+    return headers if isinstance(headers, Mapping) else {}
+
+
+class _TrackedCall:
+    """Bookkeeping for one tracked OpenAI call, shared by sync and async calls."""
+
+    def __init__(
+        self,
+        model: str,
+        operation: str,
+        size: Optional[str],
+        quality: Optional[str],
+        reserved: float = 0,
+    ):
+        self.model = model
+        self.operation = operation
+        self.size = size
+        self.quality = quality
+        self.reserved = reserved
+        self.start_time = time.time()
+        self.success = False
+        self.error_message: Optional[str] = None
+        self.tokens_used = 0
+        self.rate_limit_remaining: Optional[int] = None
+        self.rate_limit_reset: Optional[datetime] = None
+
+    def succeeded(self, result: Any) -> None:
+        self.success = True
+
+        # Try to extract token usage from response
+        usage = getattr(result, "usage", None)
+        if isinstance(getattr(usage, "total_tokens", None), int):
+            self.tokens_used = usage.total_tokens
+            # Only the tokens beyond what acquire already reserved
+            openai_rate_limiter.debit(self.model, self.tokens_used - self.reserved)
+
+        # Try to extract rate limit info from response headers
+        headers = _response_headers(result)
+        if headers:
+            openai_rate_limiter.observe(self.model, headers)
+            remaining = headers.get("x-ratelimit-remaining-requests")
+            if remaining is not None and remaining.isdigit():
+                self.rate_limit_remaining = int(remaining)
+            reset = parse_reset(headers.get("x-ratelimit-reset-requests"))
+            if reset is not None:
+                self.rate_limit_reset = datetime.now(timezone.utc) + timedelta(
+                    seconds=reset
+                )
+
+    def failed(self, e: Exception) -> None:
+        model, operation = self.model, self.operation
+        error_message = self.error_message = str(e)
+        rate_limited = getattr(e, "status_code", None) == 429 or "429" in error_message
+        headers = _response_headers(e)
+        if headers or rate_limited:
+            openai_rate_limiter.observe(model, headers, rate_limited=rate_limited)
+
+        # Check for specific error types and log appropriate warnings (skip in test mode)
+        if not _test_mode:
+            if "429" in error_message or "rate limit" in error_message.lower():
+                logger.warning(f"🚨 Rate limit exceeded for {model} - {operation}")
+            elif "quota" in error_message.lower():
+                logger.error(f"💳 API quota exceeded for {model} - {operation}")
+            elif "insufficient_quota" in error_message.lower():
+                logger.error(f"💳 Insufficient quota for {model} - {operation}")
+            elif "invalid_api_key" in error_message.lower():
+                logger.error(f"🔑 Invalid API key for {model} - {operation}")
+            else:
+                logger.error(
+                    f"❌ API call failed for {model} - {operation}: {error_message}"
+                )
+
+    def finish(self) -> None:
+        response_time_ms = (time.time() - self.start_time) * 1000
+
+        # Always log the API call attempt, even if it failed (but skip in test mode for performance)
+        if not _test_mode:
+            _usage_tracker.log_api_call(
+                model=self.model,
+                operation=self.operation,
+                tokens_used=self.tokens_used,
+                response_time_ms=response_time_ms,
+                success=self.success,
+                error_message=self.error_message,
+                rate_limit_remaining=self.rate_limit_remaining,
+                rate_limit_reset=self.rate_limit_reset,
+                size=self.size,
+                quality=self.quality,
+            )
+
+
+def track_openai_call(
+    model: str,
+    operation: str = "chat",
+    size: Optional[str] = None,
+    quality: Optional[str] = None,
+    estimate: Optional[Callable[..., float]] = None,
+):
     """
     Decorator to track OpenAI API calls.
 
+    Works on both regular and async functions. Calls first wait for capacity
+    in the model's rate limiter, which is then fed the call's token usage and
+    rate-limit headers.
+
     Args:
         model: The OpenAI model being used
         operation: The type of operation (chat, image, etc.)
+        size: Image size, for image pricing and latency tiers
+        quality: Image quality, for image pricing and latency tiers
+        estimate: Called with the call's arguments; returns the tokens to
+            reserve before the call
     """
 
+    def reserve(args, kwargs) -> float:
+        return estimate(*args, **kwargs) if estimate is not None else 0
+
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                reserved = reserve(args, kwargs)
+                await openai_rate_limiter.acquire_async(model, reserved)
+                call = _TrackedCall(model, operation, size, quality, reserved)
+                try:
+                    result = await func(*args, **kwargs)
+                    # Feeding the limiter may make blocking Redis calls
+                    await asyncio.to_thread(call.succeeded, result)
+                    return result
+                except Exception as e:
+                    await asyncio.to_thread(call.failed, e)
+                    raise
+                finally:
+                    call.finish()
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            start_time = time.time()
-            success = False
-            error_message = None
-            tokens_used = 0
-            rate_limit_remaining = None
-            rate_limit_reset = None
-
+            reserved = reserve(args, kwargs)
+            openai_rate_limiter.acquire(model, reserved)
+            call = _TrackedCall(model, operation, size, quality, reserved)
             try:
                 result = func(*args, **kwargs)
-                success = True
-
-                # Try to extract token usage from response
-                if hasattr(result, "usage") and result.usage:
-                    tokens_used = result.usage.total_tokens
-
-                # Try to extract rate limit info from response headers
-                if hasattr(result, "_headers"):
-                    headers = result._headers
-                    if "x-ratelimit-remaining-requests" in headers:
-                        rate_limit_remaining = int(
-                            headers["x-ratelimit-remaining-requests"]
-                        )
-                    if "x-ratelimit-reset-requests" in headers:
-                        reset_timestamp = int(headers["x-ratelimit-reset-requests"])
-                        rate_limit_reset = datetime.fromtimestamp(
-                            reset_timestamp, timezone.utc
-                        )
-
+                call.succeeded(result)
                 return result
-
             except Exception as e:
-                error_message = str(e)
-
-                # Check for specific error types and log appropriate warnings (skip in test mode)
-                if not _test_mode:
-                    if "429" in error_message or "rate limit" in error_message.lower():
-                        logger.warning(
-                            f"🚨 Rate limit exceeded for {model} - {operation}"
-                        )
-                    elif "quota" in error_message.lower():
-                        logger.error(f"💳 API quota exceeded for {model} - {operation}")
-                    elif "insufficient_quota" in error_message.lower():
-                        logger.error(f"💳 Insufficient quota for {model} - {operation}")
-                    elif "invalid_api_key" in error_message.lower():
-                        logger.error(f"🔑 Invalid API key for {model} - {operation}")
-                    else:
-                        logger.error(
-                            f"❌ API call failed for {model} - {operation}: {error_message}"
-                        )
-
+                call.failed(e)
                 raise
             finally:
-                response_time_ms = (time.time() - start_time) * 1000
-
-                # Always log the API call attempt, even if it failed (but skip in test mode for performance)
-                if not _test_mode:
-                    _usage_tracker.log_api_call(
-                        model=model,
-                        operation=operation,
-                        tokens_used=tokens_used,
-                        response_time_ms=response_time_ms,
-                        success=success,
-                        error_message=error_message,
-                        rate_limit_remaining=rate_limit_remaining,
-                        rate_limit_reset=rate_limit_reset,
-                    )
+                call.finish()
 
         return wrapper
 
@@ -467,3 +852,45 @@ def log_session_summary():
     # Skip session summary in test mode
     if not _test_mode:
         _usage_tracker.log_session_summary()
+
+
+def load_latency_metrics(session: Any, since: datetime) -> Dict[str, Any]:
+    """
+    Latency quantiles per model, operation and tier from persisted rollups.
+
+    Unlike OpenAIUsageTracker.get_latency_metrics, this covers every process
+    that records usage: API replicas, commission workers and agents.
+
+    Args:
+        session: Database session
+        since: Only rollups whose window ended at or after this time count
+
+    Returns:
+        Dict keyed by "model:operation[:tier]" with call counts, average and
+        p50/p95/p99/max latency in milliseconds
+    """
+    from app.db.models import OpenAIUsageRollup
+
+    rows = (
+        session.query(OpenAIUsageRollup)
+        .filter(OpenAIUsageRollup.window_end >= since)
+        .all()
+    )
+    merged: Dict[Tuple[str, str, str], UsageAggregate] = {}
+    for row in rows:
+        aggregate = UsageAggregate(
+            calls=row.calls,
+            successful_calls=row.calls - row.failed_calls,
+            tokens_used=row.tokens_used,
+            cost_usd=row.cost_usd,
+        )
+        latency = aggregate.latency
+        # Rows written with different bucket bounds only contribute totals
+        if row.latency_histogram and len(row.latency_histogram) == len(latency.counts):
+            latency.counts = list(row.latency_histogram)
+            latency.count = sum(latency.counts)
+        latency.total_ms = row.total_response_time_ms
+        latency.max_ms = row.max_response_time_ms
+        key = (row.model, row.operation, row.tier or "")
+        merged.setdefault(key, UsageAggregate()).merge(aggregate)
+    return _latency_report(merged)
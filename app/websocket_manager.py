@@ -3,22 +3,144 @@ WebSocket Manager for real-time task progress updates.
 
 This module handles WebSocket connections for real-time updates
 about commission task progress, using Redis pub/sub for cross-service communication.
+
+Each connection has its own bounded outbound queue drained by a dedicated
+sender task, so broadcasting never waits on a client and one slow client
+cannot stall fan-out to the others.
+
+Task updates are published on per-task channels. A replica subscribes to a
+task's channel only while one of its local sockets is subscribed to that task,
+so its Redis fan-in scales with local subscribers rather than global traffic.
 """
 
 import asyncio
 import json
 import logging
-from typing import Any, Dict, Optional, Set
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Set
 
 from fastapi import WebSocket, WebSocketDisconnect
 
-from app.config import WEBSOCKET_GENERAL_UPDATES_CHANNEL, WEBSOCKET_TASK_UPDATES_CHANNEL
+from app.config import (
+    WEBSOCKET_GENERAL_UPDATES_CHANNEL,
+    WEBSOCKET_QUEUE_SIZE,
+    WEBSOCKET_SEND_TIMEOUT,
+)
+from app.redis_publisher import task_update_channel
 from app.redis_service import redis_service
 from app.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
+class OutboundQueue:
+    """
+    Bounded outbound frame queue for a single WebSocket connection.
+
+    Frames with a coalesce key (task updates, keyed by task ID) replace any
+    queued frame with the same key, so a client that falls behind receives
+    only the latest progress for each task. Other frames are dropped oldest
+    first when the queue is full. A client that times out on a send, or keeps
+    overflowing without draining anything, is evicted.
+
+    Args:
+        websocket: The connection to send to
+        on_evict: Called as on_evict(websocket, reason) when the client is evicted
+        max_size: Maximum number of queued frames
+        send_timeout: Seconds a single send may take before the client is evicted
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        on_evict: Callable[[WebSocket, str], None],
+        max_size: int = WEBSOCKET_QUEUE_SIZE,
+        send_timeout: float = WEBSOCKET_SEND_TIMEOUT,
+    ):
+        self.websocket = websocket
+        self.max_size = max(1, max_size)
+        self.send_timeout = send_timeout
+        self._on_evict = on_evict
+        self._frames: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._ready = asyncio.Event()
+        self._sequence = 0
+        self._drops_since_send = 0
+        self._task: Optional[asyncio.Task] = None
+        self.closed = False
+
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._frames)
+
+    def start(self) -> None:
+        """Start the sender task on the running event loop."""
+        self._task = asyncio.create_task(self._run())
+
+    def put(self, frame: str, coalesce_key: Optional[Hashable] = None) -> bool:
+        """
+        Queue a serialized frame without waiting for it to be sent.
+
+        Returns:
+            bool: False if the connection is closed or was evicted
+        """
+        if self.closed:
+            return False
+
+        if coalesce_key is not None and coalesce_key in self._frames:
+            self._frames[coalesce_key] = frame
+            self.coalesced += 1
+            return True
+
+        if len(self._frames) >= self.max_size:
+            self._frames.popitem(last=False)
+            self.dropped += 1
+            self._drops_since_send += 1
+            if self._drops_since_send >= self.max_size:
+                self._evict("outbound queue overflowed without draining")
+                return False
+
+        if coalesce_key is None:
+            self._sequence += 1
+            coalesce_key = ("frame", self._sequence)
+        self._frames[coalesce_key] = frame
+        self._ready.set()
+        return True
+
+    def close(self) -> None:
+        """Stop the sender task and discard queued frames."""
+        self.closed = True
+        self._frames.clear()
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                await self._ready.wait()
+                while self._frames:
+                    _, frame = self._frames.popitem(last=False)
+                    await asyncio.wait_for(
+                        self.websocket.send_text(frame), timeout=self.send_timeout
+                    )
+                    self.sent += 1
+                    self._drops_since_send = 0
+                self._ready.clear()
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            self._evict(f"send timed out after {self.send_timeout}s")
+        except Exception as e:
+            self._evict(f"send failed: {e}")
+
+    def _evict(self, reason: str) -> None:
+        if not self.closed:
+            self._on_evict(self.websocket, reason)
+
+
 class WebSocketManager:
     """
     Manages WebSocket connections for real-time updates.
@@ -35,6 +157,13 @@ class WebSocketManager:
         self.active_connections: Set[WebSocket] = set()
         self.task_subscriptions: Dict[str, Set[WebSocket]] = {}
         self._redis_listener_task: Optional[asyncio.Task] = None
+        self._outbound: Dict[WebSocket, OutboundQueue] = {}
+
+        # Totals carried over from closed connections, for get_metrics()
+        self._closed_sent = 0
+        self._closed_dropped = 0
+        self._closed_coalesced = 0
+        self._evictions = 0
 
         logger.info("WebSocket Manager initialized")
 
@@ -44,10 +173,7 @@ class WebSocketManager:
             # Connect to Redis
             await redis_service.connect()
 
-            # Subscribe to Redis channels
-            redis_service.subscribe_to_channel(
-                WEBSOCKET_TASK_UPDATES_CHANNEL, self._handle_redis_task_update
-            )
+            # Per-task channels are subscribed on demand in subscribe_to_task
             redis_service.subscribe_to_channel(
                 WEBSOCKET_GENERAL_UPDATES_CHANNEL, self._handle_redis_general_update
             )
@@ -79,6 +205,10 @@ class WebSocketManager:
         await redis_service.stop_listening()
         await redis_service.disconnect()
 
+        for outbound in list(self._outbound.values()):
+            outbound.close()
+        self._outbound.clear()
+
         logger.info("WebSocket Manager stopped")
 
     async def _handle_redis_task_update(self, message: Dict[str, Any]) -> None:
@@ -110,6 +240,9 @@ class WebSocketManager:
         """Accept a new WebSocket connection."""
         await websocket.accept()
         self.active_connections.add(websocket)
+        outbound = OutboundQueue(websocket, self._evict)
+        outbound.start()
+        self._outbound[websocket] = outbound
         logger.debug(
             f"WebSocket connected. Total connections: {len(self.active_connections)}"
         )
@@ -118,11 +251,19 @@ class WebSocketManager:
         """Remove a WebSocket connection."""
         self.active_connections.discard(websocket)
 
+        outbound = self._outbound.pop(websocket, None)
+        if outbound is not None:
+            outbound.close()
+            self._closed_sent += outbound.sent
+            self._closed_dropped += outbound.dropped
+            self._closed_coalesced += outbound.coalesced
+
         # Remove from task subscriptions
         for task_id in list(self.task_subscriptions.keys()):
             self.task_subscriptions[task_id].discard(websocket)
             if not self.task_subscriptions[task_id]:
                 del self.task_subscriptions[task_id]
+                asyncio.ensure_future(self._release_task_channel(task_id))
 
         logger.debug(
             f"WebSocket disconnected. Total connections: {len(self.active_connections)}"
@@ -130,10 +271,15 @@ class WebSocketManager:
 
     async def subscribe_to_task(self, websocket: WebSocket, task_id: str):
         """Subscribe a WebSocket to task updates."""
-        if task_id not in self.task_subscriptions:
+        first_local_subscriber = task_id not in self.task_subscriptions
+        if first_local_subscriber:
             self.task_subscriptions[task_id] = set()
 
         self.task_subscriptions[task_id].add(websocket)
+        if first_local_subscriber:
+            await redis_service.subscribe(
+                task_update_channel(task_id), self._handle_redis_task_update
+            )
         logger.debug(f"WebSocket subscribed to task {task_id}")
 
     async def unsubscribe_from_task(self, websocket: WebSocket, task_id: str):
@@ -142,9 +288,17 @@ class WebSocketManager:
             self.task_subscriptions[task_id].discard(websocket)
             if not self.task_subscriptions[task_id]:
                 del self.task_subscriptions[task_id]
+                await self._release_task_channel(task_id)
 
         logger.debug(f"WebSocket unsubscribed from task {task_id}")
 
+    async def _release_task_channel(self, task_id: str) -> None:
+        """Drop the Redis subscription for a task once no local socket watches it."""
+        # A socket may have re-subscribed before this ran
+        if task_id in self.task_subscriptions:
+            return
+        await redis_service.unsubscribe(task_update_channel(task_id))
+
     async def broadcast_task_update(self, task_id: str, update: Dict[str, Any]):
         """Broadcast a task update to Redis (for cross-service communication)."""
         try:
@@ -157,28 +311,19 @@ class WebSocketManager:
     async def _broadcast_to_task_subscribers(
         self, task_id: str, update: Dict[str, Any]
     ):
-        """Broadcast a task update to all subscribed clients (internal method)."""
-        if task_id not in self.task_subscriptions:
+        """Queue a task update for all subscribed clients (internal method)."""
+        subscribers = self.task_subscriptions.get(task_id)
+        if not subscribers:
             return
 
         message = {"type": "task_update", "task_id": task_id, "data": update}
+        frame = json.dumps(message)
 
-        disconnected = set()
-        for websocket in self.task_subscriptions[task_id]:
-            try:
-                await websocket.send_text(json.dumps(message))
-            except Exception as e:
-                logger.error(f"Error sending task update: {e}")
-                disconnected.add(websocket)
-
-        # Clean up disconnected websockets
-        for websocket in disconnected:
-            self.disconnect(websocket)
-
-        if len(self.task_subscriptions[task_id]) > 0:
-            logger.debug(
-                f"Broadcasted task update for {task_id} to {len(self.task_subscriptions[task_id])} clients"
-            )
+        # Only the latest queued update per task is kept for a lagging client
+        for websocket in list(subscribers):
+            self._enqueue(websocket, frame, coalesce_key=("task", task_id))
+
+        logger.debug(f"Queued task update for {task_id} to {len(subscribers)} clients")
 
     async def broadcast_general_update(self, update: Dict[str, Any]):
         """Broadcast a general update to Redis (for cross-service communication)."""
@@ -190,34 +335,61 @@ class WebSocketManager:
             await self._broadcast_to_all_connections(update)
 
     async def _broadcast_to_all_connections(self, update: Dict[str, Any]):
-        """Broadcast a general update to all connected clients (internal method)."""
+        """Queue a general update for all connected clients (internal method)."""
         message = {"type": "general_update", "data": update}
+        frame = json.dumps(message)
 
-        disconnected = set()
-        for websocket in self.active_connections:
-            try:
-                await websocket.send_text(json.dumps(message))
-            except Exception as e:
-                logger.error(f"Error sending general update: {e}")
-                disconnected.add(websocket)
+        for websocket in list(self.active_connections):
+            self._enqueue(websocket, frame)
 
-        # Clean up disconnected websockets
-        for websocket in disconnected:
-            self.disconnect(websocket)
-
-        logger.info(
-            f"Broadcasted general update to {len(self.active_connections)} clients"
-        )
+        logger.info(f"Queued general update for {len(self.active_connections)} clients")
 
     async def send_personal_message(
         self, websocket: WebSocket, message: Dict[str, Any]
     ):
-        """Send a personal message to a specific WebSocket."""
+        """Queue a personal message for a specific WebSocket."""
+        self._enqueue(websocket, json.dumps(message))
+
+    def _enqueue(
+        self, websocket: WebSocket, frame: str, coalesce_key: Optional[Hashable] = None
+    ) -> None:
+        outbound = self._outbound.get(websocket)
+        if outbound is None:
+            logger.debug("Dropping frame for WebSocket without an outbound queue")
+            return
+        outbound.put(frame, coalesce_key)
+
+    def _evict(self, websocket: WebSocket, reason: str) -> None:
+        """Disconnect a slow or broken client without blocking the caller."""
+        if websocket not in self._outbound:
+            return
+        self._evictions += 1
+        logger.warning(f"Evicting WebSocket client: {reason}")
+        self.disconnect(websocket)
+        asyncio.ensure_future(self._close_quietly(websocket))
+
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket) -> None:
         try:
-            await websocket.send_text(json.dumps(message))
-        except Exception as e:
-            logger.error(f"Error sending personal message: {e}")
-            self.disconnect(websocket)
+            # 1013: try again later
+            await websocket.close(code=1013)
+        except Exception:
+            pass
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get outbound queue depth and frame counters across connections."""
+        queues = list(self._outbound.values())
+        depths = [q.depth for q in queues]
+        return {
+            "connections": len(self.active_connections),
+            "queued_frames": sum(depths),
+            "max_queue_depth": max(depths, default=0),
+            "frames_sent": self._closed_sent + sum(q.sent for q in queues),
+            "frames_dropped": self._closed_dropped + sum(q.dropped for q in queues),
+            "frames_coalesced": self._closed_coalesced
+            + sum(q.coalesced for q in queues),
+            "evictions": self._evictions,
+        }
 
     def get_connection_count(self) -> int:
         """Get the number of active connections."""
@@ -138,4 +138,30 @@ describe('useProducts', () => {
 
     expect(result.current.products).toEqual(newProducts);
   });
-});
\ No newline at end of file
+
+  it('should stream pages when pageSize is set', async () => {
+    const secondProduct = { ...mockProduct, product_info: { ...mockProduct.product_info, id: 2 } };
+    mockGet
+      .mockResolvedValueOnce({ data: { items: [mockProduct], next_cursor: 'abc' } })
+      .mockResolvedValueOnce({ data: { items: [secondProduct], next_cursor: null } });
+
+    const { result } = renderHook(() =>
+      useProducts({ pageSize: 1, fields: ['product_info', 'reddit_post.title'] })
+    );
+
+    await waitFor(() => {
+      expect(result.current.products).toHaveLength(2);
+    });
+    await waitFor(() => {
+      expect(result.current.loadingMore).toBe(false);
+    });
+
+    expect(result.current.products).toEqual([mockProduct, secondProduct]);
+    expect(mockAxios.get).toHaveBeenNthCalledWith(1, 'http://localhost:8000/api/generated_products', {
+      params: { limit: 1, fields: 'product_info,reddit_post.title' }
+    });
+    expect(mockAxios.get).toHaveBeenNthCalledWith(2, 'http://localhost:8000/api/generated_products', {
+      params: { limit: 1, cursor: 'abc', fields: 'product_info,reddit_post.title' }
+    });
+  });
+});
@@ -26,7 +26,7 @@ interface ProductGridProps {
 }
 
 export const ProductGrid: React.FC<ProductGridProps> = ({ onCommissionProgressChange, onCommissionClick, onDonationClick }) => {
-  const { products, loading, error, refresh: refreshProducts } = useProducts();
+  const { products, loading, error, refresh: refreshProducts } = useProducts({ pageSize: 24 });
   const [searchParams] = useSearchParams();
   const [selectedProduct, setSelectedProduct] = useState<ProductWithFullDonationData | null>(null);
   const [showModal, setShowModal] = useState(false);
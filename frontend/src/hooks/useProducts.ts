@@ -1,33 +1,81 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import axios from 'axios';
-import type { GeneratedProduct } from '../types/productTypes';
+import type { GeneratedProduct, GeneratedProductPage } from '../types/productTypes';
 import { API_BASE } from '../utils/apiBase';
 
 const API_URL = `${API_BASE}/api/generated_products`;
 
-export const useProducts = () => {
+interface UseProductsOptions {
+  /** When set, products are streamed in keyset pages of this size. */
+  pageSize?: number;
+  /** Dotted fields to request, e.g. ['product_info', 'reddit_post.title']. */
+  fields?: string[];
+}
+
+export const useProducts = (options: UseProductsOptions = {}) => {
+  const { pageSize, fields } = options;
+  const fieldsParam = fields?.join(',');
   const [products, setProducts] = useState<GeneratedProduct[]>([]);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
+  // Incremented on every fetch so a stale stream stops appending pages
+  const fetchIdRef = useRef(0);
+
+  const fetchAll = useCallback(async () => {
+    const response = await axios.get<GeneratedProduct[]>(API_URL);
+    const data = Array.isArray(response.data) ? response.data : [];
+    setProducts(data);
+  }, []);
+
+  const streamPages = useCallback(async (fetchId: number) => {
+    let cursor: string | null = null;
+    let firstPage = true;
+    do {
+      const params: Record<string, string | number> = { limit: pageSize as number };
+      if (cursor) params.cursor = cursor;
+      if (fieldsParam) params.fields = fieldsParam;
+
+      const response = await axios.get<GeneratedProductPage>(API_URL, { params });
+      if (fetchIdRef.current !== fetchId) return;
+
+      const items = Array.isArray(response.data?.items) ? response.data.items : [];
+      setProducts(prev => (firstPage ? items : [...prev, ...items]));
+      if (firstPage) {
+        // Show the first page immediately; keep streaming the rest
+        firstPage = false;
+        setLoading(false);
+        setLoadingMore(true);
+      }
+      cursor = response.data?.next_cursor ?? null;
+    } while (cursor);
+  }, [pageSize, fieldsParam]);
 
   const fetchProducts = useCallback(async () => {
+    const fetchId = ++fetchIdRef.current;
     try {
       setLoading(true);
-      const response = await axios.get<GeneratedProduct[]>(API_URL);
-      const data = Array.isArray(response.data) ? response.data : [];
-      setProducts(data);
-      setError(null);
+      if (pageSize) {
+        await streamPages(fetchId);
+      } else {
+        await fetchAll();
+      }
+      if (fetchIdRef.current === fetchId) setError(null);
     } catch (err) {
+      if (fetchIdRef.current !== fetchId) return;
       setProducts([]);
       setError(err instanceof Error ? err.message : 'An error occurred while fetching products');
     } finally {
-      setLoading(false);
+      if (fetchIdRef.current === fetchId) {
+        setLoading(false);
+        setLoadingMore(false);
+      }
     }
-  }, []);
+  }, [pageSize, fetchAll, streamPages]);
 
   useEffect(() => {
     fetchProducts();
   }, [fetchProducts]);
 
-  return { products, loading, error, refresh: fetchProducts, setProducts };
-}; 
\ No newline at end of file
+  return { products, loading, loadingMore, error, refresh: fetchProducts, setProducts };
+};
@@ -83,6 +83,11 @@ export interface GeneratedProduct {
   reddit_post: RedditPost;
 }
 
+export interface GeneratedProductPage {
+  items: GeneratedProduct[];
+  next_cursor: string | null;
+}
+
 export interface ProductSubredditPost {
   id: number;
   product_info_id: number;
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+QR Stamp Benchmark
+
+Compares the vectorized styled QR renderer against the per-module reference
+renderer (kept in tests/test_image_processor.py), and measures cached vs
+uncached stamping.
+
+Usage:
+    python scripts/benchmark_qr_stamp.py [--runs N]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tests"))
+
+import numpy as np
+from PIL import Image
+from test_image_processor import render_styled_qr_reference
+
+from app.services.image_processor import ImageProcessor, qr_stamp_cache
+
+URLS = [
+    "https://clouvel.ai/redirect/short.png",
+    "https://clouvel.ai/redirect/test_image_20250625124000_1024x1024.png",
+    "https://clouvel.ai/redirect/" + "long_image_name_" * 8 + ".png",
+]
+
+
+def time_call(fn, runs):
+    """Return per-call timings in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label, timings):
+    print(
+        f"  {label:<28} median {statistics.median(timings):8.2f} ms"
+        f"   min {min(timings):8.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=10, help="Runs per measurement")
+    args = parser.parse_args()
+
+    processor = ImageProcessor()
+    image = Image.new("RGB", (1024, 1024), color="white")
+
+    print("🔳 QR Stamp Benchmark")
+    print("-" * 60)
+
+    for url in URLS:
+        print(f"URL length {len(url)}")
+        reference = time_call(
+            lambda: render_styled_qr_reference(processor, url), args.runs
+        )
+        vectorized = time_call(
+            lambda: processor._create_manual_styled_qr(url), args.runs
+        )
+        report("reference (per module)", reference)
+        report("vectorized (NumPy)", vectorized)
+        print(
+            f"  speedup: {statistics.median(reference) / statistics.median(vectorized):.1f}x"
+        )
+
+        # Signature colour is random per render; seed so both pick the same one
+        random.seed(0)
+        fast = np.asarray(processor._create_manual_styled_qr(url), dtype=np.int16)
+        random.seed(0)
+        slow = np.asarray(render_styled_qr_reference(processor, url), dtype=np.int16)
+        print(f"  max pixel difference: {np.abs(fast - slow).max()}")
+
+        qr_stamp_cache.clear()
+        uncached = time_call(
+            lambda: (
+                qr_stamp_cache.clear(),
+                processor.stamp_image_with_logo(image, url=url),
+            ),
+            args.runs,
+        )
+        cached = time_call(
+            lambda: processor.stamp_image_with_logo(image, url=url), args.runs
+        )
+        report("stamp (cold cache)", uncached)
+        report("stamp (warm cache)", cached)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+
+from app.db.database import SessionLocal
+from app.db.donation_totals import rebuild_donation_totals
+
+if __name__ == "__main__":
+    print("Rebuilding subreddit donation totals...")
+    session = SessionLocal()
+    try:
+        count = rebuild_donation_totals(session)
+    finally:
+        session.close()
+    print(f"Rebuilt donation totals for {count} subreddits")
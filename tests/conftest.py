@@ -21,6 +21,7 @@ os.environ["TESTING"] = "true"
 os.environ["STRIPE_SECRET_KEY"] = "test_secret_key"
 os.environ["STRIPE_WEBHOOK_SECRET"] = "test_webhook_secret"
 os.environ["ADMIN_SECRET"] = "testsecret123"
+os.environ["OPENAI_RATE_LIMIT_BACKEND"] = "memory"
 
 pytest_plugins = ["pytest_asyncio"]
 
@@ -81,6 +82,74 @@ def db_session(test_engine) -> Generator[Session, None, None]:
         connection.close()
 
 
+@pytest.fixture(autouse=True)
+def reset_aggregate_cache():
+    """Start each test with an empty donation aggregate cache."""
+    from app.services.aggregate_cache import aggregate_cache
+
+    aggregate_cache.invalidate()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_post_dedupe():
+    """Rebuild the known-post filter from each test's own database state."""
+    from app.services.post_dedupe import post_dedupe
+
+    post_dedupe.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_subreddit_pool():
+    """Load the random subreddit pool from each test's own database state."""
+    from app.services.subreddit_pool import subreddit_pool
+
+    subreddit_pool.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_comment_summarizer():
+    """Start each test with no cached comment summaries."""
+    from app.services.comment_summarizer import comment_summarizer
+
+    comment_summarizer.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_llm_cache(monkeypatch):
+    """Give each test an empty in-memory LLM response cache."""
+    from app.clients.reddit_cache import MemoryCacheBackend
+    from app.utils.llm_cache import llm_cache
+
+    monkeypatch.setattr(llm_cache, "_backend", MemoryCacheBackend())
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_openai_rate_limiter():
+    """Give each test full OpenAI rate-limit buckets."""
+    from app.utils.openai_rate_limiter import openai_rate_limiter
+
+    openai_rate_limiter.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_reddit_registry():
+    """Give each test fresh Reddit clients and an empty Reddit read cache."""
+    from app.clients.reddit_cache import reddit_cache
+    from app.clients.reddit_registry import reddit_registry
+
+    reddit_registry.clear()
+    reddit_cache.clear()
+    yield
+    reddit_registry.clear()
+    reddit_cache.clear()
+
+
 @pytest.fixture
 def mock_stripe_service():
     """Provide a mock Stripe service with minimal necessary functionality."""
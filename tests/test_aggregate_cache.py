@@ -0,0 +1,74 @@
+"""
+Tests for the donation aggregate cache.
+"""
+
+from app.db.models import Donation
+from app.models import DonationStatus
+from app.services.aggregate_cache import AggregateCache, aggregate_cache
+
+
+def _add_donation(db_session, subreddit, amount=5.0, email="donor@example.com"):
+    donation = Donation(
+        stripe_payment_intent_id=f"pi_cache_{amount}_{email}",
+        amount_cents=int(amount * 100),
+        amount_usd=amount,
+        currency="usd",
+        status=DonationStatus.SUCCEEDED.value,
+        customer_email=email,
+        subreddit_id=subreddit.id,
+        tier="bronze",
+        donation_type="support",
+        is_anonymous=False,
+    )
+    db_session.add(donation)
+    db_session.commit()
+    return donation
+
+
+def test_values_are_cached_until_invalidated():
+    """A hit skips the computation; invalidation forces a new version."""
+    cache = AggregateCache(backend="memory")
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"total": len(calls)}
+
+    value, etag = cache.get_or_compute("summary", compute)
+    assert cache.get_or_compute("summary", compute) == (value, etag)
+    assert len(calls) == 1
+
+    cache.invalidate()
+    new_value, new_etag = cache.get_or_compute("summary", compute)
+    assert new_value == {"total": 2}
+    assert new_etag != etag
+
+
+def test_committing_a_donation_invalidates(db_session, sample_subreddit):
+    """Any commit touching a Donation bumps the shared version."""
+    version = aggregate_cache.version()
+
+    _add_donation(db_session, sample_subreddit)
+
+    assert aggregate_cache.version() != version
+
+
+def test_leaderboard_endpoint_uses_version_etag(client, db_session, test_data):
+    """The ETag is stable until donations change, and a match returns 304."""
+    subreddit = test_data[0]
+    _add_donation(db_session, subreddit, amount=7.0, email="a@example.com")
+
+    first = client.get("/api/donations/by-subreddit")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    cached = client.get("/api/donations/by-subreddit", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+    _add_donation(db_session, subreddit, amount=3.0, email="b@example.com")
+    refreshed = client.get(
+        "/api/donations/by-subreddit", headers={"If-None-Match": etag}
+    )
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != etag
+    assert len(refreshed.json()["test"]["support"]) == 2
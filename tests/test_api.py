@@ -215,6 +215,7 @@ def test_manual_create_commission_success(client, mock_stripe_service):
     assert data["status"] == "manual commission created"
     assert "donation_id" in data
     assert "task_id" in data
+    assert "queue_position" in data
 
 
 def test_manual_create_commission_unauthorized(client):
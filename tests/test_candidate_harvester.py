@@ -0,0 +1,104 @@
+"""
+Tests for the candidate-post harvester and the candidate pool.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+from app.db.models import CandidatePost
+from app.services.candidate_harvester import (
+    CandidateHarvester,
+    CandidatePostService,
+    screen_submission,
+)
+from app.services.commission_validator import CommissionValidator
+
+NOW = datetime.now(timezone.utc)
+
+
+def _submission(post_id, score=100, num_comments=30, age_days=1, **overrides):
+    submission = MagicMock(
+        id=post_id,
+        title=f"Post {post_id}",
+        selftext="Some text",
+        permalink=f"/r/golf/comments/{post_id}/post/",
+        url=f"https://reddit.com/r/golf/comments/{post_id}/post/",
+        score=score,
+        num_comments=num_comments,
+        stickied=False,
+        created_utc=(NOW - timedelta(days=age_days)).timestamp(),
+    )
+    submission.subreddit.display_name = "golf"
+    for name, value in overrides.items():
+        setattr(submission, name, value)
+    return submission
+
+
+def test_screen_submission_applies_commission_filters():
+    """Stickied, old and low-engagement link posts are rejected."""
+    assert screen_submission(_submission("a"), NOW)["post_id"] == "a"
+    assert screen_submission(_submission("b", stickied=True), NOW) is None
+    assert screen_submission(_submission("c", age_days=90), NOW) is None
+    assert screen_submission(_submission("d", selftext="", score=5), NOW) is None
+    assert screen_submission(_submission("e", selftext=""), NOW) is not None
+
+    fresh = screen_submission(_submission("f", age_days=1), NOW)
+    stale = screen_submission(_submission("g", age_days=30), NOW)
+    assert fresh["rank_score"] > stale["rank_score"]
+
+
+def test_harvest_skips_processed_posts_and_claims_best_once(db_session, test_data):
+    """Harvested candidates are claimed best-first, each only once."""
+    _, _, reddit_post = test_data
+    reddit_client = MagicMock()
+    reddit_client.reddit.subreddit.return_value.top.return_value = [
+        _submission("low", score=10),
+        _submission("high", score=5000),
+        _submission(reddit_post.post_id, score=9000),
+    ]
+    service = CandidatePostService(db_session)
+
+    stored = CandidateHarvester().harvest_subreddit(reddit_client, service, "golf")
+
+    assert stored == 2
+    assert service.get_stats() == {"total": 2, "available": 2}
+    assert service.claim_best("GOLF").post_id == "high"
+    assert service.claim_best().post_id == "low"
+    assert service.claim_best() is None
+
+
+def test_candidate_lease_expires(db_session):
+    """A validation preview only reserves its candidate for a while."""
+    service = CandidatePostService(db_session)
+    service.store_candidates([screen_submission(_submission("abc123"), NOW)])
+
+    assert service.claim_best().post_id == "abc123"
+    assert service.claim_best() is None
+    assert service.get_stats() == {"total": 1, "available": 0}
+
+    # An abandoned checkout lets the lease lapse
+    assert service.claim_best(claim_ttl=-1).post_id == "abc123"
+
+
+def test_random_subreddit_commission_uses_candidate_pool(db_session):
+    """Commission validation takes a harvested candidate without calling Reddit."""
+    CandidatePostService(db_session).store_candidates(
+        [screen_submission(_submission("abc123"), NOW)]
+    )
+
+    with (
+        patch("app.services.commission_validator.RedditClient"),
+        patch("app.services.commission_validator.RedditAgent"),
+    ):
+        validator = CommissionValidator(session=db_session)
+    validator._validate_subreddit_exists = MagicMock(return_value=True)
+
+    result = asyncio.run(validator.validate_commission("random_subreddit", "golf"))
+
+    assert result.valid is True
+    assert result.post_id == "abc123"
+    assert result.post_url == "https://reddit.com/r/golf/comments/abc123/post/"
+    validator.reddit_agent.find_top_post_from_subreddit.assert_not_called()
+    candidate = db_session.query(CandidatePost).filter_by(post_id="abc123").one()
+    assert candidate.claimed_at is not None
@@ -237,6 +237,31 @@ class TestClouvelPromoterAgentAnalysis:
         assert should_promote is True
         assert reason == "Great story potential"
 
+    @patch("app.agents.clouvel_promoter_agent.OpenAI")
+    def test_decide_promotion_worthiness_replays_cached_decision(
+        self, mock_openai_class
+    ):
+        """Re-analysing the same post reuses the cached decision"""
+        mock_openai = Mock()
+        mock_response = Mock()
+        mock_choice = Mock()
+        mock_choice.message.content = '{"promote": false, "reason": "Spam"}'
+        mock_response.choices = [mock_choice]
+        mock_openai.chat.completions.create.return_value = mock_response
+        mock_openai_class.return_value = mock_openai
+
+        agent = ClouvelPromoterAgent(dry_run=True)
+        agent.openai = mock_openai
+
+        post_content = {"title": "Buy now", "selftext": "", "subreddit": "test"}
+
+        first = agent.decide_promotion_worthiness(post_content)
+        second = agent.decide_promotion_worthiness(post_content)
+
+        assert first == second
+        assert first[:2] == (False, "Spam")
+        mock_openai.chat.completions.create.assert_called_once()
+
     @patch("app.agents.clouvel_promoter_agent.OpenAI")
     def test_generate_witty_comment(self, mock_openai_class):
         """Test comment generation"""
@@ -0,0 +1,75 @@
+"""
+Tests for cached, token-budgeted comment summaries.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.comment_summarizer import (
+    NO_COMMENTS,
+    SUMMARY_ERROR,
+    CommentSummarizer,
+    estimate_tokens,
+    truncate_to_budget,
+)
+
+
+def _submission(post_id, bodies):
+    submission = MagicMock(id=post_id)
+    submission.comments.__iter__.return_value = [
+        MagicMock(id=f"c{i}", body=body) for i, body in enumerate(bodies)
+    ]
+    return submission
+
+
+def _summarizer(summary="People love it", **kwargs):
+    client = MagicMock()
+    response = MagicMock()
+    response.choices[0].message.content = f"  {summary}  "
+    response.usage = None
+    client.chat.completions.create = AsyncMock(return_value=response)
+    return CommentSummarizer(client=client, **kwargs), client
+
+
+def test_truncate_to_budget_cuts_the_crossing_comment():
+    """Comments are kept in order and the one crossing the budget is cut short."""
+    texts = ["a" * 40, "b" * 400, "c" * 40]
+
+    kept = truncate_to_budget(texts, token_budget=30)
+
+    assert kept[0] == texts[0]
+    assert kept[1].startswith("b") and len(kept[1]) < len(texts[1])
+    assert len(kept) == 2
+    assert sum(estimate_tokens(t) + 1 for t in kept) <= 30
+
+
+def test_summary_is_cached_until_comments_change():
+    """Repeat summaries of the same comments skip OpenAI; new comments do not."""
+    summarizer, client = _summarizer(top_n=2)
+    submission = _submission("abc123", ["Great post!", "So true", "Ignored"])
+
+    assert asyncio.run(summarizer.summarize(submission)) == "People love it"
+    assert asyncio.run(summarizer.summarize(submission)) == "People love it"
+
+    assert client.chat.completions.create.await_count == 1
+    prompt = client.chat.completions.create.call_args.kwargs["messages"][1]
+    assert "So true" in prompt["content"]
+    assert "Ignored" not in prompt["content"]
+    assert submission.comment_sort == "top"
+    assert summarizer.stats()["hits"] == 1
+
+    changed = _submission("abc123", ["Great post!", "Edited"])
+    asyncio.run(summarizer.summarize(changed))
+    assert client.chat.completions.create.await_count == 2
+
+
+def test_summary_fallbacks():
+    """No comments and OpenAI failures return the existing fallback messages."""
+    summarizer, client = _summarizer()
+
+    assert asyncio.run(summarizer.summarize(_submission("empty", []))) == NO_COMMENTS
+
+    client.chat.completions.create.side_effect = Exception("API Error")
+    result = asyncio.run(summarizer.summarize(_submission("abc123", ["Hi"])))
+    assert result == SUMMARY_ERROR
+    assert summarizer.stats()["size"] == 0
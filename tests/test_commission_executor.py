@@ -0,0 +1,183 @@
+"""
+Tests for the bounded commission executor.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.commission_executor import CommissionExecutor, CommissionExecutorStoppedError
+
+
+class BlockingRunner:
+    """Runner that records calls and blocks until released."""
+
+    def __init__(self):
+        self.started = []
+        self.finished = []
+        self.release = threading.Event()
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    async def __call__(self, task_id, donation_id, task_data):
+        with self._lock:
+            self.started.append(task_id)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        while not self.release.is_set():
+            await asyncio.sleep(0.01)
+        with self._lock:
+            self.active -= 1
+            self.finished.append(task_id)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.fixture
+def runner():
+    return BlockingRunner()
+
+
+@pytest.fixture
+def executor(runner):
+    executor = CommissionExecutor(
+        runner, num_workers=2, max_queue_size=3, claim=lambda task_id: True
+    )
+    executor.start(recover=False)
+    yield executor
+    runner.release.set()
+    executor.stop(timeout=2)
+
+
+def test_runs_tasks_with_bounded_concurrency(executor, runner):
+    """No more than num_workers tasks run at once."""
+    executor.submit(1, 10, {})
+    executor.submit(2, 20, {})
+    assert wait_for(lambda: len(runner.started) == 2)
+    executor.submit(3, 30, {})
+    executor.submit(4, 40, {})
+
+    time.sleep(0.05)
+    assert runner.max_active == 2
+
+    runner.release.set()
+    assert wait_for(lambda: len(runner.finished) == 4)
+    assert runner.max_active == 2
+
+
+def test_submit_returns_queue_position(executor, runner):
+    """Positions count waiting tasks; running tasks report position 0."""
+    executor.submit(1, 10, {})
+    executor.submit(2, 20, {})
+    assert wait_for(lambda: len(runner.started) == 2)
+
+    assert executor.submit(3, 30, {}) == 1
+    assert executor.submit(4, 40, {}) == 2
+    assert executor.submit(1, 10, {}) == 0
+    assert executor.submit(3, 30, {}) == 1  # resubmitting is a no-op
+    assert executor.queue_position(4) == 2
+
+
+def test_overflow_is_deferred_to_database_backlog(executor, runner):
+    """Tasks beyond the queue bound stay pending and are loaded later in order."""
+    executor.submit(1, 10, {})
+    executor.submit(2, 20, {})
+    assert wait_for(lambda: len(runner.started) == 2)
+    for task_id in (3, 4, 5):
+        executor.submit(task_id, task_id * 10, {})
+
+    with (
+        patch.object(executor, "_backlog_position", return_value=1),
+        patch.object(
+            executor, "_load_pending_tasks", return_value=[(6, 60, {"from": "db"})]
+        ) as load,
+    ):
+        assert executor.submit(6, 60, {}) == 4
+        assert executor.stats()["has_backlog"] is True
+
+        runner.release.set()
+        assert wait_for(lambda: 6 in runner.finished)
+        assert load.called
+
+    assert runner.finished.index(6) > runner.finished.index(5)
+
+
+def test_submit_after_stop_raises(runner):
+    """A stopped executor rejects new work instead of silently dropping it."""
+    executor = CommissionExecutor(
+        runner, num_workers=1, max_queue_size=1, claim=lambda task_id: True
+    )
+    executor.start(recover=False)
+    executor.stop(timeout=1)
+
+    with pytest.raises(CommissionExecutorStoppedError):
+        executor.submit(1, 10, {})
+
+
+def test_stop_waits_for_in_flight_tasks(runner):
+    """Graceful stop lets running tasks finish within the timeout."""
+    executor = CommissionExecutor(
+        runner, num_workers=1, max_queue_size=2, claim=lambda task_id: True
+    )
+    executor.start(recover=False)
+    executor.submit(1, 10, {})
+    assert wait_for(lambda: runner.started == [1])
+
+    threading.Timer(0.1, runner.release.set).start()
+    executor.stop(timeout=2)
+
+    assert runner.finished == [1]
+    assert executor.is_running is False
+
+
+def test_tasks_claimed_elsewhere_are_skipped(runner):
+    """A task another process already claimed is not run again."""
+    executor = CommissionExecutor(
+        runner, num_workers=1, max_queue_size=3, claim=lambda task_id: task_id != 1
+    )
+    executor.start(recover=False)
+    runner.release.set()
+    try:
+        executor.submit(1, 10, {})
+        executor.submit(2, 20, {})
+        assert wait_for(lambda: runner.finished == [2])
+        time.sleep(0.05)
+        assert runner.started == [2]
+    finally:
+        executor.stop(timeout=2)
+
+
+def test_blocking_task_does_not_stall_other_workers():
+    """Each worker has its own loop, so a blocking call holds up only one task."""
+    release = threading.Event()
+    finished = []
+
+    async def blocking_runner(task_id, donation_id, task_data):
+        if task_id == 1:
+            release.wait(5)  # e.g. a sync OpenAI or PRAW call
+        finished.append(task_id)
+
+    executor = CommissionExecutor(
+        blocking_runner, num_workers=2, max_queue_size=3, claim=lambda task_id: True
+    )
+    executor.start(recover=False)
+    try:
+        executor.submit(1, 10, {})
+        executor.submit(2, 20, {})
+        assert wait_for(lambda: finished == [2])
+        release.set()
+        assert wait_for(lambda: finished == [2, 1])
+    finally:
+        release.set()
+        executor.stop(timeout=2)
@@ -174,6 +174,21 @@ class TestCommissionWorkflowE2E:
             assert task_id == "task_123"
             mock_create_task.assert_called_once_with(donation.id, task_data, db_session)
 
+    def test_submit_commission_task_returns_queue_position(self):
+        """The executor's admission position is returned with the task id."""
+        task_manager = TaskManager()
+        task_manager.use_k8s = False
+
+        with (
+            patch.object(task_manager, "_create_pipeline_task", return_value="42"),
+            patch.object(task_manager, "_broadcast_task_creation"),
+            patch.object(task_manager.executor, "submit", return_value=3) as submit,
+        ):
+            task = task_manager.submit_commission_task(7, {"tier": "sapphire"})
+
+        assert task == {"task_id": "42", "queue_position": 3}
+        submit.assert_called_once_with(42, 7, {"tier": "sapphire"})
+
     @pytest.mark.asyncio
     async def test_full_commission_workflow_mock(
         self, db_session, mock_stripe_service, test_subreddit
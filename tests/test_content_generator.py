@@ -88,3 +88,31 @@ def test_generate_content_batch_empty(mock_generate_content, content_generator):
     processed = content_generator.generate_content_batch(products)
     assert processed == []
     mock_generate_content.assert_not_called()
+
+
+def test_make_openai_call_is_never_replayed_from_cache(content_generator):
+    """Generated copy bypasses the LLM response cache."""
+    with patch.object(content_generator, "client") as client:
+        client.chat.completions.create.return_value.choices[0].message.content = (
+            "Fresh copy"
+        )
+        content_generator._make_openai_call("Describe the product")
+        content_generator._make_openai_call("Describe the product")
+
+    assert client.chat.completions.create.call_count == 2
+
+
+def test_make_openai_call_feeds_usage_to_the_rate_limiter(content_generator):
+    """The tracked call sees the whole response, so its token usage is debited."""
+    with (
+        patch.object(content_generator, "client") as client,
+        patch("app.utils.openai_usage_tracker.openai_rate_limiter") as limiter,
+    ):
+        response = client.chat.completions.create.return_value
+        response.choices[0].message.content = " Fresh copy "
+        response.usage.total_tokens = 500
+        assert content_generator._make_openai_call("x" * 400) == "Fresh copy"
+
+    model, reserved = limiter.acquire.call_args.args
+    assert reserved == 100
+    limiter.debit.assert_called_once_with(model, 400)
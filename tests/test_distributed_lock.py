@@ -0,0 +1,132 @@
+"""
+Tests for the Redis-backed distributed lock.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.services.distributed_lock import DistributedLock, LockTimeoutError
+
+
+@pytest.fixture
+def service():
+    """RedisService stand-in whose lock can be held by someone else."""
+    service = MagicMock()
+    service.redis_client = MagicMock()
+    service.holder = None
+    service.fence = 0
+
+    async def acquire_lock(key, ttl, token="locked", raise_errors=False):
+        if service.holder is None:
+            service.holder = token
+            return True
+        return False
+
+    async def release_lock(key, token=None):
+        if service.holder == token:
+            service.holder = None
+            return True
+        return False
+
+    async def next_fencing_token(key):
+        service.fence += 1
+        return service.fence
+
+    service.acquire_lock = AsyncMock(side_effect=acquire_lock)
+    service.release_lock = AsyncMock(side_effect=release_lock)
+    service.next_fencing_token = AsyncMock(side_effect=next_fencing_token)
+    service.wait_for_lock_release = AsyncMock(return_value=False)
+    return service
+
+
+def test_lease_carries_token_and_increasing_fence(service):
+    """Each acquisition gets a fresh holder token and a larger fencing token."""
+    lock = DistributedLock("lock:test", ttl=10, service=service)
+
+    async def scenario():
+        async with lock.hold("pi_1") as first:
+            pass
+        async with lock.hold("pi_1") as second:
+            pass
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first.key == "lock:test:pi_1"
+    assert first.token != second.token
+    assert second.fencing_token > first.fencing_token
+    service.acquire_lock.assert_any_await(
+        "lock:test:pi_1", 10, token=first.token, raise_errors=True
+    )
+    service.release_lock.assert_any_await("lock:test:pi_1", token=first.token)
+
+
+def test_waiter_blocks_on_release_signal_instead_of_spinning(service):
+    """A held lock makes callers wait on the release signal until it frees up."""
+    lock = DistributedLock("lock:test", service=service)
+    service.holder = "someone-else"
+
+    async def release_after_wait(key, timeout):
+        service.holder = None
+        return True
+
+    service.wait_for_lock_release.side_effect = release_after_wait
+
+    lease = asyncio.run(lock.acquire("pi_1", wait_timeout=5))
+
+    assert lease is not None
+    service.wait_for_lock_release.assert_awaited_once()
+    assert service.acquire_lock.await_count == 2
+
+
+def test_hold_raises_when_lock_stays_taken(service):
+    """Giving up after the wait timeout surfaces as LockTimeoutError."""
+    lock = DistributedLock("lock:test", service=service)
+    service.holder = "someone-else"
+
+    async def scenario():
+        async with lock.hold("pi_1", wait_timeout=0.01):
+            pass
+
+    with pytest.raises(LockTimeoutError):
+        asyncio.run(scenario())
+
+
+def test_local_fallback_serializes_and_forgets_idle_locks():
+    """Without Redis the lock still serializes callers in-process."""
+    service = MagicMock()
+    service.redis_client = None
+    lock = DistributedLock("lock:test", service=service)
+    order = []
+
+    async def worker(name):
+        async with lock.hold("pi_1"):
+            order.append(f"{name}-start")
+            await asyncio.sleep(0.01)
+            order.append(f"{name}-end")
+
+    async def scenario():
+        await asyncio.gather(worker("a"), worker("b"))
+
+    asyncio.run(scenario())
+
+    assert order == ["a-start", "a-end", "b-start", "b-end"]
+    assert lock._local_locks == {}
+
+
+def test_redis_errors_fall_back_to_local_lock(service):
+    """A Redis outage degrades to the in-process lock instead of timing out."""
+    lock = DistributedLock("lock:test", service=service)
+    service.acquire_lock.side_effect = ConnectionError("Connection refused")
+
+    async def scenario():
+        async with lock.hold("pi_1", wait_timeout=1) as lease:
+            return lease
+
+    lease = asyncio.run(scenario())
+
+    assert lease.distributed is False
+    service.wait_for_lock_release.assert_not_awaited()
+    assert lock._local_locks == {}
@@ -0,0 +1,109 @@
+"""
+Tests for the incrementally maintained subreddit donation totals.
+"""
+
+import uuid
+from decimal import Decimal
+
+from app.db.donation_totals import rebuild_donation_totals
+from app.db.models import Donation, SubredditDonationTotal, SubredditFundraisingGoal
+from app.services.fundraising_goals_service import FundraisingGoalsService
+
+
+def _add_donation(db_session, subreddit, cents, email, status="succeeded"):
+    donation = Donation(
+        stripe_payment_intent_id=f"pi_test_{uuid.uuid4().hex[:8]}",
+        amount_cents=cents,
+        amount_usd=Decimal(cents) / 100,
+        status=status,
+        tier="bronze",
+        customer_email=email,
+        subreddit_id=subreddit.id,
+    )
+    db_session.add(donation)
+    db_session.commit()
+    return donation
+
+
+def _totals(db_session, subreddit):
+    return (
+        db_session.query(
+            SubredditDonationTotal.total_cents,
+            SubredditDonationTotal.donation_count,
+            SubredditDonationTotal.donor_count,
+        )
+        .filter(SubredditDonationTotal.subreddit_id == subreddit.id)
+        .one()
+    )
+
+
+def test_succeeded_donations_update_totals(db_session, sample_subreddit):
+    """Succeeded donations add to the rollup; pending ones do not."""
+    _add_donation(db_session, sample_subreddit, 500, "a@example.com")
+    _add_donation(db_session, sample_subreddit, 300, "a@example.com")
+    _add_donation(db_session, sample_subreddit, 200, "b@example.com")
+    _add_donation(db_session, sample_subreddit, 999, "c@example.com", "pending")
+
+    assert tuple(_totals(db_session, sample_subreddit)) == (1000, 3, 2)
+
+
+def test_status_transitions_move_totals(db_session, sample_subreddit):
+    """Moving into and out of succeeded adjusts amount, count and donors."""
+    pending = _add_donation(
+        db_session, sample_subreddit, 700, "a@example.com", "pending"
+    )
+    _add_donation(db_session, sample_subreddit, 100, "b@example.com")
+
+    pending.status = "succeeded"
+    db_session.commit()
+    assert tuple(_totals(db_session, sample_subreddit)) == (800, 2, 2)
+
+    pending.status = "refunded"
+    db_session.commit()
+    assert tuple(_totals(db_session, sample_subreddit)) == (100, 1, 1)
+
+
+def test_donor_kept_while_another_donation_remains(db_session, sample_subreddit):
+    """A donor stays counted until their last succeeded donation goes away."""
+    first = _add_donation(db_session, sample_subreddit, 100, "a@example.com")
+    second = _add_donation(db_session, sample_subreddit, 200, "a@example.com")
+
+    first.status = "failed"
+    db_session.commit()
+    assert tuple(_totals(db_session, sample_subreddit)) == (200, 1, 1)
+
+    db_session.delete(second)
+    db_session.commit()
+    assert tuple(_totals(db_session, sample_subreddit)) == (0, 0, 0)
+
+
+def test_rebuild_matches_incremental_totals(db_session, sample_subreddit):
+    """Rebuilding from donations reproduces the incrementally kept rollup."""
+    _add_donation(db_session, sample_subreddit, 500, "a@example.com")
+    _add_donation(db_session, sample_subreddit, 250, "b@example.com")
+    _add_donation(db_session, sample_subreddit, 125, "b@example.com")
+    incremental = tuple(_totals(db_session, sample_subreddit))
+
+    db_session.query(SubredditDonationTotal).delete()
+    db_session.commit()
+
+    assert rebuild_donation_totals(db_session) == 1
+    assert tuple(_totals(db_session, sample_subreddit)) == incremental
+
+
+def test_goal_progress_reads_rollup(db_session, sample_subreddit):
+    """Fundraising goal progress comes from the rollup totals."""
+    db_session.add(
+        SubredditFundraisingGoal(
+            subreddit_id=sample_subreddit.id,
+            goal_amount=Decimal("20.00"),
+            status="active",
+        )
+    )
+    db_session.commit()
+    _add_donation(db_session, sample_subreddit, 1250, "a@example.com")
+
+    service = FundraisingGoalsService(db_session)
+    [goal] = service.get_subreddit_goals_with_progress()
+    assert goal.subreddit_name == sample_subreddit.subreddit_name
+    assert goal.current_amount == Decimal("12.50")
@@ -0,0 +1,260 @@
+"""
+Tests for the gallery read model service.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.db.models import (
+    Donation,
+    GalleryProduct,
+    PipelineRun,
+    PipelineTask,
+    ProductInfo,
+)
+from app.models import DonationStatus
+from app.services.gallery_service import (
+    GalleryService,
+    decode_cursor,
+    encode_cursor,
+    project_payload,
+)
+
+
+@pytest.fixture
+def gallery_product(db_session, test_data):
+    """Create a completed product with a commission donation."""
+    subreddit, pipeline_run, reddit_post = test_data
+
+    product_info = ProductInfo(
+        pipeline_run_id=pipeline_run.id,
+        reddit_post_id=reddit_post.id,
+        theme="Gallery Theme",
+        image_url="https://i.imgur.com/gallery123.png",
+        product_url="https://zazzle.com/product",
+        affiliate_link="https://zazzle.com/product?rf=123",
+        template_id="template123",
+        model="dall-e-3",
+        prompt_version="1.0.0",
+        product_type="sticker",
+        design_description="Gallery design",
+    )
+    db_session.add(product_info)
+
+    donation = Donation(
+        stripe_payment_intent_id=f"pi_gallery_{uuid.uuid4().hex[:8]}",
+        amount_cents=2500,
+        amount_usd=25.0,
+        currency="usd",
+        status=DonationStatus.SUCCEEDED.value,
+        tier="sapphire",
+        subreddit_id=subreddit.id,
+        reddit_username="gallery_user",
+        is_anonymous=False,
+        donation_type="commission",
+        commission_type="specific_post",
+    )
+    db_session.add(donation)
+    db_session.commit()
+
+    task = PipelineTask(
+        type="SUBREDDIT_POST",
+        subreddit_id=subreddit.id,
+        donation_id=donation.id,
+        pipeline_run_id=pipeline_run.id,
+        status="completed",
+    )
+    db_session.add(task)
+    db_session.commit()
+
+    return pipeline_run, product_info, donation
+
+
+def test_refresh_pipeline_run_builds_payload(db_session, gallery_product):
+    """Refreshing a completed run stores the full serialized product."""
+    pipeline_run, product_info, donation = gallery_product
+    service = GalleryService(db_session)
+
+    entry = service.refresh_pipeline_run(pipeline_run.id)
+
+    assert entry is not None
+    assert entry.product_info_id == product_info.id
+    assert entry.donation_id == donation.id
+    payload = entry.payload
+    assert payload["product_info"]["theme"] == "Gallery Theme"
+    assert payload["product_info"]["donation_info"]["reddit_username"] == "gallery_user"
+    assert payload["reddit_post"]["subreddit"] == "test"
+    assert payload["pipeline_run"]["status"] == "completed"
+
+
+def test_refresh_is_idempotent_and_list_products(db_session, gallery_product):
+    """Repeated refreshes update a single row that list_products serves."""
+    pipeline_run, _, _ = gallery_product
+    service = GalleryService(db_session)
+
+    service.refresh_pipeline_run(pipeline_run.id)
+    service.refresh_pipeline_run(pipeline_run.id)
+
+    assert (
+        db_session.query(GalleryProduct)
+        .filter_by(pipeline_run_id=pipeline_run.id)
+        .count()
+        == 1
+    )
+    products = service.list_products()
+    assert [p["pipeline_run"]["id"] for p in products] == [pipeline_run.id]
+
+
+def test_refresh_for_donation_picks_up_donation_changes(db_session, gallery_product):
+    """Donation changes are reflected after refresh_for_donation."""
+    pipeline_run, _, donation = gallery_product
+    service = GalleryService(db_session)
+    service.refresh_pipeline_run(pipeline_run.id)
+
+    donation.is_anonymous = True
+    db_session.commit()
+
+    assert service.refresh_for_donation(donation.id) == 1
+    payload = service.list_products()[0]
+    assert payload["product_info"]["donation_info"]["reddit_username"] == "Anonymous"
+
+
+def test_backfill_missing_only_builds_absent_entries(db_session, gallery_product):
+    """Backfill creates entries once and is a no-op afterwards."""
+    service = GalleryService(db_session)
+
+    assert service.backfill_missing() == 1
+    assert service.backfill_missing() == 0
+
+
+def test_refresh_removes_entry_when_run_no_longer_completed(
+    db_session, gallery_product
+):
+    """A run that leaves the completed state drops out of the gallery."""
+    pipeline_run, _, _ = gallery_product
+    service = GalleryService(db_session)
+    service.refresh_pipeline_run(pipeline_run.id)
+
+    pipeline_run.status = "failed"
+    db_session.commit()
+
+    assert service.refresh_pipeline_run(pipeline_run.id) is None
+    assert service.list_products() == []
+
+
+@pytest.fixture
+def gallery_entries(db_session, test_data):
+    """Insert five gallery entries one hour apart; returns run ids oldest first."""
+    _, _, reddit_post = test_data
+    base_time = datetime(2024, 1, 1)
+    run_ids = []
+    for i in range(5):
+        run = PipelineRun(status="completed", end_time=base_time + timedelta(hours=i))
+        db_session.add(run)
+        db_session.flush()
+        product_info = ProductInfo(
+            pipeline_run_id=run.id,
+            reddit_post_id=reddit_post.id,
+            theme=f"Theme {i}",
+            image_url=f"https://i.imgur.com/{i}.png",
+            product_url="https://zazzle.com/product",
+            template_id="template123",
+            model="dall-e-3",
+            prompt_version="1.0.0",
+            product_type="sticker",
+        )
+        db_session.add(product_info)
+        db_session.flush()
+        db_session.add(
+            GalleryProduct(
+                pipeline_run_id=run.id,
+                product_info_id=product_info.id,
+                end_time=run.end_time,
+                payload={
+                    "product_info": {"id": product_info.id, "theme": f"Theme {i}"},
+                    "pipeline_run": {"id": run.id},
+                    "reddit_post": {"title": f"Post {i}", "content": "long body"},
+                    "usage": {"total_cost_usd": 0.1},
+                },
+            )
+        )
+        run_ids.append(run.id)
+    db_session.commit()
+    return run_ids
+
+
+def test_list_page_walks_all_entries_newest_first(db_session, gallery_entries):
+    """Following next_cursor visits every entry exactly once, newest first."""
+    service = GalleryService(db_session)
+
+    seen = []
+    cursor = None
+    while True:
+        items, cursor = service.list_page(cursor=cursor, limit=2)
+        seen.extend(item["pipeline_run"]["id"] for item in items)
+        if cursor is None:
+            break
+
+    assert seen == list(reversed(gallery_entries))
+
+
+def test_list_page_walks_across_run_without_end_time(
+    db_session, gallery_product, gallery_entries
+):
+    """A run without an end_time sorts by its start_time and is paged over."""
+    pipeline_run, _, _ = gallery_product
+    pipeline_run.end_time = None
+    pipeline_run.start_time = datetime(2024, 1, 1, 2, 30)
+    db_session.commit()
+    service = GalleryService(db_session)
+
+    entry = service.refresh_pipeline_run(pipeline_run.id)
+    assert entry.end_time == pipeline_run.start_time
+
+    seen = []
+    cursor = None
+    while True:
+        items, cursor = service.list_page(cursor=cursor, limit=1)
+        seen.extend(item["pipeline_run"]["id"] for item in items)
+        if cursor is None:
+            break
+
+    newest_first = list(reversed(gallery_entries))
+    assert seen == newest_first[:2] + [pipeline_run.id] + newest_first[2:]
+
+
+def test_list_page_projects_fields(db_session, gallery_entries):
+    """Only the requested dotted fields are returned."""
+    service = GalleryService(db_session)
+
+    items, _ = service.list_page(limit=1, fields=["product_info", "reddit_post.title"])
+
+    assert items == [
+        {
+            "product_info": {"id": items[0]["product_info"]["id"], "theme": "Theme 4"},
+            "reddit_post": {"title": "Post 4"},
+        }
+    ]
+
+
+def test_list_page_rejects_malformed_cursor(db_session):
+    """A garbage cursor raises ValueError for the API to turn into a 400."""
+    with pytest.raises(ValueError):
+        GalleryService(db_session).list_page(cursor="not-a-cursor")
+
+
+def test_cursor_round_trip():
+    """Cursors decode back to the keyset position they were built from."""
+    end_time = datetime(2024, 5, 1, 12, 30)
+    assert decode_cursor(encode_cursor(end_time, 42)) == (end_time, 42)
+
+
+def test_project_payload_ignores_unknown_fields():
+    """Unknown paths are skipped rather than raising."""
+    payload = {"product_info": {"id": 1}, "usage": None}
+    assert project_payload(payload, ["product_info.id", "missing.path"]) == {
+        "product_info": {"id": 1}
+    }
+    assert project_payload(payload, None) is payload
@@ -10,10 +10,94 @@ import tempfile
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
 from PIL import Image, ImageDraw, ImageFont
 
-from app.services.image_processor import ImageProcessingError, ImageProcessor
+from app.services.image_processor import (
+    STYLED_QR_GRAD_END,
+    STYLED_QR_GRAD_START,
+    STYLED_QR_SIZE,
+    ImageProcessingError,
+    ImageProcessor,
+    QRStampCache,
+    qr_stamp_cache,
+)
+
+
+def render_styled_qr_reference(processor: ImageProcessor, url: str) -> Image.Image:
+    """
+    Per-module reference renderer for ImageProcessor._create_manual_styled_qr.
+
+    The original loop-based renderer: draws the halo and module of every dark
+    module with separate PIL images. Also used by scripts/benchmark_qr_stamp.py.
+    """
+    QR_SIZE = STYLED_QR_SIZE
+    qr_img = processor._styled_qr_background()
+
+    # Enhanced blue/grey gradient for better readability when reduced
+    grad_start = STYLED_QR_GRAD_START
+    grad_end = STYLED_QR_GRAD_END
+    alpha = 255  # Fully opaque for maximum contrast and readability
+
+    qr_matrix = processor._styled_qr_matrix(url)
+    modules_count = len(qr_matrix)
+    module_size = QR_SIZE // modules_count
+
+    # Larger corner radius for smoother appearance when scaled
+    corner_radius = max(6, module_size // 2)
+
+    for y in range(modules_count):
+        for x in range(modules_count):
+            if qr_matrix[y][x]:
+                # Calculate gradient based on position
+                t = (y + x) / (2 * (modules_count - 1))  # Diagonal gradient
+                color = tuple((grad_start * (1 - t) + grad_end * t).astype(int))
+
+                # Module coordinates
+                left = x * module_size
+                top = y * module_size
+
+                # Create a slightly larger area for the halo effect
+                halo_size = module_size + 4
+                halo_left = left - 2
+                halo_top = top - 2
+
+                # Draw white halo/glow first
+                halo_mask = Image.new("L", (halo_size, halo_size), 0)
+                halo_draw = ImageDraw.Draw(halo_mask)
+                halo_draw.rounded_rectangle(
+                    [0, 0, halo_size, halo_size],
+                    radius=corner_radius + 2,
+                    fill=180,  # Semi-transparent white
+                )
+
+                # Create the halo image
+                halo_img = Image.new(
+                    "RGBA", (halo_size, halo_size), (255, 255, 255, 180)
+                )
+                halo_img.putalpha(halo_mask)
+
+                # Paste the halo
+                qr_img.paste(halo_img, (halo_left, halo_top), halo_img)
+
+                # Draw the main module with rounded corners
+                mask = Image.new("L", (module_size, module_size), 0)
+                mask_draw = ImageDraw.Draw(mask)
+                mask_draw.rounded_rectangle(
+                    [0, 0, module_size, module_size], radius=corner_radius, fill=255
+                )
+
+                # Create the colored module
+                module_img = Image.new(
+                    "RGBA", (module_size, module_size), color + (alpha,)
+                )
+                module_img.putalpha(mask)
+
+                # Paste the main module
+                qr_img.paste(module_img, (left, top), module_img)
+
+    return qr_img
 
 
 class TestImageProcessor:
@@ -324,3 +408,75 @@ class TestImageProcessor:
 
         result = processor.sign_image_with_clouvel(large_image)
         assert result.size == large_image.size
+
+
+class TestStyledQRRenderer:
+    """Test cases for the vectorized styled QR renderer and stamp cache."""
+
+    def setup_method(self):
+        qr_stamp_cache.clear()
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://clouvel.ai/redirect/a.png",
+            "https://clouvel.ai/redirect/test_image_20250625124000_1024x1024.png?"
+            + "x" * 120,
+        ],
+    )
+    def test_vectorized_matches_reference(self, url):
+        """The NumPy renderer reproduces the per-module reference output."""
+        processor = ImageProcessor()
+
+        with patch(
+            "app.services.image_processor.random.choice", side_effect=lambda s: s[0]
+        ):
+            fast = processor._create_manual_styled_qr(url)
+            reference = render_styled_qr_reference(processor, url)
+
+        assert fast.size == reference.size
+        assert fast.mode == reference.mode == "RGBA"
+        diff = np.abs(
+            np.asarray(fast, dtype=np.int16) - np.asarray(reference, dtype=np.int16)
+        )
+        assert diff.max() <= 1
+
+    def test_stamp_is_cached_per_url_style_and_size(self):
+        """Re-stamping the same URL reuses the rendered stamp."""
+        processor = ImageProcessor()
+        image = Image.new("RGB", (1024, 1024), color="white")
+
+        with patch.object(
+            processor, "_render_qr_stamp", wraps=processor._render_qr_stamp
+        ) as render:
+            first = processor.stamp_image_with_logo(image, url="https://a.test/1")
+            second = processor.stamp_image_with_logo(image, url="https://a.test/1")
+            processor.stamp_image_with_logo(image, url="https://a.test/2")
+
+        assert render.call_count == 2
+        assert list(first.getdata()) == list(second.getdata())
+
+    def test_cache_returns_copies(self):
+        """Mutating a returned image does not corrupt the cached entry."""
+        processor = ImageProcessor()
+
+        first = processor.simple_qr(None, "https://a.test/copy")
+        first.paste((0, 0, 0, 255), (0, 0, 512, 512))
+        second = processor.simple_qr(None, "https://a.test/copy")
+
+        assert second.getpixel((0, 0)) != (0, 0, 0, 255)
+
+    def test_cache_evicts_least_recently_used(self):
+        """The cache holds at most maxsize entries, evicting the oldest."""
+        cache = QRStampCache(maxsize=2)
+        image = Image.new("RGBA", (4, 4))
+
+        cache.put("a", image)
+        cache.put("b", image)
+        assert cache.get("a") is not None  # "a" is now most recent
+        cache.put("c", image)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert len(cache) == 2
@@ -85,3 +85,112 @@ class TestImgurClient:
         assert not os.path.exists(file_path)
         with pytest.raises(ValueError, match="Image file not found"):
             self.imgur_client.upload_image(file_path)
+
+
+class TestAsyncImgurClient:
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        os.environ["OUTPUT_DIR"] = self.temp_dir
+        os.environ.setdefault("IMGUR_CLIENT_ID", "test_client_id")
+        os.environ.setdefault("IMGUR_CLIENT_SECRET", "test_client_secret")
+        from app.clients.imgur_client import AsyncImgurClient, ImgurUploadError
+
+        self.AsyncImgurClient = AsyncImgurClient
+        self.ImgurUploadError = ImgurUploadError
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _client(self, handler):
+        import httpx
+
+        client = self.AsyncImgurClient(
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        )
+        client.BACKOFF_BASE_SECONDS = 0
+        return client
+
+    @pytest.mark.asyncio
+    async def test_upload_and_save_from_memory(self):
+        import httpx
+
+        uploaded = []
+
+        def handler(request):
+            uploaded.append(request.content)
+            return httpx.Response(
+                200,
+                json={"success": True, "data": {"link": "https://i.imgur.com/a.png"}},
+            )
+
+        client = self._client(handler)
+        imgur_url, local_path = await client.upload_and_save(
+            b"png-bytes", "a.png", subdirectory="generated_products"
+        )
+
+        assert imgur_url == "https://i.imgur.com/a.png"
+        assert b"png-bytes" in uploaded[0]
+        with open(local_path, "rb") as f:
+            assert f.read() == b"png-bytes"
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_upload_retries_on_429_and_5xx(self):
+        import httpx
+
+        responses = [
+            httpx.Response(429, headers={"Retry-After": "0"}),
+            httpx.Response(503),
+            httpx.Response(
+                200,
+                json={"success": True, "data": {"link": "https://i.imgur.com/b.png"}},
+            ),
+        ]
+
+        client = self._client(lambda request: responses.pop(0))
+        assert await client.upload_image_bytes(b"data") == "https://i.imgur.com/b.png"
+        assert responses == []
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_upload_gives_up_after_max_retries(self):
+        import httpx
+
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(502)
+
+        client = self._client(handler)
+        with pytest.raises(self.ImgurUploadError):
+            await client.upload_image_bytes(b"data")
+        assert len(calls) == client.MAX_RETRIES + 1
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_upload_does_not_retry_client_errors(self):
+        import httpx
+
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(400, json={"success": False, "data": {}})
+
+        client = self._client(handler)
+        with pytest.raises(self.ImgurUploadError):
+            await client.upload_image_bytes(b"data")
+        assert len(calls) == 1
+        await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_pooled_client_is_shared_and_closed(self):
+        first = self.AsyncImgurClient()._get_http_client()
+        assert self.AsyncImgurClient()._get_http_client() is first
+
+        await self.AsyncImgurClient.aclose_pooled()
+
+        assert first.is_closed
+        assert self.AsyncImgurClient()._get_http_client() is not first
+        await self.AsyncImgurClient.aclose_pooled()
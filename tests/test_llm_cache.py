@@ -0,0 +1,85 @@
+"""
+Tests for the content-addressed OpenAI response cache.
+"""
+
+import time
+from unittest.mock import MagicMock
+
+from app.clients.reddit_cache import MemoryCacheBackend
+from app.utils.llm_cache import LLMResponseCache, SQLiteCacheBackend, llm_cache_key
+from app.utils.openai_usage_tracker import OpenAIUsageTracker
+
+MESSAGES = [{"role": "user", "content": "Describe this post"}]
+
+
+def _client(*contents):
+    client = MagicMock()
+    responses = []
+    for content in contents:
+        response = MagicMock()
+        response.choices[0].message.content = content
+        responses.append(response)
+    client.chat.completions.create.side_effect = responses
+    return client
+
+
+def test_key_depends_on_every_request_parameter():
+    """Model, messages, temperature and response format all change the key."""
+    base = dict(model="gpt-4o-mini", messages=MESSAGES, temperature=0.7)
+    key = llm_cache_key(**base)
+
+    assert key == llm_cache_key(**dict(reversed(list(base.items()))))
+    assert key != llm_cache_key(**{**base, "model": "gpt-4"})
+    assert key != llm_cache_key(**{**base, "temperature": 0.8})
+    assert key != llm_cache_key(**{**base, "response_format": {"type": "json_object"}})
+
+
+def test_chat_replays_cached_content_unless_opted_out(monkeypatch):
+    """Identical requests hit the cache; cache=False always calls OpenAI."""
+    tracker = OpenAIUsageTracker(test_mode=True)
+    monkeypatch.setattr("app.utils.llm_cache.get_usage_tracker", lambda: tracker)
+    cache = LLMResponseCache(backend=MemoryCacheBackend())
+    client = _client("first", "second", "third")
+
+    assert cache.chat(client, model="gpt-4o-mini", messages=MESSAGES) == "first"
+    assert cache.chat(client, model="gpt-4o-mini", messages=MESSAGES) == "first"
+    assert (
+        cache.chat(client, cache=False, model="gpt-4o-mini", messages=MESSAGES)
+        == "second"
+    )
+    assert client.chat.completions.create.call_count == 2
+
+    stats = tracker.get_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["by_model"]["gpt-4o-mini"] == {"hits": 1, "misses": 1}
+
+
+def test_empty_responses_are_not_cached():
+    """Empty content is fetched again on the next identical request."""
+    cache = LLMResponseCache(backend=MemoryCacheBackend())
+    client = _client("", "answer")
+
+    assert cache.chat(client, model="gpt-4o-mini", messages=MESSAGES) == ""
+    assert cache.chat(client, model="gpt-4o-mini", messages=MESSAGES) == "answer"
+
+
+def test_sqlite_backend_expires_and_evicts_least_recently_used(tmp_path):
+    """Entries expire by TTL and the oldest-accessed go first when full."""
+    backend = SQLiteCacheBackend(str(tmp_path / "llm_cache.db"), maxsize=2)
+
+    backend.set("expired", "x", ttl=-1)
+    assert backend.get("expired") == (False, None)
+
+    backend.set("a", "A", ttl=60)
+    time.sleep(0.01)
+    backend.set("b", "B", ttl=60)
+    time.sleep(0.01)
+    assert backend.get("a") == (True, "A")
+    time.sleep(0.01)
+    backend.set("c", "C", ttl=60)
+
+    assert len(backend) == 2
+    assert backend.get("b") == (False, None)
+    assert backend.get("a") == (True, "A")
+    assert backend.get("c") == (True, "C")
@@ -0,0 +1,89 @@
+"""
+Tests for the per-model OpenAI rate limiter.
+"""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.utils.openai_rate_limiter import ModelRateLimiter, parse_reset
+from app.utils.openai_usage_tracker import track_openai_call
+
+
+def test_parse_reset_reads_openai_durations():
+    """Reset headers come as Go-style durations or plain seconds."""
+    assert parse_reset("1s") == 1.0
+    assert parse_reset("6m0s") == 360.0
+    assert parse_reset("20ms") == pytest.approx(0.02)
+    assert parse_reset("0.5") == 0.5
+    assert parse_reset("soon") is None
+
+
+def test_callers_wait_for_requests_and_tokens():
+    """Requests past the burst, or token debits, make the next caller wait."""
+    limiter = ModelRateLimiter("gpt-4", requests_per_minute=60, tokens_per_minute=600)
+
+    with patch("app.utils.openai_rate_limiter.time.sleep") as sleep:
+        for _ in range(60):
+            assert limiter.acquire() == 0
+        assert limiter.acquire() == pytest.approx(1.0, abs=0.05)
+        sleep.assert_called_once()
+
+    tokens = ModelRateLimiter("gpt-4", requests_per_minute=0, tokens_per_minute=600)
+    tokens.debit(700)
+    with patch("app.utils.openai_rate_limiter.asyncio.sleep") as sleep:
+        waited = asyncio.run(tokens.acquire_async(tokens=0))
+    assert waited == pytest.approx(10.0, abs=0.1)
+    assert tokens.metrics()["throttled_calls"] == 1
+
+
+def test_headers_cap_the_bucket_and_pause_on_429():
+    """Remaining quota caps the bucket; a 429 pauses until the reset."""
+    limiter = ModelRateLimiter("gpt-4", requests_per_minute=600, tokens_per_minute=0)
+
+    limiter.observe(
+        {"x-ratelimit-limit-requests": "1000", "x-ratelimit-remaining-requests": "0"}
+    )
+    assert limiter.metrics()["requests_per_minute"] == pytest.approx(900)
+    with patch("app.utils.openai_rate_limiter.time.sleep"):
+        assert limiter.acquire() > 0
+
+    limiter.observe(
+        {"x-ratelimit-remaining-requests": "5", "x-ratelimit-reset-requests": "30s"},
+        rate_limited=True,
+    )
+    assert 29 < limiter.metrics()["paused_for"] <= 30
+    assert limiter.metrics()["rate_limited"] == 1
+
+
+def test_tracked_calls_acquire_before_calling():
+    """track_openai_call waits on the model's limiter before the API call."""
+    calls = []
+
+    @track_openai_call(model="gpt-4o-mini")
+    def _call():
+        calls.append("api")
+        return "ok"
+
+    with patch("app.utils.openai_usage_tracker.openai_rate_limiter") as limiter:
+        limiter.acquire.side_effect = lambda model, tokens: calls.append(
+            ("acquire", model, tokens)
+        )
+        assert _call() == "ok"
+
+    assert calls == [("acquire", "gpt-4o-mini", 0), "api"]
+
+
+def test_tracked_calls_reserve_estimated_tokens():
+    """An estimate is reserved up front and only the excess is debited after."""
+
+    @track_openai_call(model="gpt-4o-mini", estimate=lambda prompt: len(prompt))
+    def _call(prompt):
+        return MagicMock(usage=MagicMock(total_tokens=150))
+
+    with patch("app.utils.openai_usage_tracker.openai_rate_limiter") as limiter:
+        _call("x" * 100)
+
+    limiter.acquire.assert_called_once_with("gpt-4o-mini", 100)
+    limiter.debit.assert_called_once_with("gpt-4o-mini", 50)
@@ -0,0 +1,137 @@
+"""
+Tests for bounded-memory OpenAI usage tracking.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.db.models import OpenAIUsageRollup
+from app.utils.openai_usage_tracker import (
+    LatencyHistogram,
+    OpenAIUsageTracker,
+    load_latency_metrics,
+    track_openai_call,
+)
+
+
+def _tracker(**kwargs):
+    return OpenAIUsageTracker(test_mode=True, **kwargs)
+
+
+def test_history_is_bounded_but_summary_counts_every_call():
+    """Only recent calls are kept, while totals cover the whole session."""
+    tracker = _tracker(history_size=5)
+    for _ in range(20):
+        tracker.log_api_call("gpt-4", "chat", tokens_used=100, response_time_ms=300)
+    tracker.log_api_call(
+        "gpt-4", "chat", response_time_ms=50, success=False, error_message="429"
+    )
+
+    summary = tracker.get_session_summary()
+
+    assert len(tracker.usage_history) == 5
+    assert summary["total_api_calls"] == 21
+    assert summary["failed_calls"] == 1
+    assert summary["total_tokens_used"] == 2000
+    assert summary["model_breakdown"]["gpt-4"]["error_types"] == ["rate_limit"]
+    assert summary["error_summary"]["common_errors"] == [
+        {"type": "rate_limit", "count": 1}
+    ]
+    assert 250 <= summary["latency"]["gpt-4:chat"]["p50_ms"] <= 500
+
+
+def test_latency_histogram_quantiles():
+    """Quantiles interpolate within buckets and never exceed the maximum."""
+    histogram = LatencyHistogram(bounds=(100, 1000))
+    for value in [10] * 90 + [900] * 9 + [5000]:
+        histogram.observe(value)
+
+    assert histogram.quantile(0.5) <= 100
+    assert 100 < histogram.quantile(0.95) <= 1000
+    assert histogram.quantile(1.0) == 5000
+
+
+def test_flush_writes_pending_rollups_once(db_session):
+    """A flush persists totals since the previous flush, then starts over."""
+    tracker = _tracker()
+    tracker.log_api_call("gpt-4", "chat", tokens_used=100, response_time_ms=300)
+    tracker.log_api_call("gpt-4", "chat", tokens_used=50, response_time_ms=700)
+    tracker.log_api_call("dall-e-3", "image", response_time_ms=9000)
+
+    assert tracker.flush(db_session) == 2
+    assert tracker.flush(db_session) == 0
+
+    chat = db_session.query(OpenAIUsageRollup).filter_by(model="gpt-4").one()
+    assert chat.calls == 2
+    assert chat.tokens_used == 150
+    assert chat.max_response_time_ms == 700
+    assert sum(chat.latency_histogram) == 2
+    assert tracker.get_session_summary()["total_api_calls"] == 3
+
+
+def test_image_cost_follows_size_and_quality():
+    """DALL-E pricing uses the requested size and HD quality, not a fixed size."""
+    tracker = _tracker()
+    tracker.log_api_call("dall-e-3", "image", size="1024x1792", quality="hd")
+    tracker.log_api_call("dall-e-3", "image", size="1792x1024", quality="standard")
+    tracker.log_api_call("dall-e-2", "image", size="512x512")
+
+    costs = [usage.cost_usd for usage in tracker.usage_history]
+
+    assert costs == [0.12, 0.08, 0.018]
+    assert set(tracker.get_latency_metrics()) == {
+        "dall-e-3:image:hd/1024x1792",
+        "dall-e-3:image:standard/1792x1024",
+        "dall-e-2:image:512x512",
+    }
+
+
+def test_async_calls_are_tracked(monkeypatch):
+    """Coroutines stay awaitable and their latency and tier are recorded."""
+    tracker = _tracker()
+    monkeypatch.setattr("app.utils.openai_usage_tracker._test_mode", False)
+    monkeypatch.setattr("app.utils.openai_usage_tracker._usage_tracker", tracker)
+
+    @track_openai_call(model="dall-e-3", operation="image", size="1024x1024")
+    async def _generate():
+        await asyncio.sleep(0.01)
+        return "image"
+
+    @track_openai_call(model="dall-e-3", operation="image", size="1024x1024")
+    async def _fail():
+        raise RuntimeError("boom")
+
+    assert asyncio.run(_generate()) == "image"
+    with pytest.raises(RuntimeError):
+        asyncio.run(_fail())
+
+    metrics = tracker.get_latency_metrics()["dall-e-3:image:1024x1024"]
+    assert metrics["calls"] == 2
+    assert metrics["max_ms"] >= 10
+    assert tracker.get_session_summary()["failed_calls"] == 1
+
+
+def test_load_latency_metrics_merges_flushed_rollups(db_session):
+    """Rollups from separate flushes merge into one set of quantiles per tier."""
+    since = datetime.now(timezone.utc) - timedelta(hours=1)
+    for latencies in ([200, 400], [3000]):
+        tracker = _tracker()
+        for response_time_ms in latencies:
+            tracker.log_api_call(
+                "dall-e-3",
+                "image",
+                response_time_ms=response_time_ms,
+                size="1024x1024",
+                quality="hd",
+            )
+        tracker.flush(db_session)
+
+    metrics = load_latency_metrics(db_session, since)
+
+    tier = metrics["dall-e-3:image:hd/1024x1024"]
+    assert tier["calls"] == 3
+    assert tier["max_ms"] == 3000
+    assert 200 <= tier["p50_ms"] <= 500
+    assert tier["p95_ms"] <= 3000
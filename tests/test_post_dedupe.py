@@ -0,0 +1,86 @@
+"""
+Tests for batched, Bloom-filtered post dedupe.
+"""
+
+from unittest.mock import patch
+
+from sqlalchemy import insert
+
+from app.db.models import AgentScannedPost
+from app.services.post_dedupe import BloomFilter, PostDedupe
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """Every added id is reported present; most others are not."""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    ids = [f"post{i}" for i in range(1000)]
+    for post_id in ids:
+        bloom.add(post_id)
+
+    assert all(post_id in bloom for post_id in ids)
+    false_positives = sum(f"other{i}" in bloom for i in range(1000))
+    assert false_positives < 50
+
+
+def test_known_post_ids_checks_requested_sources(db_session, test_data):
+    """A page of ids is answered per source; unseen ids skip the database."""
+    _, _, reddit_post = test_data
+    db_session.add(AgentScannedPost(post_id="scanned1", subreddit="test"))
+    db_session.commit()
+    dedupe = PostDedupe(sync_interval=3600)
+
+    page = [reddit_post.post_id, "scanned1", "fresh1", "fresh2"]
+
+    assert dedupe.known_post_ids(db_session, page) == {
+        reddit_post.post_id,
+        "scanned1",
+    }
+    assert dedupe.known_post_ids(db_session, page, sources=("processed",)) == {
+        reddit_post.post_id
+    }
+    assert dedupe.stats()["bloom_rejections"] >= 4
+
+
+def test_sync_picks_up_rows_inserted_elsewhere(db_session):
+    """Rows written without this process's listeners are caught up on sync."""
+    dedupe = PostDedupe(sync_interval=0)
+    dedupe.warm(db_session)
+
+    # A Core insert bypasses the ORM listener, like another process would
+    db_session.execute(
+        insert(AgentScannedPost).values(
+            post_id="elsewhere1", subreddit="test", promoted=False, dry_run=True
+        )
+    )
+
+    assert dedupe.known_post_ids(db_session, ["elsewhere1"]) == {"elsewhere1"}
+
+
+def test_sync_rereads_ids_below_the_high_water_mark(db_session):
+    """A row that commits after a higher id was synced is still picked up."""
+    db_session.execute(
+        insert(AgentScannedPost).values(
+            id=100, post_id="early1", subreddit="test", promoted=False, dry_run=True
+        )
+    )
+    dedupe = PostDedupe(sync_interval=0, sync_overlap=1000)
+    dedupe.warm(db_session)
+
+    # A slower transaction commits a lower id after the warm saw id 100
+    db_session.execute(
+        insert(AgentScannedPost).values(
+            id=50, post_id="late1", subreddit="test", promoted=False, dry_run=True
+        )
+    )
+
+    assert dedupe.known_post_ids(db_session, ["late1"]) == {"late1"}
+
+
+def test_sync_rebuilds_filter_after_rewarm_interval(db_session):
+    """Past the rewarm interval a sync rebuilds the whole filter."""
+    dedupe = PostDedupe(sync_interval=0, rewarm_interval=0)
+    dedupe.warm(db_session)
+
+    with patch.object(dedupe, "warm", wraps=dedupe.warm) as warm:
+        dedupe.sync(db_session)
+    warm.assert_called_once_with(db_session)
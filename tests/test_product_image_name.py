@@ -0,0 +1,80 @@
+"""
+Tests for the indexed product image name used by QR redirects.
+"""
+
+from app.api import RedirectCache
+from app.db.models import ProductInfo, image_name_from_url, product_image_name_filter
+
+
+def _add_product(db_session, test_data, image_url):
+    _, pipeline_run, reddit_post = test_data
+    product = ProductInfo(
+        pipeline_run_id=pipeline_run.id,
+        reddit_post_id=reddit_post.id,
+        theme="test theme",
+        image_url=image_url,
+        template_id="sticker",
+        product_type="sticker",
+    )
+    db_session.add(product)
+    db_session.commit()
+    return product
+
+
+def test_image_name_from_url():
+    """The image name is the last path segment, without any query string."""
+    assert (
+        image_name_from_url("https://clouvel.ai/images/stamped_a_1024x1024.png?x=1")
+        == "stamped_a_1024x1024.png"
+    )
+    assert image_name_from_url("outputs/generated_products/b.png") == "b.png"
+    assert image_name_from_url(None) is None
+
+
+def test_image_name_is_set_on_save_and_update(db_session, test_data):
+    """image_name follows image_url when a product is saved or changed."""
+    product = _add_product(db_session, test_data, "https://i.imgur.com/abc.png")
+    assert product.image_name == "abc.png"
+
+    product.image_url = "https://i.imgur.com/def.png"
+    db_session.commit()
+    assert product.image_name == "def.png"
+
+    found = db_session.query(ProductInfo).filter_by(image_name="def.png").one()
+    assert found.id == product.id
+
+
+def test_shared_image_name_resolves_to_first_product(db_session, test_data):
+    """Products may share an image; lookups pick the first one saved."""
+    first = _add_product(db_session, test_data, "https://i.imgur.com/same.png")
+    second = _add_product(db_session, test_data, "https://i.imgur.com/same.png")
+
+    assert first.image_name == second.image_name == "same.png"
+    for name in ("same.png", "same"):
+        found = (
+            db_session.query(ProductInfo)
+            .filter(product_image_name_filter(name))
+            .order_by(ProductInfo.id)
+            .first()
+        )
+        assert found.id == first.id
+    assert (
+        db_session.query(ProductInfo).filter(product_image_name_filter("sam")).first()
+        is None
+    )
+
+
+def test_redirect_cache_evicts_least_recently_used():
+    """The redirect LRU keeps the most recently scanned image names."""
+    cache = RedirectCache(maxsize=2)
+    cache.put("a.png", "post_a")
+    cache.put("b.png", "post_b")
+    assert cache.get("a.png") == "post_a"
+
+    cache.put("c.png", "post_c")
+
+    assert cache.get("b.png") is None
+    assert cache.get("a.png") == "post_a"
+    assert cache.get("c.png") == "post_c"
+    assert cache.hits == 3
+    assert cache.misses == 1
@@ -167,19 +167,23 @@ class TestRedditAgent:
             mock_submission
         ]
 
-        # Mock OpenAI responses for both comment summary and product idea
-        openai_responses = [
-            MagicMock(),  # First call: comment summary
-            MagicMock(),  # Second call: product idea
-        ]
-        openai_responses[0].choices[0].message.content = "Test comment summary"
-        openai_responses[1].choices[
-            0
-        ].message.content = "Theme: Test Theme\nImage Title: Amazing Test Title\nImage Description: A vivid and creative test image"
-        reddit_agent.openai.chat.completions.create.side_effect = openai_responses
+        # Mock the async comment summary and the OpenAI product idea response
+        mock_idea_response = MagicMock()
+        mock_idea_response.choices[0].message.content = (
+            "Theme: Test Theme\n"
+            "Image Title: Amazing Test Title\n"
+            "Image Description: A vivid and creative test image"
+        )
+        reddit_agent.openai.chat.completions.create.return_value = mock_idea_response
 
         # Mock image generation and product creation
-        with patch("app.agents.reddit_agent.AsyncImageGenerator") as mock_image_gen:
+        with (
+            patch(
+                "app.agents.reddit_agent.comment_summarizer.summarize",
+                AsyncMock(return_value="Test comment summary"),
+            ),
+            patch("app.agents.reddit_agent.AsyncImageGenerator") as mock_image_gen,
+        ):
             with patch(
                 "app.agents.reddit_agent.ZazzleProductDesigner"
             ) as mock_designer:
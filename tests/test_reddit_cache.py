@@ -0,0 +1,74 @@
+"""
+Tests for the Reddit read-through cache.
+"""
+
+from unittest.mock import MagicMock, patch
+
+import prawcore
+import pytest
+
+from app.clients.reddit_cache import (
+    MemoryCacheBackend,
+    RedditCache,
+    RedditResourceUnavailable,
+)
+from app.clients.reddit_client import RedditClient
+
+
+def test_fetch_loads_once_within_ttl():
+    """Repeated reads are served from the cache and counted as hits."""
+    cache = RedditCache(backend="memory")
+    loader = MagicMock(return_value={"display_name": "test"})
+
+    assert cache.fetch("subreddit_info", "test", loader) == {"display_name": "test"}
+    assert cache.fetch("subreddit_info", "test", loader) == {"display_name": "test"}
+
+    loader.assert_called_once()
+    stats = cache.stats()["resources"]["subreddit_info"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_missing_resources_are_cached_negatively():
+    """A 404 is remembered, so the next lookup fails without calling Reddit."""
+    cache = RedditCache(backend="memory")
+    loader = MagicMock(
+        side_effect=prawcore.exceptions.NotFound(MagicMock(status_code=404))
+    )
+
+    for _ in range(2):
+        with pytest.raises(RedditResourceUnavailable):
+            cache.fetch("post", "gone", loader, shared=False)
+
+    loader.assert_called_once()
+    assert cache.stats()["resources"]["post"]["negative_hits"] == 1
+
+
+def test_entries_expire_and_lru_evicts():
+    """Entries past their TTL are reloaded; the LRU drops the oldest entry."""
+    backend = MemoryCacheBackend(maxsize=2)
+    backend.set("a", 1, ttl=60)
+    backend.set("b", 2, ttl=60)
+    backend.get("a")
+    backend.set("c", 3, ttl=60)
+
+    assert backend.get("b") == (False, None)
+    assert backend.get("a") == (True, 1)
+
+    backend.set("d", 4, ttl=-1)
+    assert backend.get("d") == (False, None)
+
+
+def test_reddit_client_shares_posts_across_instances(monkeypatch):
+    """Two clients fetching the same post within the TTL cost one API call."""
+    monkeypatch.setenv("REDDIT_MODE", "live")
+    with patch("praw.Reddit") as mock_reddit:
+        submission = MagicMock(removed_by_category=None)
+        mock_reddit.return_value.submission.return_value = submission
+
+        first = RedditClient().get_post("abc123")
+        second = RedditClient().get_post("abc123")
+
+    assert first is second is submission
+    mock_reddit.return_value.submission.assert_called_once_with("abc123")
@@ -0,0 +1,102 @@
+"""
+Tests for the shared Reddit client registry and its rate governor.
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.clients.reddit_registry import (
+    GovernedRequestor,
+    RedditClientRegistry,
+    RedditRateGovernor,
+    RedditRateLimited,
+)
+
+
+def test_governor_delays_calls_once_burst_is_spent():
+    """Calls within the burst go straight through; the next one waits."""
+    governor = RedditRateGovernor(per_minute=60, burst=2, backend="memory")
+
+    with patch("app.clients.reddit_registry.time.sleep") as sleep:
+        assert governor.acquire() == 0.0
+        assert governor.acquire() == 0.0
+        waited = governor.acquire()
+
+    assert 0.9 < waited <= 1.0
+    sleep.assert_called_once()
+    metrics = governor.metrics()
+    assert metrics["calls"] == 3
+    assert metrics["throttled_calls"] == 1
+    assert metrics["queued"] == 0
+
+
+def test_governor_pauses_when_reddit_reports_low_quota():
+    """Low X-Ratelimit-Remaining pauses callers until the window resets."""
+    governor = RedditRateGovernor(reserve=5, max_wait=60, backend="memory")
+
+    governor.observe({"x-ratelimit-remaining": "50", "x-ratelimit-reset": "120"})
+    assert governor.metrics()["paused_for"] == 0.0
+
+    governor.observe(
+        {
+            "x-ratelimit-remaining": "3.0",
+            "x-ratelimit-used": "597",
+            "x-ratelimit-reset": "30",
+        }
+    )
+    metrics = governor.metrics()
+    assert metrics["remaining"] == 3.0
+    assert metrics["used"] == 597
+    assert 29 < metrics["paused_for"] <= 30
+
+    with patch("app.clients.reddit_registry.time.sleep") as sleep:
+        governor.acquire()
+    assert sleep.call_args[0][0] > 29
+
+
+def test_governor_rejects_waits_longer_than_max_wait():
+    """A long pause raises instead of blocking the caller for the whole window."""
+    governor = RedditRateGovernor(burst=2, max_wait=5, backend="memory")
+    governor.observe({"x-ratelimit-remaining": "0", "x-ratelimit-reset": "300"})
+
+    with patch("app.clients.reddit_registry.time.sleep") as sleep:
+        with pytest.raises(RedditRateLimited) as excinfo:
+            governor.acquire()
+
+    sleep.assert_not_called()
+    assert 299 < excinfo.value.retry_after <= 300
+    metrics = governor.metrics()
+    assert metrics["rejected_calls"] == 1
+    assert metrics["calls"] == 0
+    assert governor._tokens == 2
+
+
+def test_registry_shares_one_client_per_account():
+    """Each account is authenticated once and routed through its governor."""
+    registry = RedditClientRegistry()
+
+    with patch("app.clients.reddit_registry.praw.Reddit") as mock_reddit:
+        mock_reddit.side_effect = lambda **kwargs: object()
+        first = registry.get()
+        second = registry.get()
+        promoter = registry.get("promoter")
+
+    assert first is second
+    assert promoter is not first
+    assert mock_reddit.call_count == 2
+    kwargs = mock_reddit.call_args_list[0].kwargs
+    assert kwargs["requestor_class"] is GovernedRequestor
+    assert kwargs["requestor_kwargs"]["governor"] is registry.governor("default")
+    assert set(registry.metrics()) == {"default", "promoter"}
+
+
+def test_redis_backend_falls_back_to_local_bucket():
+    """An unreachable Redis does not stop Reddit calls."""
+    governor = RedditRateGovernor(burst=1, backend="redis")
+
+    with patch.object(governor, "_get_redis", side_effect=ConnectionError("down")):
+        start = time.monotonic()
+        assert governor.acquire() == 0.0
+    assert time.monotonic() - start < 1
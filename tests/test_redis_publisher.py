@@ -0,0 +1,93 @@
+"""
+Tests for the shared Redis publisher.
+"""
+
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.redis_publisher import RedisPublisher
+
+
+@pytest.fixture
+def redis_client():
+    client = MagicMock()
+    client.pipeline.return_value = MagicMock()
+    return client
+
+
+@pytest.fixture
+def publisher(redis_client):
+    publisher = RedisPublisher(flush_interval=0.01)
+    publisher._client = redis_client
+    yield publisher
+    publisher.close(timeout=1)
+
+
+def published_messages(redis_client):
+    pipe = redis_client.pipeline.return_value
+    return [(c.args[0], json.loads(c.args[1])) for c in pipe.publish.call_args_list]
+
+
+def test_sync_publish_is_batched_into_one_pipeline(publisher, redis_client):
+    """A burst of progress events is sent over a single pipelined round trip."""
+    for progress in range(10):
+        publisher.publish_task_update(42, {"progress": progress})
+
+    assert publisher.flush(timeout=2)
+
+    messages = published_messages(redis_client)
+    assert len(messages) == 10
+    channel, message = messages[0]
+    assert channel == "task_updates:42"
+    assert message["type"] == "task_update"
+    assert message["task_id"] == "42"
+    assert message["data"] == {"progress": 0}
+    assert isinstance(message["timestamp"], float)
+    redis_client.pipeline.assert_called_with(transaction=False)
+
+    stats = publisher.stats()
+    assert stats["published"] == 10
+    assert stats["batches"] < 10
+    assert stats["failed"] == 0
+
+
+def test_async_publish_waits_for_delivery(publisher, redis_client):
+    """The async face resolves once its batch has been sent."""
+    result = asyncio.run(
+        publisher.publish_general_update_async({"type": "task_created"})
+    )
+
+    assert result is True
+    channel, message = published_messages(redis_client)[0]
+    assert channel == "general_updates"
+    assert message["type"] == "general_update"
+    assert message["data"] == {"type": "task_created"}
+
+
+def test_failures_are_counted_not_raised(publisher, redis_client):
+    """A Redis error marks the batch failed without raising to the producer."""
+    redis_client.pipeline.return_value.execute.side_effect = Exception("down")
+
+    result = asyncio.run(publisher.publish_async("task_updates", {"x": 1}))
+
+    assert result is False
+    stats = publisher.stats()
+    assert stats["failed"] == 1
+    assert stats["last_error"] == "down"
+
+
+def test_full_buffer_drops_oldest(redis_client):
+    """When the buffer is full the oldest message is dropped and counted."""
+    publisher = RedisPublisher(max_buffer_size=2)
+    publisher._client = redis_client
+    # Hold the flusher off so messages accumulate
+    publisher._ensure_flusher = lambda: None
+
+    for i in range(3):
+        publisher.publish("task_updates", {"i": i})
+
+    assert publisher.stats()["dropped"] == 1
+    assert [json.loads(m[1])["i"] for m in publisher._buffer] == [1, 2]
@@ -84,6 +84,22 @@ class TestStripeRefund:
         assert result["refund_id"] == "re_test_refund_123"
         assert result["amount_usd"] == 10.00
 
+    @patch("app.services.stripe_service.GalleryService")
+    @patch("app.services.stripe_service.stripe")
+    def test_refund_donation_refreshes_gallery(
+        self, mock_stripe, mock_gallery, stripe_service, db: Session, sample_donation
+    ):
+        """Gallery cards showing a refunded donation are rebuilt."""
+        mock_stripe.Refund.create.return_value = Mock(id="re_test_gallery")
+
+        result = stripe_service.refund_donation(db, sample_donation.id)
+
+        assert result["success"] is True
+        mock_gallery.assert_called_once_with(db)
+        mock_gallery.return_value.refresh_for_donation.assert_called_once_with(
+            sample_donation.id
+        )
+
     @patch("app.services.stripe_service.stripe")
     def test_refund_donation_stripe_error(
         self, mock_stripe, stripe_service, db: Session, sample_donation
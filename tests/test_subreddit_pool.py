@@ -0,0 +1,108 @@
+"""
+Tests for the background-refreshed random subreddit pool.
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+from app.db.models import PipelineTask, Subreddit
+from app.services.subreddit_pool import SubredditPool, subreddit_weight
+
+
+def _post(subreddit_name, subscribers, over_18=False):
+    post = MagicMock(subreddit_subscribers=subscribers, over_18=over_18)
+    post.subreddit.display_name = subreddit_name
+    return post
+
+
+def test_weight_favours_size_and_recent_success():
+    """Bigger subreddits and recent completed commissions weigh more."""
+    assert subreddit_weight(1_000_000, 0) > subreddit_weight(1_000, 0)
+    assert subreddit_weight(1_000, 2) > subreddit_weight(1_000, 0)
+    assert subreddit_weight(None, 0) > 0
+
+
+def test_refresh_records_r_all_subreddits_and_skips_excluded(db_session):
+    """A refresh saves r/all's subreddits and leaves out the exclusion list."""
+    db_session.add(Subreddit(subreddit_name="golf", subscribers=10))
+    db_session.commit()
+    reddit_client = MagicMock()
+    reddit_client.reddit.subreddit.return_value.hot.return_value = [
+        _post("golf", 500_000),
+        _post("pics", 30_000_000),
+        _post("announcements", 100_000_000),
+        _post("ModSupport", 100),
+    ]
+    pool = SubredditPool()
+
+    assert pool.refresh(db_session, reddit_client) == 2
+
+    reddit_client.reddit.subreddit.assert_called_once_with("all")
+    golf = db_session.query(Subreddit).filter_by(subreddit_name="golf").one()
+    assert golf.subscribers == 500_000
+    assert db_session.query(Subreddit).filter_by(subreddit_name="pics").count() == 1
+    assert (
+        db_session.query(Subreddit).filter_by(subreddit_name="announcements").count()
+        == 0
+    )
+    assert pool.pick() in {"golf", "pics"}
+
+
+def test_pick_loads_weights_from_database(db_session):
+    """Recent completed commissions boost a subreddit's sampling weight."""
+    golf = Subreddit(subreddit_name="golf", subscribers=1000)
+    chess = Subreddit(subreddit_name="chess", subscribers=1000)
+    db_session.add_all([golf, chess])
+    db_session.commit()
+    db_session.add(
+        PipelineTask(
+            type="SUBREDDIT_POST",
+            subreddit_id=golf.id,
+            status="completed",
+            completed_at=datetime.now(timezone.utc),
+        )
+    )
+    db_session.commit()
+    pool = SubredditPool()
+
+    with patch("app.services.subreddit_pool.random.choices") as choices:
+        choices.return_value = ["golf"]
+        assert pool.pick(db_session) == "golf"
+
+    names = choices.call_args.args[0]
+    weights = dict(zip(names, choices.call_args.kwargs["weights"]))
+    assert weights["golf"] > weights["chess"]
+    assert pool.stats()["size"] == len(names)
+
+
+def test_listing_matches_names_case_insensitively_and_skips_nsfw(db_session):
+    """A listing updates the existing row whatever its case; NSFW is never picked."""
+    db_session.add_all(
+        [
+            Subreddit(subreddit_name="Golf", subscribers=10),
+            Subreddit(subreddit_name="nsfwstuff", subscribers=10, over18=True),
+        ]
+    )
+    db_session.commit()
+    pool = SubredditPool()
+
+    assert pool.record_listing(db_session, [_post("golf", 500_000)]) == 1
+
+    golf = db_session.query(Subreddit).filter(Subreddit.subreddit_name.ilike("golf"))
+    assert [s.subscribers for s in golf] == [500_000]
+    pool.load(db_session)
+    assert "nsfwstuff" not in pool._names
+
+
+def test_listing_leaves_out_nsfw_posts(db_session):
+    """A subreddit seen only through an NSFW post never enters the pool."""
+    pool = SubredditPool()
+
+    listing = [_post("golf", 500_000), _post("nsfwstuff", 10, over_18=True)]
+    assert pool.record_listing(db_session, listing) == 1
+
+    assert (
+        db_session.query(Subreddit).filter_by(subreddit_name="nsfwstuff").count() == 0
+    )
+    pool.load(db_session)
+    assert pool._names == ["golf"]
@@ -268,5 +268,64 @@ async def test_check_stuck_tasks_once(task_monitor):
         assert result["tasks"][0]["donation_id"] == 123
 
 
+def _running_task(db_session, subreddit, heartbeat_age_seconds):
+    task = PipelineTask(
+        type="SUBREDDIT_POST",
+        subreddit_id=subreddit.id,
+        status="in_progress",
+        timeout_seconds=300,
+    )
+    task.started_at = datetime.now(timezone.utc) - timedelta(
+        seconds=heartbeat_age_seconds
+    )
+    task.last_heartbeat = datetime.now(timezone.utc) - timedelta(
+        seconds=heartbeat_age_seconds
+    )
+    db_session.add(task)
+    db_session.commit()
+    return task
+
+
+def test_heartbeat_maintains_deadline(db_session, sample_subreddit):
+    """Setting last_heartbeat keeps deadline_at one timeout ahead."""
+    task = _running_task(db_session, sample_subreddit, heartbeat_age_seconds=0)
+    assert task.deadline_at == task.last_heartbeat + timedelta(seconds=300)
+
+    task.started_at = None
+    task.last_heartbeat = None
+    assert task.deadline_at is None
+
+
+def test_find_stuck_tasks_queries_expired_deadlines(
+    task_monitor, db_session, sample_subreddit
+):
+    """Only tasks past their heartbeat deadline are returned."""
+    stuck = _running_task(db_session, sample_subreddit, heartbeat_age_seconds=600)
+    _running_task(db_session, sample_subreddit, heartbeat_age_seconds=30)
+
+    stuck_tasks = task_monitor._find_stuck_tasks(db_session)
+
+    assert [task.id for task in stuck_tasks] == [stuck.id]
+
+
+def test_stuck_task_can_only_be_claimed_once(
+    task_monitor, db_session, sample_subreddit
+):
+    """A second monitor sees the lease and does not claim the same task."""
+    stuck = _running_task(db_session, sample_subreddit, heartbeat_age_seconds=600)
+    seen = task_monitor._find_stuck_tasks(db_session)[0]
+    stale_deadline = seen.deadline_at
+
+    assert task_monitor._claim_stuck_task(db_session, seen) is True
+
+    # Another replica still holding the old deadline loses the race
+    other_view = MockTask(task_id=stuck.id, status="in_progress")
+    other_view.deadline_at = stale_deadline
+    assert task_monitor._claim_stuck_task(db_session, other_view) is False
+
+    db_session.expire_all()
+    assert task_monitor._find_stuck_tasks(db_session) == []
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,66 @@
+"""
+Tests for atomic task claiming in the task queue.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from app.db.models import PipelineTask
+from app.task_queue import TaskQueue
+
+
+def _add_pending(db_session, subreddit, priority=0, scheduled_for=None):
+    task = PipelineTask(
+        type="SUBREDDIT_POST",
+        subreddit_id=subreddit.id,
+        status="pending",
+        priority=priority,
+        scheduled_for=scheduled_for,
+    )
+    db_session.add(task)
+    db_session.commit()
+    return task
+
+
+def test_claim_tasks_takes_batch_in_priority_order(db_session, sample_subreddit):
+    """A batch claim returns the highest priority ready tasks, marked in progress."""
+    low = _add_pending(db_session, sample_subreddit, priority=1)
+    high = _add_pending(db_session, sample_subreddit, priority=5)
+    _add_pending(
+        db_session,
+        sample_subreddit,
+        priority=9,
+        scheduled_for=datetime.now(timezone.utc) + timedelta(hours=1),
+    )
+
+    claimed = TaskQueue(db_session).claim_tasks(limit=5)
+
+    assert [task.id for task in claimed] == [high.id, low.id]
+    for task in claimed:
+        assert task.status == "in_progress"
+        assert task.started_at is not None
+        assert task.last_heartbeat == task.started_at
+        assert task.deadline_at > task.last_heartbeat
+
+
+def test_claimed_tasks_are_not_handed_out_twice(db_session, sample_subreddit):
+    """A second consumer only receives tasks the first one did not claim."""
+    first = _add_pending(db_session, sample_subreddit, priority=2)
+    second = _add_pending(db_session, sample_subreddit, priority=1)
+    queue = TaskQueue(db_session)
+
+    assert queue.get_next_task().id == first.id
+    assert queue.get_next_task().id == second.id
+    assert queue.get_next_task() is None
+
+
+def test_claim_task_succeeds_once(db_session, sample_subreddit):
+    """Only the first claim of a specific pending task wins."""
+    task = _add_pending(db_session, sample_subreddit)
+    queue = TaskQueue(db_session)
+
+    assert queue.claim_task(task.id) is True
+    assert queue.claim_task(task.id) is False
+
+    db_session.refresh(task)
+    assert task.status == "in_progress"
+    assert task.deadline_at > task.started_at
@@ -0,0 +1,114 @@
+"""
+Tests for the Stripe webhook inbox and its background consumer.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.db.models import WebhookEvent
+from app.services.webhook_inbox import WebhookConsumer, WebhookInbox
+
+
+def _event(
+    event_id, payment_intent_id="pi_1", event_type="payment_intent.succeeded", created=1
+):
+    return {
+        "id": event_id,
+        "type": event_type,
+        "created": created,
+        "data": {"object": {"id": payment_intent_id, "object": "payment_intent"}},
+    }
+
+
+def _signed_headers(body: str):
+    timestamp = int(time.time())
+    secret = os.environ["STRIPE_WEBHOOK_SECRET"]
+    signature = hmac.new(
+        secret.encode(), f"{timestamp}.{body}".encode(), hashlib.sha256
+    ).hexdigest()
+    return {
+        "Content-Type": "application/json",
+        "Stripe-Signature": f"t={timestamp},v1={signature}",
+    }
+
+
+def test_webhook_endpoint_records_event_once(client, db_session):
+    """The endpoint stores the event and acks; a redelivery adds nothing."""
+    body = json.dumps(_event("evt_1"))
+
+    for _ in range(2):
+        response = client.post(
+            "/api/donations/webhook", data=body, headers=_signed_headers(body)
+        )
+        assert response.status_code == 200
+
+    [event] = db_session.query(WebhookEvent).all()
+    assert event.stripe_event_id == "evt_1"
+    assert event.payment_intent_id == "pi_1"
+    assert event.status == "pending"
+
+
+def test_consumer_processes_events_per_intent_in_order(db_session):
+    """A later event for a payment intent waits until the earlier one is done."""
+    inbox = WebhookInbox(db_session)
+    inbox.record_event(
+        _event("evt_late", created=2, event_type="payment_intent.payment_failed")
+    )
+    inbox.record_event(_event("evt_early", created=1))
+    inbox.record_event(_event("evt_other", payment_intent_id="pi_2", created=3))
+
+    [first, other] = inbox.claim_due_events(limit=10)
+    assert [first.stripe_event_id, other.stripe_event_id] == ["evt_early", "evt_other"]
+    assert inbox.claim_due_events(limit=10) == []
+
+    inbox.mark_done(first)
+    [late] = inbox.claim_due_events(limit=10)
+    assert late.stripe_event_id == "evt_late"
+
+
+def test_failed_event_is_retried_with_backoff(db_session):
+    """A handler error reschedules the event and blocks its successors."""
+    inbox = WebhookInbox(db_session)
+    inbox.record_event(_event("evt_1", created=1))
+    inbox.record_event(_event("evt_2", created=2))
+
+    calls = []
+
+    async def flaky(payload):
+        calls.append(payload["id"])
+        if len(calls) == 1:
+            raise RuntimeError("database busy")
+
+    consumer = WebhookConsumer(batch_size=10)
+    consumer.register("payment_intent.succeeded", flaky)
+
+    assert asyncio.run(consumer.process_batch(inbox)) == 1
+    event = db_session.query(WebhookEvent).filter_by(stripe_event_id="evt_1").one()
+    assert event.status == "pending"
+    assert event.attempts == 1
+    assert event.last_error == "database busy"
+    assert event.next_attempt_at > datetime.now(timezone.utc).replace(tzinfo=None)
+
+    # Nothing is due until the backoff expires
+    assert asyncio.run(consumer.process_batch(inbox)) == 0
+
+    event.next_attempt_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db_session.commit()
+    assert asyncio.run(consumer.process_batch(inbox)) == 1
+    assert asyncio.run(consumer.process_batch(inbox)) == 1
+    assert calls == ["evt_1", "evt_1", "evt_2"]
+    assert {e.status for e in db_session.query(WebhookEvent)} == {"processed"}
+
+
+def test_unhandled_event_types_are_ignored(db_session):
+    """Events without a registered handler are marked ignored."""
+    inbox = WebhookInbox(db_session)
+    inbox.record_event(_event("evt_1", event_type="customer.created"))
+
+    assert asyncio.run(WebhookConsumer().process_batch(inbox)) == 1
+    assert db_session.query(WebhookEvent).one().status == "ignored"
@@ -0,0 +1,170 @@
+"""
+Tests for WebSocket fan-out through per-connection outbound queues.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.websocket_manager import OutboundQueue, WebSocketManager
+
+
+@pytest.fixture(autouse=True)
+def redis_service():
+    with patch("app.websocket_manager.redis_service") as service:
+        service.subscribe = AsyncMock()
+        service.unsubscribe = AsyncMock()
+        yield service
+
+
+class FakeWebSocket:
+    """WebSocket stand-in that records frames and can be made to stall."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.frames = []
+        self.closed_with = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.frames.append(json.loads(text))
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+def test_slow_client_does_not_stall_fast_clients():
+    """Fan-out returns immediately and fast clients are served independently."""
+
+    async def scenario():
+        manager = WebSocketManager()
+        fast, slow = FakeWebSocket(), FakeWebSocket(delay=10)
+        for websocket in (fast, slow):
+            await manager.connect(websocket)
+            await manager.subscribe_to_task(websocket, "7")
+
+        await asyncio.wait_for(
+            manager._broadcast_to_task_subscribers("7", {"progress": 50}), timeout=0.1
+        )
+        await asyncio.sleep(0.05)
+
+        assert fast.frames == [
+            {"type": "task_update", "task_id": "7", "data": {"progress": 50}}
+        ]
+        assert slow.frames == []
+        manager.disconnect(fast)
+        manager.disconnect(slow)
+
+    asyncio.run(scenario())
+
+
+def test_task_updates_coalesce_to_latest_per_task():
+    """A lagging client only receives the newest queued update for each task."""
+
+    async def scenario():
+        websocket = FakeWebSocket()
+        queue = OutboundQueue(websocket, on_evict=lambda ws, reason: None, max_size=10)
+        for progress in (10, 20, 30):
+            queue.put(json.dumps({"progress": progress}), coalesce_key=("task", "1"))
+        queue.put(json.dumps({"general": True}))
+
+        assert queue.depth == 2
+        assert queue.coalesced == 2
+
+        queue.start()
+        await asyncio.sleep(0.01)
+        assert websocket.frames == [{"progress": 30}, {"general": True}]
+        queue.close()
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_drops_oldest_frames():
+    """Uncoalesced frames are dropped oldest first once the queue is full."""
+
+    async def scenario():
+        websocket = FakeWebSocket()
+        queue = OutboundQueue(websocket, on_evict=lambda ws, reason: None, max_size=3)
+        for i in range(5):
+            queue.put(json.dumps({"i": i}))
+
+        assert queue.dropped == 2
+        queue.start()
+        await asyncio.sleep(0.01)
+        assert [frame["i"] for frame in websocket.frames] == [2, 3, 4]
+        queue.close()
+
+    asyncio.run(scenario())
+
+
+def test_slow_consumer_is_evicted_on_send_timeout():
+    """A client that cannot accept a frame within the timeout is disconnected."""
+
+    async def scenario():
+        manager = WebSocketManager()
+        slow = FakeWebSocket(delay=10)
+        await manager.connect(slow)
+        manager._outbound[slow].send_timeout = 0.02
+
+        await manager._broadcast_to_all_connections({"type": "task_created"})
+        await asyncio.sleep(0.1)
+
+        assert manager.get_connection_count() == 0
+        assert slow.closed_with == 1013
+        assert manager.get_metrics()["evictions"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_metrics_report_depth_and_drops():
+    """Metrics include live queue depth and dropped frames."""
+
+    async def scenario():
+        manager = WebSocketManager()
+        websocket = FakeWebSocket(delay=10)
+        await manager.connect(websocket)
+        outbound = manager._outbound[websocket]
+        outbound.max_size = 3
+
+        for i in range(4):
+            await manager.send_personal_message(websocket, {"i": i})
+        await asyncio.sleep(0.01)
+
+        metrics = manager.get_metrics()
+        assert metrics["connections"] == 1
+        assert metrics["queued_frames"] == outbound.depth
+        assert metrics["frames_dropped"] >= 1
+        manager.disconnect(websocket)
+
+    asyncio.run(scenario())
+
+
+def test_task_channel_subscribed_only_while_locally_watched(redis_service):
+    """The per-task Redis channel follows the first and last local subscriber."""
+
+    async def scenario():
+        manager = WebSocketManager()
+        first, second = FakeWebSocket(), FakeWebSocket()
+        for websocket in (first, second):
+            await manager.connect(websocket)
+            await manager.subscribe_to_task(websocket, "9")
+
+        redis_service.subscribe.assert_awaited_once_with(
+            "task_updates:9", manager._handle_redis_task_update
+        )
+
+        await manager.unsubscribe_from_task(first, "9")
+        redis_service.unsubscribe.assert_not_awaited()
+
+        manager.disconnect(second)
+        await asyncio.sleep(0)
+        redis_service.unsubscribe.assert_awaited_once_with("task_updates:9")
+        manager.disconnect(first)
+
+    asyncio.run(scenario())